@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Offline Claude Benchmark for PMCC Scanner
+
+Runs Step 5 (ClaudeIntegrationManager -> ClaudeProvider -> ClaudeClient) end to
+end against the local Claude stand-in, so throughput, latency and concurrency
+settings can be tuned without sending requests to Anthropic.
+
+Usage:
+    python scripts/benchmark_claude.py
+    python scripts/benchmark_claude.py --opportunities 100 --rpm 50 --latency-ms 2000
+    python scripts/benchmark_claude.py --max-concurrent 5 --rate-limit-probability 0.05
+    python scripts/benchmark_claude.py --batch-token-budget 12000 --max-batch-size 5
+    python scripts/benchmark_claude.py --replay-dir data/claude_submissions --streaming --json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from src.api.data_provider import ProviderType
+    from src.api.providers.claude_provider import ClaudeProvider
+    from src.analysis.claude_integration import ClaudeIntegrationManager
+except ImportError as e:
+    print(f"Import error: {e}")
+    print("Make sure you're running from the project root or have proper Python path setup")
+    sys.exit(1)
+
+
+def build_opportunities(count: int) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Build synthetic opportunities and their enhanced stock data."""
+    opportunities = []
+    enhanced_lookup = {}
+    for i in range(count):
+        symbol = f"T{i:03d}"
+        price = 50.0 + i
+        opportunities.append({
+            'symbol': symbol,
+            'underlying_price': price,
+            'pmcc_score': 60 + i % 30,
+            'strategy_details': {'net_debit': round(price * 0.2, 2), 'max_profit': round(price * 0.1, 2)},
+            'leaps_option': {'strike': round(price * 0.8), 'expiration': '2027-06-17', 'delta': 0.8,
+                             'mid': round(price * 0.25, 2), 'iv': 0.3},
+            'short_option': {'strike': round(price * 1.1), 'expiration': '2026-11-20', 'delta': 0.3,
+                             'mid': round(price * 0.03, 2), 'iv': 0.35}
+        })
+        enhanced_lookup[symbol] = {
+            'quote': {'symbol': symbol, 'last': price},
+            'fundamentals': {'market_capitalization': 5e9 + i * 1e8, 'pe_ratio': 18.0, 'beta': 1.1},
+            'completeness_score': 80.0
+        }
+    return opportunities, enhanced_lookup
+
+
+def build_provider(args: argparse.Namespace) -> ClaudeProvider:
+    """Create a Claude provider answered by the local stand-in."""
+    return ClaudeProvider(ProviderType.CLAUDE, {
+        'api_key': 'standin',
+        'max_retries': args.max_retries,
+        'response_cache_enabled': False,
+        'streaming_enabled': args.streaming,
+        'stream_early_stop': args.early_stop,
+        'rate_limit_enabled': args.rpm > 0 or args.itpm > 0 or args.otpm > 0,
+        'requests_per_minute': args.rpm,
+        'input_tokens_per_minute': args.itpm,
+        'output_tokens_per_minute': args.otpm,
+        'standin_enabled': True,
+        'standin_replay_dir': args.replay_dir,
+        'standin_latency_distribution': args.latency_distribution,
+        'standin_latency_ms': args.latency_ms,
+        'standin_latency_jitter_ms': args.latency_jitter_ms,
+        'standin_output_tokens_per_second': args.output_tokens_per_second,
+        'standin_rate_limit_probability': args.rate_limit_probability,
+        'standin_output_tokens': args.output_tokens
+    })
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Analyze the synthetic opportunities and collect timings and stats."""
+    opportunities, enhanced_lookup = build_opportunities(args.opportunities)
+    provider = build_provider(args)
+    manager = ClaudeIntegrationManager()
+
+    # Time each provider call as seen by the integration manager
+    latencies = []
+    method = 'analyze_pmcc_opportunity_batch' if args.batch_token_budget else 'analyze_single_pmcc_opportunity'
+    analyze = getattr(provider, method)
+
+    async def timed_analyze(*call_args, **call_kwargs):
+        started = time.perf_counter()
+        try:
+            return await analyze(*call_args, **call_kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    setattr(provider, method, timed_analyze)
+
+    started = time.perf_counter()
+    results = await manager.analyze_opportunities_individually(
+        opportunities, enhanced_lookup, provider,
+        max_concurrent=args.max_concurrent,
+        batch_token_budget=args.batch_token_budget,
+        max_batch_size=args.max_batch_size
+    )
+    elapsed = time.perf_counter() - started
+
+    analyzed = sum(1 for r in results if r.get('claude_analyzed'))
+    latencies.sort()
+    return {
+        'opportunities': len(opportunities),
+        'analyzed': analyzed,
+        'elapsed_seconds': round(elapsed, 3),
+        'opportunities_per_minute': round(analyzed / elapsed * 60, 1) if elapsed > 0 else None,
+        'latency_seconds': {
+            'p50': round(statistics.median(latencies), 3),
+            'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+            'max': round(latencies[-1], 3)
+        } if latencies else None,
+        'client': provider.client.get_stats(),
+        'standin': provider.standin.get_stats()
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Step 5 Claude analysis offline against the local stand-in",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--opportunities', type=int, default=25, help='Number of synthetic opportunities')
+    parser.add_argument('--max-concurrent', type=int, default=None,
+                        help='Concurrency cap (default: paced by the rate limiter)')
+    parser.add_argument('--batch-token-budget', type=int, default=None,
+                        help='Pack opportunities into multi-opportunity requests with this budget')
+    parser.add_argument('--max-batch-size', type=int, default=5, help='Maximum opportunities per packed request')
+    parser.add_argument('--max-retries', type=int, default=3, help='Client retry attempts')
+    parser.add_argument('--rpm', type=int, default=50, help='Requests per minute limit (0 disables)')
+    parser.add_argument('--itpm', type=int, default=40000, help='Input tokens per minute limit (0 disables)')
+    parser.add_argument('--otpm', type=int, default=8000, help='Output tokens per minute limit (0 disables)')
+    parser.add_argument('--streaming', action='store_true', help='Stream responses')
+    parser.add_argument('--early-stop', action='store_true', help='Stop streams once key fields are complete')
+    parser.add_argument('--replay-dir', default=None, help='Directory of recorded analyses to replay')
+    parser.add_argument('--latency-distribution', default='lognormal', choices=['fixed', 'uniform', 'lognormal'])
+    parser.add_argument('--latency-ms', type=float, default=1500.0, help='Median time to first token')
+    parser.add_argument('--latency-jitter-ms', type=float, default=500.0, help='Spread of time to first token')
+    parser.add_argument('--output-tokens-per-second', type=float, default=60.0, help='Simulated generation speed')
+    parser.add_argument('--rate-limit-probability', type=float, default=0.0, help='Probability of a simulated 429')
+    parser.add_argument('--output-tokens', type=int, default=600, help='Approximate tokens per analysis')
+    parser.add_argument('--json', action='store_true', help='Output JSON results')
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return 0
+
+    print(f"Analyzed {report['analyzed']}/{report['opportunities']} opportunities "
+          f"in {report['elapsed_seconds']}s ({report['opportunities_per_minute']}/min)")
+    if report['latency_seconds']:
+        latency = report['latency_seconds']
+        print(f"Latency p50 {latency['p50']}s, p95 {latency['p95']}s, max {latency['max']}s")
+    client = report['client']
+    print(f"Requests: {client['total_requests']} ({client['failed_requests']} failed), "
+          f"tokens in/out: {client['total_input_tokens']}/{client['total_output_tokens']}, "
+          f"estimated cost ${client['total_cost_estimate']:.4f}")
+    if client.get('rate_limiter'):
+        limiter = client['rate_limiter']
+        print(f"Rate limiter: {limiter['requests_delayed']} delayed, "
+              f"{limiter['total_wait_seconds']:.1f}s waiting, {limiter['rate_limit_pauses']} pauses")
+    standin = report['standin']
+    print(f"Stand-in: {standin['requests']} requests, {standin['rate_limited']} rate limited, "
+          f"max {standin['max_in_flight']} in flight")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
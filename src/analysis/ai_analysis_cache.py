@@ -0,0 +1,213 @@
+"""
+Persistent store of Claude analyses keyed by opportunity fingerprint.
+
+The same symbols and near-identical LEAPS/short call pairs often rank in the
+top opportunities on consecutive days. Each analysed opportunity is reduced
+to a fingerprint of what Claude's judgement depends on: the contracts'
+strikes and expirations, prices bucketed to a relative step, implied
+volatility bucketed to an absolute step, the next earnings date and a few
+key fundamentals. While an opportunity's fingerprint matches the one stored
+for its symbol and the stored analysis is younger than the staleness window,
+the scanner reuses it instead of asking Claude again.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Fundamentals whose material change invalidates a stored analysis
+FINGERPRINT_FUNDAMENTALS = (
+    'market_capitalization', 'pe_ratio', 'beta', 'debt_to_equity', 'profit_margin'
+)
+
+
+def bucket_relative(value: Any, step_pct: float) -> Optional[int]:
+    """Bucket a positive value on a log scale so each bucket spans step_pct percent."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if value <= 0 or not math.isfinite(value):
+        return None
+    return round(math.log(value) / math.log1p(step_pct / 100))
+
+
+def bucket_absolute(value: Any, step: float) -> Optional[int]:
+    """Bucket a value into fixed-width steps."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(value):
+        return None
+    return round(value / step)
+
+
+def opportunity_fingerprint(opportunity_data: Dict[str, Any],
+                            enhanced_stock_data: Optional[Dict[str, Any]] = None,
+                            price_step_pct: float = 2.5,
+                            iv_step: float = 0.02) -> str:
+    """
+    Fingerprint the inputs a Claude analysis of an opportunity depends on.
+
+    Args:
+        opportunity_data: Opportunity dict as sent to Claude (symbol, prices, option legs)
+        enhanced_stock_data: Enhanced stock dict as sent to Claude
+        price_step_pct: Relative width of price buckets in percent
+        iv_step: Absolute width of implied volatility buckets
+
+    Returns:
+        Hex digest identifying the opportunity's material state
+    """
+    enhanced_stock_data = enhanced_stock_data or {}
+
+    def leg(option: Dict[str, Any]) -> Dict[str, Any]:
+        option = option or {}
+        return {
+            'strike': option.get('strike'),
+            'expiration': option.get('expiration'),
+            'mid': bucket_relative(option.get('mid'), price_step_pct),
+            'iv': bucket_absolute(option.get('iv'), iv_step),
+        }
+
+    strategy = opportunity_data.get('strategy_details') or {}
+    fundamentals = enhanced_stock_data.get('fundamentals') or {}
+    earnings = enhanced_stock_data.get('earnings_calendar') or []
+    today = datetime.now().date().isoformat()
+    upcoming_earnings = sorted(
+        day for day in (
+            str(e.get('report_date') or e.get('date') or '') for e in earnings if isinstance(e, dict)
+        ) if day[:10] >= today
+    )
+
+    material = {
+        'symbol': opportunity_data.get('symbol'),
+        'underlying_price': bucket_relative(opportunity_data.get('underlying_price'), price_step_pct),
+        'net_debit': bucket_relative(strategy.get('net_debit'), price_step_pct),
+        'leaps': leg(opportunity_data.get('leaps_option')),
+        'short': leg(opportunity_data.get('short_option')),
+        'next_earnings': upcoming_earnings[0] if upcoming_earnings else None,
+        'fundamentals': {
+            key: bucket_relative(abs(fundamentals[key]), price_step_pct * 4)
+            if isinstance(fundamentals.get(key), (int, float)) else None
+            for key in FINGERPRINT_FUNDAMENTALS
+        },
+    }
+    payload = json.dumps(material, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class StoredAnalysis:
+    """A Claude analysis and the fingerprint of the opportunity it scored."""
+    fingerprint: str
+    analyzed_at: datetime
+    analysis: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert entry to a JSON-serializable dictionary."""
+        return {
+            'fingerprint': self.fingerprint,
+            'analyzed_at': self.analyzed_at.isoformat(),
+            'analysis': self.analysis
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StoredAnalysis':
+        """Create entry from its dictionary form."""
+        return cls(
+            fingerprint=data['fingerprint'],
+            analyzed_at=datetime.fromisoformat(data['analyzed_at']),
+            analysis=dict(data['analysis'])
+        )
+
+
+class AIAnalysisCache:
+    """
+    File-backed map of symbol -> latest stored Claude analysis.
+
+    An analysis is reusable while its fingerprint matches the current
+    opportunity and it is younger than ``max_age_hours``.
+    """
+
+    def __init__(self, cache_file: str, max_age_hours: float = 72.0):
+        """
+        Initialize cache and load existing entries.
+
+        Args:
+            cache_file: Path of the JSON file backing the cache
+            max_age_hours: Hours after which a stored analysis is re-run regardless
+        """
+        self.cache_file = cache_file
+        self.max_age = timedelta(hours=max_age_hours)
+        self._entries: Dict[str, StoredAnalysis] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> None:
+        """Load entries from disk, starting empty if the file is missing or corrupt."""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self._entries = {
+                symbol: StoredAnalysis.from_dict(entry)
+                for symbol, entry in data.get('symbols', {}).items()
+            }
+            logger.debug(f"Loaded {len(self._entries)} stored AI analyses from {self.cache_file}")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable AI analysis cache {self.cache_file}: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Drop stale entries and write the rest to disk if anything changed."""
+        now = datetime.now()
+        stale = [s for s, e in self._entries.items() if now - e.analyzed_at >= self.max_age]
+        for symbol in stale:
+            del self._entries[symbol]
+        if not self._dirty and not stale:
+            return
+
+        try:
+            Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    'symbols': {symbol: entry.to_dict() for symbol, entry in self._entries.items()}
+                }, f, indent=2, sort_keys=True, default=str)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save AI analysis cache {self.cache_file}: {e}")
+
+    def get(self, symbol: str, fingerprint: str,
+            now: Optional[datetime] = None) -> Optional[StoredAnalysis]:
+        """Get the stored analysis if its fingerprint matches and it is not stale."""
+        entry = self._entries.get(symbol.upper())
+        if entry is None or entry.fingerprint != fingerprint:
+            return None
+        if (now or datetime.now()) - entry.analyzed_at >= self.max_age:
+            return None
+        return entry
+
+    def record(self, symbol: str, fingerprint: str, analysis: Dict[str, Any],
+               analyzed_at: Optional[datetime] = None) -> None:
+        """Store the latest analysis for a symbol."""
+        self._entries[symbol.upper()] = StoredAnalysis(
+            fingerprint, analyzed_at or datetime.now(), dict(analysis)
+        )
+        self._dirty = True
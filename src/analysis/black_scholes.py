@@ -0,0 +1,299 @@
+"""
+Vectorized Black-Scholes option pricing.
+
+All functions take scalars or NumPy arrays (broadcast against each other)
+and return float arrays. Times are in years, rates and volatilities as
+decimals (0.05 = 5%). Greeks follow market data conventions: theta per
+calendar day, vega per volatility point. No dividend yield is modelled.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+DAYS_PER_YEAR = 365.0
+
+# Implied volatility search bracket
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 5.0
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+# Abramowitz & Stegun 26.2.17 coefficients (absolute error < 7.5e-8)
+_P = 0.2316419
+_B = (0.319381530, -0.356563782, 1.781477937, -1.821255978, 1.330274429)
+
+
+def norm_pdf(x):
+    """Standard normal probability density."""
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def norm_cdf(x):
+    """Standard normal cumulative distribution."""
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 0:
+        return norm_cdf(x[None])[0]
+    # Upper tail Q(|x|) = pdf(x) * poly(t), t = 1 / (1 + p|x|); Phi(x) = 0.5 + sign(x) * (0.5 - Q)
+    t = np.abs(x)
+    t *= _P
+    t += 1.0
+    np.reciprocal(t, out=t)
+    poly = t * _B[4]
+    for b in (_B[3], _B[2], _B[1], _B[0]):
+        poly += b
+        poly *= t
+    tail = np.square(x)
+    tail *= -0.5
+    np.exp(tail, out=tail)
+    tail *= poly
+    tail *= -1.0 / _SQRT_2PI
+    tail += 0.5
+    np.copysign(tail, x, out=tail)
+    tail += 0.5
+    return tail
+
+
+def _d1_d2(spot, strike, years, rate, volatility):
+    """Black-Scholes d1 and d2."""
+    sigma_sqrt_t = volatility * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * volatility * volatility) * years) / sigma_sqrt_t
+    return d1, d1 - sigma_sqrt_t
+
+
+def _prepare(spot, strike, years, rate, volatility):
+    """
+    Broadcast inputs and compute d1/d2 for live contracts.
+
+    Returns the broadcast arrays, the live mask (years > 0 and volatility > 0)
+    and d1/d2, which are only meaningful where live.
+    """
+    spot, strike, years, rate, volatility = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (spot, strike, years, rate, volatility))
+    )
+    live = (years > 0) & (volatility > 0)
+    safe_years = np.where(live, years, 1.0)
+    safe_volatility = np.where(live, volatility, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1, d2 = _d1_d2(spot, strike, safe_years, rate, safe_volatility)
+    return spot, strike, safe_years, rate, safe_volatility, live, d1, d2
+
+
+def _call_intrinsic(spot, strike, years, rate, live):
+    """Value of a non-live call: spot less the strike discounted over any remaining time."""
+    remaining = np.where(live, 0.0, np.maximum(years, 0))
+    return np.maximum(spot - strike * np.exp(-rate * remaining), 0.0)
+
+
+def call_price(spot, strike, years, rate, volatility):
+    """
+    European call value.
+
+    Expired contracts (years <= 0) and zero volatility are valued at
+    (discounted) intrinsic value.
+    """
+    spot, strike, safe_years, rate, _, live, d1, d2 = _prepare(spot, strike, years, rate, volatility)
+    with np.errstate(invalid='ignore'):
+        value = spot * norm_cdf(d1) - strike * np.exp(-rate * safe_years) * norm_cdf(d2)
+    return np.where(live, value, _call_intrinsic(spot, strike, years, rate, live))
+
+
+def call_delta(spot, strike, years, rate, volatility):
+    """Call delta; 1 or 0 for expired contracts depending on moneyness."""
+    spot, strike, _, _, _, live, d1, _ = _prepare(spot, strike, years, rate, volatility)
+    return np.where(live, norm_cdf(d1), (spot > strike).astype(float))
+
+
+def gamma(spot, strike, years, rate, volatility):
+    """Gamma (identical for calls and puts); 0 for expired contracts."""
+    spot, _, safe_years, _, safe_volatility, live, d1, _ = _prepare(spot, strike, years, rate, volatility)
+    with np.errstate(invalid='ignore'):
+        value = norm_pdf(d1) / (spot * safe_volatility * np.sqrt(safe_years))
+    return np.where(live, value, 0.0)
+
+
+def call_theta(spot, strike, years, rate, volatility):
+    """Call theta per calendar day; 0 for expired contracts."""
+    spot, strike, safe_years, rate, safe_volatility, live, d1, d2 = _prepare(
+        spot, strike, years, rate, volatility
+    )
+    with np.errstate(invalid='ignore'):
+        value = (
+            -spot * norm_pdf(d1) * safe_volatility / (2 * np.sqrt(safe_years))
+            - rate * strike * np.exp(-rate * safe_years) * norm_cdf(d2)
+        ) / DAYS_PER_YEAR
+    return np.where(live, value, 0.0)
+
+
+def vega(spot, strike, years, rate, volatility):
+    """Vega per volatility point (0.01); 0 for expired contracts."""
+    spot, _, safe_years, _, _, live, d1, _ = _prepare(spot, strike, years, rate, volatility)
+    with np.errstate(invalid='ignore'):
+        value = spot * norm_pdf(d1) * np.sqrt(safe_years) / 100
+    return np.where(live, value, 0.0)
+
+
+def call_greeks(spot, strike, years, rate, volatility) -> Dict[str, np.ndarray]:
+    """
+    Call price and Greeks in one pass.
+
+    Returns:
+        Dict with 'price', 'delta', 'gamma', 'theta' (per day) and 'vega'
+        (per volatility point) arrays
+    """
+    spot, strike, safe_years, rate, safe_volatility, live, d1, d2 = _prepare(
+        spot, strike, years, rate, volatility
+    )
+    with np.errstate(invalid='ignore'):
+        pdf = norm_pdf(d1)
+        cdf_d1 = norm_cdf(d1)
+        cdf_d2 = norm_cdf(d2)
+        sqrt_t = np.sqrt(safe_years)
+        discounted_strike = strike * np.exp(-rate * safe_years)
+        price = spot * cdf_d1 - discounted_strike * cdf_d2
+        theta = (-spot * pdf * safe_volatility / (2 * sqrt_t) - rate * discounted_strike * cdf_d2) / DAYS_PER_YEAR
+        gamma_value = pdf / (spot * safe_volatility * sqrt_t)
+        vega_value = spot * pdf * sqrt_t / 100
+    return {
+        'price': np.where(live, price, _call_intrinsic(spot, strike, years, rate, live)),
+        'delta': np.where(live, cdf_d1, (spot > strike).astype(float)),
+        'gamma': np.where(live, gamma_value, 0.0),
+        'theta': np.where(live, theta, 0.0),
+        'vega': np.where(live, vega_value, 0.0)
+    }
+
+
+def probability_above(spot, level, years, rate, volatility):
+    """
+    Lognormal (risk-neutral) probability that the price ends above level.
+
+    N(d2) of a call struck at level; expired contracts and zero volatility
+    give 1 or 0 depending on whether spot is above level.
+    """
+    spot, level, _, _, _, live, _, d2 = _prepare(spot, level, years, rate, volatility)
+    return np.where(live, norm_cdf(d2), (spot > level).astype(float))
+
+
+def probability_of_touch(spot, level, years, rate, volatility):
+    """
+    Probability that the price trades at or above level before expiry.
+
+    First passage of a lognormal path (drift rate - volatility^2 / 2) through
+    an upper barrier, by the reflection principle; 1 where spot is already at
+    or above level.
+    """
+    spot, level, safe_years, rate, safe_volatility, live, _, _ = _prepare(
+        spot, level, years, rate, volatility
+    )
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        barrier = np.log(level / spot)
+        drift = rate - 0.5 * safe_volatility * safe_volatility
+        sigma_sqrt_t = safe_volatility * np.sqrt(safe_years)
+        touch = (
+            norm_cdf((drift * safe_years - barrier) / sigma_sqrt_t)
+            + np.exp(2 * drift * barrier / (safe_volatility * safe_volatility))
+            * norm_cdf((-drift * safe_years - barrier) / sigma_sqrt_t)
+        )
+    touch = np.where(live, np.clip(touch, 0.0, 1.0), 0.0)
+    return np.where(spot >= level, 1.0, touch)
+
+
+def implied_volatility(price, spot, strike, years, rate,
+                       tolerance: float = 1e-6, max_iterations: int = 100):
+    """
+    Implied volatility of call prices.
+
+    Newton steps on the pricing error, safeguarded by a bisection bracket:
+    a step that leaves the bracket (or stalls on a vanishing vega) is
+    replaced by the bracket midpoint, so every element converges.
+
+    Returns:
+        Volatility array; NaN where the price violates the no-arbitrage
+        bounds (below discounted intrinsic or above spot) or the contract
+        has expired
+    """
+    price, spot, strike, years, rate = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (price, spot, strike, years, rate))
+    )
+    lower_bound = np.maximum(spot - strike * np.exp(-rate * np.maximum(years, 0)), 0.0)
+    solvable = (years > 0) & (spot > 0) & (strike > 0) & (price > lower_bound) & (price < spot)
+
+    low = np.full(price.shape, MIN_VOLATILITY)
+    high = np.full(price.shape, MAX_VOLATILITY)
+    # Brenner-Subrahmanyam at-the-money approximation as the starting point
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(2 * np.pi / np.where(solvable, years, 1.0)) * price / spot
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.3), MIN_VOLATILITY, MAX_VOLATILITY)
+
+    active = solvable.copy()
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        error = call_price(spot, strike, years, rate, sigma) - price
+        active &= np.abs(error) > tolerance
+        high = np.where(active & (error > 0), sigma, high)
+        low = np.where(active & (error < 0), sigma, low)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = sigma - error / (vega(spot, strike, years, rate, sigma) * 100)
+        in_bracket = (newton > low) & (newton < high)
+        sigma = np.where(active, np.where(in_bracket, newton, 0.5 * (low + high)), sigma)
+
+    return np.where(solvable, sigma, np.nan)
+
+
+def spot_for_call_value(value, strike, years, rate, volatility, upper, tolerance: float = 1e-4):
+    """
+    Lowest spot in (0, upper] at which a call is worth more than value.
+
+    The call value rises with spot, so the spot is found by bisection to
+    within tolerance.
+
+    Returns:
+        Spot array; inf where the call is not worth more than value even at
+        upper, NaN where an input is missing or the contract has expired
+    """
+    value, strike, years, rate, volatility, upper = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (value, strike, years, rate, volatility, upper))
+    )
+    with np.errstate(invalid='ignore'):
+        known = (value >= 0) & (strike > 0) & (years > 0) & (volatility > 0) & (upper > 0)
+    safe_upper = np.where(known, upper, 1.0)
+    reachable = known & (call_price(safe_upper, strike, years, rate, volatility) > value)
+
+    low = np.zeros(value.shape)
+    high = safe_upper.copy()
+    active = reachable & (high - low > tolerance)
+    while active.any():
+        middle = 0.5 * (low + high)
+        above = call_price(middle, strike, years, rate, volatility) > value
+        high = np.where(active & above, middle, high)
+        low = np.where(active & ~above, middle, low)
+        active &= high - low > tolerance
+
+    return np.where(reachable, high, np.where(known, np.inf, np.nan))
+
+
+def call_price_from_log_spot(log_spot, strike, years, rate, volatility):
+    """
+    European call value from the log of the spot price.
+
+    For live contracts only (years > 0, volatility > 0); skips the expiry
+    handling of call_price for simulation loops that already work in log space.
+    """
+    log_spot = np.asarray(log_spot, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    years = np.asarray(years, dtype=float)
+    volatility = np.asarray(volatility, dtype=float)
+
+    sigma_sqrt_t = volatility * np.sqrt(years)
+    d1 = log_spot - np.log(strike)
+    d1 += (rate + 0.5 * volatility * volatility) * years
+    d1 /= sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+
+    value = norm_cdf(d1)
+    value *= np.exp(log_spot)
+    value -= strike * np.exp(-rate * years) * norm_cdf(d2)
+    return value
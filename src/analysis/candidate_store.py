@@ -0,0 +1,287 @@
+"""
+Columnar store of a scan's scored PMCC candidates.
+
+Every opportunity the options analyzer produced is kept with its raw score
+components (ROI, risk-reward, probability, liquidity), its economics and the
+contract fields needed to rebuild it, one NumPy array per field. Claude
+results are kept sparsely for the few candidates that were analyzed.
+
+Re-ranking under new scoring weights or thresholds is then a handful of
+array operations: only the selected rows are turned back into objects, and
+no provider is called. The store is saved as a compressed .npz file without
+pickled objects.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.analysis.options_analyzer import PMCCOpportunity, ScoringWeights
+    from src.models.api_models import OptionContract, OptionSide, StockQuote
+    from src.models.pmcc_models import PMCCCandidate
+except ImportError:
+    # Handle case when running as script
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from analysis.options_analyzer import PMCCOpportunity, ScoringWeights
+    from models.api_models import OptionContract, OptionSide, StockQuote
+    from models.pmcc_models import PMCCCandidate
+
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+
+LEGS = ('leaps', 'short')
+
+# Contract fields stored per leg (besides option symbol and expiration)
+CONTRACT_DECIMALS = ('strike', 'bid', 'ask', 'mid', 'last', 'delta', 'gamma', 'theta', 'vega', 'iv')
+CONTRACT_INTEGERS = ('bid_size', 'ask_size', 'volume', 'open_interest', 'dte')
+
+QUOTE_DECIMALS = ('bid', 'ask', 'mid', 'last')
+
+OPPORTUNITY_DECIMALS = (
+    'net_debit', 'max_profit', 'max_loss', 'breakeven',
+    'roi_potential', 'risk_reward_ratio', 'probability_score', 'liquidity_score', 'total_score',
+    'probability_of_profit', 'probability_of_touch'
+)
+
+
+def _float(value: Any) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def _decimal(value: float) -> Optional[Decimal]:
+    return Decimal(str(value)) if np.isfinite(value) else None
+
+
+def _integer(value: float) -> Optional[int]:
+    return int(value) if np.isfinite(value) else None
+
+
+def _datetime(value: np.datetime64) -> Optional[datetime]:
+    return None if np.isnat(value) else value.astype('datetime64[us]').astype(datetime)
+
+
+def _datetime64(value: Optional[datetime]) -> np.datetime64:
+    return np.datetime64(value.replace(tzinfo=None), 's') if value else np.datetime64('NaT', 's')
+
+
+@dataclass
+class CandidateStore:
+    """
+    Scored candidates of one scan, one array per field.
+
+    ai holds Claude results for the analyzed rows only: 'row' indexes into
+    the candidate columns, the other arrays are aligned with it.
+    """
+    scan_id: str
+    columns: Dict[str, np.ndarray]
+    ai: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.columns['symbol'])
+
+    @classmethod
+    def from_opportunities(cls, opportunities: Sequence[PMCCOpportunity], scan_id: str,
+                           analyzed: Optional[Sequence[PMCCCandidate]] = None) -> 'CandidateStore':
+        """
+        Build the store from a scan's opportunities.
+
+        Args:
+            opportunities: All opportunities found by the options analyzer
+            scan_id: ID of the scan that produced them
+            analyzed: Candidates that went through AI analysis; those with a
+                Claude score are matched to their opportunity by contract symbols
+        """
+        columns: Dict[str, np.ndarray] = {
+            'symbol': np.array([o.underlying_quote.symbol for o in opportunities], dtype=str),
+            'analyzed_at': np.array([_datetime64(o.analyzed_at) for o in opportunities], dtype='datetime64[s]'),
+            'quote_volume': np.array([_float(o.underlying_quote.volume) for o in opportunities])
+        }
+        for name in QUOTE_DECIMALS:
+            columns[f'quote_{name}'] = np.array([_float(getattr(o.underlying_quote, name)) for o in opportunities])
+        for name in OPPORTUNITY_DECIMALS:
+            columns[name] = np.array([_float(getattr(o, name)) for o in opportunities])
+
+        for leg in LEGS:
+            contracts = [getattr(o, f'{leg}_contract') for o in opportunities]
+            columns[f'{leg}_option_symbol'] = np.array([c.option_symbol for c in contracts], dtype=str)
+            columns[f'{leg}_expiration'] = np.array(
+                [_datetime64(c.expiration) for c in contracts], dtype='datetime64[s]'
+            )
+            for name in CONTRACT_DECIMALS + CONTRACT_INTEGERS:
+                columns[f'{leg}_{name}'] = np.array([_float(getattr(c, name)) for c in contracts])
+
+        store = cls(scan_id=scan_id, columns=columns)
+        if analyzed:
+            store._attach_ai_results(analyzed)
+        return store
+
+    def _attach_ai_results(self, analyzed: Sequence[PMCCCandidate]) -> None:
+        """Record the Claude results of analyzed candidates against their rows."""
+        rows_by_contracts = {
+            key: row for row, key in enumerate(zip(
+                self.columns['leaps_option_symbol'].tolist(), self.columns['short_option_symbol'].tolist()
+            ))
+        }
+        rows, entries = [], []
+        for candidate in analyzed:
+            if not candidate.claude_score:
+                continue
+            key = (candidate.analysis.long_call.option_symbol, candidate.analysis.short_call.option_symbol)
+            if key in rows_by_contracts:
+                rows.append(rows_by_contracts[key])
+                entries.append(candidate)
+
+        self.ai = {
+            'row': np.array(rows, dtype=np.int64),
+            'claude_score': np.array([float(c.claude_score) for c in entries]),
+            'claude_confidence': np.array([_float(c.claude_confidence) for c in entries]),
+            'ai_recommendation': np.array([c.ai_recommendation or '' for c in entries], dtype=str),
+            'claude_reasoning': np.array([c.claude_reasoning or '' for c in entries], dtype=str),
+            'ai_insights': np.array([json.dumps(c.ai_insights or {}, default=str) for c in entries], dtype=str),
+            'ai_analysis_timestamp': np.array(
+                [_datetime64(c.ai_analysis_timestamp) for c in entries], dtype='datetime64[s]'
+            )
+        }
+
+    @property
+    def has_ai_scores(self) -> bool:
+        """Whether any candidate carries a Claude score."""
+        return len(self.ai.get('row', ())) > 0
+
+    def save(self, path: str) -> None:
+        """Write the store to a compressed .npz file."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        arrays = {f'c_{name}': values for name, values in self.columns.items()}
+        arrays.update({f'ai_{name}': values for name, values in self.ai.items()})
+        tmp_file = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_file, format_version=FORMAT_VERSION, scan_id=self.scan_id, **arrays)
+        os.replace(tmp_file, path)
+        logger.debug(f"Saved {len(self)} candidates of {self.scan_id} to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'CandidateStore':
+        """
+        Read a store written by save().
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['format_version'])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported candidate store version {version} in {path}")
+            return cls(
+                scan_id=str(data['scan_id']),
+                columns={key[2:]: data[key] for key in data.files if key.startswith('c_')},
+                ai={key[3:]: data[key] for key in data.files if key.startswith('ai_')}
+            )
+
+    def total_scores(self, weights: ScoringWeights) -> np.ndarray:
+        """Total scores of all candidates under the given weights."""
+        return weights.total_scores(
+            self.columns['roi_potential'], self.columns['risk_reward_ratio'],
+            self.columns['probability_score'], self.columns['liquidity_score']
+        )
+
+    def rank(self, total_score: np.ndarray, min_total_score: Decimal,
+             best_per_symbol_only: bool, max_opportunities: int) -> np.ndarray:
+        """
+        Rows passing the score threshold, best first, as PMCCScanner._rank_and_filter.
+
+        Returns:
+            Row indices of the top max_opportunities candidates
+        """
+        rows = np.flatnonzero((total_score > 0) & (total_score >= float(min_total_score)))
+        rows = rows[np.argsort(-total_score[rows], kind='stable')]
+        if best_per_symbol_only:
+            _, first = np.unique(self.columns['symbol'][rows], return_index=True)
+            rows = rows[np.sort(first)]
+        return rows[:max_opportunities]
+
+    def select_ai(self, rows: np.ndarray, total_score: np.ndarray,
+                  traditional_weight: float, ai_weight: float, top_n: int,
+                  min_combined_score: float, min_confidence: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Re-apply the AI selection to ranked rows, as the scan's top N selection.
+
+        Only rows with a Claude score take part; they are ordered by combined
+        score, cut to top_n and filtered by the combined score and confidence
+        thresholds. Rows whose Claude analysis was for another candidate of
+        the symbol drop out, as a rescan would need a new analysis for them.
+
+        Returns:
+            Selected rows and their combined scores
+        """
+        position = np.full(len(self), -1)
+        position[self.ai['row']] = np.arange(len(self.ai['row']))
+        ai_index = position[rows]
+        rows, ai_index = rows[ai_index >= 0], ai_index[ai_index >= 0]
+
+        combined = total_score[rows] * traditional_weight + self.ai['claude_score'][ai_index] * ai_weight
+        order = np.argsort(-combined, kind='stable')[:top_n]
+        rows, ai_index, combined = rows[order], ai_index[order], combined[order]
+
+        confidence = np.nan_to_num(self.ai['claude_confidence'][ai_index], nan=0.0)
+        keep = (combined >= min_combined_score) & (confidence >= min_confidence)
+        return rows[keep], combined[keep]
+
+    def _contract(self, leg: str, row: int) -> OptionContract:
+        values = {name: _decimal(self.columns[f'{leg}_{name}'][row]) for name in CONTRACT_DECIMALS}
+        values.update({name: _integer(self.columns[f'{leg}_{name}'][row]) for name in CONTRACT_INTEGERS})
+        return OptionContract(
+            option_symbol=str(self.columns[f'{leg}_option_symbol'][row]),
+            underlying=str(self.columns['symbol'][row]),
+            expiration=_datetime(self.columns[f'{leg}_expiration'][row]),
+            side=OptionSide.CALL,
+            **values
+        )
+
+    def opportunity(self, row: int, total_score: Optional[float] = None) -> PMCCOpportunity:
+        """
+        Rebuild a row's opportunity.
+
+        Args:
+            row: Row index
+            total_score: Rescored total, defaults to the score from the scan
+        """
+        quote = StockQuote(
+            symbol=str(self.columns['symbol'][row]),
+            volume=_integer(self.columns['quote_volume'][row]),
+            **{name: _decimal(self.columns[f'quote_{name}'][row]) for name in QUOTE_DECIMALS}
+        )
+        values = {name: _decimal(self.columns[name][row]) for name in OPPORTUNITY_DECIMALS}
+        if total_score is not None:
+            values['total_score'] = Decimal(str(round(float(total_score), 6)))
+        return PMCCOpportunity(
+            leaps_contract=self._contract('leaps', row),
+            short_contract=self._contract('short', row),
+            underlying_quote=quote,
+            analyzed_at=_datetime(self.columns['analyzed_at'][row]) or datetime.now(),
+            **values
+        )
+
+    def apply_ai_results(self, candidate: PMCCCandidate, row: int,
+                         combined_score: Optional[float] = None) -> None:
+        """Copy a row's stored Claude results onto a rebuilt candidate."""
+        matches = np.flatnonzero(self.ai.get('row', np.empty(0, dtype=np.int64)) == row)
+        if not len(matches):
+            return
+        i = matches[0]
+        candidate.claude_score = float(self.ai['claude_score'][i])
+        candidate.claude_confidence = float(np.nan_to_num(self.ai['claude_confidence'][i], nan=0.0))
+        candidate.ai_recommendation = str(self.ai['ai_recommendation'][i]) or None
+        candidate.claude_reasoning = str(self.ai['claude_reasoning'][i]) or None
+        candidate.ai_insights = json.loads(str(self.ai['ai_insights'][i])) or None
+        candidate.ai_analysis_timestamp = _datetime(self.ai['ai_analysis_timestamp'][i])
+        candidate.combined_score = combined_score
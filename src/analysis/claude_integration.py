@@ -20,6 +20,10 @@ from src.models.api_models import (
 
 logger = logging.getLogger(__name__)
 
+# Concurrency cap for analyses against a rate-limited provider; the limiter
+# paces them, this only bounds how many tasks hold a pending request at once
+RATE_LIMITED_MAX_CONCURRENT = 10
+
 
 class ClaudeIntegrationManager:
     """
@@ -812,6 +816,30 @@ class ClaudeIntegrationManager:
         # Use configurable weights for scoring combination
         return (pmcc_score * pmcc_weight) + (ai_score * ai_weight)
     
+    def max_achievable_combined_score(self, pmcc_score: float,
+                                      pmcc_weight: Optional[float] = None,
+                                      ai_weight: Optional[float] = None,
+                                      max_ai_score: float = 100.0) -> float:
+        """
+        Upper bound on the combined score an opportunity can reach.
+        
+        Assumes a perfect AI score; an opportunity whose bound is below the
+        minimum combined score cannot be selected whatever Claude says.
+        
+        Args:
+            pmcc_score: Original PMCC analysis score
+            pmcc_weight: Weight for PMCC score (uses settings if not provided)
+            ai_weight: Weight for AI score (uses settings if not provided)
+            max_ai_score: Highest score Claude can assign
+            
+        Returns:
+            Highest combined score achievable with any AI score
+        """
+        return max(
+            pmcc_score,
+            self._calculate_combined_score(pmcc_score, max_ai_score, pmcc_weight, ai_weight)
+        )
+    
     async def analyze_single_opportunity_with_claude(
         self,
         opportunity_data: Dict[str, Any],
@@ -987,20 +1015,28 @@ class ClaudeIntegrationManager:
         enhanced_stock_data_lookup: Dict[str, Dict[str, Any]],
         claude_provider,
         market_context: Optional[Dict[str, Any]] = None,
-        max_concurrent: int = 3
+        max_concurrent: Optional[int] = None,
+        batch_token_budget: Optional[int] = None,
+        max_batch_size: int = 5
     ) -> List[Dict[str, Any]]:
         """
         Analyze multiple PMCC opportunities individually using Claude.
         
         This method processes each opportunity separately to provide focused analysis.
-        Includes rate limiting and error handling for batch processing.
+        Includes rate limiting and error handling for batch processing. When
+        batch_token_budget is set and the provider supports it, opportunities are
+        packed several to a request, still scored one by one.
         
         Args:
             opportunities: List of PMCC opportunities to analyze
             enhanced_stock_data_lookup: Lookup dict of symbol -> enhanced stock data
             claude_provider: Claude provider instance
             market_context: Optional market context
-            max_concurrent: Maximum concurrent API calls to Claude
+            max_concurrent: Maximum concurrent API calls to Claude. When None,
+                RATE_LIMITED_MAX_CONCURRENT for a provider with a rate limiter
+                (which paces them by its per-minute limits), otherwise 3
+            batch_token_budget: Token budget per packed request, None for one request each
+            max_batch_size: Maximum opportunities per packed request
             
         Returns:
             List of opportunities with individual Claude analysis
@@ -1011,10 +1047,20 @@ class ClaudeIntegrationManager:
             logger.warning("No opportunities provided for individual Claude analysis")
             return []
         
+        if batch_token_budget and hasattr(claude_provider, 'analyze_pmcc_opportunity_batch'):
+            return await self._analyze_opportunities_packed(
+                opportunities, enhanced_stock_data_lookup, claude_provider,
+                market_context, batch_token_budget, max_batch_size
+            )
+        
         import asyncio
         
-        # Create semaphore to limit concurrent API calls
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # The provider's rate limiter paces requests by RPM/TPM, so a wider
+        # concurrency cap applies when there is one
+        if max_concurrent is None:
+            rate_limited = getattr(claude_provider, 'rate_limiter', None) is not None
+            max_concurrent = RATE_LIMITED_MAX_CONCURRENT if rate_limited else 3
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
         
         async def analyze_single_with_semaphore(opportunity):
             """Analyze single opportunity with concurrency control."""
@@ -1061,4 +1107,73 @@ class ClaudeIntegrationManager:
         except Exception as e:
             logger.error(f"Error in individual Claude analysis batch processing: {e}")
             # Return original opportunities with failed analysis markers
-            return [self._create_failed_analysis_result(opp) for opp in opportunities]
\ No newline at end of file
+            return [self._create_failed_analysis_result(opp) for opp in opportunities]
+        
+        finally:
+            self._save_response_cache(claude_provider)
+    
+    @staticmethod
+    def _save_response_cache(claude_provider: Any) -> None:
+        """Persist the provider's response cache once all analyses of a scan are done."""
+        save = getattr(claude_provider, 'save_response_cache', None)
+        if save is not None:
+            try:
+                save()
+            except Exception as e:
+                logger.warning(f"Failed to save Claude response cache: {e}")
+    
+    async def _analyze_opportunities_packed(
+        self,
+        opportunities: List[Dict[str, Any]],
+        enhanced_stock_data_lookup: Dict[str, Dict[str, Any]],
+        claude_provider,
+        market_context: Optional[Dict[str, Any]],
+        batch_token_budget: int,
+        max_batch_size: int
+    ) -> List[Dict[str, Any]]:
+        """Analyze opportunities with packed multi-opportunity Claude requests."""
+        requests = [
+            (opportunity, enhanced_stock_data_lookup[opportunity.get('symbol', 'Unknown')])
+            for opportunity in opportunities
+            if enhanced_stock_data_lookup.get(opportunity.get('symbol', 'Unknown'))
+        ]
+        
+        try:
+            responses = await claude_provider.analyze_pmcc_opportunity_batch(
+                requests, market_context, batch_token_budget, max_batch_size
+            )
+        except Exception as e:
+            logger.error(f"Error in packed Claude analysis: {e}")
+            responses = {}
+        self._save_response_cache(claude_provider)
+        
+        final_results = []
+        for opportunity in opportunities:
+            symbol = opportunity.get('symbol', 'Unknown')
+            response = responses.get(symbol)
+            self._stats['total_analyses'] += 1
+            
+            if response is None or not response.is_success or not response.data:
+                if not enhanced_stock_data_lookup.get(symbol):
+                    logger.warning(f"No enhanced stock data found for {symbol}")
+                else:
+                    logger.error(f"Claude analysis failed for {symbol}: {response.error if response else 'no response'}")
+                final_results.append(self._create_failed_analysis_result(opportunity))
+                continue
+            
+            claude_analysis = response.data
+            final_results.append(self._integrate_single_claude_analysis(opportunity, claude_analysis))
+            self._stats['successful_analyses'] += 1
+            self._stats['opportunities_analyzed'] += 1
+            if claude_analysis.get('confidence_level', 0) >= 75:
+                self._stats['high_confidence_recommendations'] += 1
+        
+        final_results.sort(
+            key=lambda x: x.get('combined_score', x.get('pmcc_score', 0)), 
+            reverse=True
+        )
+        
+        successful_analyses = len([r for r in final_results if r.get('claude_analyzed', False)])
+        logger.info(f"Packed Claude analysis completed: {successful_analyses}/{len(opportunities)} successful")
+        
+        return final_results
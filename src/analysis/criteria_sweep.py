@@ -0,0 +1,435 @@
+"""
+What-if sweep of LEAPS / short call criteria over already fetched option chains.
+
+Fetching chains is the expensive part of a scan; filtering and scoring them
+is cheap once they are arrays. Each chain's calls are converted to arrays
+once, the criteria of every variant are applied together as (variants x
+contracts) masks, and LEAPS/short pairs are validated and scored once for
+the union of all variants' candidates. Each variant then only selects its
+pairs from the shared matrices.
+
+Selection mirrors OptionsAnalyzer.find_pmcc_opportunities: the same
+contract and pair checks, the premium coverage ratio, the top 10 LEAPS by
+delta and top 20 short calls by (surface-adjusted) premium, and the same
+score components. Chains
+only hold the expirations that were fetched, so variants reaching beyond
+the scan's DTE windows see fewer contracts than a rescan would.
+"""
+
+import itertools
+import logging
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from src.analysis.iv_surface import IVSurface, IVSurfaceCache
+    from src.analysis.options_analyzer import (
+        LEAPSCriteria, ShortCallCriteria, ScoringWeights, combination_probabilities,
+        short_call_rank_premium
+    )
+    from src.models.api_models import OptionChain, OptionContract, StockQuote
+except ImportError:
+    # Handle case when running as script
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from analysis.iv_surface import IVSurface, IVSurfaceCache
+    from analysis.options_analyzer import (
+        LEAPSCriteria, ShortCallCriteria, ScoringWeights, combination_probabilities,
+        short_call_rank_premium
+    )
+    from models.api_models import OptionChain, OptionContract, StockQuote
+
+
+logger = logging.getLogger(__name__)
+
+# Candidates kept per chain, as in OptionsAnalyzer._rank_*_candidates
+MAX_LEAPS_CANDIDATES = 10
+MAX_SHORT_CANDIDATES = 20
+
+# Minimum max profit / net debit of a valid combination
+MIN_RISK_REWARD = 0.33
+
+
+@dataclass
+class CriteriaVariant:
+    """One named set of LEAPS and short call criteria."""
+    name: str
+    leaps_criteria: LEAPSCriteria = field(default_factory=LEAPSCriteria)
+    short_criteria: ShortCallCriteria = field(default_factory=ShortCallCriteria)
+
+    @classmethod
+    def grid(cls, leaps_values: Optional[Dict[str, Sequence[Any]]] = None,
+             short_values: Optional[Dict[str, Sequence[Any]]] = None,
+             leaps_criteria: Optional[LEAPSCriteria] = None,
+             short_criteria: Optional[ShortCallCriteria] = None) -> List['CriteriaVariant']:
+        """
+        Cartesian product of criteria values.
+
+        Args:
+            leaps_values: LEAPSCriteria field -> values to try, e.g. {'min_delta': [0.75, 0.85]}
+            short_values: ShortCallCriteria field -> values to try, e.g. {'min_dte': [21, 60]}
+            leaps_criteria: Base LEAPS criteria for fields not swept
+            short_criteria: Base short call criteria for fields not swept
+
+        Returns:
+            One variant per combination, named after its swept values
+        """
+        leaps_criteria = leaps_criteria or LEAPSCriteria()
+        short_criteria = short_criteria or ShortCallCriteria()
+        axes = [('leaps', name, values) for name, values in (leaps_values or {}).items()]
+        axes += [('short', name, values) for name, values in (short_values or {}).items()]
+
+        variants = []
+        for combination in itertools.product(*(values for _, _, values in axes)):
+            leaps_changes = {name: value for (leg, name, _), value in zip(axes, combination) if leg == 'leaps'}
+            short_changes = {name: value for (leg, name, _), value in zip(axes, combination) if leg == 'short'}
+            label = ", ".join(f"{leg}.{name}={value}" for (leg, name, _), value in zip(axes, combination))
+            variants.append(cls(
+                name=label or "base",
+                leaps_criteria=replace(leaps_criteria, **leaps_changes),
+                short_criteria=replace(short_criteria, **short_changes)
+            ))
+        return variants
+
+
+@dataclass
+class SweepResult:
+    """Opportunity counts and total score distribution of one variant."""
+    name: str
+    leaps_criteria: LEAPSCriteria
+    short_criteria: ShortCallCriteria
+    symbols_evaluated: int = 0
+    symbols_with_opportunities: int = 0
+    leaps_candidates: int = 0  # Contracts passing the LEAPS criteria (before the top 10 cut)
+    short_candidates: int = 0  # Contracts passing the short call criteria (before the top 20 cut)
+    opportunities: int = 0
+    opportunities_above_min_score: int = 0
+    scores: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False)
+
+    def score_percentiles(self) -> Dict[str, Optional[float]]:
+        """Mean, quartiles and maximum of the total scores (None without opportunities)."""
+        if not len(self.scores):
+            return {'mean': None, 'p25': None, 'median': None, 'p75': None, 'max': None}
+        p25, median, p75 = np.percentile(self.scores, [25, 50, 75])
+        return {
+            'mean': float(self.scores.mean()), 'p25': float(p25), 'median': float(median),
+            'p75': float(p75), 'max': float(self.scores.max())
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a table row."""
+        return {
+            'variant': self.name,
+            'symbols_evaluated': self.symbols_evaluated,
+            'symbols_with_opportunities': self.symbols_with_opportunities,
+            'leaps_candidates': self.leaps_candidates,
+            'short_candidates': self.short_candidates,
+            'opportunities': self.opportunities,
+            'opportunities_above_min_score': self.opportunities_above_min_score,
+            **{f'score_{name}': value for name, value in self.score_percentiles().items()}
+        }
+
+
+def _values(contracts: List[OptionContract], name: str) -> np.ndarray:
+    return np.array([float(getattr(c, name)) if getattr(c, name) is not None else np.nan
+                     for c in contracts])
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """Where a value is set and non-zero (the analyzer's truthiness checks)."""
+    return np.isfinite(values) & (values != 0)
+
+
+def _criteria(variants: Sequence[CriteriaVariant], leg: str, name: str) -> np.ndarray:
+    """Column vector of one criteria field across variants."""
+    values = [getattr(getattr(v, f'{leg}_criteria'), name) for v in variants]
+    if isinstance(values[0], str):
+        return np.array(values)[:, None]
+    return np.array([float(v) for v in values])[:, None]
+
+
+class _ChainArrays:
+    """Call contracts of one chain as arrays, with their per-contract score parts."""
+
+    def __init__(self, option_chain: OptionChain, price: float, surface: Optional[IVSurface] = None):
+        calls = option_chain.get_calls()
+        self.count = len(calls)
+        self.price = price
+        for name in ('strike', 'dte', 'delta', 'iv', 'bid', 'ask', 'mid', 'volume', 'open_interest'):
+            setattr(self, name, _values(calls, name))
+        self.surface = surface
+        self.short_rank_premium = np.array([short_call_rank_premium(c, surface) for c in calls])
+
+        has_quotes = _present(self.bid) & _present(self.ask)
+        self.mid_or_average = np.where(_present(self.mid), self.mid, np.where(has_quotes, (self.bid + self.ask) / 2, np.nan))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.spread_pct = np.where(
+                has_quotes & (self.mid_or_average > 0),
+                (self.ask - self.bid) / self.mid_or_average * 100, np.nan
+            )
+            listed_spread_pct = np.where(
+                has_quotes & _present(self.mid) & (self.mid > 0), (self.ask - self.bid) / self.mid * 100, np.nan
+            )
+
+        # Moneyness as the analyzer derives it: the contract's own, else from the quote
+        self.moneyness = np.array([
+            c.moneyness if c.moneyness or not (price and c.strike) else
+            ("ITM" if price > c.strike else "ATM" if abs(price - float(c.strike)) < 0.5 else "OTM")
+            for c in calls
+        ], dtype=str)
+
+        # Liquidity score parts of each leg (OptionsAnalyzer._calculate_liquidity_score)
+        self.leaps_liquidity = np.where(
+            np.isfinite(listed_spread_pct), np.maximum(0, 100 - listed_spread_pct * 5) * 0.6, 0.0
+        )
+        self.short_liquidity = np.where(
+            np.isfinite(listed_spread_pct), np.maximum(0, 100 - listed_spread_pct * 3) * 0.4, 0.0
+        )
+
+        intrinsic = np.maximum(0.0, price - self.strike) if price else np.zeros(self.count)
+        self.extrinsic = np.where(np.isfinite(self.mid_or_average), self.mid_or_average - intrinsic, 0.0)
+
+    def _liquid(self, variants, leg: str) -> np.ndarray:
+        """(variants x contracts) mask of OptionsAnalyzer._check_contract_liquidity."""
+        min_oi = _criteria(variants, leg, 'min_open_interest')
+        min_volume = _criteria(variants, leg, 'min_volume')
+        max_spread = _criteria(variants, leg, 'max_bid_ask_spread_pct')
+        oi_ok = (min_oi <= 0) | (_present(self.open_interest) & (self.open_interest >= min_oi))
+        volume_ok = (min_volume <= 0) | (_present(self.volume) & (self.volume >= min_volume))
+        spread_ok = (max_spread <= 0) | ~np.isfinite(self.spread_pct) | (self.spread_pct <= max_spread * 100)
+        return oi_ok & volume_ok & spread_ok
+
+    def _common(self, variants, leg: str) -> np.ndarray:
+        """DTE, delta, liquidity, moneyness and pricing checks shared by both legs."""
+        in_dte = _present(self.dte) & (self.dte >= _criteria(variants, leg, 'min_dte')) & (
+            self.dte <= _criteria(variants, leg, 'max_dte'))
+        in_delta = _present(self.delta) & (self.delta >= _criteria(variants, leg, 'min_delta')) & (
+            self.delta <= _criteria(variants, leg, 'max_delta'))
+        priced = _present(self.bid) & _present(self.ask) & (self.bid > 0)
+        moneyness = self.moneyness == _criteria(variants, leg, 'moneyness')
+        return in_dte & in_delta & self._liquid(variants, leg) & moneyness & priced
+
+    def leaps_mask(self, variants) -> np.ndarray:
+        """(variants x contracts) mask of contracts passing each variant's LEAPS criteria."""
+        mask = self._common(variants, 'leaps')
+        if self.price:
+            mask &= ~(self.ask / self.price > _criteria(variants, 'leaps', 'max_premium_pct'))
+            max_extrinsic = _criteria(variants, 'leaps', 'max_extrinsic_pct')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                extrinsic_pct = np.where(self.mid_or_average > 0, self.extrinsic / self.mid_or_average, -np.inf)
+            mask &= (max_extrinsic <= 0) | ~_present(self.strike) | ~(extrinsic_pct > max_extrinsic)
+        return mask
+
+    def short_mask(self, variants) -> np.ndarray:
+        """(variants x contracts) mask of contracts passing each variant's short call criteria."""
+        return self._common(variants, 'short')
+
+
+def _top(mask: np.ndarray, key: np.ndarray, limit: int) -> np.ndarray:
+    """Keep each row's first `limit` passing contracts by descending key (stable, as list.sort)."""
+    order = np.argsort(-np.nan_to_num(key, nan=0.0), kind='stable')
+    ranked = mask[:, order]
+    ranked &= np.cumsum(ranked, axis=1) <= limit
+    kept = np.zeros_like(mask)
+    kept[:, order] = ranked
+    return kept
+
+
+class CriteriaSweep:
+    """Evaluates many criteria variants against the same option chains."""
+
+    def __init__(self, scoring_weights: Optional[ScoringWeights] = None,
+                 min_total_score: Decimal = Decimal('60'),
+                 risk_free_rate: Decimal = Decimal('0.05'),
+                 iv_surface_cache: Optional[IVSurfaceCache] = None):
+        """
+        Initialize the sweep.
+
+        Args:
+            scoring_weights: Total score weights, defaults to the analyzer's
+            min_total_score: Threshold for opportunities_above_min_score
+            risk_free_rate: Drift of the probability of profit model
+            iv_surface_cache: The scan's IV surfaces, so short calls rank and
+                probabilities are priced as the analyzer did; without it short
+                calls rank by bid and probabilities use the contracts' IV
+        """
+        self.scoring_weights = scoring_weights or ScoringWeights()
+        self.min_total_score = min_total_score
+        self.risk_free_rate = risk_free_rate
+        self.iv_surface_cache = iv_surface_cache
+
+    def run(self, chains: Dict[str, OptionChain], variants: Sequence[CriteriaVariant],
+            quotes: Optional[Dict[str, StockQuote]] = None) -> List[SweepResult]:
+        """
+        Evaluate every variant against every chain.
+
+        Args:
+            chains: Symbol -> option chain (e.g. ScanResults.analyzed_option_chains)
+            variants: Criteria variants to compare
+            quotes: Symbol -> stock quote; the chain's underlying price is used without one
+
+        Returns:
+            One SweepResult per variant, in the order given
+        """
+        variants = list(variants)
+        results = [SweepResult(v.name, v.leaps_criteria, v.short_criteria) for v in variants]
+        if not variants:
+            return results
+        scores: List[List[np.ndarray]] = [[] for _ in variants]
+
+        for symbol, chain in chains.items():
+            if not chain or not chain.contracts:
+                continue
+            quote = (quotes or {}).get(symbol)
+            price = (quote.last if quote else None) or chain.underlying_price
+            surface = None
+            if self.iv_surface_cache is not None:
+                surface = self.iv_surface_cache.get_or_build(chain, price)
+            arrays = _ChainArrays(chain, float(price) if price else 0.0, surface)
+            if not arrays.count:
+                continue
+
+            chain_scores = self._evaluate_chain(arrays, variants, results)
+            for v, variant_scores in enumerate(chain_scores):
+                results[v].symbols_evaluated += 1
+                if len(variant_scores):
+                    results[v].symbols_with_opportunities += 1
+                    scores[v].append(variant_scores)
+
+        for result, variant_scores in zip(results, scores):
+            result.scores = np.concatenate(variant_scores) if variant_scores else np.empty(0)
+            result.opportunities = len(result.scores)
+            result.opportunities_above_min_score = int((result.scores >= float(self.min_total_score)).sum())
+        return results
+
+    def _evaluate_chain(self, arrays: _ChainArrays, variants: List[CriteriaVariant],
+                        results: List[SweepResult]) -> List[np.ndarray]:
+        """Total scores of each variant's valid combinations in one chain."""
+        leaps_mask = arrays.leaps_mask(variants)
+        short_mask = arrays.short_mask(variants)
+        for result, leaps_count, short_count in zip(results, leaps_mask.sum(axis=1), short_mask.sum(axis=1)):
+            result.leaps_candidates += int(leaps_count)
+            result.short_candidates += int(short_count)
+
+        leaps_kept = _top(leaps_mask, arrays.delta, MAX_LEAPS_CANDIDATES)
+        short_kept = _top(short_mask, arrays.short_rank_premium, MAX_SHORT_CANDIDATES)
+
+        # Pairs are validated and scored once over the union of all variants' candidates
+        leaps_rows = np.flatnonzero(leaps_kept.any(axis=0))
+        short_rows = np.flatnonzero(short_kept.any(axis=0))
+        if not len(leaps_rows) or not len(short_rows):
+            return [np.empty(0) for _ in variants]
+
+        valid, total_score, coverage = self._score_pairs(arrays, leaps_rows, short_rows)
+        min_coverage = _criteria(variants, 'short', 'min_premium_coverage_ratio')[:, :, None]
+        selected = (
+            leaps_kept[:, leaps_rows, None] & short_kept[:, None, short_rows] & valid[None]
+            & ~((min_coverage > 0) & (coverage[None] < min_coverage))
+        )
+        return [total_score[variant_selected] for variant_selected in selected]
+
+    def _score_pairs(self, arrays: _ChainArrays, leaps_rows: np.ndarray, short_rows: np.ndarray):
+        """
+        Validity, total score and premium coverage of every LEAPS x short pair.
+
+        Returns:
+            (valid, total_score, coverage) matrices of shape (leaps, shorts);
+            coverage is +inf where the ratio is not checked
+        """
+        def leaps(values):
+            return values[leaps_rows, None]
+
+        def short(values):
+            return values[None, short_rows]
+
+        price = arrays.price
+        net_debit = leaps(arrays.ask) - short(arrays.bid)
+        max_profit = short(arrays.strike) - leaps(arrays.strike) - net_debit
+        with np.errstate(divide='ignore', invalid='ignore'):
+            risk_reward = max_profit / net_debit
+        later_short = _present(leaps(arrays.dte)) & _present(short(arrays.dte)) & (short(arrays.dte) >= leaps(arrays.dte))
+        valid = (
+            (short(arrays.strike) > leaps(arrays.strike)) & ~later_short
+            & ~(bool(price) & (short(arrays.strike) <= price))
+            & _present(leaps(arrays.ask)) & _present(short(arrays.bid))
+            & (net_debit > 0) & (max_profit > 0) & (risk_reward >= MIN_RISK_REWARD)
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coverage = np.where(
+                (leaps(arrays.extrinsic) > 0) & _present(short(arrays.bid)),
+                short(arrays.bid) / leaps(arrays.extrinsic), np.inf
+            )
+            probability = self._probability_scores(arrays, leaps_rows, short_rows, leaps(arrays.strike) + net_debit)
+        liquidity = self._liquidity_scores(arrays, leaps_rows, short_rows)
+        total_score = self.scoring_weights.total_scores(risk_reward * 100, risk_reward, probability, liquidity)
+        return valid, total_score, coverage
+
+    def _probability_scores(self, arrays: _ChainArrays, leaps_rows, short_rows, breakeven) -> np.ndarray:
+        """OptionsAnalyzer._calculate_probability_score for every pair."""
+        def leaps(values):
+            return values[leaps_rows, None]
+
+        def short(values):
+            return values[None, short_rows]
+
+        probability_of_profit, _ = combination_probabilities(
+            arrays.price or np.nan,
+            leaps(arrays.strike), leaps(arrays.ask), leaps(arrays.dte), leaps(arrays.iv),
+            short(arrays.strike), short(arrays.bid), short(arrays.dte), short(arrays.iv),
+            arrays.surface, float(self.risk_free_rate)
+        )
+
+        # Heuristic for pairs without IV
+        score = np.full(breakeven.shape, 50.0)
+        if arrays.price:
+            distance_pct = np.abs(arrays.price - breakeven) / arrays.price * 100
+            score += np.where(distance_pct <= 5, 20, np.where(distance_pct <= 10, 10, np.where(distance_pct >= 20, -10, 0)))
+
+        dte = arrays.dte[None, short_rows]
+        score += np.where(~_present(dte), 0, np.where(dte >= 35, 15, np.where(dte >= 28, 10, np.where(dte <= 14, -10, 0))))
+
+        leaps_delta = arrays.delta[leaps_rows, None]
+        short_delta = arrays.delta[None, short_rows]
+        ratio = short_delta / leaps_delta
+        has_deltas = _present(leaps_delta) & _present(short_delta)
+        score += np.where(~has_deltas, 0, np.where((ratio >= 0.25) & (ratio <= 0.45), 15,
+                                                   np.where((ratio >= 0.15) & (ratio <= 0.55), 5, 0)))
+        return np.where(np.isfinite(probability_of_profit), np.round(probability_of_profit * 100, 2),
+                        np.clip(score, 0, 100))
+
+    @staticmethod
+    def _liquidity_scores(arrays: _ChainArrays, leaps_rows, short_rows) -> np.ndarray:
+        """OptionsAnalyzer._calculate_liquidity_score for every pair."""
+        def volume_bonus(first, second, high, low):
+            total = first + second
+            both = _present(first) & _present(second)
+            return np.where(both & (total >= high), 10, np.where(both & (total >= low), 5, 0))
+
+        score = arrays.leaps_liquidity[leaps_rows, None] + arrays.short_liquidity[None, short_rows]
+        score = score + volume_bonus(arrays.volume[leaps_rows, None], arrays.volume[None, short_rows], 50, 20)
+        score = score + volume_bonus(arrays.open_interest[leaps_rows, None],
+                                     arrays.open_interest[None, short_rows], 100, 50)
+        return np.clip(score, 0, 100)
+
+    @staticmethod
+    def to_table(results: Sequence[SweepResult]) -> str:
+        """Format sweep results as a fixed-width text table."""
+        header = f"{'Variant':<40} {'Symbols':>7} {'LEAPS':>6} {'Shorts':>6} {'Opps':>6} {'>=Min':>6} {'Mean':>6} {'Median':>6} {'Max':>6}"
+        lines = [header, "-" * len(header)]
+        for result in results:
+            stats = result.score_percentiles()
+
+            def fmt(value):
+                return f"{value:6.1f}" if value is not None else f"{'-':>6}"
+
+            lines.append(
+                f"{result.name[:40]:<40} {result.symbols_with_opportunities:>7} {result.leaps_candidates:>6} "
+                f"{result.short_candidates:>6} {result.opportunities:>6} {result.opportunities_above_min_score:>6} "
+                f"{fmt(stats['mean'])} {fmt(stats['median'])} {fmt(stats['max'])}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,307 @@
+"""
+Implied volatility surface per symbol.
+
+The surface is fitted once per option chain: for every expiration a smile
+quadratic in log-moneyness ln(K/S) is solved from batched normal equations,
+and expirations are joined by linear interpolation in total variance. IV at
+any strike and expiration is then a constant-time evaluation, and listed
+contracts can be compared against the fitted smile to spot rich or cheap
+quotes.
+
+IVSurfaceCache keeps surfaces per (symbol, trading date) so the screener and
+the options analyzer share one fit, and records each day's 30-day ATM IV so
+IV rank can be computed without extra API calls.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from src.analysis.black_scholes import implied_volatility, MIN_VOLATILITY, MAX_VOLATILITY
+    from src.models.api_models import OptionChain, OptionContract, OptionSide
+except ImportError:
+    # Handle case when running as script
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from analysis.black_scholes import implied_volatility, MIN_VOLATILITY, MAX_VOLATILITY
+    from models.api_models import OptionChain, OptionContract, OptionSide
+
+
+logger = logging.getLogger(__name__)
+
+# Ridge on the slope and curvature terms keeps expirations with one or two
+# quotes solvable (they collapse to a flat or linear smile)
+_RIDGE = 1e-8
+
+
+@dataclass
+class IVSurface:
+    """Fitted implied volatility smiles for one symbol's option chain."""
+    symbol: str
+    underlying_price: float
+    expiry_days: np.ndarray  # (m,) sorted days to expiration
+    coefficients: np.ndarray  # (m, 3) smile a + b*k + c*k^2, k = ln(K/S)
+    moneyness_range: np.ndarray  # (m, 2) fitted k range; smiles are flat outside it
+    points: int  # Quotes used in the fit
+    _quoted: Dict[Tuple[int, float], float] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_chain(cls, option_chain: OptionChain, underlying_price: Optional[Decimal] = None,
+                   risk_free_rate: float = 0.05) -> Optional['IVSurface']:
+        """
+        Fit the surface to an option chain.
+
+        Contracts without IV are inverted from their mid price (calls only).
+
+        Args:
+            option_chain: Option chain to fit
+            underlying_price: Stock price, defaults to the chain's underlying price
+            risk_free_rate: Rate used when implying missing IVs
+
+        Returns:
+            IVSurface, or None without a price or any usable quote
+        """
+        spot = underlying_price or option_chain.underlying_price
+        contracts = [c for c in option_chain.contracts if c.dte and c.dte > 0 and c.strike and c.strike > 0]
+        if not spot or spot <= 0 or not contracts:
+            return None
+        spot = float(spot)
+
+        dte = np.array([c.dte for c in contracts], dtype=float)
+        strike = np.array([float(c.strike) for c in contracts])
+        iv = np.array([float(c.iv) if c.iv is not None else np.nan for c in contracts])
+        is_call = np.array([c.side == OptionSide.CALL for c in contracts])
+        price = np.array([float(c.mid) if c.mid else np.nan for c in contracts])
+
+        missing = np.isnan(iv) & is_call & (price > 0)
+        if missing.any():
+            iv[missing] = implied_volatility(price[missing], spot, strike[missing], dte[missing] / 365,
+                                             risk_free_rate)
+        valid = np.isfinite(iv) & (iv > 0)
+        if not valid.any():
+            return None
+
+        dte, strike, iv, is_call = dte[valid], strike[valid], iv[valid], is_call[valid]
+        k = np.log(strike / spot)
+        expiry_days, group = np.unique(dte, return_inverse=True)
+        m = len(expiry_days)
+
+        # Normal equations of the per-expiration quadratic fit, all expirations at once
+        power_sums = np.stack([np.bincount(group, weights=k ** j, minlength=m) for j in range(5)], axis=1)
+        moment_sums = np.stack([np.bincount(group, weights=iv * k ** j, minlength=m) for j in range(3)], axis=1)
+        normal = power_sums[:, [[0, 1, 2], [1, 2, 3], [2, 3, 4]]]
+        normal[:, 1, 1] += _RIDGE
+        normal[:, 2, 2] += _RIDGE
+        coefficients = np.linalg.solve(normal, moment_sums[:, :, None])[:, :, 0]
+
+        moneyness_range = np.empty((m, 2))
+        moneyness_range[:, 0] = np.inf
+        moneyness_range[:, 1] = -np.inf
+        np.minimum.at(moneyness_range[:, 0], group, k)
+        np.maximum.at(moneyness_range[:, 1], group, k)
+
+        quoted = {(int(d), float(s)): float(v) for d, s, v in zip(dte[is_call], strike[is_call], iv[is_call])}
+
+        return cls(
+            symbol=option_chain.underlying,
+            underlying_price=spot,
+            expiry_days=expiry_days,
+            coefficients=coefficients,
+            moneyness_range=moneyness_range,
+            points=int(valid.sum()),
+            _quoted=quoted
+        )
+
+    def _smile(self, index: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """Evaluate the smiles of the given expirations at log-moneyness k."""
+        k = np.clip(k, self.moneyness_range[index, 0], self.moneyness_range[index, 1])
+        a, b, c = (self.coefficients[index, j] for j in range(3))
+        return np.clip(a + (b + c * k) * k, MIN_VOLATILITY, MAX_VOLATILITY)
+
+    def iv(self, strike, dte):
+        """
+        Surface IV at strikes and days to expiration (scalars or arrays).
+
+        Between fitted expirations total variance is interpolated linearly;
+        before the first and after the last expiration the nearest smile is used.
+        """
+        strike, dte = np.broadcast_arrays(np.asarray(strike, dtype=float), np.asarray(dte, dtype=float))
+        k = np.log(strike / self.underlying_price)
+        if len(self.expiry_days) == 1:
+            return self._smile(np.zeros(k.shape, dtype=int), k)
+
+        days = np.clip(dte, self.expiry_days[0], self.expiry_days[-1])
+        upper = np.clip(np.searchsorted(self.expiry_days, days), 1, len(self.expiry_days) - 1)
+        lower = upper - 1
+        t_lower, t_upper = self.expiry_days[lower], self.expiry_days[upper]
+        weight = (days - t_lower) / (t_upper - t_lower)
+        variance = ((1 - weight) * self._smile(lower, k) ** 2 * t_lower
+                    + weight * self._smile(upper, k) ** 2 * t_upper)
+        return np.sqrt(variance / days)
+
+    def market_iv(self, strike: Decimal, dte: int) -> Optional[float]:
+        """IV of the listed call at this strike and expiration, if it was quoted."""
+        return self._quoted.get((int(dte), float(strike)))
+
+    def richness(self, contract: OptionContract) -> Optional[float]:
+        """
+        Contract IV minus the fitted smile IV (positive = rich, negative = cheap).
+
+        Returns:
+            Difference in volatility (0.02 = 2 points), None without IV or DTE
+        """
+        market = float(contract.iv) if contract.iv is not None else self.market_iv(contract.strike, contract.dte or 0)
+        if market is None or not contract.dte or contract.dte <= 0:
+            return None
+        return market - float(self.iv(float(contract.strike), contract.dte))
+
+    def atm_iv(self, dte: int = 30) -> float:
+        """Constant-maturity at-the-money IV, the input to IV rank."""
+        return float(self.iv(self.underlying_price, dte))
+
+
+class IVSurfaceCache:
+    """
+    Surfaces per (symbol, trading date) plus a file-backed ATM IV history.
+
+    Surfaces live in memory for the scan; the daily 30-day ATM IV of every
+    fitted surface is persisted so IV rank can use the last year of scans.
+    """
+
+    def __init__(self, history_file: Optional[str] = None,
+                 lookback_days: int = 365, min_observations: int = 20):
+        """
+        Initialize cache and load the IV history.
+
+        Args:
+            history_file: JSON file for the ATM IV history, None keeps it in memory
+            lookback_days: History window for IV rank
+            min_observations: Days of history required before IV rank is reported
+        """
+        self.history_file = history_file
+        self.lookback_days = lookback_days
+        self.min_observations = min_observations
+        self._surfaces: Dict[Tuple[str, date], Optional[IVSurface]] = {}
+        self._latest: Dict[str, IVSurface] = {}
+        self._history: Dict[str, Dict[str, float]] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def load(self) -> None:
+        """Load the IV history from disk, starting empty if the file is missing or corrupt."""
+        if not self.history_file or not os.path.exists(self.history_file):
+            return
+
+        try:
+            with open(self.history_file, 'r') as f:
+                data = json.load(f)
+            self._history = {
+                symbol: {day: float(value) for day, value in days.items()}
+                for symbol, days in data.get('symbols', {}).items()
+            }
+            logger.debug(f"Loaded IV history for {len(self._history)} symbols from {self.history_file}")
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable IV history {self.history_file}: {e}")
+            self._history = {}
+
+    def save(self) -> None:
+        """Write the IV history to disk if it changed since the last save."""
+        if not self.history_file or not self._dirty:
+            return
+
+        try:
+            Path(self.history_file).parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = f"{self.history_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'symbols': self._history}, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.history_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save IV history {self.history_file}: {e}")
+
+    def clear_surfaces(self) -> None:
+        """Forget the fitted surfaces so the next scan refits them; the ATM IV history is kept."""
+        self._surfaces.clear()
+        self._latest.clear()
+
+    @staticmethod
+    def trading_date(option_chain: OptionChain) -> date:
+        """Trading date of a chain: its update time, or today."""
+        return option_chain.updated.date() if option_chain.updated else date.today()
+
+    def get(self, symbol: str, trading_date: Optional[date] = None) -> Optional[IVSurface]:
+        """Get the cached surface of a symbol for a trading date (default today)."""
+        return self._surfaces.get((symbol.upper(), trading_date or date.today()))
+
+    def latest(self, symbol: str) -> Optional[IVSurface]:
+        """Most recently fitted surface of a symbol, whatever its trading date."""
+        return self._latest.get(symbol.upper())
+
+    def get_or_build(self, option_chain: OptionChain, underlying_price: Optional[Decimal] = None,
+                     trading_date: Optional[date] = None) -> Optional[IVSurface]:
+        """
+        Get the symbol's surface for the chain's trading date, fitting it on first use.
+
+        Chains that cannot be fitted are remembered too, so they are not retried.
+        """
+        trading_date = trading_date or self.trading_date(option_chain)
+        key = (option_chain.underlying.upper(), trading_date)
+        if key in self._surfaces:
+            return self._surfaces[key]
+
+        try:
+            surface = IVSurface.from_chain(option_chain, underlying_price)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            logger.warning(f"Could not fit IV surface for {option_chain.underlying}: {e}")
+            surface = None
+        self._surfaces[key] = surface
+        if surface is not None:
+            self._latest[key[0]] = surface
+            self.record_atm_iv(key[0], surface.atm_iv(), trading_date)
+        return surface
+
+    def record_atm_iv(self, symbol: str, atm_iv: float, trading_date: date) -> None:
+        """Record a day's ATM IV and drop observations outside the lookback window."""
+        history = self._history.setdefault(symbol.upper(), {})
+        history[trading_date.isoformat()] = round(float(atm_iv), 6)
+        cutoff = (trading_date - timedelta(days=self.lookback_days)).isoformat()
+        for day in [d for d in history if d < cutoff]:
+            del history[day]
+        self._dirty = True
+
+    def iv_rank_inputs(self, symbol: str) -> Optional[Dict[str, float]]:
+        """
+        Current, low and high ATM IV over the lookback window.
+
+        Returns:
+            Dict with 'current', 'low', 'high' and 'observations', None without history
+        """
+        history = self._history.get(symbol.upper())
+        if not history:
+            return None
+        values = np.array([history[day] for day in sorted(history)])
+        return {
+            'current': float(values[-1]),
+            'low': float(values.min()),
+            'high': float(values.max()),
+            'observations': len(values)
+        }
+
+    def iv_rank(self, symbol: str) -> Optional[Decimal]:
+        """IV rank 0-100 of the latest ATM IV, None until enough history exists."""
+        inputs = self.iv_rank_inputs(symbol)
+        if not inputs or inputs['observations'] < self.min_observations or inputs['high'] <= inputs['low']:
+            return None
+        rank = (inputs['current'] - inputs['low']) / (inputs['high'] - inputs['low']) * 100
+        return Decimal(str(round(rank, 1)))
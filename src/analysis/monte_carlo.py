@@ -0,0 +1,208 @@
+"""
+Monte Carlo P&L simulation for PMCC positions.
+
+Simulates the underlying's price at short call expiration from implied
+volatility and values the position there: the short call at intrinsic and
+the LEAPS by Black-Scholes over its remaining life. Many candidates are
+simulated together as arrays, all driven by one seeded set of antithetic
+standard normals, so results are reproducible and a candidate's metrics do
+not depend on which other candidates are in the batch.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from src.analysis.black_scholes import call_price_from_log_spot
+    from src.models.pmcc_models import PMCCAnalysis
+except ImportError:
+    # Handle case when running as script
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from analysis.black_scholes import call_price_from_log_spot
+    from models.pmcc_models import PMCCAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MonteCarloResults:
+    """
+    Simulated P&L statistics at short call expiration, one entry per candidate.
+
+    Losses (var_95, expected_shortfall) are positive amounts per share, 0 when
+    even the tail outcome is a profit. Entries of invalid candidates (missing
+    price, strikes, expirations or IV) are NaN.
+    """
+    paths: int
+    valid: np.ndarray
+    expected_pnl: np.ndarray
+    pnl_std: np.ndarray
+    probability_of_profit: np.ndarray
+    var_95: np.ndarray
+    expected_shortfall: np.ndarray
+    sharpe_ratio: np.ndarray
+
+
+class MonteCarloSimulator:
+    """Vectorized Monte Carlo engine for PMCC P&L, VaR and expected shortfall."""
+
+    def __init__(self, paths: int = 10000, seed: Optional[int] = 42,
+                 confidence: float = 0.95, chunk_size: int = 32):
+        """
+        Initialize the simulator.
+
+        Args:
+            paths: Number of simulated price paths (rounded up to even for antithetic pairs)
+            seed: RNG seed, None for a fresh random stream on every run
+            confidence: VaR / expected shortfall confidence level
+            chunk_size: Candidates simulated per array block, bounds memory use
+        """
+        if paths < 2:
+            raise ValueError(f"paths must be at least 2, got {paths}")
+        self.paths = paths + paths % 2
+        self.seed = seed
+        self.confidence = confidence
+        self.chunk_size = max(1, chunk_size)
+
+    def _standard_normals(self) -> np.ndarray:
+        """Antithetic standard normal draws shared by all candidates."""
+        half = np.random.default_rng(self.seed).standard_normal(self.paths // 2)
+        return np.concatenate([half, -half])
+
+    def simulate(self, spot, long_strike, short_strike, net_debit,
+                 short_years, long_years, volatility, long_volatility,
+                 risk_free_rate: float = 0.05) -> MonteCarloResults:
+        """
+        Simulate P&L at short expiration for arrays of candidates.
+
+        Args:
+            spot: Current underlying prices
+            long_strike: LEAPS strikes
+            short_strike: Short call strikes
+            net_debit: Net debits paid per share
+            short_years: Years to short call expiration
+            long_years: Years to LEAPS expiration
+            volatility: IV driving the underlying until short expiration
+            long_volatility: IV used to value the LEAPS at short expiration
+            risk_free_rate: Drift and discount rate
+
+        Returns:
+            MonteCarloResults with one entry per candidate
+        """
+        spot, long_strike, short_strike, net_debit, short_years, long_years, volatility, long_volatility = (
+            np.atleast_1d(np.asarray(v, dtype=float)) for v in
+            (spot, long_strike, short_strike, net_debit, short_years, long_years, volatility, long_volatility)
+        )
+        n = len(spot)
+        valid = (
+            (spot > 0) & (long_strike > 0) & (short_strike > 0) & (net_debit > 0)
+            & (short_years > 0) & (long_years > short_years)
+            & (volatility > 0) & (long_volatility > 0)
+        )
+
+        results = {name: np.full(n, np.nan) for name in (
+            'expected_pnl', 'pnl_std', 'probability_of_profit', 'var_95', 'expected_shortfall', 'sharpe_ratio'
+        )}
+        rows = np.flatnonzero(valid)
+        if len(rows):
+            z = self._standard_normals()
+            tail = max(1, int(self.paths * (1 - self.confidence)))
+            for start in range(0, len(rows), self.chunk_size):
+                block = rows[start:start + self.chunk_size]
+                self._simulate_block(
+                    block, z, tail, results, risk_free_rate, spot, long_strike, short_strike,
+                    net_debit, short_years, long_years, volatility, long_volatility
+                )
+
+        return MonteCarloResults(paths=self.paths, valid=valid, **results)
+
+    def _simulate_block(self, block, z, tail, results, rate, spot, long_strike, short_strike,
+                        net_debit, short_years, long_years, volatility, long_volatility) -> None:
+        """Simulate one block of candidates and store their statistics."""
+        def column(values):
+            return values[block, None]
+
+        t = column(short_years)
+        sigma = column(volatility)
+
+        # Log terminal price at short expiration under geometric Brownian motion
+        log_terminal = z[None, :] * (sigma * np.sqrt(t))
+        log_terminal += np.log(column(spot)) + (rate - 0.5 * sigma * sigma) * t
+
+        long_value = call_price_from_log_spot(
+            log_terminal, column(long_strike), column(long_years) - t, rate, column(long_volatility)
+        )
+        short_value = np.exp(log_terminal)
+        short_value -= column(short_strike)
+        np.maximum(short_value, 0.0, out=short_value)
+        pnl = long_value
+        pnl -= short_value
+        pnl -= column(net_debit)
+
+        mean = pnl.mean(axis=1)
+        std = pnl.std(axis=1)
+        worst = np.partition(pnl, tail - 1, axis=1)[:, :tail]
+
+        results['expected_pnl'][block] = mean
+        results['pnl_std'][block] = std
+        results['probability_of_profit'][block] = (pnl > 0).mean(axis=1)
+        results['var_95'][block] = np.maximum(-worst.max(axis=1), 0.0)
+        results['expected_shortfall'][block] = np.maximum(-worst.mean(axis=1), 0.0)
+
+        # Annualized Sharpe ratio of the return on the net debit over the short's life
+        periods = 1.0 / short_years[block]
+        debit = net_debit[block]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results['sharpe_ratio'][block] = np.where(
+                std > 0,
+                (mean / debit * periods - rate) / (std / debit * np.sqrt(periods)),
+                np.nan
+            )
+
+    def simulate_analyses(self, analyses: List[PMCCAnalysis],
+                          risk_free_rate: float = 0.05,
+                          long_volatility: Optional[Sequence[float]] = None) -> MonteCarloResults:
+        """
+        Simulate P&L for PMCC analyses.
+
+        The underlying is driven by the short call's IV (the LEAPS IV if the
+        short has none); the LEAPS is valued with its own IV (or the short's)
+        unless a repricing IV is given.
+
+        Args:
+            analyses: PMCC analysis objects
+            risk_free_rate: Drift and discount rate
+            long_volatility: Optional IV per analysis to value the LEAPS at
+                short expiration, e.g. from the IV surface; NaN entries fall
+                back to the contracts' IVs
+
+        Returns:
+            MonteCarloResults with one entry per analysis
+        """
+        def value(v):
+            return float(v) if v is not None else np.nan
+
+        short_iv = np.array([value(a.short_call.iv) for a in analyses], dtype=float)
+        long_iv = np.array([value(a.long_call.iv) for a in analyses], dtype=float)
+        repricing_iv = np.where(np.isnan(long_iv), short_iv, long_iv)
+        if long_volatility is not None:
+            override = np.asarray(long_volatility, dtype=float)
+            repricing_iv = np.where(np.isnan(override), repricing_iv, override)
+
+        return self.simulate(
+            spot=[value(a.underlying.last) for a in analyses],
+            long_strike=[value(a.long_call.strike) for a in analyses],
+            short_strike=[value(a.short_call.strike) for a in analyses],
+            net_debit=[value(a.net_debit) for a in analyses],
+            short_years=[(a.short_call.dte or 0) / 365 for a in analyses],
+            long_years=[(a.long_call.dte or 0) / 365 for a in analyses],
+            volatility=np.where(np.isnan(short_iv), long_iv, short_iv),
+            long_volatility=repricing_iv,
+            risk_free_rate=float(risk_free_rate)
+        )
@@ -7,28 +7,42 @@ for Poor Man's Covered Call strategies.
 
 import logging
 import asyncio
-from typing import List, Optional, Tuple, Dict, Any, Union
-from dataclasses import dataclass
+from typing import List, Optional, Tuple, Dict, Any, Union, Sequence
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from datetime import datetime, timedelta, date
 from collections import defaultdict
 import math
 
+import numpy as np
+
 try:
-    from src.models.api_models import OptionChain, OptionContract, OptionSide, StockQuote
+    from src.analysis.black_scholes import (
+        DAYS_PER_YEAR, call_greeks, implied_volatility, probability_above, probability_of_touch,
+        spot_for_call_value
+    )
+    from src.analysis.iv_surface import IVSurface, IVSurfaceCache
+    from src.models.api_models import OptionChain, OptionContract, OptionSide, StockQuote, APIStatus
     from src.models.pmcc_models import PMCCAnalysis, RiskMetrics
-    from src.api.data_provider import DataProvider, SyncDataProvider
-    from src.analysis.pmcc_analysis_reporter import PMCCAnalysisReporter
+    from src.api.data_provider import DataProvider, SyncDataProvider, OptionChainQuery
+    from src.analysis.pmcc_analysis_reporter import PMCCAnalysisReporter, ChainScreen
+    from src.analysis.options_availability_cache import NO_OPTIONS, NO_LEAPS
     from src.config.settings import AnalysisVerbosity
 except ImportError:
     # Handle case when running as script
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from models.api_models import OptionChain, OptionContract, OptionSide, StockQuote
+    from analysis.black_scholes import (
+        DAYS_PER_YEAR, call_greeks, implied_volatility, probability_above, probability_of_touch,
+        spot_for_call_value
+    )
+    from analysis.iv_surface import IVSurface, IVSurfaceCache
+    from models.api_models import OptionChain, OptionContract, OptionSide, StockQuote, APIStatus
     from models.pmcc_models import PMCCAnalysis, RiskMetrics
-    from api.data_provider import DataProvider, SyncDataProvider
-    from analysis.pmcc_analysis_reporter import PMCCAnalysisReporter
+    from api.data_provider import DataProvider, SyncDataProvider, OptionChainQuery
+    from analysis.pmcc_analysis_reporter import PMCCAnalysisReporter, ChainScreen
+    from analysis.options_availability_cache import NO_OPTIONS, NO_LEAPS
     from config.settings import AnalysisVerbosity
 
 
@@ -65,6 +79,176 @@ class ShortCallCriteria:
     min_premium_coverage_ratio: Decimal = Decimal('0.50')  # Min ratio of short premium to LEAPS extrinsic
 
 
+@dataclass
+class ScoringWeights:
+    """Weights of the score components in an opportunity's total score."""
+    roi: Decimal = Decimal('0.25')
+    risk_reward: Decimal = Decimal('0.25')
+    probability: Decimal = Decimal('0.30')
+    liquidity: Decimal = Decimal('0.20')
+    
+    def total_scores(self, roi_potential, risk_reward_ratio, probability_score, liquidity_score) -> np.ndarray:
+        """
+        Total scores for arrays of raw components, as OptionsAnalyzer._calculate_total_score.
+        
+        ROI is capped to 0-100 and a 2:1 risk-reward ratio scores 100; the
+        weighted sum is clamped to 0-100.
+        """
+        roi_score = np.clip(np.asarray(roi_potential, dtype=float), 0, 100)
+        rr_score = np.minimum(np.asarray(risk_reward_ratio, dtype=float) * 50, 100)
+        total = (
+            roi_score * float(self.roi) +
+            rr_score * float(self.risk_reward) +
+            np.asarray(probability_score, dtype=float) * float(self.probability) +
+            np.asarray(liquidity_score, dtype=float) * float(self.liquidity)
+        )
+        return np.clip(total, 0, 100)
+
+
+Criteria = Union[LEAPSCriteria, ShortCallCriteria]
+
+
+def widest_criteria(criteria: Sequence[Criteria]) -> Criteria:
+    """
+    Criteria that accept every contract any of the given criteria accepts.
+    
+    Used to fetch one option chain for several profiles: DTE and delta windows
+    are joined, liquidity and price limits take the loosest value, and
+    moneyness is dropped ("") unless all criteria agree on it.
+    """
+    first = criteria[0]
+    changes = {
+        'min_dte': min(c.min_dte for c in criteria),
+        'max_dte': max(c.max_dte for c in criteria),
+        'min_delta': min(c.min_delta for c in criteria),
+        'max_delta': max(c.max_delta for c in criteria),
+        'max_bid_ask_spread_pct': max(c.max_bid_ask_spread_pct for c in criteria),
+        'min_open_interest': min(c.min_open_interest for c in criteria),
+        'min_volume': min(c.min_volume for c in criteria),
+        'moneyness': first.moneyness if all(c.moneyness == first.moneyness for c in criteria) else ""
+    }
+    if isinstance(first, LEAPSCriteria):
+        changes['max_premium_pct'] = max(c.max_premium_pct for c in criteria)
+        # A limit of 0 disables the extrinsic check
+        extrinsic = [c.max_extrinsic_pct for c in criteria]
+        changes['max_extrinsic_pct'] = Decimal('0') if min(extrinsic) <= 0 else max(extrinsic)
+    else:
+        changes['min_premium_coverage_ratio'] = min(c.min_premium_coverage_ratio for c in criteria)
+    return replace(first, **changes)
+
+
+def profit_and_touch_probabilities(spot, breakeven, short_strike, short_dte, volatility,
+                                   risk_free_rate: float = 0.05,
+                                   touch_volatility=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lognormal probability of profit and of touching the short strike.
+    
+    Profit is the stock closing above the breakeven at the short call's
+    expiration; touch is the stock reaching the short strike before then
+    (at touch_volatility when given, else volatility). Inputs broadcast,
+    so (LEAPS x 1) breakevens against short call rows give every
+    combination of a chain in one call.
+    
+    Returns:
+        (probability_of_profit, probability_of_touch) as fractions; NaN
+        where the spot, breakeven, volatility or DTE is missing
+    """
+    if touch_volatility is None:
+        touch_volatility = volatility
+    spot, breakeven, short_strike, short_dte, volatility, touch_volatility = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float)
+          for v in (spot, breakeven, short_strike, short_dte, volatility, touch_volatility))
+    )
+    years = short_dte / DAYS_PER_YEAR
+    known = (
+        (spot > 0) & (breakeven > 0) & (short_strike > 0) & (years > 0) & (volatility > 0)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit = probability_above(spot, breakeven, years, risk_free_rate, volatility)
+        touch = probability_of_touch(spot, short_strike, years, risk_free_rate, touch_volatility)
+    return np.where(known, profit, np.nan), np.where(known & (touch_volatility > 0), touch, np.nan)
+
+
+def combination_probabilities(spot, leaps_strike, leaps_ask, leaps_dte, leaps_iv,
+                              short_strike, short_bid, short_dte, short_iv,
+                              surface: Optional[IVSurface] = None,
+                              risk_free_rate: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Probability of profit and of touching the short strike for LEAPS/short pairs.
+    
+    The breakeven is RiskCalculator._short_expiration_breakeven's: the stock
+    price at the short call's expiration where the LEAPS, repriced by
+    Black-Scholes over its remaining DTE, covers the net debit. The LEAPS is
+    repriced at the surface IV of its strike and remaining DTE, else at its
+    own IV; without either the static breakeven (strike + net debit) is
+    used. A position that loses money even at the short strike has no
+    chance of profit.
+    
+    Both probabilities use the surface IV at the short DTE (at the
+    breakeven for profit, the short strike for touch), else the short
+    call's IV, else the LEAPS IV. Inputs broadcast like
+    profit_and_touch_probabilities.
+    """
+    (spot, leaps_strike, leaps_ask, leaps_dte, leaps_iv,
+     short_strike, short_bid, short_dte, short_iv) = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (spot, leaps_strike, leaps_ask, leaps_dte, leaps_iv,
+                                               short_strike, short_bid, short_dte, short_iv))
+    )
+    net_debit = leaps_ask - short_bid
+    remaining_dte = leaps_dte - short_dte
+    market_volatility = np.where(np.isfinite(short_iv), short_iv, leaps_iv)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        leaps_volatility = leaps_iv
+        if surface is not None:
+            leaps_volatility = np.where(
+                (remaining_dte > 0) & (leaps_strike > 0), surface.iv(leaps_strike, remaining_dte), leaps_iv
+            )
+        model_breakeven = spot_for_call_value(
+            net_debit, leaps_strike, remaining_dte / DAYS_PER_YEAR, risk_free_rate,
+            leaps_volatility, short_strike
+        )
+        breakeven = np.where(np.isnan(model_breakeven), leaps_strike + net_debit, model_breakeven)
+        
+        profit_volatility = touch_volatility = market_volatility
+        if surface is not None:
+            listed = short_dte > 0
+            profit_strike = np.where(np.isfinite(breakeven) & (breakeven > 0), breakeven, short_strike)
+            profit_volatility = np.where(
+                listed & (profit_strike > 0), surface.iv(profit_strike, short_dte), market_volatility
+            )
+            touch_volatility = np.where(
+                listed & (short_strike > 0), surface.iv(short_strike, short_dte), market_volatility
+            )
+    
+    return profit_and_touch_probabilities(
+        spot, breakeven, short_strike, short_dte, profit_volatility, risk_free_rate, touch_volatility
+    )
+
+
+def short_call_rank_premium(contract: OptionContract, surface: Optional[IVSurface] = None) -> float:
+    """
+    Premium a short call candidate is ranked by.
+    
+    The bid, plus how rich the quote is to the fitted smile in dollars
+    (richness x vega) when an IV surface is given: calls priced above the
+    smile rank ahead of fairly priced ones of similar premium and cheap
+    quotes fall back.
+    """
+    bid = float(contract.bid or 0)
+    if surface is None or contract.vega is None:
+        return bid
+    richness = surface.richness(contract)
+    if richness is None:
+        return bid
+    # Richness is in volatility units, vega per volatility point
+    return bid + richness * 100 * float(contract.vega)
+
+
+def _probability_decimal(value: float) -> Optional[Decimal]:
+    return Decimal(str(round(value, 6))) if np.isfinite(value) else None
+
+
 @dataclass
 class PMCCOpportunity:
     """Represents a PMCC opportunity with scoring."""
@@ -81,6 +265,8 @@ class PMCCOpportunity:
     liquidity_score: Decimal  # 0-100 liquidity score
     total_score: Decimal  # 0-100 composite score
     analyzed_at: datetime
+    probability_of_profit: Optional[Decimal] = None  # Lognormal, as a fraction
+    probability_of_touch: Optional[Decimal] = None  # Of the short strike, as a fraction
 
 
 class OptionsAnalyzer:
@@ -138,6 +324,19 @@ class OptionsAnalyzer:
         # Initialize comprehensive analysis reporter
         self.analysis_reporter = PMCCAnalysisReporter(verbosity=verbosity)
         
+        # Status of the most recent option chain fetch
+        self.last_chain_result: Optional[Dict[str, Any]] = None
+        
+        # Weights of the total score components
+        self.scoring_weights = ScoringWeights()
+        
+        # Rate for pricing missing Greeks and probabilities; the scanner sets it
+        # from ScanConfiguration.risk_free_rate
+        self.risk_free_rate: Decimal = Decimal('0.05')
+        
+        # IV surfaces shared with the scanner, fitted on first use per chain
+        self.iv_surface_cache: Optional[IVSurfaceCache] = None
+        
         # Determine provider type for optimization
         if hasattr(self.data_provider, 'provider_type'):
             self.provider_type = self.data_provider.provider_type
@@ -226,7 +425,7 @@ class OptionsAnalyzer:
     def find_pmcc_opportunities(self, symbol: str,
                                leaps_criteria: Optional[LEAPSCriteria] = None,
                                short_criteria: Optional[ShortCallCriteria] = None,
-                               max_opportunities: int = 10,
+                               max_opportunities: Optional[int] = 10,
                                return_option_chain: bool = False) -> Union[List[PMCCOpportunity], Tuple[List[PMCCOpportunity], Optional['OptionChain']]]:
         """
         Find PMCC opportunities for a given symbol.
@@ -235,7 +434,7 @@ class OptionsAnalyzer:
             symbol: Stock symbol to analyze
             leaps_criteria: Criteria for LEAPS selection
             short_criteria: Criteria for short call selection
-            max_opportunities: Maximum opportunities to return
+            max_opportunities: Maximum opportunities to return, None for every combination
             return_option_chain: If True, return tuple of (opportunities, option_chain)
             
         Returns:
@@ -249,6 +448,9 @@ class OptionsAnalyzer:
         if short_criteria is None:
             short_criteria = ShortCallCriteria()
         
+        # Chain fetch status for this symbol, read by the scanner's options availability cache
+        self.last_chain_result = None
+        
         try:
             # Helper function for consistent returns
             def _return_result(opportunities: List[PMCCOpportunity], option_chain: Optional['OptionChain'] = None):
@@ -256,159 +458,272 @@ class OptionsAnalyzer:
                     return (opportunities, option_chain)
                 return opportunities
             
-            # Check if data provider is available
-            if not self.data_provider:
-                self.logger.error(f"Cannot analyze {symbol}: Data provider not available")
+            quote, option_chain = self._fetch_option_chain_for_analysis(symbol, leaps_criteria, short_criteria)
+            if option_chain is None:
                 return _return_result([])
             
-            # Get current quote first (needed for EODHD optimization)
-            quote = self._get_current_quote(symbol)
-            if not quote:
-                self.logger.warning(f"Unable to retrieve stock quote for {symbol} - skipping analysis")
-                return _return_result([])
+            opportunities = self._find_opportunities_in_chain(
+                symbol, option_chain, quote, leaps_criteria, short_criteria, max_opportunities
+            )
+            return _return_result(opportunities[:max_opportunities], option_chain)
             
-            # Get option chain with current price for optimization
-            current_price = float(quote.last or quote.mid) if (quote.last or quote.mid) else None
-            option_chain_result = self._get_option_chain_with_details(symbol, current_price)
+        except Exception as e:
+            self.logger.error(f"Unexpected error analyzing PMCC opportunities for {symbol}: {e}")
+            return _return_result([])
+    
+    def find_pmcc_opportunities_for_profiles(
+        self, symbol: str,
+        profiles: Dict[str, Tuple[Optional[LEAPSCriteria], Optional[ShortCallCriteria]]],
+        scoring_weights: Optional[Dict[str, ScoringWeights]] = None,
+        max_opportunities: Optional[int] = 10
+    ) -> Tuple[Dict[str, List[PMCCOpportunity]], Optional[OptionChain]]:
+        """
+        Find PMCC opportunities for several criteria profiles from one data fetch.
+        
+        The quote and option chain are fetched once for the widest criteria of
+        all profiles; each profile then screens and scores the same chain.
+        
+        Args:
+            symbol: Stock symbol to analyze
+            profiles: Profile name -> (LEAPS criteria, short call criteria), None for defaults
+            scoring_weights: Profile name -> total score weights, defaults to the analyzer's
+            max_opportunities: Maximum opportunities to return per profile, None for every combination
             
-            if option_chain_result["status"] == "api_error":
-                self.logger.error(f"API error retrieving option chain for {symbol}: {option_chain_result['message']}")
-                return _return_result([])
-            elif option_chain_result["status"] == "no_options":
-                self.logger.info(f"{symbol} has no options available for trading")
-                return _return_result([])
-            elif option_chain_result["status"] == "empty_chain":
-                self.logger.info(f"{symbol} option chain is empty or contains no valid contracts")
-                return _return_result([])
-            elif option_chain_result["status"] == "partial_success":
-                # Log partial success but continue with analysis
-                api_calls = option_chain_result.get("api_calls", "unknown")
-                success_rate = option_chain_result.get("success_rate", 0.0)
-                leaps_count = option_chain_result.get("leaps_count", 0)
-                short_count = option_chain_result.get("short_count", 0)
-                self.logger.warning(f"{symbol} comprehensive fetch partially successful: {success_rate:.1f}% success rate "
-                                  f"({api_calls} API calls), found {leaps_count} LEAPS + {short_count} short calls")
-                # Continue with analysis despite partial success
-            
-            option_chain = option_chain_result["data"]
-            if not option_chain:
-                self.logger.warning(f"Unexpected: option chain data is None for {symbol}")
-                return _return_result([])
+        Returns:
+            Tuple of (profile name -> opportunities sorted by total score, option_chain)
+        """
+        print(f"\n🚀 find_pmcc_opportunities_for_profiles called for {symbol} ({len(profiles)} profiles)")
+        
+        profiles = {
+            name: (leaps_criteria or LEAPSCriteria(), short_criteria or ShortCallCriteria())
+            for name, (leaps_criteria, short_criteria) in profiles.items()
+        }
+        opportunities: Dict[str, List[PMCCOpportunity]] = {name: [] for name in profiles}
+        self.last_chain_result = None
+        
+        try:
+            quote, option_chain = self._fetch_option_chain_for_analysis(
+                symbol,
+                widest_criteria([leaps_criteria for leaps_criteria, _ in profiles.values()]),
+                widest_criteria([short_criteria for _, short_criteria in profiles.values()])
+            )
+            if option_chain is None:
+                return opportunities, None
             
-            print(f"   📦 Option chain loaded: {len(option_chain.contracts)} contracts, underlying_price=${option_chain.underlying_price}")
+            default_weights = self.scoring_weights
+            try:
+                for name, (leaps_criteria, short_criteria) in profiles.items():
+                    self.scoring_weights = (scoring_weights or {}).get(name, default_weights)
+                    opportunities[name] = self._find_opportunities_in_chain(
+                        symbol, option_chain, quote, leaps_criteria, short_criteria, max_opportunities
+                    )[:max_opportunities]
+            finally:
+                self.scoring_weights = default_weights
+            return opportunities, option_chain
             
-            # Generate comprehensive analysis report (only if not QUIET)
-            feasibility_report = None
-            if self.verbosity != AnalysisVerbosity.QUIET:
-                try:
-                    feasibility_report = self.analysis_reporter.analyze_option_chain_comprehensive(
-                        symbol, option_chain, quote, leaps_criteria, short_criteria
-                    )
-                    
-                    # If no valid combinations, return empty list (report already logged)
-                    if not feasibility_report.is_pmcc_feasible:
-                        print(f"   ⚠️  Analysis reporter says PMCC not feasible! Skipping early.")
-                        print(f"       Feasibility report: is_pmcc_feasible={feasibility_report.is_pmcc_feasible}")
-                        # COMMENTING OUT EARLY RETURN TO DEBUG
-                        # return _return_result([], option_chain)
-                except Exception as e:
-                    self.logger.error(f"Error in comprehensive analysis for {symbol}: {e}")
-                    # Fallback to basic analysis without the reporter
-                    feasibility_report = None
-            
-            # Find suitable LEAPS and short call contracts using existing methods
-            print(f"   🎯 About to filter contracts - quote.last=${quote.last if quote else 'None'}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error analyzing PMCC profiles for {symbol}: {e}")
+            return {name: [] for name in profiles}, None
+    
+    def _fetch_option_chain_for_analysis(self, symbol: str,
+                                         leaps_criteria: LEAPSCriteria,
+                                         short_criteria: ShortCallCriteria
+                                         ) -> Tuple[Optional[StockQuote], Optional[OptionChain]]:
+        """
+        Fetch the quote and the option chain covering both legs' criteria.
+        
+        Missing IV/Greeks are filled in and the symbol's IV surface is built.
+        
+        Returns:
+            (quote, option_chain); option_chain is None if nothing can be analyzed
+        """
+        # Check if data provider is available
+        if not self.data_provider:
+            self.logger.error(f"Cannot analyze {symbol}: Data provider not available")
+            return None, None
+        
+        # Get current quote first (needed for EODHD optimization)
+        quote = self._get_current_quote(symbol)
+        if not quote:
+            self.logger.warning(f"Unable to retrieve stock quote for {symbol} - skipping analysis")
+            return quote, None
+        
+        # Get option chain with current price for optimization
+        current_price = float(quote.last or quote.mid) if (quote.last or quote.mid) else None
+        option_chain_result = self._get_option_chain_with_details(
+            symbol, current_price, leaps_criteria, short_criteria
+        )
+        self.last_chain_result = option_chain_result
+        
+        if option_chain_result["status"] == "api_error":
+            self.logger.error(f"API error retrieving option chain for {symbol}: {option_chain_result['message']}")
+            return quote, None
+        elif option_chain_result["status"] == "no_options":
+            self.logger.info(f"{symbol} has no options available for trading")
+            return quote, None
+        elif option_chain_result["status"] == "empty_chain":
+            self.logger.info(f"{symbol} option chain is empty or contains no valid contracts")
+            return quote, None
+        elif option_chain_result["status"] == "partial_success":
+            # Log partial success but continue with analysis
+            api_calls = option_chain_result.get("api_calls", "unknown")
+            success_rate = option_chain_result.get("success_rate", 0.0)
+            leaps_count = option_chain_result.get("leaps_count", 0)
+            short_count = option_chain_result.get("short_count", 0)
+            self.logger.warning(f"{symbol} comprehensive fetch partially successful: {success_rate:.1f}% success rate "
+                              f"({api_calls} API calls), found {leaps_count} LEAPS + {short_count} short calls")
+            # Continue with analysis despite partial success
+        
+        option_chain = option_chain_result["data"]
+        if not option_chain:
+            self.logger.warning(f"Unexpected: option chain data is None for {symbol}")
+            return quote, None
+        
+        print(f"   📦 Option chain loaded: {len(option_chain.contracts)} contracts, underlying_price=${option_chain.underlying_price}")
+        
+        # Delta filters need Greeks; price the calls that arrived without them
+        filled = self.fill_missing_greeks(
+            option_chain, quote, self.risk_free_rate
+        )
+        if filled:
+            self.logger.debug(f"{symbol}: filled missing IV/Greeks for {filled} contracts")
+        
+        return quote, option_chain
+    
+    def _get_iv_surface(self, option_chain: OptionChain, quote: Optional[StockQuote]) -> Optional[IVSurface]:
+        """The chain's IV surface from the shared cache, fitted on first use; None without a cache."""
+        if self.iv_surface_cache is None:
+            return None
+        return self.iv_surface_cache.get_or_build(option_chain, quote.last or quote.mid if quote else None)
+    
+    def _latest_iv_surface(self, quote: Optional[StockQuote]) -> Optional[IVSurface]:
+        """The symbol's most recently fitted IV surface, for pairs analyzed without their chain."""
+        if self.iv_surface_cache is None or quote is None:
+            return None
+        return self.iv_surface_cache.latest(quote.symbol)
+    
+    def _find_opportunities_in_chain(self, symbol: str, option_chain: OptionChain, quote: StockQuote,
+                                     leaps_criteria: LEAPSCriteria,
+                                     short_criteria: ShortCallCriteria,
+                                     max_opportunities: Optional[int] = 10) -> List[PMCCOpportunity]:
+        """
+        Screen a fetched chain and score its valid LEAPS/short combinations.
+        
+        Returns:
+            All opportunities of the chain, sorted by total score
+        """
+        # Find suitable LEAPS and short call contracts in one pass over the chain.
+        # When not QUIET the same pass screens contracts for the feasibility
+        # report, and LEAPS/short pair checks are shared through the screen.
+        screen = ChainScreen(calls=option_chain.get_calls()) if self.verbosity != AnalysisVerbosity.QUIET else None
+        print(f"   🎯 About to filter contracts - quote.last=${quote.last if quote else 'None'}")
+        try:
+            leaps_candidates, short_candidates = self._screen_option_chain(
+                option_chain, leaps_criteria, short_criteria, quote, screen
+            )
+        except Exception as e:
+            self.logger.error(f"Error filtering contracts for {symbol}: {type(e).__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            leaps_candidates = []
+            short_candidates = []
+            screen = None
+        
+        # Generate comprehensive analysis report from the screen (only if not QUIET)
+        feasibility_report = None
+        if screen is not None:
             try:
-                leaps_candidates = self._filter_leaps_contracts(
-                    option_chain, leaps_criteria, quote
+                feasibility_report = self.analysis_reporter.analyze_option_chain_comprehensive(
+                    symbol, option_chain, quote, leaps_criteria, short_criteria, screen=screen
                 )
-            except Exception as e:
-                self.logger.error(f"Error filtering LEAPS for {symbol}: {type(e).__name__}: {e}")
-                import traceback
-                traceback.print_exc()
-                leaps_candidates = []
                 
-            try:
-                short_candidates = self._filter_short_contracts(
-                    option_chain, short_criteria, quote
-                )
+                # If no valid combinations, return empty list (report already logged)
+                if not feasibility_report.is_pmcc_feasible:
+                    print(f"   ⚠️  Analysis reporter says PMCC not feasible! Skipping early.")
+                    print(f"       Feasibility report: is_pmcc_feasible={feasibility_report.is_pmcc_feasible}")
+                    # COMMENTING OUT EARLY RETURN TO DEBUG
+                    # return _return_result([], option_chain)
             except Exception as e:
-                self.logger.error(f"Error filtering short calls for {symbol}: {type(e).__name__}: {e}")
-                import traceback
-                traceback.print_exc()
-                short_candidates = []
-            
-            # Debug: Always print filtering results
-            print(f"   📊 Filtering results for {symbol}:")
-            print(f"      LEAPS candidates found: {len(leaps_candidates)}")
-            print(f"      Short candidates found: {len(short_candidates)}")
-            
-            if len(leaps_candidates) > 0:
-                print(f"      LEAPS contracts that passed filters:")
-                for i, leaps in enumerate(leaps_candidates[:3]):  # Show first 3
-                    delta_str = f"{leaps.delta:.3f}" if leaps.delta else "N/A"
-                    print(f"        #{i+1}: Strike=${leaps.strike}, Delta={delta_str}, "
-                          f"DTE={leaps.dte}, OI={leaps.open_interest}, Bid/Ask=${leaps.bid}/${leaps.ask}, "
-                          f"Moneyness={leaps.moneyness}")
-            else:
-                print(f"      ❌ No LEAPS passed filters!")
-                
-            if len(short_candidates) > 0:
-                print(f"      Short calls that passed filters:")
-                for i, short in enumerate(short_candidates[:3]):  # Show first 3
-                    delta_str = f"{short.delta:.3f}" if short.delta else "N/A"
-                    print(f"        #{i+1}: Strike=${short.strike}, Delta={delta_str}, "
-                          f"DTE={short.dte}, OI={short.open_interest}, Bid/Ask=${short.bid}/${short.ask}, "
-                          f"Moneyness={short.moneyness}")
-            else:
-                print(f"      ❌ No short calls passed filters!")
-            
-            # Generate and analyze PMCC combinations
-            opportunities = []
-            for leaps in leaps_candidates:
-                # Calculate LEAPS extrinsic value once per LEAPS contract
-                leaps_intrinsic = max(Decimal('0'), quote.last - leaps.strike) if quote.last and leaps.strike else Decimal('0')
-                # Use mid price if available, otherwise calculate it
-                leaps_mid = leaps.mid if leaps.mid else (leaps.bid + leaps.ask) / Decimal('2') if (leaps.bid and leaps.ask) else None
-                leaps_extrinsic = (leaps_mid - leaps_intrinsic) if leaps_mid else Decimal('0')
-                
-                for short in short_candidates:
-                    if self._is_valid_pmcc_combination(leaps, short, quote):
-                        # Check premium coverage ratio (only if enabled)
-                        if short_criteria.min_premium_coverage_ratio > 0 and leaps_extrinsic > 0 and short.bid:
-                            coverage_ratio = short.bid / leaps_extrinsic
-                            if coverage_ratio < short_criteria.min_premium_coverage_ratio:
-                                if self.verbosity == AnalysisVerbosity.DEBUG:
-                                    self.logger.debug(f"PMCC {leaps.strike}/{short.strike} rejected: premium coverage ratio {coverage_ratio:.2f} < {short_criteria.min_premium_coverage_ratio}")
-                                continue
-                        
-                        opportunity = self._analyze_pmcc_combination(
-                            leaps, short, quote
-                        )
-                        if opportunity:
-                            opportunities.append(opportunity)
-            
-            # Sort by total score and return top results
-            opportunities.sort(key=lambda x: x.total_score, reverse=True)
-            
-            if self.verbosity in [AnalysisVerbosity.VERBOSE, AnalysisVerbosity.DEBUG]:
-                self.logger.info(f"{symbol}: Generated {len(opportunities)} PMCC opportunities, "
-                               f"returning top {min(len(opportunities), max_opportunities)}")
-            
-            # If no opportunities found, log a summary of why
-            if len(opportunities) == 0:
-                if self.verbosity != AnalysisVerbosity.QUIET:
-                    self._log_no_opportunities_summary(symbol, leaps_candidates, short_candidates, 
-                                                     option_chain, leaps_criteria, short_criteria)
-                else:
-                    # Even in quiet mode, print a basic summary for debugging
-                    print(f"   ℹ️  Debug: {len(leaps_candidates)} LEAPS candidates, {len(short_candidates)} short candidates found")
-            
-            return _return_result(opportunities[:max_opportunities], option_chain)
+                self.logger.error(f"Error in comprehensive analysis for {symbol}: {e}")
+                # Fallback to basic analysis without the reporter
+                feasibility_report = None
+                screen = None
+        
+        # Debug: Always print filtering results
+        print(f"   📊 Filtering results for {symbol}:")
+        print(f"      LEAPS candidates found: {len(leaps_candidates)}")
+        print(f"      Short candidates found: {len(short_candidates)}")
+        
+        if len(leaps_candidates) > 0:
+            print(f"      LEAPS contracts that passed filters:")
+            for i, leaps in enumerate(leaps_candidates[:3]):  # Show first 3
+                delta_str = f"{leaps.delta:.3f}" if leaps.delta else "N/A"
+                print(f"        #{i+1}: Strike=${leaps.strike}, Delta={delta_str}, "
+                      f"DTE={leaps.dte}, OI={leaps.open_interest}, Bid/Ask=${leaps.bid}/${leaps.ask}, "
+                      f"Moneyness={leaps.moneyness}")
+        else:
+            print(f"      ❌ No LEAPS passed filters!")
+            
+        if len(short_candidates) > 0:
+            print(f"      Short calls that passed filters:")
+            for i, short in enumerate(short_candidates[:3]):  # Show first 3
+                delta_str = f"{short.delta:.3f}" if short.delta else "N/A"
+                print(f"        #{i+1}: Strike=${short.strike}, Delta={delta_str}, "
+                      f"DTE={short.dte}, OI={short.open_interest}, Bid/Ask=${short.bid}/${short.ask}, "
+                      f"Moneyness={short.moneyness}")
+        else:
+            print(f"      ❌ No short calls passed filters!")
+        
+        # Generate and analyze PMCC combinations; probabilities of all pairs are computed in one pass
+        opportunities = []
+        probability_of_profit, probability_of_touch = self._combination_probabilities(
+            leaps_candidates, short_candidates, quote,
+            self._get_iv_surface(option_chain, quote) if short_candidates else None
+        )
+        for i, leaps in enumerate(leaps_candidates):
+            # Calculate LEAPS extrinsic value once per LEAPS contract
+            leaps_intrinsic = max(Decimal('0'), quote.last - leaps.strike) if quote.last and leaps.strike else Decimal('0')
+            # Use mid price if available, otherwise calculate it
+            leaps_mid = leaps.mid if leaps.mid else (leaps.bid + leaps.ask) / Decimal('2') if (leaps.bid and leaps.ask) else None
+            leaps_extrinsic = (leaps_mid - leaps_intrinsic) if leaps_mid else Decimal('0')
             
-        except Exception as e:
-            self.logger.error(f"Unexpected error analyzing PMCC opportunities for {symbol}: {e}")
-            return _return_result([])
+            for j, short in enumerate(short_candidates):
+                if screen is not None:
+                    is_valid = self.analysis_reporter.check_combination(leaps, short, quote, screen) is None
+                else:
+                    is_valid = self._is_valid_pmcc_combination(leaps, short, quote)
+                if is_valid:
+                    # Check premium coverage ratio (only if enabled)
+                    if short_criteria.min_premium_coverage_ratio > 0 and leaps_extrinsic > 0 and short.bid:
+                        coverage_ratio = short.bid / leaps_extrinsic
+                        if coverage_ratio < short_criteria.min_premium_coverage_ratio:
+                            if self.verbosity == AnalysisVerbosity.DEBUG:
+                                self.logger.debug(f"PMCC {leaps.strike}/{short.strike} rejected: premium coverage ratio {coverage_ratio:.2f} < {short_criteria.min_premium_coverage_ratio}")
+                            continue
+                    
+                    opportunity = self._analyze_pmcc_combination(
+                        leaps, short, quote, (probability_of_profit[i, j], probability_of_touch[i, j])
+                    )
+                    if opportunity:
+                        opportunities.append(opportunity)
+        
+        # Sort by total score and return top results
+        opportunities.sort(key=lambda x: x.total_score, reverse=True)
+        
+        if self.verbosity in [AnalysisVerbosity.VERBOSE, AnalysisVerbosity.DEBUG]:
+            self.logger.info(f"{symbol}: Generated {len(opportunities)} PMCC opportunities, "
+                           f"returning top {min(len(opportunities), max_opportunities or len(opportunities))}")
+        
+        # If no opportunities found, log a summary of why
+        if len(opportunities) == 0:
+            if self.verbosity != AnalysisVerbosity.QUIET:
+                self._log_no_opportunities_summary(symbol, leaps_candidates, short_candidates, 
+                                                 option_chain, leaps_criteria, short_criteria)
+            else:
+                # Even in quiet mode, print a basic summary for debugging
+                print(f"   ℹ️  Debug: {len(leaps_candidates)} LEAPS candidates, {len(short_candidates)} short candidates found")
+        
+        return opportunities
     
     def analyze_specific_pmcc(self, leaps_symbol: str, short_symbol: str) -> Optional[PMCCOpportunity]:
         """
@@ -607,37 +922,164 @@ class OptionsAnalyzer:
         
         return validation
     
-    def _get_option_chain_with_details(self, symbol: str, current_price: Optional[float] = None) -> Dict[str, Any]:
+    def supports_option_expirations(self) -> bool:
+        """
+        Whether the data provider can list option expirations.
+        
+        DataProvider defines get_option_expirations for every provider (as an
+        error response), so providers are asked through supports_operation;
+        legacy clients without it are checked for the method.
+        """
+        supports_operation = getattr(self.data_provider, 'supports_operation', None)
+        if callable(supports_operation):
+            return bool(supports_operation('get_option_expirations'))
+        return hasattr(self.data_provider, 'get_option_expirations')
+    
+    def get_leaps_unavailability_reason(self, symbol: str, min_dte: int) -> Optional[str]:
+        """
+        Check LEAPS availability from the option expirations list.
+        
+        This is a single cheap request, used instead of a full chain fetch to
+        decide whether a symbol can produce PMCC opportunities at all.
+        
+        Args:
+            symbol: Stock symbol
+            min_dte: Minimum days to expiration for LEAPS
+            
+        Returns:
+            NO_OPTIONS or NO_LEAPS, or None if LEAPS are listed or availability
+            could not be determined
+        """
+        if not self.supports_option_expirations():
+            return None
+        
+        try:
+            response = self.data_provider.get_option_expirations(symbol)
+            if hasattr(response, '__await__'):
+                response = asyncio.run(response)
+        except Exception as e:
+            self.logger.debug(f"Option expirations check failed for {symbol}: {e}")
+            return None
+        
+        if response.status == APIStatus.NO_DATA:
+            return NO_OPTIONS
+        if not response.is_success or not isinstance(response.data, list):
+            return None
+        if not response.data:
+            return NO_OPTIONS
+        
+        leaps_cutoff = date.today() + timedelta(days=min_dte)
+        for expiration in response.data:
+            try:
+                if date.fromisoformat(str(expiration)[:10]) >= leaps_cutoff:
+                    return None
+            except ValueError:
+                continue
+        return NO_LEAPS
+    
+    def _plan_option_chain_queries(self,
+                                   leaps_criteria: LEAPSCriteria,
+                                   short_criteria: ShortCallCriteria,
+                                   current_price: Optional[float] = None) -> List[OptionChainQuery]:
+        """
+        Translate LEAPS and short call criteria into the narrowest chain queries.
+        
+        Each leg gets its own DTE window, delta band, liquidity floor and (when
+        the current price is known) the strike side implied by its moneyness.
+        Legs whose DTE windows overlap are merged into one covering query.
+        
+        Args:
+            leaps_criteria: Criteria for LEAPS selection
+            short_criteria: Criteria for short call selection
+            current_price: Current stock price used for strike bounds
+            
+        Returns:
+            List of OptionChainQuery objects, one per provider request
+        """
+        today = date.today()
+        price = Decimal(str(current_price)) if current_price else None
+        
+        def leg_query(criteria: Union[LEAPSCriteria, ShortCallCriteria]) -> OptionChainQuery:
+            return OptionChainQuery(
+                expiration_from=today + timedelta(days=criteria.min_dte),
+                expiration_to=today + timedelta(days=criteria.max_dte),
+                min_delta=criteria.min_delta,
+                max_delta=criteria.max_delta,
+                # ITM legs need strike below spot, OTM legs need strike above it
+                min_strike=price if price and criteria.moneyness == "OTM" else None,
+                max_strike=price if price and criteria.moneyness == "ITM" else None,
+                min_open_interest=criteria.min_open_interest,
+                min_volume=criteria.min_volume
+            )
+        
+        short_query = leg_query(short_criteria)
+        leaps_query = leg_query(leaps_criteria)
+        
+        if (short_query.expiration_to < leaps_query.expiration_from or
+                leaps_query.expiration_to < short_query.expiration_from):
+            return [leaps_query, short_query]
+        
+        # Overlapping windows: one request covering both legs is cheaper than two
+        def lower(a, b):
+            return None if a is None or b is None else min(a, b)
+        
+        def upper(a, b):
+            return None if a is None or b is None else max(a, b)
+        
+        return [OptionChainQuery(
+            expiration_from=min(short_query.expiration_from, leaps_query.expiration_from),
+            expiration_to=max(short_query.expiration_to, leaps_query.expiration_to),
+            min_delta=lower(short_query.min_delta, leaps_query.min_delta),
+            max_delta=upper(short_query.max_delta, leaps_query.max_delta),
+            min_strike=lower(short_query.min_strike, leaps_query.min_strike),
+            max_strike=upper(short_query.max_strike, leaps_query.max_strike),
+            min_open_interest=min(short_query.min_open_interest, leaps_query.min_open_interest),
+            min_volume=min(short_query.min_volume, leaps_query.min_volume)
+        )]
+    
+    def _get_option_chain_with_details(self, symbol: str, current_price: Optional[float] = None,
+                                       leaps_criteria: Optional[LEAPSCriteria] = None,
+                                       short_criteria: Optional[ShortCallCriteria] = None) -> Dict[str, Any]:
         """
         Get option chain for symbol using the configured data provider with detailed status information.
         
         Args:
             symbol: Stock symbol
             current_price: Current stock price (used for optimization)
+            leaps_criteria: LEAPS criteria used to plan server-side filters
+            short_criteria: Short call criteria used to plan server-side filters
             
         Returns:
             Dict with keys: 'status', 'data', 'message', 'api_calls', 'success_rate'
             Status values: 'success', 'api_error', 'no_options', 'empty_chain', 'partial_success'
         """
+        if leaps_criteria is None:
+            leaps_criteria = LEAPSCriteria()
+        if short_criteria is None:
+            short_criteria = ShortCallCriteria()
+        
+        api_calls = 1
         try:
-            # Calculate reasonable date ranges for PMCC strategy
-            today = date.today()
-            leaps_min_date = today + timedelta(days=270)  # 9 months minimum for LEAPS
-            leaps_max_date = today + timedelta(days=730)  # 24 months maximum for LEAPS
-            short_min_date = today + timedelta(days=21)   # 3 weeks minimum for short calls
-            short_max_date = today + timedelta(days=45)   # 6 weeks maximum for short calls
-            
-            # Get options chain using provider abstraction
-            self.logger.info(f"Data provider type: {type(self.data_provider)}")
-            self.logger.info(f"Data provider attributes: {dir(self.data_provider)}")
-            
-            if hasattr(self.data_provider, 'get_options_chain'):
-                # Use full range to get both LEAPS and short options
+            queries = self._plan_option_chain_queries(leaps_criteria, short_criteria, current_price)
+            
+            if hasattr(self.data_provider, 'get_options_chain_for_queries'):
+                # Push criteria down to the provider so only viable contracts are fetched
+                self.logger.info(f"Fetching options for {symbol} with {len(queries)} filtered request(s) "
+                                 f"using provider: {getattr(self.data_provider, 'provider_type', 'unknown')}")
+                response = self.data_provider.get_options_chain_for_queries(symbol, queries)
+                api_calls = len(queries)
+                
+                # Handle async response
+                if hasattr(response, '__await__'):
+                    response = asyncio.run(response)
+                    
+            elif hasattr(self.data_provider, 'get_options_chain'):
+                expiration_from, expiration_to = OptionChainQuery.expiration_span(queries)
                 self.logger.info(f"Fetching options for {symbol} using provider: {getattr(self.data_provider, 'provider_type', 'unknown')}")
                 response = self.data_provider.get_options_chain(
                     symbol, 
-                    expiration_from=short_min_date,
-                    expiration_to=leaps_max_date
+                    expiration_from=expiration_from,
+                    expiration_to=expiration_to
                 )
                 
                 # Handle async response
@@ -653,7 +1095,7 @@ class OptionsAnalyzer:
                     "status": "api_error",
                     "data": None,
                     "message": f"Invalid response from provider for {symbol}",
-                    "api_calls": 1,
+                    "api_calls": api_calls,
                     "success_rate": 0.0
                 }
             
@@ -662,7 +1104,7 @@ class OptionsAnalyzer:
                     "status": "api_error",
                     "data": None,
                     "message": f"Provider API returned error status for {symbol}: {response.error}",
-                    "api_calls": 1,
+                    "api_calls": api_calls,
                     "success_rate": 0.0
                 }
             
@@ -671,7 +1113,7 @@ class OptionsAnalyzer:
                     "status": "no_options",
                     "data": None,
                     "message": f"No option data returned from provider for {symbol}",
-                    "api_calls": 1,
+                    "api_calls": api_calls,
                     "success_rate": 0.0
                 }
             
@@ -682,27 +1124,26 @@ class OptionsAnalyzer:
                     "status": "empty_chain",
                     "data": None,
                     "message": f"Option chain is empty or contains no contracts for {symbol}",
-                    "api_calls": 1,
+                    "api_calls": api_calls,
                     "success_rate": 0.0
                 }
             
             # Count LEAPS and short call candidates
             leaps_count = 0
             short_count = 0
-            today = date.today()
             
             for contract in option_chain.contracts:
                 if contract.side == OptionSide.CALL and contract.dte:
-                    if 270 <= contract.dte <= 730:  # LEAPS range
+                    if leaps_criteria.min_dte <= contract.dte <= leaps_criteria.max_dte:
                         leaps_count += 1
-                    elif 21 <= contract.dte <= 45:  # Short call range
+                    elif short_criteria.min_dte <= contract.dte <= short_criteria.max_dte:
                         short_count += 1
             
             return {
                 "status": "success",
                 "data": option_chain,
                 "message": f"Successfully retrieved {len(option_chain.contracts)} options for {symbol}",
-                "api_calls": 1,
+                "api_calls": api_calls,
                 "success_rate": 100.0,
                 "leaps_count": leaps_count,
                 "short_count": short_count
@@ -713,7 +1154,7 @@ class OptionsAnalyzer:
                 "status": "api_error",
                 "data": None,
                 "message": f"Exception retrieving options for {symbol}: {str(e)}",
-                "api_calls": 1,
+                "api_calls": api_calls,
                 "success_rate": 0.0
             }
 
@@ -754,6 +1195,66 @@ class OptionsAnalyzer:
             self.logger.error(f"Error getting quote for {symbol}: {e}")
         return None
     
+    def fill_missing_greeks(self, option_chain: OptionChain,
+                            quote: Optional[StockQuote] = None,
+                            risk_free_rate: Decimal = Decimal('0.05')) -> int:
+        """
+        Fill missing IV and Greeks of call contracts with Black-Scholes values.
+        
+        All calls missing IV or any Greek are priced in one vectorized call;
+        IV is implied from the mid price when the provider did not supply it.
+        Values supplied by the provider are never overwritten.
+        
+        Args:
+            option_chain: Option chain whose contracts are updated in place
+            quote: Current stock quote, used when the chain has no underlying price
+            risk_free_rate: Risk-free rate for pricing
+            
+        Returns:
+            Number of contracts that received at least one value
+        """
+        chain_price = option_chain.underlying_price or (quote.last or quote.mid if quote else None)
+        contracts = []
+        rows = []
+        for contract in option_chain.get_calls():
+            if all(v is not None for v in (contract.iv, contract.delta, contract.gamma,
+                                           contract.theta, contract.vega)):
+                continue
+            spot = contract.underlying_price or chain_price
+            price = contract.mid or (
+                (contract.bid + contract.ask) / 2 if contract.bid and contract.ask else contract.last
+            )
+            if not spot or not contract.dte or contract.dte <= 0 or (contract.iv is None and not price):
+                continue
+            contracts.append(contract)
+            rows.append((float(spot), float(contract.strike), contract.dte / 365,
+                         float(price) if price else np.nan,
+                         float(contract.iv) if contract.iv is not None else np.nan))
+        
+        if not contracts:
+            return 0
+        
+        spot, strike, years, price, iv = np.array(rows, dtype=float).T
+        rate = float(risk_free_rate)
+        missing_iv = np.isnan(iv)
+        if missing_iv.any():
+            iv[missing_iv] = implied_volatility(
+                price[missing_iv], spot[missing_iv], strike[missing_iv], years[missing_iv], rate
+            )
+        greeks = call_greeks(spot, strike, years, rate, iv)
+        
+        filled = 0
+        for i, contract in enumerate(contracts):
+            if np.isnan(iv[i]):
+                continue
+            if contract.iv is None:
+                contract.iv = Decimal(str(round(float(iv[i]), 6)))
+            for name in ('delta', 'gamma', 'theta', 'vega'):
+                if getattr(contract, name) is None:
+                    setattr(contract, name, Decimal(str(round(float(greeks[name][i]), 6))))
+            filled += 1
+        return filled
+    
     def _filter_leaps_contracts(self, option_chain: OptionChain,
                                criteria: LEAPSCriteria,
                                quote: StockQuote) -> List[OptionContract]:
@@ -766,6 +1267,89 @@ class OptionsAnalyzer:
         candidates = []
         rejection_counts = defaultdict(int)
         
+        self._log_leaps_filter_start(calls, criteria)
+        
+        for contract in calls:
+            reason = self._leaps_rejection_reason(contract, criteria, quote)
+            if reason:
+                rejection_counts[reason] += 1
+            else:
+                candidates.append(contract)
+        
+        return self._rank_leaps_candidates(candidates, rejection_counts, len(calls))
+    
+    def _filter_short_contracts(self, option_chain: OptionChain,
+                               criteria: ShortCallCriteria,
+                               quote: StockQuote) -> List[OptionContract]:
+        """Filter option chain for suitable short call contracts with detailed logging."""
+        
+        # Start with all call contracts
+        calls = option_chain.get_calls()
+        candidates = []
+        rejection_counts = defaultdict(int)
+        
+        if self.verbosity == AnalysisVerbosity.DEBUG:
+            self.logger.debug(f"Filtering {len(calls)} call contracts for short calls (DTE {criteria.min_dte}-{criteria.max_dte})")
+        
+        for contract in calls:
+            reason = self._short_rejection_reason(contract, criteria, quote)
+            if reason:
+                rejection_counts[reason] += 1
+            else:
+                candidates.append(contract)
+        
+        surface = self._get_iv_surface(option_chain, quote) if candidates else None
+        return self._rank_short_candidates(candidates, rejection_counts, len(calls), surface)
+    
+    def _screen_option_chain(self, option_chain: OptionChain,
+                             leaps_criteria: LEAPSCriteria,
+                             short_criteria: ShortCallCriteria,
+                             quote: StockQuote,
+                             screen: Optional[ChainScreen] = None
+                             ) -> Tuple[List[OptionContract], List[OptionContract]]:
+        """
+        Filter LEAPS and short call candidates in a single pass over the calls.
+        
+        Equivalent to _filter_leaps_contracts followed by _filter_short_contracts.
+        When a screen is given, each contract is also screened for the
+        feasibility report in the same pass so the reporter does not walk the
+        chain again.
+        """
+        calls = screen.calls if screen is not None else option_chain.get_calls()
+        leaps_candidates = []
+        short_candidates = []
+        leaps_rejections = defaultdict(int)
+        short_rejections = defaultdict(int)
+        
+        self._log_leaps_filter_start(calls, leaps_criteria)
+        
+        for contract in calls:
+            reason = self._leaps_rejection_reason(contract, leaps_criteria, quote)
+            if reason:
+                leaps_rejections[reason] += 1
+            else:
+                leaps_candidates.append(contract)
+            
+            reason = self._short_rejection_reason(contract, short_criteria, quote)
+            if reason:
+                short_rejections[reason] += 1
+            else:
+                short_candidates.append(contract)
+            
+            if screen is not None:
+                self.analysis_reporter.screen_contract(
+                    contract, leaps_criteria, short_criteria, quote, screen
+                )
+        
+        # The IV surface is only fitted when there are short calls to rank against it
+        surface = self._get_iv_surface(option_chain, quote) if short_candidates else None
+        return (
+            self._rank_leaps_candidates(leaps_candidates, leaps_rejections, len(calls)),
+            self._rank_short_candidates(short_candidates, short_rejections, len(calls), surface)
+        )
+    
+    def _log_leaps_filter_start(self, calls: List[OptionContract], criteria: LEAPSCriteria) -> None:
+        """Log the start of LEAPS filtering."""
         print(f"   🔍 Filtering LEAPS: {len(calls)} calls, DTE range {criteria.min_dte}-{criteria.max_dte}, verbosity={self.verbosity.value if self.verbosity else 'None'}")
         if self.verbosity == AnalysisVerbosity.DEBUG:
             self.logger.debug(f"Filtering {len(calls)} call contracts for LEAPS (DTE {criteria.min_dte}-{criteria.max_dte})")
@@ -777,94 +1361,149 @@ class OptionsAnalyzer:
                 self.logger.debug(f"  Contract {i+1}: Strike={contract.strike}, DTE={contract.dte}, "
                                 f"Delta={contract.delta}, OI={contract.open_interest}, "
                                 f"Bid={contract.bid}, Ask={contract.ask}, Mid={contract.mid}")
+    
+    def _leaps_rejection_reason(self, contract: OptionContract,
+                                criteria: LEAPSCriteria,
+                                quote: StockQuote) -> Optional[str]:
+        """Check one call against the LEAPS criteria, returning the rejection reason or None."""
         
-        for contract in calls:
-            # Check days to expiration
-            if not contract.dte or contract.dte < criteria.min_dte or contract.dte > criteria.max_dte:
-                rejection_counts["dte_out_of_range"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"LEAPS {contract.strike} rejected: DTE {contract.dte} not in range")
-                continue
-            
-            # Check delta requirements
-            if not contract.delta or contract.delta < criteria.min_delta or contract.delta > criteria.max_delta:
-                rejection_counts["delta_out_of_range"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"LEAPS {contract.strike} rejected: delta {contract.delta} not in range")
-                continue
-            
-            # Check liquidity
-            if not self._check_contract_liquidity(contract, criteria.min_open_interest,
-                                                criteria.min_volume, criteria.max_bid_ask_spread_pct):
-                rejection_counts["liquidity_insufficient"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    spread_pct = ((contract.ask - contract.bid) / contract.mid * Decimal('100')) if (contract.bid and contract.ask and contract.mid and contract.mid > 0) else None
-                    spread_str = f"{spread_pct:.2f}" if spread_pct else "N/A"
-                    self.logger.debug(f"LEAPS {contract.strike} rejected: liquidity (OI:{contract.open_interest}, Vol:{contract.volume}, Spread:{spread_str}%)")
-                continue
-            
-            # Check moneyness (should be ITM)
-            # Calculate moneyness if not set
-            if not contract.moneyness and quote.last and contract.strike:
-                if quote.last > contract.strike:
-                    calculated_moneyness = "ITM"
-                elif abs(quote.last - contract.strike) < Decimal('0.50'):
-                    calculated_moneyness = "ATM" 
-                else:
-                    calculated_moneyness = "OTM"
+        # Check days to expiration
+        if not contract.dte or contract.dte < criteria.min_dte or contract.dte > criteria.max_dte:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"LEAPS {contract.strike} rejected: DTE {contract.dte} not in range")
+            return "dte_out_of_range"
+        
+        # Check delta requirements
+        if not contract.delta or contract.delta < criteria.min_delta or contract.delta > criteria.max_delta:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"LEAPS {contract.strike} rejected: delta {contract.delta} not in range")
+            return "delta_out_of_range"
+        
+        # Check liquidity
+        if not self._check_contract_liquidity(contract, criteria.min_open_interest,
+                                            criteria.min_volume, criteria.max_bid_ask_spread_pct):
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                spread_pct = ((contract.ask - contract.bid) / contract.mid * Decimal('100')) if (contract.bid and contract.ask and contract.mid and contract.mid > 0) else None
+                spread_str = f"{spread_pct:.2f}" if spread_pct else "N/A"
+                self.logger.debug(f"LEAPS {contract.strike} rejected: liquidity (OI:{contract.open_interest}, Vol:{contract.volume}, Spread:{spread_str}%)")
+            return "liquidity_insufficient"
+        
+        # Check moneyness (should be ITM)
+        # Calculate moneyness if not set
+        if not contract.moneyness and quote.last and contract.strike:
+            if quote.last > contract.strike:
+                calculated_moneyness = "ITM"
+            elif abs(quote.last - contract.strike) < Decimal('0.50'):
+                calculated_moneyness = "ATM" 
             else:
-                calculated_moneyness = contract.moneyness
-                
-            if calculated_moneyness != criteria.moneyness:
-                rejection_counts["not_itm"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"LEAPS {contract.strike} rejected: not ITM (is {calculated_moneyness}, stock=${quote.last}, strike=${contract.strike})")
-                continue
+                calculated_moneyness = "OTM"
+        else:
+            calculated_moneyness = contract.moneyness
             
-            # Ensure reasonable pricing
-            if not contract.bid or not contract.ask or contract.bid <= 0:
-                rejection_counts["invalid_pricing"] += 1
+        if calculated_moneyness != criteria.moneyness:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"LEAPS {contract.strike} rejected: not ITM (is {calculated_moneyness}, stock=${quote.last}, strike=${contract.strike})")
+            return "not_itm"
+        
+        # Ensure reasonable pricing
+        if not contract.bid or not contract.ask or contract.bid <= 0:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"LEAPS {contract.strike} rejected: invalid pricing (bid:{contract.bid}, ask:{contract.ask})")
+            return "invalid_pricing"
+        
+        # Check premium as percentage of stock price
+        if quote.last and contract.ask:
+            premium_pct = contract.ask / quote.last
+            if premium_pct > criteria.max_premium_pct:
                 if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"LEAPS {contract.strike} rejected: invalid pricing (bid:{contract.bid}, ask:{contract.ask})")
-                continue
-            
-            # Check premium as percentage of stock price
-            if quote.last and contract.ask:
-                premium_pct = contract.ask / quote.last
-                if premium_pct > criteria.max_premium_pct:
-                    rejection_counts["premium_too_expensive"] += 1
+                    self.logger.debug(f"LEAPS {contract.strike} rejected: premium {contract.ask:.2f} is {premium_pct*100:.1f}% of stock price {quote.last:.2f} (max: {criteria.max_premium_pct*100:.0f}%)")
+                return "premium_too_expensive"
+        
+        # Check extrinsic value as percentage of option price (only if enabled)
+        if criteria.max_extrinsic_pct > 0 and quote.last and contract.strike:
+            # Use mid price if available, otherwise calculate it
+            mid_price = contract.mid if contract.mid else (contract.bid + contract.ask) / Decimal('2') if (contract.bid and contract.ask) else None
+            if mid_price and mid_price > 0:
+                intrinsic_value = max(Decimal('0'), quote.last - contract.strike)
+                extrinsic_value = mid_price - intrinsic_value
+                extrinsic_pct = extrinsic_value / mid_price
+                if extrinsic_pct > criteria.max_extrinsic_pct:
                     if self.verbosity == AnalysisVerbosity.DEBUG:
-                        self.logger.debug(f"LEAPS {contract.strike} rejected: premium {contract.ask:.2f} is {premium_pct*100:.1f}% of stock price {quote.last:.2f} (max: {criteria.max_premium_pct*100:.0f}%)")
-                    continue
-            
-            # Check extrinsic value as percentage of option price (only if enabled)
-            if criteria.max_extrinsic_pct > 0 and quote.last and contract.strike:
-                # Use mid price if available, otherwise calculate it
-                mid_price = contract.mid if contract.mid else (contract.bid + contract.ask) / Decimal('2') if (contract.bid and contract.ask) else None
-                if mid_price and mid_price > 0:
-                    intrinsic_value = max(Decimal('0'), quote.last - contract.strike)
-                    extrinsic_value = mid_price - intrinsic_value
-                    extrinsic_pct = extrinsic_value / mid_price
-                    if extrinsic_pct > criteria.max_extrinsic_pct:
-                        rejection_counts["extrinsic_too_high"] += 1
-                        if self.verbosity == AnalysisVerbosity.DEBUG:
-                            self.logger.debug(f"LEAPS {contract.strike} rejected: extrinsic value {extrinsic_value:.2f} is {extrinsic_pct*100:.1f}% of option price {mid_price:.2f} (max: {criteria.max_extrinsic_pct*100:.0f}%)")
-                        continue
-            
-            candidates.append(contract)
+                        self.logger.debug(f"LEAPS {contract.strike} rejected: extrinsic value {extrinsic_value:.2f} is {extrinsic_pct*100:.1f}% of option price {mid_price:.2f} (max: {criteria.max_extrinsic_pct*100:.0f}%)")
+                    return "extrinsic_too_high"
+        
+        if self.verbosity == AnalysisVerbosity.DEBUG:
+            self.logger.debug(f"LEAPS candidate: {contract.strike} delta={contract.delta} DTE={contract.dte}")
+        return None
+    
+    def _short_rejection_reason(self, contract: OptionContract,
+                                criteria: ShortCallCriteria,
+                                quote: StockQuote) -> Optional[str]:
+        """Check one call against the short call criteria, returning the rejection reason or None."""
+        
+        # Check days to expiration
+        if not contract.dte or contract.dte < criteria.min_dte or contract.dte > criteria.max_dte:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"Short call {contract.strike} rejected: DTE {contract.dte} not in range")
+            return "dte_out_of_range"
+        
+        # Check delta requirements
+        if not contract.delta or contract.delta < criteria.min_delta or contract.delta > criteria.max_delta:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"Short call {contract.strike} rejected: delta {contract.delta} not in range")
+            return "delta_out_of_range"
+        
+        # Check liquidity
+        if not self._check_contract_liquidity(contract, criteria.min_open_interest,
+                                            criteria.min_volume, criteria.max_bid_ask_spread_pct):
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                spread_pct = ((contract.ask - contract.bid) / contract.mid * Decimal('100')) if (contract.bid and contract.ask and contract.mid and contract.mid > 0) else None
+                spread_str = f"{spread_pct:.2f}" if spread_pct else "N/A"
+                self.logger.debug(f"Short call {contract.strike} rejected: liquidity (OI:{contract.open_interest}, Vol:{contract.volume}, Spread:{spread_str}%)")
+            return "liquidity_insufficient"
+        
+        # Check moneyness (should be OTM)
+        # Calculate moneyness if not set
+        if not contract.moneyness and quote.last and contract.strike:
+            if quote.last > contract.strike:
+                calculated_moneyness = "ITM"
+            elif abs(quote.last - contract.strike) < Decimal('0.50'):
+                calculated_moneyness = "ATM"
+            else:
+                calculated_moneyness = "OTM"
+        else:
+            calculated_moneyness = contract.moneyness
+            
+        if calculated_moneyness != criteria.moneyness:
             if self.verbosity == AnalysisVerbosity.DEBUG:
-                self.logger.debug(f"LEAPS candidate: {contract.strike} delta={contract.delta} DTE={contract.dte}")
+                self.logger.debug(f"Short call {contract.strike} rejected: not OTM (is {calculated_moneyness}, stock=${quote.last}, strike=${contract.strike})")
+            return "not_otm"
+        
+        # Ensure reasonable pricing
+        if not contract.bid or not contract.ask or contract.bid <= 0:
+            if self.verbosity == AnalysisVerbosity.DEBUG:
+                self.logger.debug(f"Short call {contract.strike} rejected: invalid pricing (bid:{contract.bid}, ask:{contract.ask})")
+            return "invalid_pricing"
+        
+        if self.verbosity == AnalysisVerbosity.DEBUG:
+            self.logger.debug(f"Short call candidate: {contract.strike} delta={contract.delta} DTE={contract.dte} premium={contract.bid}")
+        return None
+    
+    def _rank_leaps_candidates(self, candidates: List[OptionContract],
+                               rejection_counts: Dict[str, int],
+                               total_calls: int) -> List[OptionContract]:
+        """Sort LEAPS candidates, log the filtering summary and return the top 10."""
         
         # Sort by delta (prefer higher delta for LEAPS)
         candidates.sort(key=lambda x: x.delta or Decimal('0'), reverse=True)
         
         if self.verbosity in [AnalysisVerbosity.VERBOSE, AnalysisVerbosity.DEBUG] and rejection_counts:
             rejection_summary = ", ".join(f"{reason}: {count}" for reason, count in rejection_counts.items())
-            self.logger.info(f"LEAPS filtering: {len(candidates)} candidates from {len(calls)} calls. Rejections: {rejection_summary}")
+            self.logger.info(f"LEAPS filtering: {len(candidates)} candidates from {total_calls} calls. Rejections: {rejection_summary}")
         
         # Always print summary for debugging
         print(f"   📊 LEAPS filtering summary:")
-        print(f"      Total calls evaluated: {len(calls)}")
+        print(f"      Total calls evaluated: {total_calls}")
         print(f"      Candidates found: {len(candidates)}")
         if rejection_counts:
             print(f"      Rejections by reason:")
@@ -874,79 +1513,22 @@ class OptionsAnalyzer:
         print(f"   ✅ LEAPS filter found {len(candidates)} candidates (returning top 10)")
         return candidates[:10]  # Return top 10 candidates
     
-    def _filter_short_contracts(self, option_chain: OptionChain,
-                               criteria: ShortCallCriteria,
-                               quote: StockQuote) -> List[OptionContract]:
-        """Filter option chain for suitable short call contracts with detailed logging."""
-        
-        # Start with all call contracts
-        calls = option_chain.get_calls()
-        candidates = []
-        rejection_counts = defaultdict(int)
-        
-        if self.verbosity == AnalysisVerbosity.DEBUG:
-            self.logger.debug(f"Filtering {len(calls)} call contracts for short calls (DTE {criteria.min_dte}-{criteria.max_dte})")
-        
-        for contract in calls:
-            # Check days to expiration
-            if not contract.dte or contract.dte < criteria.min_dte or contract.dte > criteria.max_dte:
-                rejection_counts["dte_out_of_range"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"Short call {contract.strike} rejected: DTE {contract.dte} not in range")
-                continue
-            
-            # Check delta requirements
-            if not contract.delta or contract.delta < criteria.min_delta or contract.delta > criteria.max_delta:
-                rejection_counts["delta_out_of_range"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"Short call {contract.strike} rejected: delta {contract.delta} not in range")
-                continue
-            
-            # Check liquidity
-            if not self._check_contract_liquidity(contract, criteria.min_open_interest,
-                                                criteria.min_volume, criteria.max_bid_ask_spread_pct):
-                rejection_counts["liquidity_insufficient"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    spread_pct = ((contract.ask - contract.bid) / contract.mid * Decimal('100')) if (contract.bid and contract.ask and contract.mid and contract.mid > 0) else None
-                    spread_str = f"{spread_pct:.2f}" if spread_pct else "N/A"
-                    self.logger.debug(f"Short call {contract.strike} rejected: liquidity (OI:{contract.open_interest}, Vol:{contract.volume}, Spread:{spread_str}%)")
-                continue
-            
-            # Check moneyness (should be OTM)
-            # Calculate moneyness if not set
-            if not contract.moneyness and quote.last and contract.strike:
-                if quote.last > contract.strike:
-                    calculated_moneyness = "ITM"
-                elif abs(quote.last - contract.strike) < Decimal('0.50'):
-                    calculated_moneyness = "ATM"
-                else:
-                    calculated_moneyness = "OTM"
-            else:
-                calculated_moneyness = contract.moneyness
-                
-            if calculated_moneyness != criteria.moneyness:
-                rejection_counts["not_otm"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"Short call {contract.strike} rejected: not OTM (is {calculated_moneyness}, stock=${quote.last}, strike=${contract.strike})")
-                continue
-            
-            # Ensure reasonable pricing
-            if not contract.bid or not contract.ask or contract.bid <= 0:
-                rejection_counts["invalid_pricing"] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"Short call {contract.strike} rejected: invalid pricing (bid:{contract.bid}, ask:{contract.ask})")
-                continue
-            
-            candidates.append(contract)
-            if self.verbosity == AnalysisVerbosity.DEBUG:
-                self.logger.debug(f"Short call candidate: {contract.strike} delta={contract.delta} DTE={contract.dte} premium={contract.bid}")
+    def _rank_short_candidates(self, candidates: List[OptionContract],
+                               rejection_counts: Dict[str, int],
+                               total_calls: int,
+                               surface: Optional[IVSurface] = None) -> List[OptionContract]:
+        """
+        Sort short call candidates, log the filtering summary and return the top 20.
         
+        Candidates rank by premium collected, adjusted by the quote's richness
+        to the IV surface when one is given (short_call_rank_premium).
+        """
         # Sort by premium collected (higher is better for shorts)
-        candidates.sort(key=lambda x: x.bid or Decimal('0'), reverse=True)
+        candidates.sort(key=lambda x: short_call_rank_premium(x, surface), reverse=True)
         
         if self.verbosity in [AnalysisVerbosity.VERBOSE, AnalysisVerbosity.DEBUG] and rejection_counts:
             rejection_summary = ", ".join(f"{reason}: {count}" for reason, count in rejection_counts.items())
-            self.logger.info(f"Short call filtering: {len(candidates)} candidates from {len(calls)} calls. Rejections: {rejection_summary}")
+            self.logger.info(f"Short call filtering: {len(candidates)} candidates from {total_calls} calls. Rejections: {rejection_summary}")
         
         # Always print summary for debugging
         if rejection_counts:
@@ -1042,12 +1624,56 @@ class OptionsAnalyzer:
         
         return True
     
+    def _combination_probabilities(self, leaps_contracts: Sequence[OptionContract],
+                                   short_contracts: Sequence[OptionContract],
+                                   quote: Optional[StockQuote],
+                                   surface: Optional[IVSurface] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Probability of profit and of touching the short strike for every LEAPS x short pair.
+        
+        See combination_probabilities.
+        
+        Returns:
+            (probability_of_profit, probability_of_touch) matrices of shape
+            (LEAPS, shorts) as fractions; NaN where they cannot be computed
+        """
+        def values(contracts, name):
+            return np.array([float(getattr(c, name)) if getattr(c, name) is not None else np.nan
+                             for c in contracts])
+        
+        def leaps(name):
+            return values(leaps_contracts, name)[:, None]
+        
+        def short(name):
+            return values(short_contracts, name)[None, :]
+        
+        return combination_probabilities(
+            float(quote.last) if quote and quote.last else np.nan,
+            leaps('strike'), leaps('ask'), leaps('dte'), leaps('iv'),
+            short('strike'), short('bid'), short('dte'), short('iv'),
+            surface, float(self.risk_free_rate)
+        )
+    
     def _analyze_pmcc_combination(self, leaps: OptionContract,
                                  short: OptionContract,
-                                 quote: StockQuote) -> Optional[PMCCOpportunity]:
-        """Analyze a specific PMCC combination."""
+                                 quote: StockQuote,
+                                 probabilities: Optional[Tuple[float, float]] = None) -> Optional[PMCCOpportunity]:
+        """
+        Analyze a specific PMCC combination.
+        
+        Args:
+            probabilities: The pair's (probability of profit, probability of touch)
+                from _combination_probabilities, computed here when not given
+        """
         
         try:
+            if probabilities is None:
+                profit, touch = self._combination_probabilities(
+                    [leaps], [short], quote, self._latest_iv_surface(quote)
+                )
+                probabilities = (profit[0, 0], touch[0, 0])
+            probability_of_profit, probability_of_touch = (float(p) for p in probabilities)
+            
             # Calculate position metrics
             net_debit = leaps.ask - short.bid
             strike_width = short.strike - leaps.strike
@@ -1063,7 +1689,7 @@ class OptionsAnalyzer:
             
             # Calculate probability score
             probability_score = self._calculate_probability_score(
-                leaps, short, quote, breakeven
+                leaps, short, quote, breakeven, probability_of_profit
             )
             
             # Calculate liquidity score
@@ -1087,7 +1713,9 @@ class OptionsAnalyzer:
                 probability_score=probability_score,
                 liquidity_score=liquidity_score,
                 total_score=total_score,
-                analyzed_at=datetime.now()
+                analyzed_at=datetime.now(),
+                probability_of_profit=_probability_decimal(probability_of_profit),
+                probability_of_touch=_probability_decimal(probability_of_touch)
             )
             
         except Exception as e:
@@ -1097,8 +1725,17 @@ class OptionsAnalyzer:
     def _calculate_probability_score(self, leaps: OptionContract,
                                    short: OptionContract,
                                    quote: StockQuote,
-                                   breakeven: Decimal) -> Decimal:
-        """Calculate probability score based on various factors."""
+                                   breakeven: Decimal,
+                                   probability_of_profit: Optional[float] = None) -> Decimal:
+        """
+        Calculate probability score (0-100).
+        
+        The lognormal probability of profit (combination_probabilities), in
+        percent to two decimals, when one is known; contracts without IV fall
+        back to a heuristic of breakeven distance, short DTE and delta ratio.
+        """
+        if probability_of_profit is not None and np.isfinite(probability_of_profit):
+            return Decimal(str(round(probability_of_profit * 100, 2)))
         
         score = Decimal('50')  # Base score
         
@@ -1175,24 +1812,25 @@ class OptionsAnalyzer:
                               probability_score: Decimal,
                               liquidity_score: Decimal) -> Decimal:
         """Calculate total weighted score for the opportunity."""
+        weights = self.scoring_weights
         
-        # ROI component (25% weight) - normalize to 0-100 scale
+        # ROI component - normalize to 0-100 scale
         roi_score = min(100, max(0, roi_potential))  # Cap at 100%
         
-        # Risk-reward component (25% weight) - normalize to 0-100 scale
+        # Risk-reward component - normalize to 0-100 scale
         rr_score = min(100, risk_reward_ratio * 50)  # 2:1 ratio = 100 points
         
-        # Probability component (30% weight) - already 0-100
+        # Probability component - already 0-100
         prob_score = probability_score
         
-        # Liquidity component (20% weight) - already 0-100
+        # Liquidity component - already 0-100
         liq_score = liquidity_score
         
         total = (
-            roi_score * Decimal('0.25') +
-            rr_score * Decimal('0.25') + 
-            prob_score * Decimal('0.30') +
-            liq_score * Decimal('0.20')
+            roi_score * weights.roi +
+            rr_score * weights.risk_reward + 
+            prob_score * weights.probability +
+            liq_score * weights.liquidity
         )
         
         return max(Decimal('0'), min(Decimal('100'), total))
@@ -1269,6 +1907,10 @@ class OptionsAnalyzer:
         # Calculate risk metrics
         try:
             analysis.risk_metrics = analysis.calculate_risk_metrics()
+            probability_of_profit, _ = self._combination_probabilities(
+                [leaps], [short], quote, self._latest_iv_surface(quote)
+            )
+            analysis.risk_metrics.probability_of_profit = _probability_decimal(float(probability_of_profit[0, 0]))
             analysis.liquidity_score = analysis.calculate_liquidity_score()
         except Exception as e:
             self.logger.error(f"Error calculating analysis metrics: {e}")
@@ -0,0 +1,131 @@
+"""
+Persistent negative cache for symbols without usable options.
+
+Remembers symbols that returned no option chain, or have no expirations far
+enough out for LEAPS, so daily scans skip their chain fetch until the
+configured re-check interval has passed.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Reasons a symbol is excluded from options analysis
+NO_OPTIONS = "no_options"
+NO_LEAPS = "no_leaps"
+
+
+@dataclass
+class OptionsAvailabilityEntry:
+    """Why a symbol was excluded and when that was last checked."""
+    reason: str
+    checked: date
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convert entry to a JSON-serializable dictionary."""
+        return {'reason': self.reason, 'checked': self.checked.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> 'OptionsAvailabilityEntry':
+        """Create entry from its dictionary form."""
+        return cls(reason=data['reason'], checked=date.fromisoformat(data['checked']))
+
+
+class OptionsAvailabilityCache:
+    """
+    File-backed map of symbol -> (reason, checked date).
+
+    Entries are fresh until ``recheck_days[reason]`` days have passed since the
+    last check; stale entries are kept so callers can run a cheap re-check
+    before deciding whether to fetch the full chain again.
+    """
+
+    def __init__(self, cache_file: str,
+                 no_options_recheck_days: int = 7,
+                 no_leaps_recheck_days: int = 3):
+        """
+        Initialize cache and load existing entries.
+
+        Args:
+            cache_file: Path of the JSON file backing the cache
+            no_options_recheck_days: Days before re-checking symbols without options
+            no_leaps_recheck_days: Days before re-checking symbols without LEAPS
+        """
+        self.cache_file = cache_file
+        self.recheck_days = {
+            NO_OPTIONS: no_options_recheck_days,
+            NO_LEAPS: no_leaps_recheck_days
+        }
+        self._entries: Dict[str, OptionsAvailabilityEntry] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> None:
+        """Load entries from disk, starting empty if the file is missing or corrupt."""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self._entries = {
+                symbol: OptionsAvailabilityEntry.from_dict(entry)
+                for symbol, entry in data.get('symbols', {}).items()
+            }
+            logger.debug(f"Loaded {len(self._entries)} options availability entries from {self.cache_file}")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable options availability cache {self.cache_file}: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Write entries to disk if they changed since the last save."""
+        if not self._dirty:
+            return
+
+        try:
+            Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    'symbols': {symbol: entry.to_dict() for symbol, entry in self._entries.items()}
+                }, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save options availability cache {self.cache_file}: {e}")
+
+    def get(self, symbol: str) -> Optional[OptionsAvailabilityEntry]:
+        """Get the cached entry for a symbol, fresh or stale."""
+        return self._entries.get(symbol.upper())
+
+    def is_fresh(self, entry: OptionsAvailabilityEntry, today: Optional[date] = None) -> bool:
+        """Check whether an entry is still inside its re-check interval."""
+        today = today or date.today()
+        return (today - entry.checked).days < self.recheck_days.get(entry.reason, 0)
+
+    def excluded_reason(self, symbol: str, today: Optional[date] = None) -> Optional[str]:
+        """Get the exclusion reason if the symbol has a fresh negative entry."""
+        entry = self.get(symbol)
+        if entry and self.is_fresh(entry, today):
+            return entry.reason
+        return None
+
+    def record(self, symbol: str, reason: str, checked: Optional[date] = None) -> None:
+        """Record that a symbol has no usable options for the given reason."""
+        self._entries[symbol.upper()] = OptionsAvailabilityEntry(reason, checked or date.today())
+        self._dirty = True
+
+    def discard(self, symbol: str) -> None:
+        """Forget a symbol, e.g. once it has LEAPS again."""
+        if self._entries.pop(symbol.upper(), None) is not None:
+            self._dirty = True
@@ -96,6 +96,27 @@ class PMCCFeasibilityReport:
     recommendations: List[str] = field(default_factory=list)
 
 
+@dataclass
+class ChainScreen:
+    """
+    Per-contract and per-pair screening results for one option chain.
+    
+    Filled in a single pass over the chain's calls via
+    ``PMCCAnalysisReporter.screen_contract`` so the feasibility report and the
+    options analyzer's opportunity search can share it instead of each
+    re-filtering the chain and re-testing every LEAPS/short pair.
+    """
+    calls: List[OptionContract]
+    leaps_range: List[OptionContract] = field(default_factory=list)
+    short_range: List[OptionContract] = field(default_factory=list)
+    leaps_candidates: List[OptionContract] = field(default_factory=list)
+    short_candidates: List[OptionContract] = field(default_factory=list)
+    leaps_failure_reasons: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    short_failure_reasons: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    # (id(leaps), id(short)) -> failure reason, None when the pair is valid
+    combination_results: Dict[Tuple[int, int], Optional[str]] = field(default_factory=dict)
+
+
 class PMCCAnalysisReporter:
     """Comprehensive PMCC analysis reporter with quantitative insights."""
     
@@ -115,7 +136,8 @@ class PMCCAnalysisReporter:
         option_chain: OptionChain,
         quote: StockQuote,
         leaps_criteria: Any,
-        short_criteria: Any
+        short_criteria: Any,
+        screen: Optional[ChainScreen] = None
     ) -> PMCCFeasibilityReport:
         """
         Perform comprehensive analysis of option chain for PMCC feasibility.
@@ -126,6 +148,7 @@ class PMCCAnalysisReporter:
             quote: Current stock quote
             leaps_criteria: LEAPS selection criteria
             short_criteria: Short call selection criteria
+            screen: Chain already screened with screen_contract, screened here if None
             
         Returns:
             Detailed feasibility report
@@ -136,9 +159,14 @@ class PMCCAnalysisReporter:
             current_price=quote.last or quote.mid
         )
         
+        if screen is None:
+            screen = ChainScreen(calls=option_chain.get_calls())
+            for contract in screen.calls:
+                self.screen_contract(contract, leaps_criteria, short_criteria, quote, screen)
+        
         # Basic option chain metrics
         all_contracts = option_chain.contracts
-        calls = option_chain.get_calls()
+        calls = screen.calls
         puts = option_chain.get_puts()
         
         report.total_contracts = len(all_contracts)
@@ -153,19 +181,15 @@ class PMCCAnalysisReporter:
                            f"{report.unique_strikes} strikes")
         
         # Analyze LEAPS options
-        leaps_candidates, leaps_contracts_in_range = self._analyze_leaps_options(
-            calls, leaps_criteria, quote, report
-        )
+        leaps_candidates = self._analyze_leaps_options(screen, leaps_criteria, report)
         
         # Analyze short call options
-        short_candidates, short_contracts_in_range = self._analyze_short_call_options(
-            calls, short_criteria, quote, report
-        )
+        short_candidates = self._analyze_short_call_options(screen, short_criteria, report)
         
         # Analyze PMCC combinations if both LEAPS and short calls exist
         if leaps_candidates and short_candidates:
             self._analyze_pmcc_combinations(
-                leaps_candidates, short_candidates, quote, report
+                leaps_candidates, short_candidates, quote, report, screen
             )
         
         # Assess market conditions and provide recommendations
@@ -177,27 +201,74 @@ class PMCCAnalysisReporter:
         
         return report
     
+    def screen_contract(
+        self,
+        contract: OptionContract,
+        leaps_criteria: Any,
+        short_criteria: Any,
+        quote: StockQuote,
+        screen: ChainScreen
+    ) -> None:
+        """Record one call contract's DTE range membership and LEAPS/short call verdicts."""
+        dte = contract.dte
+        
+        if dte and leaps_criteria.min_dte <= dte <= leaps_criteria.max_dte:
+            screen.leaps_range.append(contract)
+            failure_reason = self._check_leaps_contract(contract, leaps_criteria, quote)
+            if failure_reason:
+                screen.leaps_failure_reasons[failure_reason] += 1
+                if self.verbosity == AnalysisVerbosity.DEBUG:
+                    self.logger.debug(f"{quote.symbol} LEAPS {contract.strike} "
+                                    f"{contract.expiration}: {failure_reason}")
+            else:
+                screen.leaps_candidates.append(contract)
+                if self.verbosity == AnalysisVerbosity.DEBUG:
+                    self.logger.debug(f"{quote.symbol} LEAPS candidate: "
+                                    f"{contract.strike} delta={contract.delta}")
+        
+        if dte and short_criteria.min_dte <= dte <= short_criteria.max_dte:
+            screen.short_range.append(contract)
+            failure_reason = self._check_short_call_contract(contract, short_criteria, quote)
+            if failure_reason:
+                screen.short_failure_reasons[failure_reason] += 1
+                if self.verbosity == AnalysisVerbosity.DEBUG:
+                    self.logger.debug(f"{quote.symbol} short call {contract.strike} "
+                                    f"{contract.expiration}: {failure_reason}")
+            else:
+                screen.short_candidates.append(contract)
+                if self.verbosity == AnalysisVerbosity.DEBUG:
+                    self.logger.debug(f"{quote.symbol} short call candidate: "
+                                    f"{contract.strike} delta={contract.delta}")
+    
+    def check_combination(
+        self,
+        leaps: OptionContract,
+        short: OptionContract,
+        quote: StockQuote,
+        screen: ChainScreen
+    ) -> Optional[str]:
+        """Check a LEAPS/short pair once per screen, returning its failure reason or None."""
+        key = (id(leaps), id(short))
+        if key not in screen.combination_results:
+            screen.combination_results[key] = self._check_pmcc_combination(leaps, short, quote)
+        return screen.combination_results[key]
+    
     def _analyze_leaps_options(
         self, 
-        calls: List[OptionContract], 
+        screen: ChainScreen,
         criteria: Any, 
-        quote: StockQuote,
         report: PMCCFeasibilityReport
-    ) -> Tuple[List[OptionContract], List[OptionContract]]:
-        """Analyze LEAPS options and populate report metrics."""
+    ) -> List[OptionContract]:
+        """Populate LEAPS report metrics from the screened chain."""
         
-        # Find contracts in LEAPS DTE range
-        leaps_range_contracts = [
-            c for c in calls 
-            if c.dte and criteria.min_dte <= c.dte <= criteria.max_dte
-        ]
+        leaps_range_contracts = screen.leaps_range
         
         if not leaps_range_contracts:
-            report.leaps_failure_reasons["no_contracts_in_dte_range"] = len(calls)
+            report.leaps_failure_reasons["no_contracts_in_dte_range"] = len(screen.calls)
             if self.verbosity != AnalysisVerbosity.QUIET:
                 self.logger.info(f"{report.symbol} has no LEAPS contracts "
                                f"({criteria.min_dte}-{criteria.max_dte} DTE)")
-            return [], []
+            return []
         
         # Calculate LEAPS metrics
         report.leaps_metrics = self._calculate_option_metrics(leaps_range_contracts)
@@ -208,49 +279,27 @@ class PMCCAnalysisReporter:
                            f"in DTE range, delta range {report.leaps_metrics.delta_range}, "
                            f"avg spread {report.leaps_liquidity.avg_spread_pct}%")
         
-        # Filter LEAPS candidates and track failure reasons
-        candidates = []
-        failure_counts = defaultdict(int)
-        
-        for contract in leaps_range_contracts:
-            failure_reason = self._check_leaps_contract(contract, criteria, quote)
-            if failure_reason:
-                failure_counts[failure_reason] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"{report.symbol} LEAPS {contract.strike} "
-                                    f"{contract.expiration}: {failure_reason}")
-            else:
-                candidates.append(contract)
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"{report.symbol} LEAPS candidate: "
-                                    f"{contract.strike} delta={contract.delta}")
+        report.leaps_candidates_found = len(screen.leaps_candidates)
+        report.leaps_failure_reasons = dict(screen.leaps_failure_reasons)
         
-        report.leaps_candidates_found = len(candidates)
-        report.leaps_failure_reasons = dict(failure_counts)
-        
-        return candidates, leaps_range_contracts
+        return screen.leaps_candidates
     
     def _analyze_short_call_options(
         self, 
-        calls: List[OptionContract], 
+        screen: ChainScreen,
         criteria: Any, 
-        quote: StockQuote,
         report: PMCCFeasibilityReport
-    ) -> Tuple[List[OptionContract], List[OptionContract]]:
-        """Analyze short call options and populate report metrics."""
+    ) -> List[OptionContract]:
+        """Populate short call report metrics from the screened chain."""
         
-        # Find contracts in short call DTE range
-        short_range_contracts = [
-            c for c in calls 
-            if c.dte and criteria.min_dte <= c.dte <= criteria.max_dte
-        ]
+        short_range_contracts = screen.short_range
         
         if not short_range_contracts:
-            report.short_failure_reasons["no_contracts_in_dte_range"] = len(calls)
+            report.short_failure_reasons["no_contracts_in_dte_range"] = len(screen.calls)
             if self.verbosity != AnalysisVerbosity.QUIET:
                 self.logger.info(f"{report.symbol} has no short call contracts "
                                f"({criteria.min_dte}-{criteria.max_dte} DTE)")
-            return [], []
+            return []
         
         # Calculate short call metrics
         report.short_metrics = self._calculate_option_metrics(short_range_contracts)
@@ -261,34 +310,18 @@ class PMCCAnalysisReporter:
                            f"in DTE range, delta range {report.short_metrics.delta_range}, "
                            f"avg spread {report.short_liquidity.avg_spread_pct}%")
         
-        # Filter short call candidates and track failure reasons
-        candidates = []
-        failure_counts = defaultdict(int)
-        
-        for contract in short_range_contracts:
-            failure_reason = self._check_short_call_contract(contract, criteria, quote)
-            if failure_reason:
-                failure_counts[failure_reason] += 1
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"{report.symbol} short call {contract.strike} "
-                                    f"{contract.expiration}: {failure_reason}")
-            else:
-                candidates.append(contract)
-                if self.verbosity == AnalysisVerbosity.DEBUG:
-                    self.logger.debug(f"{report.symbol} short call candidate: "
-                                    f"{contract.strike} delta={contract.delta}")
-        
-        report.short_candidates_found = len(candidates)
-        report.short_failure_reasons = dict(failure_counts)
+        report.short_candidates_found = len(screen.short_candidates)
+        report.short_failure_reasons = dict(screen.short_failure_reasons)
         
-        return candidates, short_range_contracts
+        return screen.short_candidates
     
     def _analyze_pmcc_combinations(
         self,
         leaps_candidates: List[OptionContract],
         short_candidates: List[OptionContract],
         quote: StockQuote,
-        report: PMCCFeasibilityReport
+        report: PMCCFeasibilityReport,
+        screen: ChainScreen
     ) -> None:
         """Analyze PMCC combinations and track failure reasons."""
         
@@ -300,7 +333,7 @@ class PMCCAnalysisReporter:
         
         for leaps in leaps_candidates:
             for short in short_candidates:
-                failure_reason = self._check_pmcc_combination(leaps, short, quote)
+                failure_reason = self.check_combination(leaps, short, quote, screen)
                 if failure_reason:
                     failure_counts[failure_reason] += 1
                     if self.verbosity == AnalysisVerbosity.DEBUG:
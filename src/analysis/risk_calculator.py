@@ -8,11 +8,16 @@ probability of profit, early assignment risk, and position sizing recommendation
 import logging
 import math
 from typing import List, Optional, Dict, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import datetime, timedelta
 
+import numpy as np
+
 try:
+    from src.analysis.black_scholes import call_price, spot_for_call_value
+    from src.analysis.iv_surface import IVSurfaceCache
+    from src.analysis.monte_carlo import MonteCarloSimulator, MonteCarloResults
     from src.models.api_models import OptionContract, StockQuote, OptionSide
     from src.models.pmcc_models import PMCCAnalysis, RiskMetrics
 except ImportError:
@@ -20,6 +25,9 @@ except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from analysis.black_scholes import call_price, spot_for_call_value
+    from analysis.iv_surface import IVSurfaceCache
+    from analysis.monte_carlo import MonteCarloSimulator, MonteCarloResults
     from models.api_models import OptionContract, StockQuote, OptionSide
     from models.pmcc_models import PMCCAnalysis, RiskMetrics
 
@@ -86,6 +94,8 @@ class ComprehensiveRisk:
     var_95: Optional[Decimal] = None  # 95% Value at Risk
     expected_shortfall: Optional[Decimal] = None  # Expected tail loss
     sharpe_ratio: Optional[Decimal] = None  # Risk-adjusted return
+    expected_pnl: Optional[Decimal] = None  # Simulated mean P&L at short expiration
+    probability_of_profit: Optional[Decimal] = None  # Simulated, as a fraction
     
     # Time decay analysis
     theta_decay_rate: Optional[Decimal] = None  # Daily theta decay
@@ -94,12 +104,87 @@ class ComprehensiveRisk:
     analyzed_at: datetime = datetime.now()
 
 
+@dataclass
+class BatchRiskMetrics:
+    """
+    Comprehensive risk metrics for many PMCC positions as NumPy arrays.
+    
+    Row i holds the metrics of analyses[i]; undefined values are NaN.
+    ComprehensiveRisk objects are built on demand with
+    RiskCalculator.materialize_comprehensive_risk.
+    """
+    analyses: List[PMCCAnalysis]
+    scenario_names: List[str]
+    scenario_moves: np.ndarray  # (scenarios,) percentage moves
+    has_scenarios: np.ndarray  # (n,) bool, False without an underlying price
+    scenario_prices: np.ndarray  # (n, scenarios)
+    scenario_pnl: np.ndarray  # (n, scenarios)
+    scenario_roi: np.ndarray  # (n, scenarios)
+    var_95: np.ndarray
+    expected_shortfall: np.ndarray
+    sharpe_ratio: np.ndarray
+    expected_pnl: np.ndarray
+    probability_of_profit: np.ndarray
+    theta_decay_rate: np.ndarray
+    vega_risk: np.ndarray
+    early_assignment_probability: np.ndarray
+    max_position_size: np.ndarray
+    recommended_size: np.ndarray
+    capital_required: np.ndarray
+    capital_at_risk: np.ndarray
+    portfolio_percentage: np.ndarray
+    _rows: Dict[int, int] = field(default_factory=dict, repr=False)
+    
+    def __post_init__(self):
+        self._rows = {id(analysis): i for i, analysis in enumerate(self.analyses)}
+    
+    def __len__(self) -> int:
+        return len(self.analyses)
+    
+    def index_of(self, analysis: PMCCAnalysis) -> Optional[int]:
+        """Get the row of an analysis passed to the batch, or None."""
+        return self._rows.get(id(analysis))
+
+
+def _to_array(values: List[Optional[Any]]) -> np.ndarray:
+    """Convert optional Decimals to a float array with NaN for None."""
+    return np.array([float(v) if v is not None else np.nan for v in values], dtype=float)
+
+
+def _to_decimal(value: float) -> Optional[Decimal]:
+    """Convert a float array element back to Decimal, None for NaN."""
+    return None if math.isnan(value) else Decimal(str(float(value)))
+
+
 class RiskCalculator:
     """Calculates comprehensive risk metrics for PMCC positions."""
     
-    def __init__(self):
-        """Initialize risk calculator."""
+    # Price scenarios for scenario analysis (percentage moves)
+    PRICE_SCENARIOS = {
+        "crash_20": -20,
+        "down_10": -10,
+        "down_5": -5,
+        "flat": 0,
+        "up_5": 5,
+        "up_10": 10,
+        "up_15": 15,
+        "up_20": 20,
+        "moon_30": 30
+    }
+    
+    def __init__(self, monte_carlo: Optional[MonteCarloSimulator] = None):
+        """
+        Initialize risk calculator.
+        
+        Args:
+            monte_carlo: Engine for VaR, expected shortfall and Sharpe ratio
+                (default MonteCarloSimulator()). Set the attribute to None to
+                fall back to the price scenarios.
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.monte_carlo = monte_carlo if monte_carlo is not None else MonteCarloSimulator()
+        # IV surfaces shared by the scanner; the LEAPS is repriced off them when set
+        self.iv_surface_cache: Optional[IVSurfaceCache] = None
     
     def calculate_comprehensive_risk(self, analysis: PMCCAnalysis,
                                    account_size: Optional[Decimal] = None,
@@ -135,12 +220,22 @@ class RiskCalculator:
         )
         
         # Perform scenario analysis
-        scenario_analysis = self._perform_scenario_analysis(analysis)
-        
-        # Calculate advanced risk metrics
-        var_95 = self._calculate_var_95(scenario_analysis)
-        expected_shortfall = self._calculate_expected_shortfall(scenario_analysis)
-        sharpe_ratio = self._calculate_sharpe_ratio(analysis, risk_free_rate)
+        scenario_analysis = self._perform_scenario_analysis(analysis, risk_free_rate)
+        
+        # Calculate advanced risk metrics, simulated when the contracts have IV
+        simulation = self._simulate([analysis], risk_free_rate)
+        if simulation is not None and simulation.valid[0]:
+            var_95 = _to_decimal(simulation.var_95[0])
+            expected_shortfall = _to_decimal(simulation.expected_shortfall[0])
+            sharpe_ratio = _to_decimal(simulation.sharpe_ratio[0])
+            expected_pnl = _to_decimal(simulation.expected_pnl[0])
+            probability_of_profit = _to_decimal(simulation.probability_of_profit[0])
+        else:
+            var_95 = self._calculate_var_95(scenario_analysis)
+            expected_shortfall = self._calculate_expected_shortfall(scenario_analysis)
+            sharpe_ratio = self._calculate_sharpe_ratio(analysis, risk_free_rate)
+            expected_pnl = None
+            probability_of_profit = None
         
         # Calculate Greeks-based risks
         theta_decay_rate = self._calculate_theta_decay_rate(analysis)
@@ -154,10 +249,252 @@ class RiskCalculator:
             var_95=var_95,
             expected_shortfall=expected_shortfall,
             sharpe_ratio=sharpe_ratio,
+            expected_pnl=expected_pnl,
+            probability_of_profit=probability_of_profit,
             theta_decay_rate=theta_decay_rate,
             vega_risk=vega_risk
         )
     
+    def _simulate(self, analyses: List[PMCCAnalysis],
+                  risk_free_rate: Decimal) -> Optional[MonteCarloResults]:
+        """Run the Monte Carlo engine, None when it is disabled."""
+        if self.monte_carlo is None or not analyses:
+            return None
+        return self.monte_carlo.simulate_analyses(
+            analyses, float(risk_free_rate), long_volatility=self._leaps_repricing_ivs(analyses)
+        )
+    
+    def _leaps_repricing_iv(self, analysis: PMCCAnalysis) -> Optional[float]:
+        """
+        IV of the LEAPS over the life it has left when the short call expires.
+        
+        Read from the symbol's fitted IV surface at the LEAPS strike and the
+        remaining DTE, so the term structure is respected; the LEAPS's own IV
+        without a surface. None when neither is available.
+        """
+        long_call = analysis.long_call
+        remaining_dte = (long_call.dte or 0) - (analysis.short_call.dte or 0)
+        surface = None
+        if self.iv_surface_cache is not None and analysis.underlying is not None:
+            surface = self.iv_surface_cache.latest(analysis.underlying.symbol)
+        if surface is not None and remaining_dte > 0 and long_call.strike and long_call.strike > 0:
+            return float(surface.iv(float(long_call.strike), remaining_dte))
+        if long_call.iv and long_call.iv > 0:
+            return float(long_call.iv)
+        return None
+    
+    def _leaps_repricing_ivs(self, analyses: List[PMCCAnalysis]) -> np.ndarray:
+        """_leaps_repricing_iv of each analysis, NaN where unavailable."""
+        ivs = [self._leaps_repricing_iv(a) for a in analyses]
+        return np.array([np.nan if iv is None else iv for iv in ivs], dtype=float)
+    
+    def calculate_comprehensive_risk_batch(self, analyses: List[PMCCAnalysis],
+                                           account_size: Optional[Decimal] = None,
+                                           risk_free_rate: Decimal = Decimal('0.05')) -> BatchRiskMetrics:
+        """
+        Calculate comprehensive risk for many positions at once.
+        
+        Strikes, debits, prices and Greeks of all analyses are gathered into
+        arrays and every metric of calculate_comprehensive_risk is computed
+        with NumPy in one shot. No per-position objects are created; use
+        materialize_comprehensive_risk for the positions that need them.
+        
+        Args:
+            analyses: PMCC analysis objects
+            account_size: Total account size for position sizing
+            risk_free_rate: Risk-free rate for calculations
+            
+        Returns:
+            BatchRiskMetrics with one row per analysis
+        """
+        for analysis in analyses:
+            if not analysis.risk_metrics:
+                analysis.risk_metrics = analysis.calculate_risk_metrics()
+        
+        long_strike = _to_array([a.long_call.strike for a in analyses])
+        short_strike = _to_array([a.short_call.strike for a in analyses])
+        net_debit = _to_array([a.net_debit for a in analyses])
+        price = _to_array([a.underlying.last for a in analyses])
+        max_profit = _to_array([a.risk_metrics.max_profit for a in analyses])
+        max_loss = _to_array([a.risk_metrics.max_loss for a in analyses])
+        short_dte = np.array([a.short_call.dte or 0 for a in analyses], dtype=float)
+        long_dte = np.array([a.long_call.dte or 0 for a in analyses], dtype=float)
+        long_iv = self._leaps_repricing_ivs(analyses)
+        short_bid = _to_array([a.short_call.bid for a in analyses])
+        short_ask = _to_array([a.short_call.ask for a in analyses])
+        short_mid = _to_array([a.short_call.mid for a in analyses])
+        short_oi = _to_array([a.short_call.open_interest for a in analyses])
+        long_theta = _to_array([a.long_call.theta for a in analyses])
+        short_theta = _to_array([a.short_call.theta for a in analyses])
+        long_vega = _to_array([a.long_call.vega for a in analyses])
+        short_vega = _to_array([a.short_call.vega for a in analyses])
+        
+        scenario_names = list(self.PRICE_SCENARIOS)
+        scenario_moves = np.array(list(self.PRICE_SCENARIOS.values()), dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Scenario analysis: P&L at short expiration for each price move
+            has_scenarios = ~np.isnan(price) & (price != 0)
+            prices = price[:, None] * (1 + scenario_moves[None, :] / 100)
+            long_value = np.maximum(prices - long_strike[:, None], 0)
+            remaining_years = (long_dte - short_dte) / 365
+            repriced = has_scenarios & (long_iv > 0) & (remaining_years > 0)
+            if repriced.any():
+                long_value[repriced] = call_price(
+                    prices[repriced], long_strike[repriced, None], remaining_years[repriced, None],
+                    float(risk_free_rate), long_iv[repriced, None]
+                )
+            pnl = (long_value
+                   - np.maximum(prices - short_strike[:, None], 0)
+                   - net_debit[:, None])
+            roi = np.where(net_debit[:, None] > 0, pnl / net_debit[:, None] * 100, 0.0)
+            pnl[~has_scenarios] = np.nan
+            roi[~has_scenarios] = np.nan
+            
+            # VaR is the 5th percentile loss, expected shortfall the mean of the worst 5%
+            sorted_pnl = np.sort(pnl, axis=1)
+            cutoff = int(len(scenario_names) * 0.05)
+            var_95 = np.abs(sorted_pnl[:, cutoff])
+            if cutoff > 0:
+                expected_shortfall = np.abs(sorted_pnl[:, :cutoff].mean(axis=1))
+            else:
+                expected_shortfall = np.full(len(analyses), np.nan)
+            
+            # Sharpe ratio assuming a 60% probability of profit
+            dte = np.where(short_dte > 0, short_dte, 30)
+            expected_return_pct = (max_profit * 0.6 - max_loss * 0.4) / net_debit * 100
+            volatility = (max_profit + max_loss) / net_debit * 50
+            annualization_factor = 365 / dte
+            annual_return = expected_return_pct * annualization_factor
+            annual_vol = volatility * np.sqrt(annualization_factor)
+            sharpe_valid = ~np.isnan(max_profit) & (max_profit != 0) & (volatility > 0)
+            sharpe_ratio = np.where(
+                sharpe_valid, (annual_return - float(risk_free_rate) * 100) / annual_vol, np.nan
+            )
+            
+            # Simulated metrics replace the above wherever the contracts have IV
+            expected_pnl = np.full(len(analyses), np.nan)
+            probability_of_profit = np.full(len(analyses), np.nan)
+            simulation = self._simulate(analyses, risk_free_rate)
+            if simulation is not None:
+                simulated = simulation.valid
+                var_95 = np.where(simulated, simulation.var_95, var_95)
+                expected_shortfall = np.where(simulated, simulation.expected_shortfall, expected_shortfall)
+                sharpe_ratio = np.where(simulated, simulation.sharpe_ratio, sharpe_ratio)
+                expected_pnl = simulation.expected_pnl
+                probability_of_profit = simulation.probability_of_profit
+            
+            # Greeks-based risks
+            theta_decay_rate = long_theta - short_theta
+            vega_risk = np.abs(long_vega - short_vega)
+            
+            # Early assignment probability (no dividend information)
+            probability = np.full(len(analyses), 5.0)
+            itm_pct = (price - short_strike) / short_strike * 100
+            probability += np.where((price > short_strike) & (itm_pct > 5), itm_pct * 2, 0)
+            probability += np.where((short_dte > 0) & (short_dte <= 7), 15,
+                                    np.where((short_dte > 7) & (short_dte <= 14), 5, 0))
+            spread_pct = (short_ask - short_bid) / short_mid * 100
+            short_quoted = (np.nan_to_num(short_bid) != 0) & (np.nan_to_num(short_ask) != 0) & (np.nan_to_num(short_mid) != 0)
+            probability += np.where(short_quoted & (spread_pct > 20), 5, 0)
+            probability += np.where((np.nan_to_num(short_oi) > 0) & (short_oi < 10), 5, 0)
+            probability = np.minimum(probability, 90)
+            
+            # Position sizing: 2% max risk and 10% max capital per trade
+            account = float(account_size) if account_size is not None else 100000.0
+            sizing_valid = (max_loss > 0) & (net_debit > 0)
+            max_size_by_risk = np.trunc(account * 0.02 / max_loss)
+            max_size_by_capital = np.trunc(account * 0.10 / net_debit)
+            max_position_size = np.maximum(1, np.minimum(max_size_by_risk, max_size_by_capital))
+            recommended_size = np.maximum(1, max_position_size // 2)
+            capital_required = net_debit * recommended_size
+            capital_at_risk = max_loss * recommended_size
+            portfolio_percentage = capital_required / account * 100
+            for sizing in (max_position_size, recommended_size, capital_required,
+                           capital_at_risk, portfolio_percentage):
+                sizing[~sizing_valid] = np.nan
+        
+        return BatchRiskMetrics(
+            analyses=list(analyses),
+            scenario_names=scenario_names,
+            scenario_moves=scenario_moves,
+            has_scenarios=has_scenarios,
+            scenario_prices=prices,
+            scenario_pnl=pnl,
+            scenario_roi=roi,
+            var_95=var_95,
+            expected_shortfall=expected_shortfall,
+            sharpe_ratio=sharpe_ratio,
+            expected_pnl=expected_pnl,
+            probability_of_profit=probability_of_profit,
+            theta_decay_rate=theta_decay_rate,
+            vega_risk=vega_risk,
+            early_assignment_probability=probability,
+            max_position_size=max_position_size,
+            recommended_size=recommended_size,
+            capital_required=capital_required,
+            capital_at_risk=capital_at_risk,
+            portfolio_percentage=portfolio_percentage
+        )
+    
+    def materialize_comprehensive_risk(self, batch: BatchRiskMetrics, index: int,
+                                       dividend_info: Optional[Dict] = None) -> ComprehensiveRisk:
+        """
+        Build the ComprehensiveRisk object for one row of a batch.
+        
+        Args:
+            batch: Result of calculate_comprehensive_risk_batch
+            index: Row of the position in the batch
+            dividend_info: Dividend information for early assignment risk
+            
+        Returns:
+            ComprehensiveRisk object with all risk metrics
+        """
+        analysis = batch.analyses[index]
+        
+        if math.isnan(batch.recommended_size[index]):
+            raise ValueError(f"Cannot size position with net debit {analysis.net_debit} "
+                             f"and max loss {analysis.risk_metrics.max_loss}")
+        
+        scenarios = {}
+        if batch.has_scenarios[index]:
+            for j, scenario_name in enumerate(batch.scenario_names):
+                scenarios[scenario_name] = {
+                    'price': _to_decimal(batch.scenario_prices[index, j]),
+                    'move_pct': Decimal(str(int(batch.scenario_moves[j]))),
+                    'pnl': _to_decimal(batch.scenario_pnl[index, j]),
+                    'roi': _to_decimal(batch.scenario_roi[index, j])
+                }
+        scenario_pnl = batch.scenario_pnl[index]
+        scenario_analysis = ScenarioAnalysis(
+            scenarios=scenarios,
+            best_case=scenarios[batch.scenario_names[int(np.argmax(scenario_pnl))]] if scenarios else {},
+            worst_case=scenarios[batch.scenario_names[int(np.argmin(scenario_pnl))]] if scenarios else {},
+            expected_case=scenarios.get('up_5', scenarios.get('flat', {}))
+        )
+        
+        position_sizing = PositionSizing(
+            max_position_size=int(batch.max_position_size[index]),
+            recommended_size=int(batch.recommended_size[index]),
+            capital_required=_to_decimal(batch.capital_required[index]),
+            capital_at_risk=_to_decimal(batch.capital_at_risk[index]),
+            portfolio_percentage=_to_decimal(batch.portfolio_percentage[index])
+        )
+        
+        return ComprehensiveRisk(
+            basic_metrics=analysis.risk_metrics,
+            early_assignment=self._calculate_early_assignment_risk(analysis, dividend_info),
+            position_sizing=position_sizing,
+            scenario_analysis=scenario_analysis,
+            var_95=_to_decimal(batch.var_95[index]),
+            expected_shortfall=_to_decimal(batch.expected_shortfall[index]),
+            sharpe_ratio=_to_decimal(batch.sharpe_ratio[index]),
+            expected_pnl=_to_decimal(batch.expected_pnl[index]),
+            probability_of_profit=_to_decimal(batch.probability_of_profit[index]),
+            theta_decay_rate=_to_decimal(batch.theta_decay_rate[index]),
+            vega_risk=_to_decimal(batch.vega_risk[index])
+        )
+    
     def _calculate_early_assignment_risk(self, analysis: PMCCAnalysis,
                                        dividend_info: Optional[Dict] = None) -> EarlyAssignmentRisk:
         """Calculate early assignment risk for the short call."""
@@ -286,7 +623,8 @@ class RiskCalculator:
             portfolio_percentage=portfolio_percentage
         )
     
-    def _perform_scenario_analysis(self, analysis: PMCCAnalysis) -> ScenarioAnalysis:
+    def _perform_scenario_analysis(self, analysis: PMCCAnalysis,
+                                   risk_free_rate: Decimal = Decimal('0.05')) -> ScenarioAnalysis:
         """Perform scenario analysis for different price movements."""
         
         current_price = analysis.underlying.last
@@ -302,23 +640,13 @@ class RiskCalculator:
         scenarios = {}
         
         # Define price scenarios (percentage moves)
-        price_scenarios = {
-            "crash_20": -20,
-            "down_10": -10,
-            "down_5": -5,
-            "flat": 0,
-            "up_5": 5,
-            "up_10": 10,
-            "up_15": 15,
-            "up_20": 20,
-            "moon_30": 30
-        }
+        price_scenarios = self.PRICE_SCENARIOS
         
         short_dte = analysis.short_call.dte or 30
         
         for scenario_name, move_pct in price_scenarios.items():
             new_price = current_price * (1 + Decimal(str(move_pct)) / 100)
-            pnl = self._calculate_pnl_at_expiration(analysis, new_price)
+            pnl = self._calculate_pnl_at_expiration(analysis, new_price, risk_free_rate)
             
             scenarios[scenario_name] = {
                 'price': new_price,
@@ -344,15 +672,15 @@ class RiskCalculator:
         )
     
     def _calculate_pnl_at_expiration(self, analysis: PMCCAnalysis, 
-                                   price_at_expiration: Decimal) -> Decimal:
+                                   price_at_expiration: Decimal,
+                                   risk_free_rate: Decimal = Decimal('0.05')) -> Decimal:
         """Calculate P&L at short call expiration for given stock price."""
         
-        long_strike = analysis.long_call.strike
         short_strike = analysis.short_call.strike
         net_debit = analysis.net_debit
         
-        # Value of long call at expiration
-        long_value = max(Decimal('0'), price_at_expiration - long_strike)
+        # Value of long call at short expiration
+        long_value = self._leaps_value_at_short_expiration(analysis, price_at_expiration, risk_free_rate)
         
         # Value of short call at expiration (our obligation)
         short_obligation = max(Decimal('0'), price_at_expiration - short_strike)
@@ -362,6 +690,24 @@ class RiskCalculator:
         
         return pnl
     
+    def _leaps_value_at_short_expiration(self, analysis: PMCCAnalysis, price: Decimal,
+                                         risk_free_rate: Decimal) -> Decimal:
+        """
+        Value the LEAPS when the short call expires.
+        
+        Uses Black-Scholes with the LEAPS IV over its remaining life
+        (_leaps_repricing_iv), so the extrinsic value still held is counted;
+        intrinsic value without IV.
+        """
+        long_call = analysis.long_call
+        remaining_years = ((long_call.dte or 0) - (analysis.short_call.dte or 0)) / 365
+        volatility = self._leaps_repricing_iv(analysis)
+        if volatility is None or remaining_years <= 0:
+            return max(Decimal('0'), price - long_call.strike)
+        value = call_price(float(price), float(long_call.strike), remaining_years,
+                           float(risk_free_rate), volatility)
+        return Decimal(str(float(value)))
+    
     def _calculate_var_95(self, scenario_analysis: ScenarioAnalysis) -> Optional[Decimal]:
         """Calculate 95% Value at Risk."""
         
@@ -450,16 +796,33 @@ class RiskCalculator:
         
         return None
     
-    def calculate_breakeven_analysis(self, analysis: PMCCAnalysis) -> Dict[str, Decimal]:
-        """Calculate multiple breakeven scenarios."""
+    def calculate_breakeven_analysis(self, analysis: PMCCAnalysis,
+                                     risk_free_rate: Decimal = Decimal('0.05')) -> Dict[str, Optional[Decimal]]:
+        """
+        Calculate multiple breakeven scenarios.
         
-        breakevens = {}
+        Always returns the same keys; a breakeven that cannot be computed
+        (e.g. no LEAPS IV for the Black-Scholes breakeven, or the theta
+        approximation when the model breakeven is available) is None.
+        """
+        breakevens: Dict[str, Optional[Decimal]] = {
+            'static_breakeven': None,
+            'short_expiration_breakeven': None,
+            'theta_adjusted_breakeven': None,
+            'profit_target_25pct': None
+        }
+        if analysis.net_debit is None:
+            return breakevens
         
         # Static breakeven at expiration
         breakevens['static_breakeven'] = analysis.long_call.strike + analysis.net_debit
         
-        # Dynamic breakeven considering time decay
-        if analysis.short_call.dte and analysis.short_call.theta:
+        # Breakeven at short expiration with the LEAPS valued by Black-Scholes
+        # (falls back to the theta approximation when the LEAPS has no IV)
+        short_expiration_breakeven = self._short_expiration_breakeven(analysis, risk_free_rate)
+        if short_expiration_breakeven is not None:
+            breakevens['short_expiration_breakeven'] = short_expiration_breakeven
+        elif analysis.short_call.dte and analysis.short_call.theta:
             days_to_exp = analysis.short_call.dte
             theta_decay = analysis.short_call.theta * days_to_exp
             
@@ -476,6 +839,30 @@ class RiskCalculator:
         
         return breakevens
     
+    def _short_expiration_breakeven(self, analysis: PMCCAnalysis,
+                                    risk_free_rate: Decimal) -> Optional[Decimal]:
+        """
+        Stock price at short expiration where the position breaks even.
+        
+        Below the short strike P&L rises with the price, so the breakeven is
+        found by bisection on (0, short strike] (spot_for_call_value). None
+        without a LEAPS repricing IV (_leaps_repricing_iv) or when the
+        position loses money even at the short strike.
+        """
+        long_call = analysis.long_call
+        remaining_years = ((long_call.dte or 0) - (analysis.short_call.dte or 0)) / 365
+        volatility = self._leaps_repricing_iv(analysis)
+        if volatility is None or remaining_years <= 0 or analysis.net_debit is None:
+            return None
+        
+        breakeven = float(spot_for_call_value(
+            float(analysis.net_debit), float(long_call.strike), remaining_years,
+            float(risk_free_rate), volatility, float(analysis.short_call.strike)
+        ))
+        if not np.isfinite(breakeven):
+            return None
+        return Decimal(str(round(breakeven, 2)))
+    
     def assess_dividend_impact(self, analysis: PMCCAnalysis,
                               dividend_info: Dict) -> Dict[str, Any]:
         """Assess impact of upcoming dividends on the position."""
@@ -6,21 +6,30 @@ to final opportunity ranking and reporting.
 """
 
 import logging
-from typing import List, Optional, Dict, Any, Tuple
-from dataclasses import dataclass, asdict, field
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Tuple, Union
+from dataclasses import dataclass, asdict, field, replace
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import csv
 import os
 from pathlib import Path
 
+import numpy as np
+
 try:
     from src.analysis.stock_screener import StockScreener, ScreeningCriteria, StockScreenResult
-    from src.analysis.options_analyzer import OptionsAnalyzer, LEAPSCriteria, ShortCallCriteria, PMCCOpportunity
-    from src.analysis.risk_calculator import RiskCalculator, ComprehensiveRisk
+    from src.analysis.options_analyzer import OptionsAnalyzer, LEAPSCriteria, ShortCallCriteria, PMCCOpportunity, ScoringWeights, widest_criteria
+    from src.analysis.risk_calculator import RiskCalculator, ComprehensiveRisk, BatchRiskMetrics
+    from src.analysis.monte_carlo import MonteCarloSimulator
+    from src.analysis.iv_surface import IVSurfaceCache
+    from src.analysis.candidate_store import CandidateStore
+    from src.analysis.criteria_sweep import CriteriaSweep, CriteriaVariant, SweepResult
+    from src.analysis.options_availability_cache import OptionsAvailabilityCache, NO_OPTIONS, NO_LEAPS
+    from src.analysis.ai_analysis_cache import AIAnalysisCache, opportunity_fingerprint
     from src.models.pmcc_models import PMCCCandidate, PMCCAnalysis, RiskMetrics
-    from src.models.api_models import StockQuote, OptionContract, EnhancedStockData
+    from src.models.api_models import StockQuote, OptionContract, EnhancedStockData, APIResponse, APIStatus
     from src.api.provider_factory import SyncDataProviderFactory, FallbackStrategy
     from src.api.data_provider import ProviderType, ScreeningCriteria as ProviderScreeningCriteria
     from src.config.provider_config import ProviderConfigurationManager, DataProviderSettings
@@ -28,6 +37,7 @@ try:
     # Enhanced workflow components
     from src.api.providers.sync_enhanced_eodhd_provider import SyncEnhancedEODHDProvider
     from src.api.claude_client import ClaudeClient
+    from src.api.claude_rate_limiter import ClaudeRateLimiter
     from src.analysis.claude_integration import ClaudeIntegrationManager
     # Legacy imports for backward compatibility
     from src.api.sync_marketdata_client import SyncMarketDataClient as MarketDataClient
@@ -38,10 +48,16 @@ except ImportError:
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from analysis.stock_screener import StockScreener, ScreeningCriteria, StockScreenResult
-    from analysis.options_analyzer import OptionsAnalyzer, LEAPSCriteria, ShortCallCriteria, PMCCOpportunity
-    from analysis.risk_calculator import RiskCalculator, ComprehensiveRisk
+    from analysis.options_analyzer import OptionsAnalyzer, LEAPSCriteria, ShortCallCriteria, PMCCOpportunity, ScoringWeights, widest_criteria
+    from analysis.risk_calculator import RiskCalculator, ComprehensiveRisk, BatchRiskMetrics
+    from analysis.monte_carlo import MonteCarloSimulator
+    from analysis.iv_surface import IVSurfaceCache
+    from analysis.candidate_store import CandidateStore
+    from analysis.criteria_sweep import CriteriaSweep, CriteriaVariant, SweepResult
+    from analysis.options_availability_cache import OptionsAvailabilityCache, NO_OPTIONS, NO_LEAPS
+    from analysis.ai_analysis_cache import AIAnalysisCache, opportunity_fingerprint
     from models.pmcc_models import PMCCCandidate, PMCCAnalysis, RiskMetrics
-    from models.api_models import StockQuote, OptionContract, EnhancedStockData
+    from models.api_models import StockQuote, OptionContract, EnhancedStockData, APIResponse, APIStatus
     from api.provider_factory import SyncDataProviderFactory, FallbackStrategy
     from api.data_provider import ProviderType, ScreeningCriteria as ProviderScreeningCriteria
     from config.provider_config import ProviderConfigurationManager, DataProviderSettings
@@ -49,6 +65,7 @@ except ImportError:
     # Enhanced workflow components
     from api.providers.sync_enhanced_eodhd_provider import SyncEnhancedEODHDProvider
     from api.claude_client import ClaudeClient
+    from api.claude_rate_limiter import ClaudeRateLimiter
     from analysis.claude_integration import ClaudeIntegrationManager
     # Legacy imports for backward compatibility
     from api.sync_marketdata_client import SyncMarketDataClient as MarketDataClient
@@ -57,6 +74,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Opportunities per symbol carried into risk analysis and ranking; the
+# candidate store keeps every combination so rescore() can promote others
+MAX_OPPORTUNITIES_PER_SYMBOL = 10
+
 
 @dataclass
 class ScanConfiguration:
@@ -81,10 +102,13 @@ class ScanConfiguration:
     account_size: Optional[Decimal] = None
     max_risk_per_trade: Decimal = Decimal('0.02')  # 2%
     risk_free_rate: Decimal = Decimal('0.05')  # 5%
+    monte_carlo_paths: int = 10000  # Simulated paths for VaR / expected shortfall (0 disables)
+    monte_carlo_seed: Optional[int] = 42  # None for a fresh random stream on every scan
     
     # Output settings
+    scoring_weights: ScoringWeights = field(default_factory=ScoringWeights)
     max_opportunities: int = 25
-    min_total_score: Decimal = Decimal('60')  # Minimum score to include
+    min_total_score: Decimal = Decimal('60')  # Minimum score to include; see SCAN_MIN_TOTAL_SCORE
     best_per_symbol_only: bool = True  # Only keep best opportunity per stock
     
     # Advanced settings
@@ -92,13 +116,39 @@ class ScanConfiguration:
     perform_scenario_analysis: bool = True
     calculate_greeks: bool = True
     
+    # Options availability negative cache (skip symbols without options/LEAPS)
+    options_negative_cache_enabled: bool = False
+    options_negative_cache_file: str = os.path.join("data", "options_negative_cache.json")
+    no_options_recheck_days: int = 7
+    no_leaps_recheck_days: int = 3
+    
+    # Daily ATM IV history behind IV rank (surfaces themselves are cached in memory)
+    iv_history_enabled: bool = False
+    iv_history_file: str = os.path.join("data", "iv_history.json")
+    
+    # Scored candidates of the last scan, kept so they can be rescored without provider calls
+    candidate_store_enabled: bool = False
+    candidate_store_file: str = os.path.join("data", "scan_candidates.npz")
+    
     # AI Enhancement settings (Phase 3)
     claude_analysis_enabled: bool = True  # Auto-detects based on API key availability
     enhanced_data_collection_enabled: bool = True  # Enable enhanced EODHD data collection
     top_n_opportunities: int = 10  # Number of top opportunities to select after AI analysis
     min_claude_confidence: float = 60.0  # Minimum Claude confidence threshold
     min_combined_score: float = 70.0  # Minimum combined score threshold
+    traditional_pmcc_weight: float = 0.6  # Combined score weights of the traditional and Claude scores
+    ai_analysis_weight: float = 0.4
     require_all_data_sources: bool = False  # Require all data sources for AI analysis
+    claude_batch_enabled: bool = False  # Pack several opportunities into each Claude request
+    claude_batch_token_budget: int = 12000  # Estimated data tokens per packed request
+    claude_max_batch_size: int = 5  # Maximum opportunities per packed request
+    claude_prefilter_enabled: bool = False  # Skip Claude for opportunities that cannot reach min_combined_score
+    claude_requests_per_minute: int = 50  # Claude org rate limits pacing requests (0 disables)
+    claude_input_tokens_per_minute: int = 40000
+    claude_output_tokens_per_minute: int = 8000
+    ai_analysis_reuse_enabled: bool = False  # Reuse stored analyses of unchanged opportunities
+    ai_analysis_cache_file: str = os.path.join("data", "ai_analysis_cache.json")
+    ai_analysis_max_age_hours: float = 72.0
 
 
 @dataclass
@@ -137,6 +187,9 @@ class ScanResults:
     stocks_screened: int = 0
     stocks_passed_screening: int = 0
     options_analyzed: int = 0
+    options_skipped_unavailable: int = 0  # Skipped via options availability cache
+    claude_analyses_reused: int = 0  # Stored analyses reused via fingerprint match
+    claude_prefilter_skipped: int = 0  # Skipped Claude as min_combined_score was unreachable
     opportunities_found: int = 0
     
     # Results
@@ -146,6 +199,9 @@ class ScanResults:
     # Complete option chain data for all analyzed stocks
     analyzed_option_chains: Dict[str, 'OptionChain'] = None  # symbol -> OptionChain
     
+    # Cumulative filter-stage counts for symbols that yielded no opportunities
+    option_filter_funnels: Dict[str, Dict[str, Optional[int]]] = None  # symbol -> stage -> count
+    
     # Provider usage tracking
     provider_usage: Dict[ProviderType, ProviderUsageStats] = None
     operation_routing: Dict[str, List[Tuple[str, ProviderType, bool]]] = None  # operation -> [(symbol, provider, success)]
@@ -162,6 +218,8 @@ class ScanResults:
             self.screening_results = []
         if self.analyzed_option_chains is None:
             self.analyzed_option_chains = {}
+        if self.option_filter_funnels is None:
+            self.option_filter_funnels = {}
         if self.provider_usage is None:
             self.provider_usage = {}
         if self.operation_routing is None:
@@ -196,6 +254,9 @@ class ScanResults:
                 'stocks_screened': self.stocks_screened,
                 'stocks_passed_screening': self.stocks_passed_screening,
                 'options_analyzed': self.options_analyzed,
+                'options_skipped_unavailable': self.options_skipped_unavailable,
+                'claude_analyses_reused': self.claude_analyses_reused,
+                'claude_prefilter_skipped': self.claude_prefilter_skipped,
                 'opportunities_found': self.opportunities_found,
                 'success_rate': self.success_rate,
                 'opportunity_rate': self.opportunity_rate
@@ -227,6 +288,7 @@ class ScanResults:
                     } if chain.contracts and any(c.strike for c in chain.contracts) else None
                 } for symbol, chain in self.analyzed_option_chains.items()
             },
+            'option_filter_funnels': self.option_filter_funnels,
             'errors': self.errors,
             'warnings': self.warnings
         }
@@ -285,7 +347,16 @@ class PMCCScanner:
         
         # Initialize components
         self.risk_calculator = RiskCalculator()
+        # Comprehensive risk arrays for the last scored opportunities
+        self.last_risk_batch: Optional[BatchRiskMetrics] = None
         self.options_analyzer = None
+        self.options_availability_cache: Optional[OptionsAvailabilityCache] = None
+        self.ai_analysis_cache: Optional[AIAnalysisCache] = None
+        # IV surfaces per (symbol, trading date), shared by the screener and the options analyzer
+        self.iv_surface_cache = IVSurfaceCache()
+        # symbol -> (raw enhanced data, converted and null-filtered dict for Claude),
+        # scoped to one scan so finished scans' data packages are not kept alive
+        self._enhanced_dicts: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
         
         # Enhanced workflow components (Phase 3)
         self.enhanced_eodhd_provider: Optional[SyncEnhancedEODHDProvider] = None
@@ -296,6 +367,11 @@ class PMCCScanner:
         self.current_scan_usage: Dict[ProviderType, ProviderUsageStats] = {}
         self.current_operation_routing: Dict[str, List[Tuple[str, ProviderType, bool]]] = {}
         
+        # Enhanced data responses shared by the profiles of scan_profiles() (None outside it)
+        self._shared_enhanced_data: Optional[Dict[str, Any]] = None
+        # Claude analyses shared by the profiles of scan_profiles(), keyed by opportunity fingerprint
+        self._shared_claude_results: Optional[Dict[str, Dict[str, Any]]] = None
+        
         if self.use_provider_factory:
             # Initialize options analyzer with default configuration
             default_config = ScanConfiguration()
@@ -438,6 +514,8 @@ class PMCCScanner:
                 )
             
             self.logger.info(f"Options analyzer initialized with legacy source='{options_source}'")
+        
+        self.options_analyzer.risk_free_rate = config.risk_free_rate
     
     def _initialize_enhanced_workflow(self, config: ScanConfiguration) -> bool:
         """
@@ -478,7 +556,14 @@ class PMCCScanner:
                 import os
                 claude_api_key = os.getenv('CLAUDE_API_KEY')
                 if claude_api_key and claude_api_key.strip() and claude_api_key != "your_claude_api_key_here":
-                    self.claude_client = ClaudeClient(api_key=claude_api_key)
+                    self.claude_client = ClaudeClient(
+                        api_key=claude_api_key,
+                        rate_limiter=ClaudeRateLimiter(
+                            requests_per_minute=config.claude_requests_per_minute,
+                            input_tokens_per_minute=config.claude_input_tokens_per_minute,
+                            output_tokens_per_minute=config.claude_output_tokens_per_minute
+                        )
+                    )
                     self.claude_integration_manager = ClaudeIntegrationManager(settings=config)
                     self.logger.info("Claude AI client initialized successfully")
                 else:
@@ -524,24 +609,34 @@ class PMCCScanner:
         
         self.logger.info(f"Starting enhanced analysis for {len(pmcc_opportunities)} opportunities")
         
+        # Drop opportunities that cannot be selected even with a perfect AI score
+        if config.claude_prefilter_enabled and config.claude_analysis_enabled and self.claude_client:
+            pmcc_opportunities = self._prefilter_for_claude(pmcc_opportunities, config, results)
+        
+        # Index opportunities by symbol once; enhanced data is collected, converted
+        # and analyzed once per symbol (the first, highest ranked opportunity)
+        opportunities_by_symbol: Dict[str, PMCCCandidate] = {}
+        for opportunity in pmcc_opportunities:
+            opportunities_by_symbol.setdefault(opportunity.symbol, opportunity)
+        
         # Step 5a: Enhanced Data Collection
-        enhanced_stock_data = []
+        enhanced_by_symbol: Dict[str, Any] = {}
         if config.enhanced_data_collection_enabled and self.enhanced_eodhd_provider:
-            print(f"📊 Collecting enhanced data for {len(pmcc_opportunities)} stocks...")
-            self.logger.info(f"Starting enhanced data collection for {len(pmcc_opportunities)} opportunities")
+            print(f"📊 Collecting enhanced data for {len(opportunities_by_symbol)} stocks...")
+            self.logger.info(f"Starting enhanced data collection for {len(opportunities_by_symbol)} opportunities")
             
             collection_start_time = datetime.now()
             successful_collections = 0
             failed_collections = 0
             
-            for opportunity in pmcc_opportunities:
+            for opportunity in opportunities_by_symbol.values():
                 try:
                     # Use synchronous comprehensive enhanced data collection method
-                    enhanced_data_response = self.enhanced_eodhd_provider.get_comprehensive_enhanced_data(opportunity.symbol)
+                    enhanced_data_response = self._get_comprehensive_enhanced_data(opportunity.symbol)
                     
                     if enhanced_data_response.is_success and enhanced_data_response.data:
                         # Update the stock price with the current price from PMCC scan
-                        enhanced_data = enhanced_data_response.data
+                        enhanced_data = dict(enhanced_data_response.data)
                         if enhanced_data.get('live_price') and hasattr(opportunity, 'underlying_price') and opportunity.underlying_price:
                             # Update the live price with the current price from PMCC scan
                             if isinstance(enhanced_data['live_price'], list) and enhanced_data['live_price']:
@@ -570,7 +665,7 @@ class PMCCScanner:
                                 enhanced_data['options_chain'] = options_chain
                                 self.logger.debug(f"Added options chain data for {opportunity.symbol} with {len(contracts)} contracts")
                         
-                        enhanced_stock_data.append(enhanced_data)
+                        enhanced_by_symbol[opportunity.symbol] = enhanced_data
                         successful_collections += 1
                         # Calculate completeness score from dictionary data
                         completeness_keys = ['live_price', 'fundamentals', 'earnings', 'news', 'technical_indicators', 'sentiment', 'historical_prices', 'economic_events']
@@ -601,20 +696,20 @@ class PMCCScanner:
                     continue
             
             collection_duration = (datetime.now() - collection_start_time).total_seconds()
-            success_rate = (successful_collections / len(pmcc_opportunities)) * 100 if pmcc_opportunities else 0
+            success_rate = (successful_collections / len(opportunities_by_symbol)) * 100 if opportunities_by_symbol else 0
             
             self.logger.info(f"Enhanced data collection completed in {collection_duration:.2f} seconds. "
                            f"Success: {successful_collections}, Failed: {failed_collections} "
                            f"(Success rate: {success_rate:.1f}%)")
             
-            print(f"✅ Enhanced data collected for {len(enhanced_stock_data)} stocks "
+            print(f"✅ Enhanced data collected for {len(enhanced_by_symbol)} stocks "
                   f"({success_rate:.1f}% success rate)")
         
         # Step 5b: Individual Claude AI Analysis
         enhanced_opportunities = []
-        if config.claude_analysis_enabled and self.claude_client and enhanced_stock_data:
-            print(f"🧠 Analyzing {len(enhanced_stock_data)} opportunities individually with Claude AI...")
-            self.logger.info(f"Starting individual Claude AI analysis for {len(enhanced_stock_data)} opportunities")
+        if config.claude_analysis_enabled and self.claude_client and enhanced_by_symbol:
+            print(f"🧠 Analyzing {len(enhanced_by_symbol)} opportunities individually with Claude AI...")
+            self.logger.info(f"Starting individual Claude AI analysis for {len(enhanced_by_symbol)} opportunities")
             
             try:
                 claude_start_time = datetime.now()
@@ -622,7 +717,7 @@ class PMCCScanner:
                 # Create market context
                 market_context = {
                     'analysis_date': date.today().isoformat(),
-                    'total_opportunities': len(enhanced_stock_data),
+                    'total_opportunities': len(enhanced_by_symbol),
                     'market_sentiment': 'neutral',  # Could be enhanced with market data
                     'volatility_regime': 'normal'   # Could be enhanced with VIX data
                 }
@@ -630,51 +725,11 @@ class PMCCScanner:
                 successful_analyses = 0
                 failed_analyses = 0
                 
-                # Analyze each opportunity individually with complete data package
-                for i, enhanced_data in enumerate(enhanced_stock_data, 1):
-                    # Extract symbol from comprehensive data structure
-                    symbol = 'Unknown'
-                    if isinstance(enhanced_data, dict):
-                        # Try to get symbol from live_price data
-                        if enhanced_data.get('live_price'):
-                            live_price = enhanced_data['live_price']
-                            if isinstance(live_price, dict):
-                                # Find first symbol key (format: SYMBOL.US)
-                                for key in live_price.keys():
-                                    if '.US' in key:
-                                        symbol = key.replace('.US', '')
-                                        break
-                            elif isinstance(live_price, list) and len(live_price) > 0:
-                                code = live_price[0].get('code', '')
-                                symbol = code.replace('.US', '') if code else 'Unknown'
-                        # Fallback: try to infer from PMCC opportunities by index
-                        if symbol == 'Unknown' and i <= len(pmcc_opportunities):
-                            symbol = pmcc_opportunities[i-1].symbol
-                    else:
-                        # Legacy format - try to get symbol from live_price data
-                        if enhanced_data.get('live_price') and isinstance(enhanced_data['live_price'], list) and enhanced_data['live_price']:
-                            live_price = enhanced_data['live_price'][0]
-                            code = live_price.get('code', '')
-                            symbol = code.replace('.US', '') if code else 'Unknown'
-                        else:
-                            symbol = 'Unknown'
-                    
+                # Prepare each opportunity's complete data package
+                prepared_requests = []
+                for symbol, enhanced_data in enhanced_by_symbol.items():
+                    corresponding_opportunity = opportunities_by_symbol[symbol]
                     try:
-                        self.logger.info(f"Analyzing opportunity {i}/{len(enhanced_stock_data)}: {symbol}")
-                        print(f"  Analyzing {symbol} ({i}/{len(enhanced_stock_data)})...")
-                        
-                        # Find the corresponding PMCC opportunity
-                        corresponding_opportunity = None
-                        for opp in pmcc_opportunities:
-                            if opp.symbol == symbol:
-                                corresponding_opportunity = opp
-                                break
-                        
-                        if not corresponding_opportunity:
-                            self.logger.warning(f"No PMCC opportunity found for {symbol}")
-                            failed_analyses += 1
-                            continue
-                        
                         # Prepare opportunity data for Claude with complete PMCC details
                         opportunity_data = {
                             'symbol': symbol,
@@ -702,7 +757,7 @@ class PMCCScanner:
                             self.logger.debug(f"  Enhanced data string: {enhanced_data[:100]}...")
                         
                         try:
-                            enhanced_stock_dict = self._enhanced_stock_data_to_dict(enhanced_data)
+                            enhanced_stock_dict = self._get_enhanced_stock_dict(symbol, enhanced_data)
                         except Exception as conv_e:
                             self.logger.error(f"Error converting enhanced data for {symbol}: {conv_e}")
                             self.logger.error(f"Enhanced data type was: {type(enhanced_data)}")
@@ -723,66 +778,137 @@ class PMCCScanner:
                             self.logger.debug(f"  Enhanced stock data string: {enhanced_stock_dict[:100]}...")
                         self.logger.debug(f"  Market context: {market_context}")
                         
-                        # Run individual Claude analysis
-                        claude_response = asyncio.run(
-                            self.claude_client.analyze_single_opportunity(
-                                opportunity_data,
-                                enhanced_stock_dict,
-                                market_context
-                            )
+                        prepared_requests.append(
+                            (symbol, corresponding_opportunity, opportunity_data, enhanced_stock_dict)
+                        )
+                        
+                    except Exception as e:
+                        self.logger.error(f"Error preparing {symbol} for Claude: {e}")
+                        failed_analyses += 1
+                        # Add the opportunity without Claude insights on error
+                        if corresponding_opportunity:
+                            enhanced_opportunities.append(corresponding_opportunity)
+                        continue
+                
+                # Reuse stored analyses of opportunities that have not materially changed
+                analysis_cache = self._get_ai_analysis_cache(config)
+                fingerprints = {}
+                batch_responses = {}
+                if analysis_cache is not None:
+                    fingerprints, batch_responses = self._reuse_stored_analyses(
+                        prepared_requests, analysis_cache
+                    )
+                    results.claude_analyses_reused = len(batch_responses)
+                    if batch_responses:
+                        print(f"♻️  Reusing {len(batch_responses)} stored Claude analyses of unchanged opportunities")
+                if self._shared_claude_results is not None:
+                    profile_responses = self._reuse_profile_analyses(
+                        [r for r in prepared_requests if r[0] not in batch_responses], fingerprints
+                    )
+                    batch_responses.update(profile_responses)
+                    results.claude_analyses_reused += len(profile_responses)
+                    if profile_responses:
+                        print(f"♻️  Reusing {len(profile_responses)} Claude analyses from an earlier profile")
+                pending_requests = [r for r in prepared_requests if r[0] not in batch_responses]
+                
+                # Pack several opportunities per request when enabled; the client
+                # retries anything a packed response misses as an individual request
+                if config.claude_batch_enabled and len(pending_requests) > 1:
+                    print(f"📦 Packing {len(pending_requests)} opportunities into batched Claude requests...")
+                    batch_responses.update(asyncio.run(
+                        self.claude_client.analyze_opportunities_batch(
+                            [(opportunity_data, enhanced_stock_dict)
+                             for _, _, opportunity_data, enhanced_stock_dict in pending_requests],
+                            market_context,
+                            batch_token_budget=config.claude_batch_token_budget,
+                            max_batch_size=config.claude_max_batch_size
                         )
+                    ))
+                
+                # Analyze each opportunity individually with complete data package
+                for i, (symbol, corresponding_opportunity, opportunity_data, enhanced_stock_dict) in enumerate(prepared_requests, 1):
+                    try:
+                        self.logger.info(f"Analyzing opportunity {i}/{len(prepared_requests)}: {symbol}")
+                        print(f"  Analyzing {symbol} ({i}/{len(prepared_requests)})...")
+                        
+                        claude_response = batch_responses.get(symbol)
+                        if claude_response is None:
+                            # Run individual Claude analysis; the client's rate
+                            # limiter paces requests against the per-minute limits
+                            claude_response = asyncio.run(
+                                self.claude_client.analyze_single_opportunity(
+                                    opportunity_data,
+                                    enhanced_stock_dict,
+                                    market_context
+                                )
+                            )
                         
                         if claude_response.is_success and claude_response.data:
                             claude_result = claude_response.data
+                            reused = claude_result.get('analysis_reused', False)
                             
                             # DEBUG LOGGING: Log Claude response
                             self.logger.debug(f"Claude response for {symbol}:")
                             self.logger.debug(f"  Response data: {claude_result}")
                             
-                            # PERSISTENCE: Save Claude request/response for debugging
-                            try:
-                                import os
-                                import json
-                                debug_dir = os.path.join("data", "claude_submissions")
-                                os.makedirs(debug_dir, exist_ok=True)
+                            # PERSISTENCE: Save Claude request/response for debugging (new analyses only)
+                            if not reused:
+                                try:
+                                    import os
+                                    import json
+                                    debug_dir = os.path.join("data", "claude_submissions")
+                                    os.makedirs(debug_dir, exist_ok=True)
                                 
-                                # Extract the debug prompt if available
-                                full_prompt = claude_result.pop('_debug_prompt', None)
+                                    # Extract the debug prompt if available
+                                    full_prompt = claude_result.pop('_debug_prompt', None)
                                 
-                                debug_data = {
-                                    'timestamp': datetime.now().isoformat(),
-                                    'symbol': symbol,
-                                    'full_claude_prompt': full_prompt,  # The complete prompt sent to Claude
-                                    'request_data': {
-                                        'opportunity_data': opportunity_data,
-                                        'enhanced_stock_dict': enhanced_stock_dict,
-                                        'market_context': market_context
-                                    },
-                                    'response_data': claude_result
-                                }
+                                    debug_data = {
+                                        'timestamp': datetime.now().isoformat(),
+                                        'symbol': symbol,
+                                        'full_claude_prompt': full_prompt,  # The complete prompt sent to Claude
+                                        'request_data': {
+                                            'opportunity_data': opportunity_data,
+                                            'enhanced_stock_dict': enhanced_stock_dict,
+                                            'market_context': market_context
+                                        },
+                                        'response_data': claude_result
+                                    }
                                 
-                                debug_file = os.path.join(debug_dir, f"claude_analysis_{symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-                                with open(debug_file, 'w') as f:
-                                    json.dump(debug_data, f, indent=2, default=str)
+                                    debug_file = os.path.join(debug_dir, f"claude_analysis_{symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+                                    with open(debug_file, 'w') as f:
+                                        json.dump(debug_data, f, indent=2, default=str)
                                 
-                                self.logger.debug(f"Saved Claude debug data to {debug_file}")
-                            except Exception as debug_e:
-                                self.logger.warning(f"Failed to save Claude debug data for {symbol}: {debug_e}")
+                                    self.logger.debug(f"Saved Claude debug data to {debug_file}")
+                                except Exception as debug_e:
+                                    self.logger.warning(f"Failed to save Claude debug data for {symbol}: {debug_e}")
+                            
+                            if analysis_cache is not None and not reused:
+                                analysis_cache.record(symbol, fingerprints[symbol], {
+                                    key: value for key, value in claude_result.items()
+                                    if key not in ('_debug_prompt', 'usage')
+                                })
+                            if self._shared_claude_results is not None and not reused:
+                                self._shared_claude_results[fingerprints[symbol]] = {
+                                    **{key: value for key, value in claude_result.items()
+                                       if key not in ('_debug_prompt', 'usage')},
+                                    'analyzed_at': datetime.now().isoformat()
+                                }
                             
                             # Add Claude insights to the original opportunity with timestamp
                             corresponding_opportunity.ai_insights = claude_result
                             corresponding_opportunity.claude_score = claude_result.get('pmcc_score', 0)
                             
-                            # Calculate combined score using configurable weights from settings
-                            settings = get_settings()
-                            traditional_weight = settings.scan.traditional_pmcc_weight
-                            ai_weight = settings.scan.ai_analysis_weight
+                            # Calculate combined score using the configured weights
+                            traditional_weight = config.traditional_pmcc_weight
+                            ai_weight = config.ai_analysis_weight
                             
                             corresponding_opportunity.combined_score = (
                                 float(corresponding_opportunity.total_score) * traditional_weight + 
                                 claude_result.get('pmcc_score', 0) * ai_weight
                             )
-                            corresponding_opportunity.ai_analysis_timestamp = datetime.now()
+                            corresponding_opportunity.ai_analysis_timestamp = (
+                                datetime.fromisoformat(claude_result['analyzed_at']) if reused else datetime.now()
+                            )
                             corresponding_opportunity.claude_reasoning = claude_result.get('analysis_summary', '')
                             corresponding_opportunity.ai_recommendation = claude_result.get('recommendation', 'neutral')
                             corresponding_opportunity.claude_confidence = claude_result.get('confidence_level', claude_result.get('confidence_score', 0))
@@ -800,13 +926,7 @@ class PMCCScanner:
                             self.logger.debug(f"{symbol}: PMCC={corresponding_opportunity.total_score:.1f}, "
                                            f"Claude={claude_result.get('pmcc_score', 0):.1f}, "
                                            f"Combined={corresponding_opportunity.combined_score:.1f}")
-                            
-                            # Add 60-second delay to respect Claude API rate limits
-                            # (40K input tokens/min, 8K output tokens/min)
-                            if i < len(enhanced_stock_data):  # Don't delay after the last analysis
-                                self.logger.info("Waiting 60 seconds before next Claude API call to respect rate limits...")
-                                import time
-                                time.sleep(60)
+
                         else:
                             self.logger.warning(f"Claude analysis failed for {symbol}")
                             failed_analyses += 1
@@ -821,8 +941,11 @@ class PMCCScanner:
                             enhanced_opportunities.append(corresponding_opportunity)
                         continue
                 
+                if analysis_cache is not None:
+                    analysis_cache.save()
+                
                 claude_duration = (datetime.now() - claude_start_time).total_seconds()
-                success_rate = (successful_analyses / len(enhanced_stock_data)) * 100 if enhanced_stock_data else 0
+                success_rate = (successful_analyses / len(enhanced_by_symbol)) * 100 if enhanced_by_symbol else 0
                 
                 self.logger.info(f"Individual Claude AI analysis completed in {claude_duration:.2f} seconds. "
                                f"Success: {successful_analyses}, Failed: {failed_analyses} "
@@ -841,7 +964,7 @@ class PMCCScanner:
                 self.logger.info("Claude AI analysis disabled by configuration")
             elif not self.claude_client:
                 self.logger.warning("Claude AI client not initialized")
-            elif not enhanced_stock_data:
+            elif not enhanced_by_symbol:
                 self.logger.warning("No enhanced stock data available for Claude analysis")
         
         # Step 5c: Integration and Top N Selection
@@ -952,6 +1075,21 @@ class PMCCScanner:
             'iv': float(getattr(option_contract, 'iv', 0)) if getattr(option_contract, 'iv', None) is not None else 0
         }
     
+    def _get_enhanced_stock_dict(self, symbol: str, enhanced_data: Any) -> Dict[str, Any]:
+        """
+        Convert a symbol's enhanced data for Claude, memoized per symbol.
+        
+        The conversion and null-filtering deep-traverse the whole data package,
+        so the result is reused for as long as the same data object is passed.
+        """
+        cached = self._enhanced_dicts.get(symbol)
+        if cached is not None and cached[0] is enhanced_data:
+            return cached[1]
+        
+        enhanced_stock_dict = self._enhanced_stock_data_to_dict(enhanced_data)
+        self._enhanced_dicts[symbol] = (enhanced_data, enhanced_stock_dict)
+        return enhanced_stock_dict
+    
     def _enhanced_stock_data_to_dict(self, comprehensive_data) -> Dict[str, Any]:
         """Convert comprehensive enhanced data to dictionary for Claude analysis."""
         result = {}
@@ -1427,8 +1565,6 @@ class PMCCScanner:
             
             # Include ALL earnings (historical + future) for Claude to analyze patterns
             # Sort by report_date if available, otherwise by date
-            from datetime import datetime
-            
             sorted_earnings = []
             for earnings in earnings_list:
                 if isinstance(earnings, dict):
@@ -1681,13 +1817,13 @@ class PMCCScanner:
         Returns:
             Filtered dictionary with null/empty fields removed
         """
+        import pandas as pd
+        
         # Critical sections that should be preserved even if they contain zeros
         PRESERVE_SECTIONS = {'balance_sheet', 'cash_flow', 'income_statement', 'historical_prices', 'analyst_sentiment'}
         
         def is_meaningful_value(value, key=None, parent_key=None):
             """Check if a value is meaningful (not null, empty, or meaningless)."""
-            import pandas as pd
-            
             if value is None:
                 return False
             if isinstance(value, str):
@@ -1712,8 +1848,6 @@ class PMCCScanner:
         
         def filter_dict(d, parent_key=None):
             """Recursively filter dictionary."""
-            import pandas as pd
-            
             if not isinstance(d, dict):
                 return d
             
@@ -1786,6 +1920,7 @@ class PMCCScanner:
         
         # Initialize provider usage tracking for this scan
         self.current_scan_usage = {}
+        self._enhanced_dicts = {}
         self.current_operation_routing = {
             'screen_stocks': [],
             'get_stock_quote': [],
@@ -1797,6 +1932,8 @@ class PMCCScanner:
         try:
             # Initialize options analyzer based on configuration
             self._initialize_options_analyzer(config)
+            self.options_analyzer.scoring_weights = config.scoring_weights
+            self._attach_iv_surface_cache(config)
             
             # Step 1: Screen stocks
             print("\n" + "=" * 80)
@@ -1823,58 +1960,8 @@ class PMCCScanner:
                 results.completed_at = datetime.now()
                 return results
             
-            # Step 3: Calculate comprehensive risk for top opportunities
-            print("\n" + "=" * 80)
-            print("🎯 STEP 3: CALCULATING RISK METRICS")
-            print("=" * 80)
-            self.logger.info("Step 3: Calculating risk metrics...")
-            scored_opportunities = self._calculate_risk_metrics(all_opportunities, config, results)
-            
-            # Step 4: Rank and filter final results
-            print("\n" + "=" * 80)
-            print("🏆 STEP 4: RANKING TOP OPPORTUNITIES")
-            print("=" * 80)
-            self.logger.info("Step 4: Ranking opportunities...")
-            final_opportunities = self._rank_and_filter(scored_opportunities, config)
-            
-            # Initialize enhanced workflow if configured
-            enhanced_available = self._initialize_enhanced_workflow(config)
-            
-            # Step 5: Enhanced AI Analysis (Phase 3)
-            if enhanced_available and final_opportunities:
-                print("\n" + "=" * 80)
-                print("🧠 STEP 5: AI-ENHANCED ANALYSIS")
-                print("=" * 80)
-                self.logger.info(
-                    f"Step 5: Performing AI-enhanced analysis on {len(final_opportunities)} opportunities"
-                    f" (Enhanced data collection: {config.enhanced_data_collection_enabled}, "
-                    f"Claude AI: {config.claude_analysis_enabled})"
-                )
-                
-                try:
-                    enhanced_start_time = datetime.now()
-                    final_opportunities = self._perform_enhanced_analysis(
-                        final_opportunities, config, results
-                    )
-                    enhanced_duration = (datetime.now() - enhanced_start_time).total_seconds()
-                    
-                    self.logger.info(
-                        f"Enhanced analysis completed in {enhanced_duration:.2f} seconds. "
-                        f"Selected {len(final_opportunities)} top opportunities from AI analysis."
-                    )
-                    
-                except Exception as e:
-                    self.logger.error(f"Enhanced analysis failed: {e}", exc_info=True)
-                    results.errors.append(f"Enhanced analysis error: {str(e)}")
-                    # Continue with standard results if enhanced analysis fails
-            else:
-                if not enhanced_available:
-                    self.logger.info("Enhanced workflow not available - skipping AI analysis")
-                if not final_opportunities:
-                    self.logger.info("No opportunities available for enhanced analysis")
-            
-            results.top_opportunities = final_opportunities
-            results.opportunities_found = len(all_opportunities)
+            # Steps 3-5: risk metrics, ranking and AI analysis
+            self._select_opportunities(all_opportunities, config, results)
             
             # Complete scan
             results.completed_at = datetime.now()
@@ -1897,7 +1984,7 @@ class PMCCScanner:
                 self.logger.warning(f"Error auto-exporting results: {e}")
             
             self.logger.info(
-                f"Scan completed: {len(final_opportunities)} opportunities found "
+                f"Scan completed: {len(results.top_opportunities)} opportunities found "
                 f"in {duration:.1f} seconds"
             )
             
@@ -1909,9 +1996,245 @@ class PMCCScanner:
             # Still add provider usage statistics even on error
             results.provider_usage = self.current_scan_usage.copy()
             results.operation_routing = self.current_operation_routing.copy()
+        finally:
+            self._enhanced_dicts = {}
         
         return results
     
+    def scan_profiles(self, profiles: Dict[str, ScanConfiguration]) -> Dict[str, ScanResults]:
+        """
+        Run several named scan profiles on one shared data fetch.
+        
+        Stocks are screened once, using the universe, screening criteria and
+        data sources of the first profile. Each symbol's quote and option chain
+        are fetched once for the widest DTE, delta, strike and liquidity window
+        of all profiles' LEAPS and short call criteria. Every profile then
+        selects and scores its own opportunities from the shared chains and is
+        ranked, risk-analyzed and AI-analyzed on its own settings; enhanced
+        stock data is also fetched once per symbol for all profiles.
+        
+        Args:
+            profiles: Profile name -> scan configuration, e.g. conservative/moderate/aggressive
+            
+        Returns:
+            Profile name -> ScanResults, in the given order
+            
+        Raises:
+            ValueError: If no profile is given
+        """
+        if not profiles:
+            raise ValueError("scan_profiles() needs at least one profile")
+        
+        names = list(profiles)
+        base = profiles[names[0]]
+        screening_fields = ('universe', 'custom_symbols', 'max_stocks_to_screen', 'screening_criteria',
+                            'options_source', 'stock_screener_source', 'use_hybrid_flow')
+        for name in names[1:]:
+            differing = [f for f in screening_fields if getattr(profiles[name], f) != getattr(base, f)]
+            if differing:
+                self.logger.warning(
+                    f"Profile {name} differs from {names[0]} in {', '.join(differing)}; "
+                    f"stocks are screened once with the settings of {names[0]}"
+                )
+        
+        # Profiles sharing a candidate store file each get their own
+        store_files = [p.candidate_store_file for p in profiles.values() if p.candidate_store_enabled]
+        profiles = dict(profiles)
+        for name, config in profiles.items():
+            if config.candidate_store_enabled and store_files.count(config.candidate_store_file) > 1:
+                root, ext = os.path.splitext(config.candidate_store_file)
+                profiles[name] = replace(config, candidate_store_file=f"{root}_{name}{ext}")
+        fetch_config = replace(
+            base,
+            leaps_criteria=widest_criteria([p.leaps_criteria or LEAPSCriteria() for p in profiles.values()]),
+            short_criteria=widest_criteria([p.short_criteria or ShortCallCriteria() for p in profiles.values()])
+        )
+        
+        scan_id = f"pmcc_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        shared = ScanResults(scan_id=scan_id, started_at=datetime.now(), configuration=fetch_config)
+        profile_results = {
+            name: ScanResults(scan_id=f"{scan_id}_{name}", started_at=shared.started_at, configuration=config)
+            for name, config in profiles.items()
+        }
+        
+        self.current_scan_usage = {}
+        self._enhanced_dicts = {}
+        self.current_operation_routing = {
+            'screen_stocks': [],
+            'get_stock_quote': [],
+            'get_options_chain': []
+        }
+        self.logger.info(f"Starting PMCC scan {scan_id} for profiles: {', '.join(names)}")
+        
+        try:
+            self._initialize_options_analyzer(fetch_config)
+            self._attach_iv_surface_cache(fetch_config)
+            self._shared_enhanced_data = {}
+            self._shared_claude_results = {}
+            
+            # Step 1: Screen stocks once for all profiles
+            print("\n" + "=" * 80)
+            print(f"🔍 STEP 1: SCREENING STOCKS ({len(profiles)} profiles)")
+            print("=" * 80)
+            shared.screening_results = self._screen_stocks(fetch_config, shared)
+            
+            # Step 2: One quote and chain per symbol, evaluated for every profile
+            opportunities_by_profile: Dict[Optional[str], List[PMCCOpportunity]] = {name: [] for name in names}
+            if shared.screening_results:
+                print("\n" + "=" * 80)
+                print(f"📊 STEP 2: ANALYZING OPTIONS FOR {len(profiles)} PROFILES (using {fetch_config.options_source})")
+                print("=" * 80)
+                opportunities_by_profile = self._analyze_options_by_profile(
+                    shared.screening_results, fetch_config, shared, profiles
+                )
+            else:
+                self.logger.warning("No stocks passed screening criteria")
+            
+            for name, config in profiles.items():
+                results = profile_results[name]
+                for attr in ('stocks_screened', 'stocks_passed_screening', 'options_analyzed',
+                             'options_skipped_unavailable'):
+                    setattr(results, attr, getattr(shared, attr))
+                results.screening_results = list(shared.screening_results)
+                results.analyzed_option_chains = dict(shared.analyzed_option_chains)
+                results.option_filter_funnels = dict(shared.option_filter_funnels)
+                results.errors = list(shared.errors)
+                results.warnings = list(shared.warnings)
+                
+                if opportunities_by_profile[name]:
+                    print(f"\n📋 PROFILE {name}: {len(opportunities_by_profile[name])} opportunities")
+                    self.options_analyzer.scoring_weights = config.scoring_weights
+                    self._select_opportunities(opportunities_by_profile[name], config, results)
+                else:
+                    self.logger.warning(f"No PMCC opportunities found for profile {name}")
+                
+                results.completed_at = datetime.now()
+                results.total_duration_seconds = (results.completed_at - results.started_at).total_seconds()
+                results.provider_usage = self.current_scan_usage.copy()
+                results.operation_routing = self.current_operation_routing.copy()
+                
+                try:
+                    timestamp = results.started_at.strftime("%Y%m%d_%H%M%S")
+                    json_file = self.export_results(results, format="json", filename=f"pmcc_scan_{name}_{timestamp}.json")
+                    csv_file = self.export_results(results, format="csv", filename=f"pmcc_scan_{name}_{timestamp}.csv")
+                    self.logger.info(f"Profile {name} results exported to {json_file} and {csv_file}")
+                except Exception as e:
+                    self.logger.warning(f"Error auto-exporting results of profile {name}: {e}")
+            
+            self._log_provider_usage_summary()
+            self.logger.info(
+                f"Profile scan completed in {(datetime.now() - shared.started_at).total_seconds():.1f} seconds: " +
+                ", ".join(f"{name}={len(r.top_opportunities)}" for name, r in profile_results.items())
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error during profile scan: {e}")
+            for results in profile_results.values():
+                results.errors.append(f"Scan error: {str(e)}")
+                results.completed_at = results.completed_at or datetime.now()
+                results.provider_usage = self.current_scan_usage.copy()
+                results.operation_routing = self.current_operation_routing.copy()
+        finally:
+            self._shared_enhanced_data = None
+            self._shared_claude_results = None
+            self._enhanced_dicts = {}
+        
+        return profile_results
+    
+    def _get_comprehensive_enhanced_data(self, symbol: str):
+        """Enhanced stock data for a symbol, fetched once per symbol during scan_profiles()."""
+        if self._shared_enhanced_data is None:
+            return self.enhanced_eodhd_provider.get_comprehensive_enhanced_data(symbol)
+        if symbol not in self._shared_enhanced_data:
+            self._shared_enhanced_data[symbol] = self.enhanced_eodhd_provider.get_comprehensive_enhanced_data(symbol)
+        return self._shared_enhanced_data[symbol]
+    
+    def _select_opportunities(self, all_opportunities: List[PMCCOpportunity],
+                              config: ScanConfiguration, results: ScanResults) -> None:
+        """
+        Score, rank and AI-analyze a scan's opportunities (steps 3-5) into results.
+        
+        Sets results.top_opportunities and results.opportunities_found and saves
+        the candidate store when it is enabled. The store gets every
+        opportunity given; the steps only each symbol's top
+        MAX_OPPORTUNITIES_PER_SYMBOL.
+        """
+        stored_opportunities = all_opportunities
+        all_opportunities = self._top_opportunities_per_symbol(all_opportunities)
+        
+        # Step 3: Calculate comprehensive risk for top opportunities
+        print("\n" + "=" * 80)
+        print("🎯 STEP 3: CALCULATING RISK METRICS")
+        print("=" * 80)
+        self.logger.info("Step 3: Calculating risk metrics...")
+        scored_opportunities = self._calculate_risk_metrics(all_opportunities, config, results)
+        
+        # Step 4: Rank and filter final results
+        print("\n" + "=" * 80)
+        print("🏆 STEP 4: RANKING TOP OPPORTUNITIES")
+        print("=" * 80)
+        self.logger.info("Step 4: Ranking opportunities...")
+        final_opportunities = self._rank_and_filter(scored_opportunities, config)
+        self._attach_comprehensive_risk(final_opportunities)
+        ranked_opportunities = list(final_opportunities)
+        
+        # Initialize enhanced workflow if configured
+        enhanced_available = self._initialize_enhanced_workflow(config)
+        
+        # Step 5: Enhanced AI Analysis (Phase 3)
+        if enhanced_available and final_opportunities:
+            print("\n" + "=" * 80)
+            print("🧠 STEP 5: AI-ENHANCED ANALYSIS")
+            print("=" * 80)
+            self.logger.info(
+                f"Step 5: Performing AI-enhanced analysis on {len(final_opportunities)} opportunities"
+                f" (Enhanced data collection: {config.enhanced_data_collection_enabled}, "
+                f"Claude AI: {config.claude_analysis_enabled})"
+            )
+            
+            try:
+                enhanced_start_time = datetime.now()
+                final_opportunities = self._perform_enhanced_analysis(
+                    final_opportunities, config, results
+                )
+                enhanced_duration = (datetime.now() - enhanced_start_time).total_seconds()
+                
+                self.logger.info(
+                    f"Enhanced analysis completed in {enhanced_duration:.2f} seconds. "
+                    f"Selected {len(final_opportunities)} top opportunities from AI analysis."
+                )
+                
+            except Exception as e:
+                self.logger.error(f"Enhanced analysis failed: {e}", exc_info=True)
+                results.errors.append(f"Enhanced analysis error: {str(e)}")
+                # Continue with standard results if enhanced analysis fails
+        else:
+            if not enhanced_available:
+                self.logger.info("Enhanced workflow not available - skipping AI analysis")
+            if not final_opportunities:
+                self.logger.info("No opportunities available for enhanced analysis")
+        
+        results.top_opportunities = final_opportunities
+        results.opportunities_found = len(all_opportunities)
+        
+        if config.candidate_store_enabled:
+            self._save_candidate_store(stored_opportunities, ranked_opportunities, config, results.scan_id)
+    
+    @staticmethod
+    def _top_opportunities_per_symbol(opportunities: List[PMCCOpportunity]) -> List[PMCCOpportunity]:
+        """Keep each symbol's MAX_OPPORTUNITIES_PER_SYMBOL highest-scoring opportunities, in order."""
+        by_symbol: Dict[str, List[PMCCOpportunity]] = defaultdict(list)
+        for opportunity in opportunities:
+            by_symbol[opportunity.underlying_quote.symbol].append(opportunity)
+        if all(len(group) <= MAX_OPPORTUNITIES_PER_SYMBOL for group in by_symbol.values()):
+            return opportunities
+        
+        kept = set()
+        for group in by_symbol.values():
+            group.sort(key=lambda o: o.total_score, reverse=True)
+            kept.update(id(o) for o in group[:MAX_OPPORTUNITIES_PER_SYMBOL])
+        return [o for o in opportunities if id(o) in kept]
+    
     def scan_symbol(self, symbol: str, config: Optional[ScanConfiguration] = None) -> List[PMCCCandidate]:
         """
         Scan a specific symbol for PMCC opportunities.
@@ -2001,6 +2324,7 @@ class PMCCScanner:
                 
                 # Calculate risk metrics
                 analysis.risk_metrics = analysis.calculate_risk_metrics()
+                analysis.risk_metrics.probability_of_profit = opp.probability_of_profit
                 analysis.liquidity_score = analysis.calculate_liquidity_score()
                 
                 # Create candidate
@@ -2265,6 +2589,7 @@ class PMCCScanner:
                 
                 # Calculate risk metrics
                 analysis.risk_metrics = analysis.calculate_risk_metrics()
+                analysis.risk_metrics.probability_of_profit = opp.probability_of_profit
                 analysis.liquidity_score = analysis.calculate_liquidity_score()
                 
                 # Create candidate
@@ -2455,11 +2780,104 @@ class PMCCScanner:
         
         return screening_results
     
+    def _compute_filter_funnel(self, option_chain: 'OptionChain',
+                               config: ScanConfiguration) -> Dict[str, Optional[int]]:
+        """
+        Count the calls surviving each cumulative LEAPS and short call filter stage.
+        
+        All stages are counted in a single pass over the chain's calls. Stages
+        that cannot be evaluated (no underlying price, spread filter disabled)
+        are None.
+        """
+        leaps = config.leaps_criteria or LEAPSCriteria()
+        short = config.short_criteria or ShortCallCriteria()
+        stock_price = option_chain.underlying_price
+        calls = option_chain.get_calls()
+        
+        funnel = {
+            'total_calls': len(calls),
+            'leaps_in_dte_range': 0,
+            'leaps_with_open_interest': 0,
+            'leaps_with_delta': 0,
+            'leaps_itm': 0,
+            'leaps_itm_and_delta': 0,
+            'leaps_pass_basic_filters': 0,
+            'leaps_pass_premium_filter': 0 if stock_price else None,
+            'leaps_pass_spread_filter': 0 if stock_price and leaps.max_bid_ask_spread_pct > 0 else None,
+            'short_in_dte_range': 0,
+            'short_with_open_interest': 0,
+            'short_with_delta': 0,
+            'short_otm': 0,
+            'short_otm_and_delta': 0,
+            'short_pass_basic_filters': 0
+        }
+        
+        for c in calls:
+            if not c.dte:
+                continue
+            priced = bool(c.bid and c.ask and c.bid > 0)
+            
+            if leaps.min_dte <= c.dte <= leaps.max_dte:
+                funnel['leaps_in_dte_range'] += 1
+                has_oi = bool(c.open_interest and c.open_interest >= leaps.min_open_interest)
+                has_delta = bool(c.delta and leaps.min_delta <= c.delta <= leaps.max_delta)
+                itm = c.moneyness == "ITM"
+                funnel['leaps_with_open_interest'] += has_oi
+                funnel['leaps_with_delta'] += has_delta
+                funnel['leaps_itm'] += itm
+                funnel['leaps_itm_and_delta'] += itm and has_delta
+                if itm and has_delta and has_oi and priced:
+                    funnel['leaps_pass_basic_filters'] += 1
+                    if stock_price and (c.ask / stock_price) <= leaps.max_premium_pct:
+                        funnel['leaps_pass_premium_filter'] += 1
+                        if (funnel['leaps_pass_spread_filter'] is not None and c.spread_percentage
+                                and c.spread_percentage <= leaps.max_bid_ask_spread_pct * 100):
+                            funnel['leaps_pass_spread_filter'] += 1
+            
+            if short.min_dte <= c.dte <= short.max_dte:
+                funnel['short_in_dte_range'] += 1
+                has_oi = bool(c.open_interest and c.open_interest >= short.min_open_interest)
+                has_delta = bool(c.delta and short.min_delta <= c.delta <= short.max_delta)
+                otm = c.moneyness == "OTM"
+                funnel['short_with_open_interest'] += has_oi
+                funnel['short_with_delta'] += has_delta
+                funnel['short_otm'] += otm
+                funnel['short_otm_and_delta'] += otm and has_delta
+                funnel['short_pass_basic_filters'] += otm and has_delta and has_oi and priced
+        
+        return funnel
+    
     def _analyze_options(self, screening_results: List[StockScreenResult],
                         config: ScanConfiguration, results: ScanResults) -> List[PMCCOpportunity]:
         """Analyze options for screened stocks with provider tracking and progress updates."""
+        return self._analyze_options_by_profile(screening_results, config, results)[None]
+    
+    def _analyze_options_by_profile(self, screening_results: List[StockScreenResult],
+                                    config: ScanConfiguration, results: ScanResults,
+                                    profiles: Optional[Dict[str, ScanConfiguration]] = None
+                                    ) -> Dict[Optional[str], List[PMCCOpportunity]]:
+        """
+        Analyze options for screened stocks, once per symbol for all profiles.
+        
+        Without profiles the opportunities of config are returned under the key
+        None. With profiles each symbol's chain is fetched once for their widest
+        criteria and the opportunities are returned per profile name.
         
+        Each symbol contributes its top MAX_OPPORTUNITIES_PER_SYMBOL, or every
+        combination when a candidate store is enabled; _select_opportunities
+        applies the per-symbol cut after the store has them.
+        """
+        opportunities_by_profile: Dict[Optional[str], List[PMCCOpportunity]] = {
+            name: [] for name in (profiles or [None])
+        }
+        store_enabled = any(p.candidate_store_enabled for p in (profiles or {None: config}).values())
+        per_symbol_limit = None if store_enabled else MAX_OPPORTUNITIES_PER_SYMBOL
         all_opportunities = []
+        availability_cache = self._get_options_availability_cache(config)
+        if availability_cache is not None:
+            screening_results = self._skip_unavailable_options(
+                screening_results, availability_cache, config, results
+            )
         total_stocks = len(screening_results)
         
         # Log the complete list of stocks to be analyzed
@@ -2483,18 +2901,35 @@ class PMCCScanner:
                     self.current_operation_routing['get_options_chain'].append((symbol, provider_type, True))
                 
                 # Find PMCC opportunities and get complete option chain
-                result = self.options_analyzer.find_pmcc_opportunities(
-                    symbol, config.leaps_criteria, config.short_criteria,
-                    return_option_chain=True
-                )
-                if isinstance(result, tuple):
-                    opportunities, option_chain = result
-                    # Save the complete option chain for AI analysis
+                if profiles:
+                    symbol_opportunities, option_chain = self.options_analyzer.find_pmcc_opportunities_for_profiles(
+                        symbol,
+                        {name: (p.leaps_criteria, p.short_criteria) for name, p in profiles.items()},
+                        {name: p.scoring_weights for name, p in profiles.items()},
+                        max_opportunities=per_symbol_limit
+                    )
                     if option_chain:
                         results.analyzed_option_chains[symbol] = option_chain
+                    for name, profile_opportunities in symbol_opportunities.items():
+                        opportunities_by_profile[name].extend(profile_opportunities)
+                    opportunities = [o for profile_opportunities in symbol_opportunities.values() for o in profile_opportunities]
                 else:
-                    # Backward compatibility if option chain not returned
-                    opportunities = result
+                    result = self.options_analyzer.find_pmcc_opportunities(
+                        symbol, config.leaps_criteria, config.short_criteria,
+                        max_opportunities=per_symbol_limit, return_option_chain=True
+                    )
+                    if isinstance(result, tuple):
+                        opportunities, option_chain = result
+                        # Save the complete option chain for AI analysis
+                        if option_chain:
+                            results.analyzed_option_chains[symbol] = option_chain
+                    else:
+                        # Backward compatibility if option chain not returned
+                        opportunities = result
+                    opportunities_by_profile[None].extend(opportunities or [])
+                
+                if availability_cache is not None:
+                    self._update_options_availability(symbol, availability_cache, config)
                 
                 if opportunities:
                     all_opportunities.extend(opportunities)
@@ -2502,100 +2937,11 @@ class PMCCScanner:
                     self.logger.info(f"Found {len(opportunities)} PMCC opportunities for {symbol}")
                 else:
                     print(f"   ❌ No PMCC opportunities found for {symbol}")
-                    # Debug info for empty results
+                    # Record where the chain's calls dropped out of the filters
                     if 'option_chain' in locals() and option_chain:
-                        calls = option_chain.get_calls()
-                        leaps_range = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte)
-                        short_range = sum(1 for c in calls if c.dte and config.short_criteria.min_dte <= c.dte <= config.short_criteria.max_dte)
-                        print(f"   ℹ️  Debug: {len(calls)} total calls, {leaps_range} in LEAPS range ({config.leaps_criteria.min_dte}-{config.leaps_criteria.max_dte} DTE), {short_range} in short range ({config.short_criteria.min_dte}-{config.short_criteria.max_dte} DTE)")
-                        
-                        # More detailed analysis
-                        if leaps_range > 0:
-                            # Check LEAPS filter details
-                            leaps_with_oi = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte 
-                                              and c.open_interest and c.open_interest >= config.leaps_criteria.min_open_interest)
-                            print(f"       → LEAPS with OI >= {config.leaps_criteria.min_open_interest}: {leaps_with_oi}")
-                            
-                            # Check delta
-                            leaps_with_delta = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte
-                                                 and c.delta and config.leaps_criteria.min_delta <= c.delta <= config.leaps_criteria.max_delta)
-                            print(f"       → LEAPS with delta {config.leaps_criteria.min_delta}-{config.leaps_criteria.max_delta}: {leaps_with_delta}")
-                            
-                            # Check ITM
-                            leaps_itm = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte
-                                           and c.moneyness == "ITM")
-                            print(f"       → LEAPS that are ITM: {leaps_itm}")
-                            
-                            # Check intersection of ITM and delta
-                            leaps_itm_and_delta = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte
-                                                     and c.moneyness == "ITM"
-                                                     and c.delta and config.leaps_criteria.min_delta <= c.delta <= config.leaps_criteria.max_delta)
-                            print(f"       → LEAPS that are ITM AND have delta {config.leaps_criteria.min_delta}-{config.leaps_criteria.max_delta}: {leaps_itm_and_delta}")
-                            
-                            # Check all filters together
-                            leaps_pass_all = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte
-                                               and c.moneyness == "ITM"
-                                               and c.delta and config.leaps_criteria.min_delta <= c.delta <= config.leaps_criteria.max_delta
-                                               and c.open_interest and c.open_interest >= config.leaps_criteria.min_open_interest
-                                               and c.bid and c.ask and c.bid > 0)
-                            print(f"       → LEAPS passing ALL basic filters: {leaps_pass_all}")
-                            
-                            # Check bid-ask spread
-                            if hasattr(option_chain, 'underlying_price') and option_chain.underlying_price:
-                                stock_price = option_chain.underlying_price  # Keep as Decimal
-                                leaps_premium_ok = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte
-                                                     and c.moneyness == "ITM"
-                                                     and c.delta and config.leaps_criteria.min_delta <= c.delta <= config.leaps_criteria.max_delta
-                                                     and c.open_interest and c.open_interest >= config.leaps_criteria.min_open_interest
-                                                     and c.bid and c.ask and c.bid > 0
-                                                     and c.ask and (c.ask / stock_price) <= config.leaps_criteria.max_premium_pct)
-                                print(f"       → LEAPS also passing premium % filter: {leaps_premium_ok}")
-                                
-                                # Check spread too
-                                if config.leaps_criteria.max_bid_ask_spread_pct > 0:
-                                    leaps_spread_ok = sum(1 for c in calls if c.dte and config.leaps_criteria.min_dte <= c.dte <= config.leaps_criteria.max_dte
-                                                        and c.moneyness == "ITM"
-                                                        and c.delta and config.leaps_criteria.min_delta <= c.delta <= config.leaps_criteria.max_delta
-                                                        and c.open_interest and c.open_interest >= config.leaps_criteria.min_open_interest
-                                                        and c.bid and c.ask and c.bid > 0
-                                                        and c.ask and (c.ask / stock_price) <= config.leaps_criteria.max_premium_pct
-                                                        and c.spread_percentage and c.spread_percentage <= config.leaps_criteria.max_bid_ask_spread_pct * 100)
-                                    print(f"       → LEAPS also passing bid-ask spread filter: {leaps_spread_ok}")
-                                else:
-                                    print(f"       → LEAPS bid-ask spread filter DISABLED (set to 0)")
-                            
-                        if short_range > 0:
-                            # Check short call filter details  
-                            # Check intersection of OTM and delta
-                            short_otm_and_delta = sum(1 for c in calls if c.dte and config.short_criteria.min_dte <= c.dte <= config.short_criteria.max_dte
-                                                     and c.moneyness == "OTM"
-                                                     and c.delta and config.short_criteria.min_delta <= c.delta <= config.short_criteria.max_delta)
-                            print(f"       → Short calls that are OTM AND have delta {config.short_criteria.min_delta}-{config.short_criteria.max_delta}: {short_otm_and_delta}")
-                            
-                            # Check all filters together
-                            short_pass_all = sum(1 for c in calls if c.dte and config.short_criteria.min_dte <= c.dte <= config.short_criteria.max_dte
-                                               and c.moneyness == "OTM"
-                                               and c.delta and config.short_criteria.min_delta <= c.delta <= config.short_criteria.max_delta
-                                               and c.open_interest and c.open_interest >= config.short_criteria.min_open_interest
-                                               and c.bid and c.ask and c.bid > 0)
-                            print(f"       → Short calls passing ALL basic filters: {short_pass_all}")
-                            
-                            short_with_oi = sum(1 for c in calls if c.dte and config.short_criteria.min_dte <= c.dte <= config.short_criteria.max_dte
-                                              and c.open_interest and c.open_interest >= config.short_criteria.min_open_interest)
-                            print(f"       → Short calls with OI >= {config.short_criteria.min_open_interest}: {short_with_oi}")
-                            
-                            # Check delta for short calls
-                            short_with_delta = sum(1 for c in calls if c.dte and config.short_criteria.min_dte <= c.dte <= config.short_criteria.max_dte
-                                                 and c.delta and config.short_criteria.min_delta <= c.delta <= config.short_criteria.max_delta)
-                            print(f"       → Short calls with delta {config.short_criteria.min_delta}-{config.short_criteria.max_delta}: {short_with_delta}")
-                            
-                            # Check OTM
-                            short_otm = sum(1 for c in calls if c.dte and config.short_criteria.min_dte <= c.dte <= config.short_criteria.max_dte
-                                           and c.moneyness == "OTM")
-                            print(f"       → Short calls that are OTM: {short_otm}")
-                            
-                            # Final check - options passing ALL filters
-                            print(f"   📊 Filter summary: Max bid-ask spread LEAPS={config.leaps_criteria.max_bid_ask_spread_pct*100:.0f}%, Shorts={config.short_criteria.max_bid_ask_spread_pct*100:.0f}%")
+                        funnel = self._compute_filter_funnel(option_chain, config)
+                        results.option_filter_funnels[symbol] = funnel
+                        self.logger.debug(f"{symbol} filter funnel: {funnel}")
                     # Log detailed reasons if verbosity is enabled
                     if hasattr(config, 'analysis_verbosity'):
                         from src.config.settings import AnalysisVerbosity
@@ -2660,6 +3006,10 @@ class PMCCScanner:
                 # Continue processing remaining stocks
                 continue
         
+        if availability_cache is not None:
+            availability_cache.save()
+        self.iv_surface_cache.save()
+        
         # Final summary
         print("\n" + "=" * 60)
         print("🏁 Options Analysis Complete!")
@@ -2681,71 +3031,322 @@ class PMCCScanner:
                 self.logger.warning(f"Failed to export complete option chains: {e}")
                 results.warnings.append(f"Failed to export complete option chains: {e}")
         
-        return all_opportunities
+        return opportunities_by_profile
+    
+    def _prefilter_for_claude(self, pmcc_opportunities: List[PMCCCandidate],
+                              config: ScanConfiguration, results: ScanResults) -> List[PMCCCandidate]:
+        """
+        Remove opportunities whose best achievable combined score is below min_combined_score.
+        
+        Only AI-analyzed opportunities scoring at least min_combined_score are
+        selected in Step 5c, so skipping the rest before enhanced data
+        collection and Claude leaves the final selection unchanged.
+        """
+        manager = self.claude_integration_manager or ClaudeIntegrationManager()
+        
+        remaining = []
+        for opportunity in pmcc_opportunities:
+            upper_bound = manager.max_achievable_combined_score(
+                float(opportunity.total_score or 0),
+                pmcc_weight=config.traditional_pmcc_weight,
+                ai_weight=config.ai_analysis_weight
+            )
+            if upper_bound < config.min_combined_score:
+                self.logger.debug(f"Skipping Claude for {opportunity.symbol}: best combined score "
+                                  f"{upper_bound:.1f} < {config.min_combined_score}")
+            else:
+                remaining.append(opportunity)
+        
+        skipped = len(pmcc_opportunities) - len(remaining)
+        results.claude_prefilter_skipped += skipped
+        if skipped:
+            self.logger.info(f"Pre-filter skipped Claude for {skipped} opportunities that cannot reach "
+                             f"the minimum combined score of {config.min_combined_score}")
+            print(f"⏭️  Skipping {skipped} opportunities that cannot reach the minimum combined score")
+        return remaining
+    
+    def _get_options_availability_cache(self, config: ScanConfiguration) -> Optional[OptionsAvailabilityCache]:
+        """Get the options availability cache for this configuration, if enabled."""
+        if not config.options_negative_cache_enabled:
+            return None
+        
+        cache = self.options_availability_cache
+        if cache is None or cache.cache_file != config.options_negative_cache_file:
+            cache = OptionsAvailabilityCache(
+                config.options_negative_cache_file,
+                no_options_recheck_days=config.no_options_recheck_days,
+                no_leaps_recheck_days=config.no_leaps_recheck_days
+            )
+            self.options_availability_cache = cache
+        else:
+            cache.recheck_days.update({
+                NO_OPTIONS: config.no_options_recheck_days,
+                NO_LEAPS: config.no_leaps_recheck_days
+            })
+        return cache
+    
+    def _attach_iv_surface_cache(self, config: ScanConfiguration) -> None:
+        """
+        Share the IV surface cache for this configuration with its readers.
+        
+        The options analyzer ranks short calls against the surface and the
+        risk calculator reprices LEAPS off it; both fit it on demand. The
+        screener only fits chains for IV rank, which needs the IV history, so
+        it gets the cache only when the history is enabled.
+        
+        Called at the start of every scan and rescore: surfaces fitted by an
+        earlier scan are dropped, so a later scan on the same trading date
+        refits them from its own chains, and the cache does not grow for
+        the life of the process.
+        """
+        history_file = config.iv_history_file if config.iv_history_enabled else None
+        if self.iv_surface_cache.history_file != history_file:
+            self.iv_surface_cache = IVSurfaceCache(history_file)
+        else:
+            self.iv_surface_cache.clear_surfaces()
+        
+        if getattr(self, 'stock_screener', None) is not None:
+            self.stock_screener.iv_surface_cache = self.iv_surface_cache if config.iv_history_enabled else None
+        if self.options_analyzer is not None:
+            self.options_analyzer.iv_surface_cache = self.iv_surface_cache
+        self.risk_calculator.iv_surface_cache = self.iv_surface_cache
+    
+    def _save_candidate_store(self, opportunities: List[PMCCOpportunity], ranked: List[PMCCCandidate],
+                              config: ScanConfiguration, scan_id: str) -> None:
+        """Persist all scored opportunities, with Claude results of the ranked candidates, for rescore()."""
+        try:
+            store = CandidateStore.from_opportunities(opportunities, scan_id, analyzed=ranked)
+            store.save(config.candidate_store_file)
+            self.logger.info(f"Saved {len(store)} scored candidates to {config.candidate_store_file}")
+        except Exception as e:
+            self.logger.warning(f"Failed to save candidate store {config.candidate_store_file}: {e}")
+    
+    def _get_ai_analysis_cache(self, config: ScanConfiguration) -> Optional[AIAnalysisCache]:
+        """Get the stored AI analysis cache for this scan, or None if disabled."""
+        if not config.ai_analysis_reuse_enabled:
+            return None
+        
+        cache = self.ai_analysis_cache
+        if cache is None or cache.cache_file != config.ai_analysis_cache_file:
+            cache = AIAnalysisCache(config.ai_analysis_cache_file, config.ai_analysis_max_age_hours)
+            self.ai_analysis_cache = cache
+        else:
+            cache.max_age = timedelta(hours=config.ai_analysis_max_age_hours)
+        return cache
+    
+    def _reuse_stored_analyses(self, prepared_requests: List[Tuple[str, Any, Dict[str, Any], Dict[str, Any]]],
+                               analysis_cache: AIAnalysisCache
+                               ) -> Tuple[Dict[str, str], Dict[str, APIResponse]]:
+        """
+        Fingerprint prepared Claude requests and look up reusable analyses.
+        
+        Args:
+            prepared_requests: (symbol, opportunity, opportunity_data, enhanced_stock_dict) tuples
+            analysis_cache: Store of prior analyses
+            
+        Returns:
+            Tuple of (symbol -> fingerprint, symbol -> response built from a stored analysis)
+        """
+        fingerprints = {}
+        reused = {}
+        for symbol, _, opportunity_data, enhanced_stock_dict in prepared_requests:
+            fingerprints[symbol] = opportunity_fingerprint(opportunity_data, enhanced_stock_dict)
+            stored = analysis_cache.get(symbol, fingerprints[symbol])
+            if stored is None:
+                continue
+            
+            reused[symbol] = APIResponse(
+                status=APIStatus.OK,
+                data={
+                    **stored.analysis,
+                    'analysis_reused': True,
+                    'analyzed_at': stored.analyzed_at.isoformat()
+                }
+            )
+            self.logger.info(f"{symbol}: opportunity unchanged since {stored.analyzed_at:%Y-%m-%d %H:%M}, "
+                             f"reusing stored Claude analysis")
+        return fingerprints, reused
+    
+    def _reuse_profile_analyses(self, prepared_requests: List[Tuple[str, Any, Dict[str, Any], Dict[str, Any]]],
+                                fingerprints: Dict[str, str]) -> Dict[str, APIResponse]:
+        """
+        Look up Claude analyses an earlier profile of scan_profiles() already made.
+        
+        Args:
+            prepared_requests: (symbol, opportunity, opportunity_data, enhanced_stock_dict) tuples
+            fingerprints: symbol -> fingerprint, filled in for requests not yet fingerprinted
+            
+        Returns:
+            symbol -> response built from the analysis of an identical opportunity
+        """
+        reused = {}
+        for symbol, _, opportunity_data, enhanced_stock_dict in prepared_requests:
+            if symbol not in fingerprints:
+                fingerprints[symbol] = opportunity_fingerprint(opportunity_data, enhanced_stock_dict)
+            shared = self._shared_claude_results.get(fingerprints[symbol])
+            if shared is None:
+                continue
+            
+            reused[symbol] = APIResponse(status=APIStatus.OK, data={**shared, 'analysis_reused': True})
+            self.logger.info(f"{symbol}: opportunity already analyzed by an earlier profile, "
+                             f"reusing its Claude analysis")
+        return reused
+    
+    def _skip_unavailable_options(self, screening_results: List[StockScreenResult],
+                                  availability_cache: OptionsAvailabilityCache,
+                                  config: ScanConfiguration,
+                                  results: ScanResults) -> List[StockScreenResult]:
+        """
+        Drop symbols known to have no options or no LEAPS before fetching chains.
+        
+        Fresh negative entries are skipped outright. Stale entries are re-checked
+        with the cheap option expirations request and only fetched in full if
+        LEAPS are listed again.
+        """
+        leaps_min_dte = (config.leaps_criteria or LEAPSCriteria()).min_dte
+        remaining = []
+        skipped = []
+        
+        for stock_result in screening_results:
+            symbol = stock_result.symbol
+            entry = availability_cache.get(symbol)
+            
+            if entry is not None:
+                if availability_cache.is_fresh(entry):
+                    skipped.append(f"{symbol} ({entry.reason})")
+                    continue
+                
+                reason = self.options_analyzer.get_leaps_unavailability_reason(symbol, leaps_min_dte)
+                if reason:
+                    availability_cache.record(symbol, reason)
+                    skipped.append(f"{symbol} ({reason})")
+                    continue
+            
+            remaining.append(stock_result)
+        
+        if skipped:
+            results.options_skipped_unavailable += len(skipped)
+            self.logger.info(f"Skipping {len(skipped)} symbols without options/LEAPS: {', '.join(skipped[:20])}")
+            print(f"⏭️  Skipping {len(skipped)} symbols cached as having no options/LEAPS")
+        
+        return remaining
+    
+    def _update_options_availability(self, symbol: str,
+                                     availability_cache: OptionsAvailabilityCache,
+                                     config: ScanConfiguration) -> None:
+        """Record or clear a symbol's negative cache entry from its chain fetch."""
+        chain_result = self.options_analyzer.last_chain_result
+        if not chain_result:
+            return
+        
+        status = chain_result.get('status')
+        no_leaps_in_chain = status == 'success' and chain_result.get('leaps_count', 0) == 0
+        
+        if status in ('no_options', 'empty_chain') or no_leaps_in_chain:
+            # Filtered chains can be empty for liquidity reasons; confirm with expirations
+            leaps_min_dte = (config.leaps_criteria or LEAPSCriteria()).min_dte
+            reason = self.options_analyzer.get_leaps_unavailability_reason(symbol, leaps_min_dte)
+            if reason is None and status == 'no_options' and not self.options_analyzer.supports_option_expirations():
+                reason = NO_OPTIONS
+            if reason:
+                availability_cache.record(symbol, reason)
+                self.logger.debug(f"Cached {symbol} as {reason}")
+            else:
+                availability_cache.discard(symbol)
+        elif status in ('success', 'partial_success'):
+            availability_cache.discard(symbol)
     
     def _calculate_risk_metrics(self, opportunities: List[PMCCOpportunity],
                                config: ScanConfiguration, results: ScanResults) -> List[PMCCCandidate]:
         """Calculate comprehensive risk metrics for opportunities."""
         
         candidates = []
+        self.last_risk_batch = None
         
         for opp in opportunities:
             try:
-                # Create PMCCAnalysis object
-                analysis = PMCCAnalysis(
-                    long_call=opp.leaps_contract,
-                    short_call=opp.short_contract,
-                    underlying=opp.underlying_quote,
-                    net_debit=opp.net_debit,
-                    credit_received=opp.short_contract.bid,
-                    analyzed_at=datetime.now()
-                )
-                
-                # Calculate basic risk metrics
-                analysis.risk_metrics = RiskMetrics(
-                    max_loss=opp.max_loss,
-                    max_profit=opp.max_profit,
-                    breakeven=opp.breakeven,
-                    probability_of_profit=opp.probability_score,
-                    net_delta=None,  # Would be calculated from Greeks
-                    net_gamma=None,
-                    net_theta=None,
-                    net_vega=None,
-                    risk_reward_ratio=opp.risk_reward_ratio
-                )
-                
-                analysis.liquidity_score = opp.liquidity_score
-                
-                # Calculate comprehensive risk if requested
-                if config.perform_scenario_analysis:
-                    try:
-                        comprehensive_risk = self.risk_calculator.calculate_comprehensive_risk(
-                            analysis, config.account_size, config.risk_free_rate
-                        )
-                        # Store additional risk metrics (could extend PMCCAnalysis)
-                    except Exception as e:
-                        self.logger.warning(f"Error calculating comprehensive risk: {e}")
-                
-                # Create candidate
-                candidate = PMCCCandidate(
-                    symbol=opp.underlying_quote.symbol,
-                    underlying_price=opp.underlying_quote.last or opp.underlying_quote.mid or Decimal('0'),
-                    analysis=analysis,
-                    liquidity_score=opp.liquidity_score,
-                    total_score=opp.total_score,
-                    discovered_at=datetime.now()
-                )
-                
-                candidates.append(candidate)
-                
+                candidates.append(self._candidate_from_opportunity(opp))
             except Exception as e:
                 warning_msg = f"Error calculating risk for opportunity: {e}"
                 self.logger.warning(warning_msg)
                 results.warnings.append(warning_msg)
                 continue
         
+        # Calculate comprehensive risk for all candidates at once if requested;
+        # ComprehensiveRisk objects are only built for the final ranked candidates
+        if config.perform_scenario_analysis and candidates:
+            self._calculate_risk_batch(candidates, config)
+        
         return candidates
     
+    def _candidate_from_opportunity(self, opp: PMCCOpportunity) -> PMCCCandidate:
+        """Build a candidate with basic risk metrics from an options analyzer opportunity."""
+        
+        # Create PMCCAnalysis object
+        analysis = PMCCAnalysis(
+            long_call=opp.leaps_contract,
+            short_call=opp.short_contract,
+            underlying=opp.underlying_quote,
+            net_debit=opp.net_debit,
+            credit_received=opp.short_contract.bid,
+            iv_rank=self.iv_surface_cache.iv_rank(opp.underlying_quote.symbol),
+            analyzed_at=datetime.now()
+        )
+        
+        # Calculate basic risk metrics
+        analysis.risk_metrics = RiskMetrics(
+            max_loss=opp.max_loss,
+            max_profit=opp.max_profit,
+            breakeven=opp.breakeven,
+            probability_of_profit=opp.probability_of_profit,
+            net_delta=None,  # Would be calculated from Greeks
+            net_gamma=None,
+            net_theta=None,
+            net_vega=None,
+            risk_reward_ratio=opp.risk_reward_ratio
+        )
+        
+        analysis.liquidity_score = opp.liquidity_score
+        
+        return PMCCCandidate(
+            symbol=opp.underlying_quote.symbol,
+            underlying_price=opp.underlying_quote.last or opp.underlying_quote.mid or Decimal('0'),
+            analysis=analysis,
+            liquidity_score=opp.liquidity_score,
+            total_score=opp.total_score,
+            discovered_at=datetime.now()
+        )
+    
+    def _calculate_risk_batch(self, candidates: List[PMCCCandidate], config: ScanConfiguration) -> None:
+        """Calculate comprehensive risk for candidates into last_risk_batch."""
+        try:
+            self.risk_calculator.monte_carlo = MonteCarloSimulator(
+                config.monte_carlo_paths, config.monte_carlo_seed
+            ) if config.monte_carlo_paths > 0 else None
+            self.last_risk_batch = self.risk_calculator.calculate_comprehensive_risk_batch(
+                [c.analysis for c in candidates], config.account_size, config.risk_free_rate
+            )
+        except Exception as e:
+            self.logger.warning(f"Error calculating comprehensive risk: {e}")
+    
+    def _attach_comprehensive_risk(self, candidates: List[PMCCCandidate]) -> None:
+        """Materialize comprehensive risk from the last risk batch for the given candidates."""
+        
+        batch = self.last_risk_batch
+        if batch is None:
+            return
+        
+        for candidate in candidates:
+            index = batch.index_of(candidate.analysis)
+            if index is None:
+                continue
+            try:
+                candidate.comprehensive_risk = self.risk_calculator.materialize_comprehensive_risk(
+                    batch, index
+                )
+            except Exception as e:
+                self.logger.warning(f"Error calculating comprehensive risk for {candidate.symbol}: {e}")
+    
     def _rank_and_filter(self, candidates: List[PMCCCandidate],
                         config: ScanConfiguration) -> List[PMCCCandidate]:
         """Rank candidates and filter by minimum score, keeping only best per symbol."""
@@ -2785,6 +3386,123 @@ class PMCCScanner:
         # Return top N opportunities
         return filtered[:config.max_opportunities]
     
+    def rescore(self, store: Optional[Union[CandidateStore, str]] = None, config: Optional[ScanConfiguration] = None,
+                traditional_pmcc_weight: Optional[float] = None, export: bool = True) -> ScanResults:
+        """
+        Re-rank the stored candidates of a previous scan without calling any provider.
+        
+        Applies config.scoring_weights, min_total_score, best_per_symbol_only and
+        max_opportunities to every stored candidate. If the scan ran Claude
+        analysis, its stored scores are recombined with the traditional scores
+        and the top N selection is repeated with the configured thresholds.
+        
+        Args:
+            store: CandidateStore or path to one, defaults to config.candidate_store_file
+            config: Scan configuration with the new weights and thresholds
+            traditional_pmcc_weight: Weight of the traditional score in the combined
+                score (the AI weight is the remainder), defaults to the config's weights
+            export: Export the new results as JSON and CSV
+            
+        Returns:
+            ScanResults with the re-ranked top opportunities
+        """
+        if config is None:
+            config = ScanConfiguration()
+        if store is None:
+            store = config.candidate_store_file
+        if isinstance(store, str):
+            store = CandidateStore.load(store)
+        
+        results = ScanResults(
+            scan_id=f"{store.scan_id}_rescored_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            started_at=datetime.now(),
+            configuration=config,
+            opportunities_found=len(store)
+        )
+        self._attach_iv_surface_cache(config)
+        
+        total_score = store.total_scores(config.scoring_weights)
+        rows = store.rank(total_score, config.min_total_score, config.best_per_symbol_only,
+                          config.max_opportunities)
+        rank_of = {row: i + 1 for i, row in enumerate(rows.tolist())}
+        combined_score = np.full(len(rows), np.nan)
+        
+        if store.has_ai_scores:
+            if traditional_pmcc_weight is None:
+                traditional_weight, ai_weight = config.traditional_pmcc_weight, config.ai_analysis_weight
+            else:
+                traditional_weight, ai_weight = traditional_pmcc_weight, 1.0 - traditional_pmcc_weight
+            rows, combined_score = store.select_ai(
+                rows, total_score, traditional_weight, ai_weight, config.top_n_opportunities,
+                config.min_combined_score, config.min_claude_confidence
+            )
+        
+        candidates = []
+        for row, combined in zip(rows.tolist(), combined_score.tolist()):
+            candidate = self._candidate_from_opportunity(store.opportunity(row, total_score[row]))
+            candidate.rank = rank_of[row]
+            store.apply_ai_results(candidate, row, combined if np.isfinite(combined) else None)
+            candidates.append(candidate)
+        
+        self.last_risk_batch = None
+        if config.perform_scenario_analysis and candidates:
+            self._calculate_risk_batch(candidates, config)
+            self._attach_comprehensive_risk(candidates)
+        
+        results.top_opportunities = candidates
+        results.completed_at = datetime.now()
+        results.total_duration_seconds = (results.completed_at - results.started_at).total_seconds()
+        self.logger.info(
+            f"Rescored {len(store)} candidates of {store.scan_id}: {len(candidates)} selected "
+            f"in {results.total_duration_seconds * 1000:.0f} ms"
+        )
+        
+        if export:
+            try:
+                json_file = self.export_results(results, format="json")
+                csv_file = self.export_results(results, format="csv")
+                self.logger.info(f"Rescored results exported to {json_file} and {csv_file}")
+            except Exception as e:
+                self.logger.warning(f"Error exporting rescored results: {e}")
+        
+        return results
+    
+    def sweep_criteria(self, variants: List[CriteriaVariant], results: Optional[ScanResults] = None,
+                       chains: Optional[Dict[str, 'OptionChain']] = None,
+                       config: Optional[ScanConfiguration] = None) -> List[SweepResult]:
+        """
+        Compare LEAPS / short call criteria variants on already fetched option chains.
+        
+        No provider is called: every variant is evaluated against the same
+        chains in one vectorized pass. Chains only contain the expirations the
+        scan fetched, so variants with wider DTE windows than the scan's
+        criteria are undercounted.
+        
+        Args:
+            variants: Criteria variants to compare, e.g. from CriteriaVariant.grid()
+            results: Scan results whose analyzed_option_chains are swept
+            chains: Symbol -> option chain, used instead of results' chains
+            config: Supplies scoring_weights and min_total_score
+            
+        Returns:
+            One SweepResult per variant
+        """
+        if config is None:
+            config = results.configuration if results and results.configuration else ScanConfiguration()
+        if chains is None:
+            chains = results.analyzed_option_chains if results else {}
+        quotes = {s.symbol: s.quote for s in results.screening_results} if results else None
+        
+        started_at = datetime.now()
+        sweep = CriteriaSweep(config.scoring_weights, config.min_total_score, config.risk_free_rate,
+                              self.iv_surface_cache)
+        sweep_results = sweep.run(chains, variants, quotes)
+        self.logger.info(
+            f"Swept {len(variants)} criteria variants over {len(chains)} option chains "
+            f"in {(datetime.now() - started_at).total_seconds() * 1000:.0f} ms"
+        )
+        return sweep_results
+    
     def export_results(self, results: ScanResults, format: str = "json", 
                       filename: Optional[str] = None, output_dir: str = "data") -> str:
         """
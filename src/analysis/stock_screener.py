@@ -12,6 +12,7 @@ from decimal import Decimal
 from datetime import datetime, timedelta
 
 try:
+    from src.analysis.iv_surface import IVSurfaceCache
     from src.models.api_models import StockQuote, OptionChain, EODHDScreenerResponse
     from src.api.sync_marketdata_client import SyncMarketDataClient as MarketDataClient
     from src.api.eodhd_client import EODHDClient
@@ -20,6 +21,7 @@ except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from analysis.iv_surface import IVSurfaceCache
     from models.api_models import StockQuote, OptionChain, EODHDScreenerResponse
     from api.sync_marketdata_client import SyncMarketDataClient as MarketDataClient
     from api.eodhd_client import EODHDClient
@@ -88,16 +90,19 @@ class StockScreenResult:
 class StockScreener:
     """Screens stocks for PMCC suitability."""
     
-    def __init__(self, api_client: Optional[MarketDataClient], eodhd_client: Optional[EODHDClient] = None):
+    def __init__(self, api_client: Optional[MarketDataClient], eodhd_client: Optional[EODHDClient] = None,
+                 iv_surface_cache: Optional[IVSurfaceCache] = None):
         """
         Initialize with API clients.
         
         Args:
             api_client: Optional MarketData.app client for quotes and options data
             eodhd_client: Optional EODHD client for stock screening
+            iv_surface_cache: Optional IV surface cache supplying IV rank from fetched chains
         """
         self.api_client = api_client
         self.eodhd_client = eodhd_client
+        self.iv_surface_cache = iv_surface_cache
         self.sync_eodhd_client = None  # Will be initialized when needed
         self.logger = logging.getLogger(self.__class__.__name__)
         
@@ -137,9 +142,14 @@ class StockScreener:
         
         results = []
         
+        # Fetch EOD quotes for the whole universe up front when EODHD serves quotes
+        prefetched_quotes = self._prefetch_eodhd_quotes(symbols, quote_source)
+        
         for symbol in symbols:
             try:
-                result = self._screen_single_symbol(symbol, criteria, quote_source)
+                result = self._screen_single_symbol(
+                    symbol, criteria, quote_source, quote=prefetched_quotes.get(symbol)
+                )
                 if result:
                     results.append(result)
             except Exception as e:
@@ -177,10 +187,83 @@ class StockScreener:
         
         return results[:max_results]
     
+    def _uses_eodhd_quotes(self, quote_source: str) -> bool:
+        """Check whether quotes for this quote source will come from EODHD."""
+        if quote_source.lower() == "eodhd":
+            return self.eodhd_client is not None
+        return self.api_client is None and self.eodhd_client is not None
+    
+    def _prefetch_eodhd_quotes(self, symbols: List[str], quote_source: str) -> Dict[str, StockQuote]:
+        """
+        Fetch quotes for all symbols with the EODHD bulk last-day endpoint.
+        
+        Returns an empty dict when EODHD is not the quote source or the bulk
+        request fails, in which case symbols fall back to per-symbol quotes.
+        """
+        if not symbols or not self._uses_eodhd_quotes(quote_source):
+            return {}
+        
+        eodhd_client = self._get_sync_eodhd_client()
+        if not eodhd_client:
+            return {}
+        
+        try:
+            response = eodhd_client.get_stock_quotes_eod_bulk(symbols)
+        except Exception as e:
+            self.logger.warning(f"Bulk EOD quote fetch failed, using per-symbol quotes: {e}")
+            return {}
+        
+        if not response.is_success or not isinstance(response.data, dict):
+            self.logger.warning(f"Bulk EOD quote fetch failed, using per-symbol quotes: {response.error}")
+            return {}
+        
+        self.logger.info(f"Prefetched {len(response.data)}/{len(symbols)} quotes via EODHD bulk EOD")
+        return response.data
+    
     def _screen_single_symbol(self, symbol: str, 
                              criteria: ScreeningCriteria,
-                             quote_source: str = "marketdata") -> Optional[StockScreenResult]:
-        """Screen a single symbol against criteria."""
+                             quote_source: str = "marketdata",
+                             quote: Optional[StockQuote] = None) -> Optional[StockScreenResult]:
+        """Screen a single symbol against criteria, reusing a prefetched quote if given."""
+        
+        if quote is None:
+            quote = self._fetch_quote(symbol, quote_source)
+            if quote is None:
+                return None
+        
+        # Apply basic price filters
+        if not self._check_price_filters(quote, criteria):
+            return None
+        
+        # Get additional market data
+        market_data = self._get_market_data(symbol, quote_source, quote=quote)
+        
+        # Apply all screening filters
+        if not self._check_all_filters(quote, market_data, criteria):
+            return None
+        
+        # Calculate screening score
+        score = self._calculate_screening_score(quote, market_data, criteria)
+        
+        return StockScreenResult(
+            symbol=symbol,
+            quote=quote,
+            market_cap=market_data.get('market_cap'),
+            avg_volume_20d=market_data.get('avg_volume_20d'),
+            iv_rank=market_data.get('iv_rank'),
+            hv_20d=market_data.get('hv_20d'),
+            sma_20=market_data.get('sma_20'),
+            sma_50=market_data.get('sma_50'),
+            rsi=market_data.get('rsi'),
+            has_weekly_options=market_data.get('has_weekly_options', False),
+            has_leaps=market_data.get('has_leaps', False),
+            options_volume=market_data.get('options_volume'),
+            earnings_date=market_data.get('earnings_date'),
+            screening_score=score
+        )
+    
+    def _fetch_quote(self, symbol: str, quote_source: str = "marketdata") -> Optional[StockQuote]:
+        """Fetch a single quote from the appropriate source."""
         
         # Get basic quote data from appropriate source
         quote_response = None
@@ -217,41 +300,8 @@ class StockScreener:
         
         # Convert raw response to StockQuote if needed
         if isinstance(quote_response.data, dict):
-            from src.models.api_models import StockQuote
-            quote = StockQuote.from_api_response(quote_response.data)
-        else:
-            quote = quote_response.data
-        
-        # Apply basic price filters
-        if not self._check_price_filters(quote, criteria):
-            return None
-        
-        # Get additional market data
-        market_data = self._get_market_data(symbol, quote_source)
-        
-        # Apply all screening filters
-        if not self._check_all_filters(quote, market_data, criteria):
-            return None
-        
-        # Calculate screening score
-        score = self._calculate_screening_score(quote, market_data, criteria)
-        
-        return StockScreenResult(
-            symbol=symbol,
-            quote=quote,
-            market_cap=market_data.get('market_cap'),
-            avg_volume_20d=market_data.get('avg_volume_20d'),
-            iv_rank=market_data.get('iv_rank'),
-            hv_20d=market_data.get('hv_20d'),
-            sma_20=market_data.get('sma_20'),
-            sma_50=market_data.get('sma_50'),
-            rsi=market_data.get('rsi'),
-            has_weekly_options=market_data.get('has_weekly_options', False),
-            has_leaps=market_data.get('has_leaps', False),
-            options_volume=market_data.get('options_volume'),
-            earnings_date=market_data.get('earnings_date'),
-            screening_score=score
-        )
+            return StockQuote.from_api_response(quote_response.data)
+        return quote_response.data
     
     def _check_price_filters(self, quote: StockQuote, 
                            criteria: ScreeningCriteria) -> bool:
@@ -271,8 +321,9 @@ class StockScreener:
         
         return True
     
-    def _get_market_data(self, symbol: str, quote_source: str = "marketdata") -> Dict[str, Any]:
-        """Get additional market data for screening."""
+    def _get_market_data(self, symbol: str, quote_source: str = "marketdata",
+                         quote: Optional[StockQuote] = None) -> Dict[str, Any]:
+        """Get additional market data for screening, reusing the screened quote if given."""
         market_data = {}
         
         try:
@@ -280,32 +331,10 @@ class StockScreener:
             # For now, using placeholder logic
             
             # Market cap estimation (simplified) - reuse the same quote logic
-            quote_response = None
-            if quote_source.lower() == "eodhd":
-                eodhd_client = self._get_sync_eodhd_client()
-                if not eodhd_client and self.api_client:
-                    # Fall back to MarketData if EODHD not available
-                    quote_response = self.api_client.get_quote(symbol)
-                elif eodhd_client:
-                    quote_response = eodhd_client.get_stock_quote_eod(symbol)
-            else:
-                # Default to MarketData client
-                if self.api_client:
-                    quote_response = self.api_client.get_quote(symbol)
-                elif self.eodhd_client:
-                    # Fall back to EODHD if MarketData not available
-                    eodhd_client = self._get_sync_eodhd_client()
-                    if eodhd_client:
-                        quote_response = eodhd_client.get_stock_quote_eod(symbol)
+            if quote is None:
+                quote = self._fetch_quote(symbol, quote_source)
             
-            if quote_response and quote_response.is_success and quote_response.data:
-                # Convert raw response to StockQuote if needed
-                if isinstance(quote_response.data, dict):
-                    from src.models.api_models import StockQuote
-                    quote = StockQuote.from_api_response(quote_response.data)
-                else:
-                    quote = quote_response.data
-                
+            if quote is not None:
                 if quote.last:
                     # Rough estimate - would need shares outstanding from fundamentals API
                     estimated_market_cap = quote.last * Decimal('100000000')  # Placeholder
@@ -333,7 +362,7 @@ class StockScreener:
             # Technical indicators (would be calculated from historical data)
             market_data.update({
                 'avg_volume_20d': None,  # Would calculate from historical data
-                'iv_rank': None,  # Would calculate from IV history
+                'iv_rank': self._get_iv_rank(symbol, options_response, quote),
                 'hv_20d': None,  # Would calculate from price history
                 'sma_20': None,  # Would calculate from price history
                 'sma_50': None,  # Would calculate from price history
@@ -346,6 +375,14 @@ class StockScreener:
         
         return market_data
     
+    def _get_iv_rank(self, symbol: str, options_response, quote: Optional[StockQuote]) -> Optional[Decimal]:
+        """IV rank from the fetched chain's IV surface and the cached ATM IV history."""
+        if self.iv_surface_cache is None:
+            return None
+        if options_response and options_response.is_success and options_response.data:
+            self.iv_surface_cache.get_or_build(options_response.data, quote.last if quote else None)
+        return self.iv_surface_cache.iv_rank(symbol)
+    
     def _check_has_leaps(self, options_data: OptionChain) -> bool:
         """Check if stock has LEAPS available."""
         if not options_data.contracts:
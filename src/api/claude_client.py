@@ -17,21 +17,193 @@ import logging
 import os
 import json
 import time
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 from decimal import Decimal
 from datetime import datetime, date, timedelta
 
 import anthropic
 from anthropic import AsyncAnthropic
-from anthropic.types import Message
+from anthropic.types import Message, TextBlock
 
 from src.models.api_models import (
     APIResponse, APIError, APIStatus, RateLimitHeaders, EnhancedStockData,
     ClaudeAnalysisResponse, PMCCOpportunityAnalysis
 )
+from src.api.claude_rate_limiter import ClaudeRateLimiter, RateLimitReservation
+from src.api.claude_response_cache import ClaudeResponseCache
+from src.api.streaming_json import StreamingJSONObject
+from src.api.prompt_compaction import (
+    PromptCompactor, PromptCompactionReport, PromptSection,
+    DEFAULT_TOTAL_BUDGET, NEWS_ARTICLE_MAX_TOKENS, TRUNCATION_MARKER, estimate_tokens, summarize_series
+)
 
 logger = logging.getLogger(__name__)
 
+# Packed batch defaults: data token budget per request, opportunities per
+# request and output tokens reserved for each opportunity's JSON analysis
+DEFAULT_BATCH_TOKEN_BUDGET = 12000
+DEFAULT_MAX_BATCH_SIZE = 5
+BATCH_OUTPUT_TOKENS_PER_OPPORTUNITY = 800
+
+# Fields a streamed single-opportunity analysis must contain before the
+# stream can be closed early: everything notifications render. The trailing
+# management_strategy, entry_timing, exit_conditions and position_sizing
+# fields are dropped from early-stopped analyses.
+STREAM_STOP_FIELDS = ('symbol', 'pmcc_score', 'recommendation', 'confidence_level', 'key_risks',
+                      'key_opportunities')
+
+
+# Scoring rubric shared by single and batched opportunity prompts
+PMCC_SCORING_GUIDE = """## SCORING FRAMEWORK (0-100 Total)
+
+**1. EXECUTION RISK (30 points)**
+- Liquidity Quality: Bid/ask spreads, volume, open interest for both legs
+- Greeks Alignment: Delta positioning, theta decay optimization, vega risk
+- Strike Selection: LEAPS depth ITM, short call distance OTM
+- Spread Management: Ability to adjust, roll, or close positions
+
+**2. FINANCIAL STABILITY (25 points)**
+- Cash Flow Health: Free cash flow generation, operating cash trends
+- Balance Sheet Strength: Debt levels, working capital, financial flexibility
+- Earnings Quality: Profit margins, revenue growth sustainability
+- Survival Probability: Ability to weather 6-12 month holding period
+
+**3. CALENDAR & EVENT RISK (25 points)**
+- Dividend Timing: Ex-dividend dates relative to short expiration cycles
+- Earnings Proximity: Volatility impact, early assignment risk
+- Economic Sensitivity: Sector exposure to macro events, tariffs, policy changes
+- Volatility Events: Known catalysts that could disrupt strategy
+
+**4. TECHNICAL SETUP (20 points)**
+- Entry Timing: Current price relative to support/resistance, trend
+- Volatility Environment: IV vs HV, volatility term structure
+- Momentum Indicators: RSI, trend strength, reversal signals
+- Risk/Reward Profile: Probability-weighted return expectations
+
+## CRITICAL PMCC CONSIDERATIONS
+
+**RED FLAGS (Avoid if present):**
+- LEAPS volume < 10 or extremely wide spreads
+- Company burning cash with high debt loads
+- Ex-dividend date within 45 days of short expiration
+- Earnings within 7 days of short expiration
+- Sector in severe distress or regulatory pressure
+
+**GREEN FLAGS (Favorable conditions):**
+- Stable/growing free cash flow with manageable debt
+- Technical oversold condition with solid fundamentals
+- High implied volatility environment with mean reversion potential
+- Strong options liquidity with tight spreads
+- Clear catalyst for recovery during LEAPS holding period
+
+"""
+
+# Per-opportunity JSON fields Claude must return, after "symbol"
+PMCC_ANALYSIS_JSON_FIELDS = '''"pmcc_score": 0,
+"execution_risk_score": 0,
+"financial_stability_score": 0,
+"calendar_event_score": 0,
+"technical_setup_score": 0,
+"recommendation": "buy/hold/avoid",
+"confidence_level": 0,
+"key_risks": ["risk1", "risk2", "risk3"],
+"key_opportunities": ["opp1", "opp2", "opp3"],
+"management_strategy": "Specific guidance for position management",
+"entry_timing": "Immediate/Wait for X condition/Avoid",
+"exit_conditions": ["condition1", "condition2"],
+"position_sizing": "X% of portfolio based on risk profile"'''
+
+# Closing instructions shared by single and batched opportunity prompts
+PMCC_ANALYSIS_INSTRUCTIONS = """## ANALYSIS INSTRUCTIONS
+
+1. **Prioritize PMCC-specific factors** over general stock analysis
+2. **Quantify risks with specific dates and probabilities** when possible
+3. **Focus on 3-6 month time horizon** matching typical PMCC holding periods
+4. **Consider position sizing implications** based on liquidity and volatility
+5. **Provide actionable management guidance** for different market scenarios
+6. **Weight recent news and events** more heavily than historical data
+7. **Account for current market regime** in volatility and sentiment analysis
+
+**Critical**: Base your analysis strictly on the provided comprehensive dataset."""
+
+# How the per-opportunity dataset is laid out and how to read gaps in it
+PMCC_DATASET_GUIDE = f"""## DATASET LAYOUT
+
+Each opportunity starts with a "## PMCC OPPORTUNITY: SYMBOL" heading followed by:
+
+- **STRATEGY SETUP**: stock price and daily range, net debit, and strike, expiration, DTE and delta of the LEAPS (long leg) and the short call
+- **LIQUIDITY ASSESSMENT**: volume, open interest and bid/ask of both legs
+- **COMPREHENSIVE ANALYSIS DATA**: the sections available for the symbol, such as company overview, financial health, valuation, balance sheet, cash flow, income statement, technical indicators, moving averages, historical price trends, options analysis, risk assessment, dividend and calendar risk, earnings calendar, analyst and market sentiment, recent news and economic context
+- **DATA COMPLETENESS**: a completeness score and the list of sources that returned data
+
+Reading the data:
+- Sections and fields without data are omitted rather than shown as zero; treat a missing section as unknown, not as favorable or unfavorable, and lower your confidence_level accordingly
+- Long sections are trimmed to fit a token budget: items ending in "{TRUNCATION_MARKER.strip()}" were cut, and long price and indicator series are summarized (first, last, min, max, trend)
+- Percentages are already scaled (0.75% means 0.75 percent); prices are in USD
+- Dates are ISO (YYYY-MM-DD); compare ex-dividend and earnings dates against the short call expiration in STRATEGY SETUP
+
+"""
+
+# Response shape for single and packed (several opportunities) requests
+PMCC_REQUEST_FORMAT = """## SINGLE AND PACKED REQUESTS
+
+A request contains either one opportunity or several opportunities separated by "---" lines.
+
+- **One opportunity**: respond only with its analysis object
+- **Several opportunities**: respond only with a single JSON object keyed by symbol, with one analysis object for every symbol listed in the request, for example {"AAPL": {"symbol": "AAPL", "pmcc_score": 0, ...}, "MSFT": {"symbol": "MSFT", ...}}
+- Analyze and score every opportunity independently on its own data; never compare opportunities or let one symbol's data influence another's scores
+- pmcc_score and confidence_level range from 0 to 100; the four component scores use the point ranges of the scoring framework (execution risk 0-30, financial stability 0-25, calendar and event risk 0-25, technical setup 0-20), higher meaning more favorable
+- recommendation is exactly one of "buy", "hold" or "avoid"
+- Output valid JSON only: no markdown code fences, comments, trailing commas or text before or after the JSON
+
+"""
+
+# Static system block for single and packed opportunity requests. It is sent
+# ahead of the per-symbol data and marked for provider-side prompt caching,
+# so it must not contain anything that varies between requests.
+PMCC_ANALYST_SYSTEM_PROMPT = f"""You are an expert options strategist specializing in Poor Man's Covered Call (PMCC) analysis. You analyze PMCC opportunities using the comprehensive dataset provided for each one and score each from 0-100.
+
+{PMCC_SCORING_GUIDE}{PMCC_DATASET_GUIDE}## RESPONSE FORMAT
+
+Each opportunity's analysis is a JSON object with this exact structure:
+
+{{
+"symbol": "SYMBOL",
+{PMCC_ANALYSIS_JSON_FIELDS}
+}}
+
+{PMCC_REQUEST_FORMAT}{PMCC_ANALYSIS_INSTRUCTIONS}"""
+
+# Smallest prompt prefix (in tokens) the API caches for Sonnet models; the
+# system block above must stay longer than this to get cache hits
+MIN_CACHEABLE_PROMPT_TOKENS = 1024
+
+# Price per token in USD (Claude 3.5 Sonnet). Cache writes cost 1.25x and
+# cache reads 0.1x the base input price.
+INPUT_TOKEN_COST = 0.000003
+OUTPUT_TOKEN_COST = 0.000015
+CACHE_WRITE_TOKEN_COST = 0.00000375
+CACHE_READ_TOKEN_COST = 0.0000003
+
+
+def estimate_usage_cost(usage: Dict[str, Any]) -> float:
+    """Estimate the USD cost of a request from its usage counts."""
+    return (
+        (usage.get('input_tokens') or 0) * INPUT_TOKEN_COST
+        + (usage.get('output_tokens') or 0) * OUTPUT_TOKEN_COST
+        + (usage.get('cache_creation_input_tokens') or 0) * CACHE_WRITE_TOKEN_COST
+        + (usage.get('cache_read_input_tokens') or 0) * CACHE_READ_TOKEN_COST
+    )
+
+
+def usage_to_dict(usage: Any) -> Dict[str, int]:
+    """Convert an API usage object to a dict including prompt cache counts."""
+    counts = {'input_tokens': usage.input_tokens, 'output_tokens': usage.output_tokens}
+    for key in ('cache_creation_input_tokens', 'cache_read_input_tokens'):
+        value = getattr(usage, key, None)
+        counts[key] = value if isinstance(value, int) else 0
+    return counts
+
 
 class ClaudeError(Exception):
     """Base exception for Claude API errors."""
@@ -73,7 +245,14 @@ class ClaudeClient:
                  temperature: float = 0.1,
                  timeout: float = 60.0,
                  max_retries: int = 3,
-                 retry_backoff: float = 1.0):
+                 retry_backoff: float = 1.0,
+                 response_cache: Optional[ClaudeResponseCache] = None,
+                 prompt_token_budget: int = DEFAULT_TOTAL_BUDGET,
+                 prompt_caching_enabled: bool = True,
+                 rate_limiter: Optional[ClaudeRateLimiter] = None,
+                 streaming_enabled: bool = False,
+                 stream_early_stop: bool = False,
+                 anthropic_client: Optional[Any] = None):
         """
         Initialize Claude API client.
         
@@ -85,6 +264,15 @@ class ClaudeClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             retry_backoff: Initial backoff delay for retries (exponential backoff)
+            response_cache: Optional persistent cache for identical requests
+            prompt_token_budget: Estimated token budget for prompt data sections
+            prompt_caching_enabled: Mark the static system block for provider-side prompt caching
+            rate_limiter: Optional RPM/TPM scheduler that paces requests before dispatch
+            streaming_enabled: Stream responses and record time-to-first-token metrics
+            stream_early_stop: Close a streamed single-opportunity response once
+                STREAM_STOP_FIELDS are complete
+            anthropic_client: Optional object used instead of AsyncAnthropic, e.g. a
+                local ClaudeStandIn for offline benchmarks
         """
         # API configuration
         self.api_key = api_key or os.getenv('CLAUDE_API_KEY')
@@ -97,9 +285,17 @@ class ClaudeClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_backoff = retry_backoff
+        self.response_cache = response_cache
+        self.prompt_compactor = PromptCompactor(total_budget=prompt_token_budget)
+        self.prompt_caching_enabled = prompt_caching_enabled
+        # API token count of the cached system block, checked on the first health check
+        self.system_prompt_tokens: Optional[int] = None
+        self.rate_limiter = rate_limiter
+        self.streaming_enabled = streaming_enabled
+        self.stream_early_stop = stream_early_stop
         
         # Initialize client
-        self.client = AsyncAnthropic(api_key=self.api_key)
+        self.client = anthropic_client or AsyncAnthropic(api_key=self.api_key)
         
         # Request statistics
         self._stats = {
@@ -108,7 +304,18 @@ class ClaudeClient:
             'failed_requests': 0,
             'total_input_tokens': 0,
             'total_output_tokens': 0,
-            'total_cost_estimate': 0.0
+            'total_cache_creation_input_tokens': 0,
+            'total_cache_read_input_tokens': 0,
+            'total_cost_estimate': 0.0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'streamed_requests': 0,
+            'early_stopped_requests': 0,
+            'total_time_to_first_token_ms': 0.0,
+            'total_streamed_output_tokens': 0,
+            'total_generation_seconds': 0.0,
+            'prompt_tokens_before_compaction': 0,
+            'prompt_tokens_after_compaction': 0
         }
         
         logger.info(f"Claude client initialized with model: {self.model}")
@@ -194,20 +401,27 @@ class ClaudeClient:
         
         try:
             # Build the single opportunity analysis prompt
-            prompt = self._build_single_opportunity_prompt(
+            prompt, compaction = self._build_compacted_single_opportunity_prompt(
                 opportunity_data, enhanced_stock_data, market_context
             )
+            self._stats['prompt_tokens_before_compaction'] += compaction.original_tokens
+            self._stats['prompt_tokens_after_compaction'] += compaction.compacted_tokens
             
             # Execute the analysis with retry logic
             start_time = time.time()
-            response = await self._execute_with_retry(prompt)
+            response = await self._execute_with_retry(
+                prompt, system=PMCC_ANALYST_SYSTEM_PROMPT,
+                stop_fields=STREAM_STOP_FIELDS if self.stream_early_stop else None,
+                expected_output_tokens=BATCH_OUTPUT_TOKENS_PER_OPPORTUNITY
+            )
             processing_time_ms = (time.time() - start_time) * 1000
             
             # Parse the response for single opportunity
             analysis_response = self._parse_single_opportunity_response(response, processing_time_ms)
             
             # Add the full prompt to the response for debugging
-            analysis_response['_debug_prompt'] = prompt
+            analysis_response['_debug_prompt'] = f"{PMCC_ANALYST_SYSTEM_PROMPT}\n\n{prompt}"
+            analysis_response['prompt_compaction'] = compaction.to_dict()
             
             # Update statistics
             self._update_stats(response, success=True)
@@ -229,6 +443,151 @@ class ClaudeClient:
                 )
             )
     
+    async def analyze_opportunities_batch(
+        self,
+        requests: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        market_context: Optional[Dict[str, Any]] = None,
+        batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ) -> Dict[str, APIResponse]:
+        """
+        Analyze several PMCC opportunities with packed multi-opportunity requests.
+        
+        Opportunities are grouped into requests of at most max_batch_size whose
+        data sections fit batch_token_budget, sharing the scoring instructions
+        and market context. Symbols missing or invalid in a batch response, or
+        in a batch that fails outright, are retried with individual requests.
+        
+        Args:
+            requests: (opportunity_data, enhanced_stock_data) pairs, one per symbol
+            market_context: Optional market context information
+            batch_token_budget: Estimated token budget for one batch's data sections
+            max_batch_size: Maximum opportunities per request
+            
+        Returns:
+            Dict of symbol -> APIResponse, shaped like analyze_single_opportunity results
+        """
+        entries = []
+        for opportunity_data, enhanced_stock_data in requests:
+            if not opportunity_data or not enhanced_stock_data:
+                continue
+            data_sections, data_summary, compaction = self._build_opportunity_data_sections(
+                opportunity_data, enhanced_stock_data, market_context
+            )
+            self._stats['prompt_tokens_before_compaction'] += compaction.original_tokens
+            self._stats['prompt_tokens_after_compaction'] += compaction.compacted_tokens
+            entries.append({
+                'symbol': opportunity_data.get('symbol', 'Unknown'),
+                'opportunity_data': opportunity_data,
+                'enhanced_stock_data': enhanced_stock_data,
+                'data_block': f"{data_sections}\n\n**COMPREHENSIVE DATA ANALYSIS:**\n{data_summary}",
+                'compaction': compaction
+            })
+        
+        results: Dict[str, APIResponse] = {}
+        fallback = []
+        
+        for batch in self._pack_batches(entries, batch_token_budget, max_batch_size):
+            if len(batch) == 1:
+                fallback.extend(batch)
+                continue
+            
+            batch_results = await self._analyze_packed_batch(batch)
+            for entry in batch:
+                if entry['symbol'] in batch_results:
+                    results[entry['symbol']] = batch_results[entry['symbol']]
+                else:
+                    fallback.append(entry)
+        
+        if fallback:
+            logger.info(f"Analyzing {len(fallback)} opportunities with individual requests")
+        for entry in fallback:
+            results[entry['symbol']] = await self.analyze_single_opportunity(
+                entry['opportunity_data'], entry['enhanced_stock_data'], market_context
+            )
+        
+        return results
+    
+    @staticmethod
+    def _pack_batches(entries: List[Dict[str, Any]], token_budget: int,
+                      max_batch_size: int) -> List[List[Dict[str, Any]]]:
+        """Greedily group entries in order so each batch fits the token budget and size limit."""
+        batches: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_tokens = 0
+        
+        for entry in entries:
+            entry_tokens = estimate_tokens(entry['data_block'])
+            if current and (len(current) >= max_batch_size or current_tokens + entry_tokens > token_budget):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(entry)
+            current_tokens += entry_tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _analyze_packed_batch(self, batch: List[Dict[str, Any]]) -> Dict[str, APIResponse]:
+        """Send one packed request and split it into per-symbol responses; failed symbols are omitted."""
+        symbols = [entry['symbol'] for entry in batch]
+        prompt = self._build_batch_opportunity_prompt(batch)
+        max_tokens = max(self.max_tokens, BATCH_OUTPUT_TOKENS_PER_OPPORTUNITY * len(batch))
+        
+        try:
+            start_time = time.time()
+            response = await self._execute_with_retry(
+                prompt, max_tokens=max_tokens, system=PMCC_ANALYST_SYSTEM_PROMPT,
+                expected_output_tokens=BATCH_OUTPUT_TOKENS_PER_OPPORTUNITY * len(batch)
+            )
+            processing_time_ms = (time.time() - start_time) * 1000
+        except Exception as e:
+            logger.warning(f"Packed Claude request for {symbols} failed, falling back to individual requests: {e}")
+            self._update_stats(None, success=False)
+            return {}
+        
+        self._update_stats(response, success=True)
+        
+        results = {}
+        parsed = []
+        for entry in batch:
+            try:
+                analysis = self._parse_single_opportunity_response(
+                    response, processing_time_ms, symbol=entry['symbol']
+                )
+            except ClaudeError as e:
+                logger.warning(f"Packed Claude response unusable for {entry['symbol']}: {e}")
+                continue
+            analysis['_debug_prompt'] = f"{PMCC_ANALYST_SYSTEM_PROMPT}\n\n{prompt}"
+            analysis['prompt_compaction'] = entry['compaction'].to_dict()
+            analysis['batch_size'] = len(batch)
+            parsed.append(analysis)
+            results[entry['symbol']] = APIResponse(status=APIStatus.OK, data=analysis)
+        
+        # Attribute the shared request's usage evenly so per-symbol cost sums to the total
+        if parsed and 'usage' in parsed[0]:
+            for key in ('input_tokens', 'output_tokens',
+                        'cache_creation_input_tokens', 'cache_read_input_tokens'):
+                total = parsed[0]['usage'][key]
+                share, remainder = divmod(total, len(parsed))
+                for i, analysis in enumerate(parsed):
+                    analysis['usage'] = {**analysis['usage'], key: share + (1 if i < remainder else 0)}
+        
+        logger.info(f"Packed Claude request analyzed {len(results)}/{len(batch)} opportunities: {symbols}")
+        return results
+    
+    def _build_batch_opportunity_prompt(self, batch: List[Dict[str, Any]]) -> str:
+        """Build one prompt covering several opportunities with shared instructions."""
+        symbols = [entry['symbol'] for entry in batch]
+        example = symbols[0]
+        data_blocks = "\n\n---\n\n".join(entry['data_block'] for entry in batch)
+        
+        return f"""Analyze these {len(batch)} PMCC opportunities: {', '.join(symbols)}.
+
+{data_blocks}
+
+Respond with one JSON object keyed by symbol, starting with "{example}"."""
+    
     def _build_pmcc_analysis_prompt(
         self, 
         enhanced_stock_data: List[EnhancedStockData],
@@ -309,6 +668,59 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         market_context: Optional[Dict[str, Any]] = None
     ) -> str:
         """Build the analysis prompt for a single PMCC opportunity using new template."""
+        prompt, _ = self._build_compacted_single_opportunity_prompt(
+            opportunity_data, enhanced_stock_data, market_context
+        )
+        return prompt
+    
+    def _build_compacted_single_opportunity_prompt(
+        self,
+        opportunity_data: Dict[str, Any],
+        enhanced_stock_data: Dict[str, Any],
+        market_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, PromptCompactionReport]:
+        """
+        Build the single opportunity prompt with its data sections fitted to the token budget.
+        
+        Returns:
+            Tuple of (prompt, compaction report for the data sections)
+        """
+        symbol = opportunity_data.get('symbol', 'Unknown')
+        data_sections, data_summary, compaction = self._build_opportunity_data_sections(
+            opportunity_data, enhanced_stock_data, market_context
+        )
+        
+        # Build the variable part of the prompt; rubric and response format are in the system block
+        prompt = f"""Analyze this PMCC opportunity: {symbol}.
+
+{data_sections}
+
+**COMPREHENSIVE DATA ANALYSIS:**
+{data_summary}
+
+Respond with the JSON analysis object for {symbol}."""
+        
+        # LOG: Final prompt (truncated for logging)
+        logger.info("=== FINAL PROMPT (first 1000 chars) ===")
+        logger.info(prompt[:1000])
+        logger.info("=== FINAL PROMPT (last 1000 chars) ===")
+        logger.info(prompt[-1000:])
+        logger.info(f"Total prompt length: {len(prompt)} characters")
+        
+        return prompt, compaction
+    
+    def _build_opportunity_data_sections(
+        self,
+        opportunity_data: Dict[str, Any],
+        enhanced_stock_data: Dict[str, Any],
+        market_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str, PromptCompactionReport]:
+        """
+        Build the compacted data sections describing one PMCC opportunity.
+        
+        Returns:
+            Tuple of (data sections text, data coverage summary, compaction report)
+        """
         
         # LOG: Enhanced stock data structure
         logger.info("=== CLAUDE PROMPT DEBUG: ENHANCED STOCK DATA ===")
@@ -1099,6 +1511,20 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
                 if recent_volumes:
                     avg_volume = sum(recent_volumes) / len(recent_volumes)
                     historical_fields.append(f"5-Day Avg Volume: {avg_volume:,.0f}")
+            
+            # Summarize the full series instead of listing older bars
+            closes = [p.get('adjusted_close') for p in reversed(sorted_prices) if p.get('adjusted_close')]
+            if len(closes) > len(recent_prices):
+                daily_returns = [closes[i] / closes[i - 1] - 1 for i in range(1, len(closes))]
+                close_stats = summarize_series(closes)
+                return_stats = summarize_series(daily_returns)
+                period_return = (close_stats['last'] / close_stats['first'] - 1) * 100
+                realized_vol = return_stats['stdev'] * (252 ** 0.5) * 100
+                historical_fields.append(
+                    f"{close_stats['count']}-Day Stats: Return {period_return:+.1f}%, "
+                    f"Range ${close_stats['min']:.2f} - ${close_stats['max']:.2f}, "
+                    f"Realized Vol {realized_vol:.1f}%"
+                )
         
         # Build enhanced technical indicators section (from technical_indicators data)
         enhanced_technical_fields = []
@@ -1221,7 +1647,6 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
             event_date_str = event.get('report_date') or event.get('date') or event.get('event_date', '')
             if event_date_str:
                 try:
-                    from datetime import datetime
                     if isinstance(event_date_str, str):
                         event_date = datetime.fromisoformat(event_date_str.replace('Z', '+00:00')).date()
                     else:
@@ -1237,9 +1662,30 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         
         sorted_earnings = sorted(sorted_earnings, key=lambda x: x['parsed_date'])
         
-        # Format earnings calendar with actual vs estimate comparisons
+        # Summarize the full EPS surprise history so the listing below can be trimmed
         today = datetime.now().date()
-        for event in sorted_earnings[:10]:  # Limit to 10 most relevant
+        eps_surprises = []
+        for event in sorted_earnings:
+            if event['parsed_date'] >= today:
+                continue
+            eps_actual = get_meaningful_value(event.get('eps_actual') or event.get('actual_eps'))
+            eps_estimate = get_meaningful_value(event.get('eps_estimate') or event.get('estimated_eps'))
+            if eps_actual and eps_estimate:
+                eps_surprises.append(((eps_actual - eps_estimate) / abs(eps_estimate)) * 100)
+        
+        surprise_stats = summarize_series(eps_surprises)
+        if surprise_stats and surprise_stats['count'] >= 2:
+            beats = sum(1 for surprise in eps_surprises if surprise > 0)
+            earnings_calendar_items.append(
+                f"• EPS History: beat {beats} of {surprise_stats['count']} quarters, "
+                f"avg surprise {surprise_stats['mean']:+.1f}% (range {surprise_stats['min']:+.1f}% to {surprise_stats['max']:+.1f}%)"
+            )
+        
+        # Format earnings calendar with actual vs estimate comparisons, upcoming
+        # first and then most recent, so budget trimming drops the oldest quarters
+        upcoming_earnings = [e for e in sorted_earnings if e['parsed_date'] >= today]
+        past_earnings = [e for e in sorted_earnings if e['parsed_date'] < today]
+        for event in (upcoming_earnings + past_earnings[::-1])[:10]:  # Limit to 10 most relevant
             event_date = event['parsed_date']
             days_diff = (event_date - today).days
             
@@ -1322,19 +1768,19 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
                     earnings_info.append(f"Next Earnings: {next_earn['parsed_date']}")
         
         # Format news articles (full content, no sentiment)
-        full_news_articles = ""
+        news_items = []
         if news:
             for i, article in enumerate(news[:5], 1):  # Limit to 5 articles
-                full_news_articles += f"\n\n**Article {i}:**\n"
-                full_news_articles += f"Date: {article.get('date', 'N/A')}\n"
-                full_news_articles += f"Title: {article.get('title', 'N/A')}\n"
+                news_item = f"**Article {i}:**\n"
+                news_item += f"Date: {article.get('date', 'N/A')}\n"
+                news_item += f"Title: {article.get('title', 'N/A')}"
                 if article.get('content'):
-                    full_news_articles += f"{article['content']}\n"
+                    news_item += f"\n{article['content']}"
+                news_items.append(news_item)
         else:
-            full_news_articles = "\nNo recent news available."
+            news_items.append("No recent news available.")
         
         # Build detailed economic events section
-        economic_events_summary = ""
         economic_events_detailed = []
         
         if economic:
@@ -1369,18 +1815,6 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
                             event_desc += f" [{', '.join(details)}]"
                     
                     economic_events_detailed.append(event_desc)
-            
-            # Create summary for main section (limit to 5)
-            summary_events = []
-            for event in economic[:5]:
-                if event.get('event') and event.get('date'):
-                    impact_label = event.get('impact', 'medium').lower()
-                    summary_events.append(f"- {event['date']}: {event['event']} ({event.get('country', 'N/A')}) - {impact_label}")
-            
-            economic_events_summary = "\n".join(summary_events) if summary_events else "No upcoming economic events"
-            
-        else:
-            economic_events_summary = "No upcoming economic events"
         
         # Extract market sentiment and context data
         market_sentiment_data = enhanced_stock_data.get('market_sentiment', {})
@@ -1472,7 +1906,7 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         stock_low = quote_data.get('low', 0)
         stock_open = quote_data.get('open', 0)
         
-        prompt_sections.append(f"""## PMCC OPPORTUNITY: {symbol}
+        prompt_sections.append(PromptSection('strategy', None, [f"""## PMCC OPPORTUNITY: {symbol}
 
 **STRATEGY SETUP:**
 - Current Stock Price: ${underlying_price}
@@ -1487,7 +1921,7 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
 - LEAPS: Volume {leaps_volume} | OI {leaps_oi} | Bid/Ask: ${leaps_bid:.2f}/${leaps_ask:.2f}
 - Short Call: Volume {short_volume} | OI {short_oi} | Bid/Ask: ${short_bid:.2f}/${short_ask:.2f}
 
-## COMPREHENSIVE ANALYSIS DATA""")
+## COMPREHENSIVE ANALYSIS DATA"""], priority=0, required=True))
         
         # LOG: Section building tracking
         logger.info("=== SECTION BUILDING TRACKING ===")
@@ -1497,41 +1931,29 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         if company_fields:
             sections_included.append(f"Company Overview ({len(company_fields)} fields)")
             logger.info(f"Including Company Overview: {company_fields}")
-            prompt_sections.append(f"""
-**COMPANY OVERVIEW:**
-- {' | '.join(company_fields)}""")
+            prompt_sections.append(PromptSection('company', "COMPANY OVERVIEW", company_fields, priority=3))
         
         # Financial health section (if any meaningful data)
         if financial_fields:
             sections_included.append(f"Financial Health ({len(financial_fields)} fields)")
             logger.info(f"Including Financial Health: {financial_fields}")
-            prompt_sections.append(f"""
-**FINANCIAL HEALTH:**
-- {' | '.join(financial_fields)}""")
+            prompt_sections.append(PromptSection('financial_health', "FINANCIAL HEALTH", financial_fields, priority=2))
         
         # Valuation section (if any meaningful data)
         if valuation_fields:
-            prompt_sections.append(f"""
-**VALUATION METRICS:**
-- {' | '.join(valuation_fields)}""")
+            prompt_sections.append(PromptSection('valuation', "VALUATION METRICS", valuation_fields, priority=3))
         
         # Historical prices section (if any meaningful data)
         if historical_fields:
-            prompt_sections.append(f"""
-**HISTORICAL PRICE TRENDS:**
-- {' | '.join(historical_fields)}""")
+            prompt_sections.append(PromptSection('historical_prices', "HISTORICAL PRICE TRENDS", historical_fields, priority=4))
         
         # Technical indicators section (if any meaningful data)
         if technical_fields:
-            prompt_sections.append(f"""
-**TECHNICAL INDICATORS (BASIC):**
-- {' | '.join(technical_fields)}""")
+            prompt_sections.append(PromptSection('technical', "TECHNICAL INDICATORS (BASIC)", technical_fields, priority=4))
         
         # Enhanced technical indicators section (if any meaningful data)
         if enhanced_technical_fields:
-            prompt_sections.append(f"""
-**TECHNICAL INDICATORS (ADVANCED):**
-- {' | '.join(enhanced_technical_fields)}""")
+            prompt_sections.append(PromptSection('technical_advanced', "TECHNICAL INDICATORS (ADVANCED)", enhanced_technical_fields, priority=5))
         
         # Build comprehensive options analysis section with extended options data
         options_analysis_fields = []
@@ -1708,43 +2130,31 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         
         # Enhanced options market analysis section (if any meaningful data)
         if options_data_fields:
-            prompt_sections.append(f"""
-**COMPREHENSIVE OPTIONS ANALYSIS:**
-- {' | '.join(options_data_fields)}""")
+            prompt_sections.append(PromptSection('options_analysis', "COMPREHENSIVE OPTIONS ANALYSIS", options_data_fields, priority=1, required=True))
         
         # Risk assessment section (if any meaningful data)
         if risk_metrics_fields:
-            prompt_sections.append(f"""
-**RISK ASSESSMENT:**
-- {' | '.join(risk_metrics_fields)}""")
+            prompt_sections.append(PromptSection('risk', "RISK ASSESSMENT", risk_metrics_fields, priority=2, required=True))
         
         # Balance sheet section (if any meaningful data)
         if balance_sheet_fields:
-            prompt_sections.append(f"""
-**BALANCE SHEET STRENGTH:**
-- {' | '.join(balance_sheet_fields)}""")
+            prompt_sections.append(PromptSection('balance_sheet', "BALANCE SHEET STRENGTH", balance_sheet_fields, priority=4))
         
         # Cash flow section (if any meaningful data)
         if cash_flow_fields:
-            prompt_sections.append(f"""
-**CASH FLOW ANALYSIS:**
-- {' | '.join(cash_flow_fields)}""")
+            prompt_sections.append(PromptSection('cash_flow', "CASH FLOW ANALYSIS", cash_flow_fields, priority=4))
         
         # Share structure section (if any meaningful data)
         if share_structure_fields:
             sections_included.append(f"Share Structure ({len(share_structure_fields)} fields)")
             logger.info(f"Including Share Structure: {share_structure_fields}")
-            prompt_sections.append(f"""
-**SHARE STRUCTURE:**
-- {' | '.join(share_structure_fields)}""")
+            prompt_sections.append(PromptSection('share_structure', "SHARE STRUCTURE", share_structure_fields, priority=6))
         
         # Moving averages section (if any meaningful data)
         if moving_averages_fields:
             sections_included.append(f"Moving Averages ({len(moving_averages_fields)} fields)")
             logger.info(f"Including Moving Averages: {moving_averages_fields}")
-            prompt_sections.append(f"""
-**MOVING AVERAGES:**
-- {' | '.join(moving_averages_fields)}""")
+            prompt_sections.append(PromptSection('moving_averages', "MOVING AVERAGES", moving_averages_fields, priority=6))
         
         # Income statement section with quarter date and EPS estimates
         income_statement_fields = []
@@ -1813,9 +2223,7 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
                 income_statement_fields.append(f"EBITDA: ${ebitda:.0f}M")
         
         if income_statement_fields:
-            prompt_sections.append(f"""
-**INCOME STATEMENT:**
-- {' | '.join(income_statement_fields)}""")
+            prompt_sections.append(PromptSection('income_statement', "INCOME STATEMENT", income_statement_fields, priority=5))
         
         # Dividend & calendar section (if any meaningful data)
         dividend_calendar_info = []
@@ -1826,56 +2234,43 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         if dividend_fields:
             sections_included.append(f"Dividend Analysis ({len(dividend_fields)} fields)")
             logger.info(f"Including Dividend Analysis: {dividend_fields}")
-            prompt_sections.append(f"""
-**DIVIDEND ANALYSIS (CRITICAL):**
-- {' | '.join(dividend_fields)}""")
+            prompt_sections.append(PromptSection('dividend', "DIVIDEND ANALYSIS (CRITICAL)", dividend_fields, priority=2, required=True))
         
         # Calendar risk section for earnings timing
         if earnings_info:
-            prompt_sections.append(f"""
-**CALENDAR RISK:**
-- {' | '.join(earnings_info)}""")
+            prompt_sections.append(PromptSection('calendar_risk', "CALENDAR RISK", earnings_info, priority=1, required=True))
         elif dividend_calendar_info:
             # Fallback: if no earnings but have dividend calendar info
-            prompt_sections.append(f"""
-**DIVIDEND & CALENDAR RISK:**
-- {' | '.join(dividend_calendar_info)}""")
+            prompt_sections.append(PromptSection('calendar_risk', "DIVIDEND & CALENDAR RISK", dividend_calendar_info, priority=1, required=True))
         
         # Market sentiment section (if any meaningful data)
         if market_sentiment_fields:
-            prompt_sections.append(f"""
-**MARKET SENTIMENT:**
-- {' | '.join(market_sentiment_fields)}""")
+            prompt_sections.append(PromptSection('market_sentiment', "MARKET SENTIMENT", market_sentiment_fields, priority=6))
         
         # Analyst sentiment section (if any meaningful data)
         if analyst_fields:
-            prompt_sections.append(f"""
-**ANALYST SENTIMENT:**
-- {' | '.join(analyst_fields)}""")
+            prompt_sections.append(PromptSection('analyst', "ANALYST SENTIMENT", analyst_fields, priority=5))
         
         # Earnings calendar section (if any meaningful data)
         if earnings_calendar_items:
-            prompt_sections.append(f"""
-**EARNINGS CALENDAR:**
-{chr(10).join(earnings_calendar_items)}""")
+            prompt_sections.append(PromptSection('earnings_calendar', "EARNINGS CALENDAR",
+                                                 earnings_calendar_items, priority=3, separator='\n'))
         
         # News section (always included)
-        prompt_sections.append(f"""
-**RECENT NEWS & DEVELOPMENTS:**
-{full_news_articles}""")
-        
-        # Economic context section with detailed events
-        economic_context_content = f"""**ECONOMIC CONTEXT:**
-- Market Volatility Regime: {volatility_regime}
-- Sector Performance: {sector_context}
-
-**DETAILED ECONOMIC CALENDAR:**
-{chr(10).join(economic_events_detailed) if economic_events_detailed else 'No detailed economic events available'}
-
-**SUMMARY - KEY ECONOMIC EVENTS:**
-{economic_events_summary}"""
-        
-        prompt_sections.append(economic_context_content)
+        prompt_sections.append(PromptSection('news', "RECENT NEWS & DEVELOPMENTS", news_items, priority=7,
+                                             separator='\n\n', max_item_tokens=NEWS_ARTICLE_MAX_TOKENS))
+        
+        # Economic context section with detailed events; the detailed calendar
+        # already covers the events a separate summary would repeat
+        prompt_sections.append(PromptSection('market_regime', "ECONOMIC CONTEXT", [
+            f"- Market Volatility Regime: {volatility_regime}",
+            f"- Sector Performance: {sector_context}"
+        ], priority=1, separator='\n', required=True))
+        prompt_sections.append(PromptSection(
+            'economic_context', "DETAILED ECONOMIC CALENDAR",
+            economic_events_detailed or ["No upcoming economic events"],
+            priority=6, separator='\n'
+        ))
         
         # Data completeness section
         completeness_score = enhanced_stock_data.get('completeness_score', 0)
@@ -1889,13 +2284,24 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         if news: data_sources.append('News')
         
         if data_sources:
-            prompt_sections.append(f"""
-**DATA COMPLETENESS:**
-- Completeness Score: {completeness_score:.1f}%
-- Available Data: {', '.join(data_sources)}""")
-        
-        # Combine all sections
-        data_sections = ''.join(prompt_sections)
+            prompt_sections.append(PromptSection('data_completeness', "DATA COMPLETENESS", [
+                f"- Completeness Score: {completeness_score:.1f}%",
+                f"- Available Data: {', '.join(data_sources)}"
+            ], priority=1, separator='\n', required=True))
+        
+        # Combine all sections within the token budget
+        data_sections, compaction = self.prompt_compactor.compact(prompt_sections)
+        logger.info(
+            f"Prompt data for {symbol}: {compaction.original_tokens} -> "
+            f"{compaction.compacted_tokens} estimated tokens "
+            f"({compaction.deduplicated_items} deduplicated, {compaction.dropped_items} dropped, "
+            f"{compaction.truncated_items} truncated)"
+        )
+        
+        data_summary = (
+            f"This analysis incorporates {len(data_sources)} data sources "
+            f"with {completeness_score:.1f}% completeness."
+        )
         
         # LOG: Final prompt summary
         logger.info("=== FINAL PROMPT SUMMARY ===")
@@ -1904,102 +2310,16 @@ Important: Respond ONLY with valid JSON. Do not include any text before or after
         logger.info(f"Completeness score: {completeness_score:.1f}%")
         logger.info(f"Total prompt sections: {len(prompt_sections)}")
         
-        # Build the complete prompt
-        prompt = f"""You are an expert options strategist specializing in Poor Man's Covered Call (PMCC) analysis. Analyze this specific PMCC opportunity using the comprehensive dataset provided and score it from 0-100.
-
-{data_sections}
-
-## ENHANCED PMCC SCORING FRAMEWORK (0-100 Total)
-
-**COMPREHENSIVE DATA ANALYSIS:**
-This analysis incorporates {len(data_sources)} data sources with {completeness_score:.1f}% completeness.
-
-## SCORING FRAMEWORK (0-100 Total)
-
-**1. EXECUTION RISK (30 points)**
-- Liquidity Quality: Bid/ask spreads, volume, open interest for both legs
-- Greeks Alignment: Delta positioning, theta decay optimization, vega risk
-- Strike Selection: LEAPS depth ITM, short call distance OTM
-- Spread Management: Ability to adjust, roll, or close positions
-
-**2. FINANCIAL STABILITY (25 points)**
-- Cash Flow Health: Free cash flow generation, operating cash trends
-- Balance Sheet Strength: Debt levels, working capital, financial flexibility
-- Earnings Quality: Profit margins, revenue growth sustainability
-- Survival Probability: Ability to weather 6-12 month holding period
-
-**3. CALENDAR & EVENT RISK (25 points)**
-- Dividend Timing: Ex-dividend dates relative to short expiration cycles
-- Earnings Proximity: Volatility impact, early assignment risk
-- Economic Sensitivity: Sector exposure to macro events, tariffs, policy changes
-- Volatility Events: Known catalysts that could disrupt strategy
-
-**4. TECHNICAL SETUP (20 points)**
-- Entry Timing: Current price relative to support/resistance, trend
-- Volatility Environment: IV vs HV, volatility term structure
-- Momentum Indicators: RSI, trend strength, reversal signals
-- Risk/Reward Profile: Probability-weighted return expectations
-
-## CRITICAL PMCC CONSIDERATIONS
-
-**RED FLAGS (Avoid if present):**
-- LEAPS volume < 10 or extremely wide spreads
-- Company burning cash with high debt loads
-- Ex-dividend date within 45 days of short expiration
-- Earnings within 7 days of short expiration
-- Sector in severe distress or regulatory pressure
-
-**GREEN FLAGS (Favorable conditions):**
-- Stable/growing free cash flow with manageable debt
-- Technical oversold condition with solid fundamentals
-- High implied volatility environment with mean reversion potential
-- Strong options liquidity with tight spreads
-- Clear catalyst for recovery during LEAPS holding period
-
-## RESPONSE FORMAT
-
-Provide your analysis as a JSON object with this exact structure:
-
-{{
-"symbol": "{symbol}",
-"pmcc_score": 0,
-"execution_risk_score": 0,
-"financial_stability_score": 0,
-"calendar_event_score": 0,
-"technical_setup_score": 0,
-"recommendation": "buy/hold/avoid",
-"confidence_level": 0,
-"key_risks": ["risk1", "risk2", "risk3"],
-"key_opportunities": ["opp1", "opp2", "opp3"],
-"management_strategy": "Specific guidance for position management",
-"entry_timing": "Immediate/Wait for X condition/Avoid",
-"exit_conditions": ["condition1", "condition2"],
-"position_sizing": "X% of portfolio based on risk profile"
-}}
-
-## ANALYSIS INSTRUCTIONS
-
-1. **Prioritize PMCC-specific factors** over general stock analysis
-2. **Quantify risks with specific dates and probabilities** when possible
-3. **Focus on 3-6 month time horizon** matching typical PMCC holding periods
-4. **Consider position sizing implications** based on liquidity and volatility
-5. **Provide actionable management guidance** for different market scenarios
-6. **Weight recent news and events** more heavily than historical data
-7. **Account for current market regime** in volatility and sentiment analysis
-
-**Critical**: Base your analysis strictly on the provided comprehensive dataset. Respond only with the JSON structure above - no additional commentary."""
-        
-        # LOG: Final prompt (truncated for logging)
-        logger.info("=== FINAL PROMPT (first 1000 chars) ===")
-        logger.info(prompt[:1000])
-        logger.info("=== FINAL PROMPT (last 1000 chars) ===")
-        logger.info(prompt[-1000:])
-        logger.info(f"Total prompt length: {len(prompt)} characters")
-        
-        return prompt
+        return data_sections, data_summary, compaction
     
-    def _parse_single_opportunity_response(self, response: Message, processing_time_ms: float) -> Dict[str, Any]:
-        """Parse Claude's response for single opportunity analysis."""
+    def _parse_single_opportunity_response(self, response: Message, processing_time_ms: float,
+                                           symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse Claude's response for single opportunity analysis.
+        
+        When symbol is given the response is a packed batch keyed by symbol and
+        only that symbol's analysis is extracted.
+        """
         try:
             # Extract the content from the response
             content = response.content[0].text if response.content else ""
@@ -2016,17 +2336,21 @@ Provide your analysis as a JSON object with this exact structure:
                 else:
                     raise ClaudeError(f"Invalid JSON response: {str(e)}")
             
+            if symbol is not None:
+                if not isinstance(data, dict) or not isinstance(data.get(symbol), dict):
+                    raise ClaudeError(f"No analysis for {symbol} in batch response")
+                data = {'symbol': symbol, **data[symbol]}
+            
             # Add usage metadata if available
             if hasattr(response, 'usage') and response.usage:
-                data['usage'] = {
-                    'input_tokens': response.usage.input_tokens,
-                    'output_tokens': response.usage.output_tokens
-                }
+                data['usage'] = usage_to_dict(response.usage)
             
             # Add processing time and model information
             data['processing_time_ms'] = processing_time_ms
             data['model_used'] = response.model if hasattr(response, 'model') else self.model
             data['analysis_timestamp'] = datetime.now().isoformat()
+            if isinstance(getattr(response, 'stream_metrics', None), dict):
+                data['stream_metrics'] = response.stream_metrics
             
             # Validate required fields for new format
             required_fields = ['symbol', 'pmcc_score', 'recommendation']
@@ -2112,45 +2436,162 @@ Provide your analysis as a JSON object with this exact structure:
    Options: {options_info}
    Risk: {inst_ownership}, {analyst_rating}"""
     
-    async def _execute_with_retry(self, prompt: str) -> Message:
-        """Execute Claude API request with retry logic."""
+    async def _execute_with_retry(self, prompt: str, max_tokens: Optional[int] = None,
+                                  system: Optional[str] = None,
+                                  stop_fields: Optional[Tuple[str, ...]] = None,
+                                  expected_output_tokens: Optional[int] = None) -> Message:
+        """
+        Execute Claude API request with retry logic, serving repeats from the response cache.
+        
+        Args:
+            prompt: User message content
+            max_tokens: Response token limit, defaults to the client setting
+            system: Optional static system block, cached provider-side when enabled
+            stop_fields: Top-level JSON fields after which a streamed response may stop
+            expected_output_tokens: Likely response size reserved with the rate
+                limiter (capped at max_tokens), defaults to max_tokens
+        """
+        max_tokens = max_tokens or self.max_tokens
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = ClaudeResponseCache.make_key(
+                self.model, self.temperature, max_tokens,
+                f"{system}\n\n{prompt}" if system else prompt
+            )
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+            self._stats['cache_misses'] += 1
+        
+        response = await self._request_with_retry(
+            prompt, max_tokens, system, stop_fields, expected_output_tokens
+        )
+        
+        # Truncated or empty completions are not worth replaying
+        if (cache_key is not None and hasattr(response, 'model_dump')
+                and response.content and getattr(response, 'stop_reason', None) == 'end_turn'):
+            self.response_cache.put(
+                cache_key, response.model_dump(mode='json', exclude={'stream_metrics'})
+            )
+        
+        return response
+    
+    def save_response_cache(self) -> None:
+        """Write responses cached since the last save to disk."""
+        if self.response_cache is not None:
+            self.response_cache.save()
+    
+    async def close(self) -> None:
+        """Persist the response cache; call when the client is no longer used."""
+        self.save_response_cache()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[Message]:
+        """Rebuild a cached message, reporting zero usage since nothing was billed."""
+        data = self.response_cache.get(cache_key)
+        if data is None:
+            return None
+        
+        try:
+            data = {**data, 'usage': {
+                **data.get('usage', {}), 'input_tokens': 0, 'output_tokens': 0,
+                'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 0
+            }}
+            response = Message.model_validate(data)
+        except Exception as e:
+            logger.warning(f"Discarding unusable cached Claude response: {e}")
+            return None
+        
+        self._stats['cache_hits'] += 1
+        logger.debug(f"Serving Claude response from cache ({cache_key[:12]})")
+        return response
+    
+    async def _request_with_retry(self, prompt: str, max_tokens: int,
+                                  system: Optional[str] = None,
+                                  stop_fields: Optional[Tuple[str, ...]] = None,
+                                  expected_output_tokens: Optional[int] = None) -> Message:
+        """Send the request to the Claude API with retry logic."""
         last_error = None
         
+        request_kwargs = {}
+        if system:
+            if self.prompt_caching_enabled:
+                request_kwargs['system'] = [
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ]
+            else:
+                request_kwargs['system'] = system
+        
+        # Pre-estimate the request's size so the rate limiter can admit it; the
+        # output is reserved at its expected size and reconciled on completion
+        estimated_input_tokens = estimate_tokens(prompt) + estimate_tokens(system or "")
+        estimated_output_tokens = min(max_tokens, expected_output_tokens or max_tokens)
+        
         for attempt in range(self.max_retries + 1):
+            reservation = None
+            if self.rate_limiter is not None:
+                reservation = await self.rate_limiter.acquire(estimated_input_tokens, estimated_output_tokens)
+            sent = False
+            
             try:
-                response = await self.client.messages.create(
+                request = dict(
                     model=self.model,
-                    max_tokens=self.max_tokens,
+                    max_tokens=max_tokens,
                     temperature=self.temperature,
                     messages=[
                         {
                             "role": "user",
                             "content": prompt
                         }
-                    ]
+                    ],
+                    **request_kwargs
                 )
+                sent = True
+                if self.streaming_enabled:
+                    response = await self._stream_message(request, stop_fields)
+                else:
+                    response = await self.client.messages.create(**request)
+                
+                if reservation is not None and getattr(response, 'usage', None):
+                    # Cache reads do not count toward the input tokens-per-minute limit
+                    usage = usage_to_dict(response.usage)
+                    self.rate_limiter.record(
+                        reservation,
+                        usage['input_tokens'] + usage['cache_creation_input_tokens'],
+                        usage['output_tokens']
+                    )
                 
                 return response
                 
             except anthropic.RateLimitError as e:
                 last_error = e
+                self._settle_failed_reservation(reservation, sent)
                 if attempt < self.max_retries:
-                    wait_time = self.retry_backoff * (2 ** attempt)
+                    retry_after = self._retry_after_seconds(e)
+                    wait_time = retry_after if retry_after is not None else self.retry_backoff * (2 ** attempt)
                     logger.warning(f"Rate limit hit, retrying in {wait_time}s (attempt {attempt + 1})")
-                    await asyncio.sleep(wait_time)
+                    if self.rate_limiter is not None:
+                        # Hold every queued request, not just this one
+                        self.rate_limiter.pause(wait_time)
+                    else:
+                        await asyncio.sleep(wait_time)
                     continue
                 else:
                     raise RateLimitError(f"Rate limit exceeded after {self.max_retries} retries") from e
             
             except anthropic.AuthenticationError as e:
+                if reservation is not None:
+                    self.rate_limiter.release(reservation)
                 raise AuthenticationError(f"Authentication failed: {str(e)}") from e
             
             except anthropic.BadRequestError as e:
+                if reservation is not None:
+                    self.rate_limiter.release(reservation)
                 # Don't retry bad requests
                 raise ClaudeError(f"Bad request: {str(e)}") from e
             
             except Exception as e:
                 last_error = e
+                self._settle_failed_reservation(reservation, sent)
                 if attempt < self.max_retries:
                     wait_time = self.retry_backoff * (2 ** attempt)
                     logger.warning(f"Request failed, retrying in {wait_time}s (attempt {attempt + 1}): {e}")
@@ -2162,6 +2603,89 @@ Provide your analysis as a JSON object with this exact structure:
         # Should not reach here, but just in case
         raise ClaudeError(f"Request failed: {str(last_error)}") from last_error
     
+    def _settle_failed_reservation(self, reservation: Optional[RateLimitReservation], sent: bool) -> None:
+        """
+        Settle the reservation of a failed attempt.
+        
+        A request that reached the API (including a 429) still counts against
+        the requests-per-minute limit, so it is kept with zero tokens; capacity
+        is only returned for attempts that failed before being sent.
+        """
+        if reservation is None:
+            return
+        if sent:
+            self.rate_limiter.record(reservation, 0, 0)
+        else:
+            self.rate_limiter.release(reservation)
+    
+    async def _stream_message(self, request: Dict[str, Any],
+                              stop_fields: Optional[Tuple[str, ...]] = None) -> Message:
+        """
+        Stream a request and return the resulting message.
+        
+        When stop_fields are given and the response is a single JSON object, the
+        stream is closed as soon as those top-level fields are complete and the
+        returned message holds the object truncated after them. Such messages
+        have no stop_reason and are not stored in the response cache.
+        """
+        started = time.time()
+        first_token_at = None
+        tracker = StreamingJSONObject() if stop_fields else None
+        early_stopped = False
+        
+        async with self.client.messages.stream(**request) as stream:
+            async for text in stream.text_stream:
+                if first_token_at is None:
+                    first_token_at = time.time()
+                if tracker is not None:
+                    tracker.feed(text)
+                    if tracker.has_completed(stop_fields) and tracker.completed_json():
+                        early_stopped = True
+                        break
+            
+            if early_stopped:
+                snapshot = stream.current_message_snapshot
+                # The closing usage event never arrives; estimate what was generated
+                usage = snapshot.usage.model_copy(update={
+                    'output_tokens': max(snapshot.usage.output_tokens or 0, estimate_tokens(tracker.text))
+                })
+                response = snapshot.model_copy(update={
+                    'content': [TextBlock(type='text', text=tracker.completed_json())],
+                    'usage': usage
+                })
+            else:
+                response = await stream.get_final_message()
+        
+        finished = time.time()
+        ttft_ms = (first_token_at - started) * 1000 if first_token_at else None
+        generation_seconds = finished - (first_token_at or started)
+        output_tokens = response.usage.output_tokens if response.usage else 0
+        
+        self._stats['streamed_requests'] += 1
+        self._stats['early_stopped_requests'] += int(early_stopped)
+        self._stats['total_time_to_first_token_ms'] += ttft_ms or 0.0
+        self._stats['total_streamed_output_tokens'] += output_tokens
+        self._stats['total_generation_seconds'] += generation_seconds
+        
+        response.stream_metrics = {
+            'time_to_first_token_ms': ttft_ms,
+            'output_tokens_per_second': output_tokens / generation_seconds if generation_seconds > 0 else None,
+            'early_stopped': early_stopped
+        }
+        return response
+    
+    @staticmethod
+    def _retry_after_seconds(error: Exception) -> Optional[float]:
+        """Read the retry-after header of a rate limit error, if present."""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return None
+        try:
+            return float(headers.get('retry-after'))
+        except (TypeError, ValueError):
+            return None
+    
     def _parse_analysis_response(self, response: Message, processing_time_ms: float) -> ClaudeAnalysisResponse:
         """Parse Claude's response into structured data."""
         try:
@@ -2183,10 +2707,7 @@ Provide your analysis as a JSON object with this exact structure:
             # Add usage metadata if available
             usage_data = {}
             if hasattr(response, 'usage') and response.usage:
-                usage_data = {
-                    'input_tokens': response.usage.input_tokens,
-                    'output_tokens': response.usage.output_tokens
-                }
+                usage_data = usage_to_dict(response.usage)
                 data['usage'] = usage_data
             
             # Add model information
@@ -2218,13 +2739,14 @@ Provide your analysis as a JSON object with this exact structure:
             self._stats['successful_requests'] += 1
             
             if response and hasattr(response, 'usage') and response.usage:
-                self._stats['total_input_tokens'] += response.usage.input_tokens
-                self._stats['total_output_tokens'] += response.usage.output_tokens
+                usage = usage_to_dict(response.usage)
+                self._stats['total_input_tokens'] += usage['input_tokens']
+                self._stats['total_output_tokens'] += usage['output_tokens']
+                self._stats['total_cache_creation_input_tokens'] += usage['cache_creation_input_tokens']
+                self._stats['total_cache_read_input_tokens'] += usage['cache_read_input_tokens']
                 
                 # Rough cost estimation (Claude 3.5 Sonnet pricing as of 2024)
-                input_cost = response.usage.input_tokens * 0.000003  # $3/1M input tokens
-                output_cost = response.usage.output_tokens * 0.000015  # $15/1M output tokens
-                self._stats['total_cost_estimate'] += input_cost + output_cost
+                self._stats['total_cost_estimate'] += estimate_usage_cost(usage)
         else:
             self._stats['failed_requests'] += 1
     
@@ -2243,11 +2765,49 @@ Provide your analysis as a JSON object with this exact structure:
             'avg_output_tokens': (
                 self._stats['total_output_tokens'] / self._stats['successful_requests']
                 if self._stats['successful_requests'] > 0 else 0
-            )
+            ),
+            'cache_hit_rate': (
+                self._stats['cache_hits'] / (self._stats['cache_hits'] + self._stats['cache_misses'])
+                if self._stats['cache_hits'] + self._stats['cache_misses'] > 0 else 0
+            ),
+            'avg_time_to_first_token_ms': (
+                self._stats['total_time_to_first_token_ms'] / self._stats['streamed_requests']
+                if self._stats['streamed_requests'] > 0 else 0
+            ),
+            'avg_output_tokens_per_second': (
+                self._stats['total_streamed_output_tokens'] / self._stats['total_generation_seconds']
+                if self._stats['total_generation_seconds'] > 0 else 0
+            ),
+            'rate_limiter': self.rate_limiter.get_stats() if self.rate_limiter else None
         }
     
+    async def count_system_prompt_tokens(self) -> int:
+        """
+        Count the cached system block's tokens with the API token counter.
+        
+        Logs a warning when the block is too short to be cached
+        (MIN_CACHEABLE_PROMPT_TOKENS), as every request then pays full price for it.
+        """
+        result = await self.client.messages.count_tokens(
+            model=self.model,
+            system=[{"type": "text", "text": PMCC_ANALYST_SYSTEM_PROMPT}],
+            messages=[{"role": "user", "content": "-"}]
+        )
+        self.system_prompt_tokens = result.input_tokens
+        if result.input_tokens < MIN_CACHEABLE_PROMPT_TOKENS:
+            logger.warning(
+                f"System prompt is {result.input_tokens} tokens, below the "
+                f"{MIN_CACHEABLE_PROMPT_TOKENS}-token minimum for prompt caching on {self.model}"
+            )
+        return result.input_tokens
+    
     async def health_check(self) -> bool:
-        """Perform a simple health check."""
+        """
+        Perform a simple health check.
+        
+        The first successful check also counts the cached system block's
+        tokens (count_system_prompt_tokens) when prompt caching is enabled.
+        """
         try:
             response = await self.client.messages.create(
                 model=self.model,
@@ -2261,7 +2821,13 @@ Provide your analysis as a JSON object with this exact structure:
                 ]
             )
             
-            return bool(response and response.content)
+            healthy = bool(response and response.content)
+            if healthy and self.prompt_caching_enabled and self.system_prompt_tokens is None:
+                try:
+                    await self.count_system_prompt_tokens()
+                except Exception as e:
+                    logger.debug(f"Could not count system prompt tokens: {e}")
+            return healthy
             
         except Exception as e:
             logger.error(f"Claude health check failed: {e}")
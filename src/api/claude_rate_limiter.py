@@ -0,0 +1,225 @@
+"""
+Requests- and tokens-per-minute scheduler for Claude API calls.
+
+Anthropic enforces organization limits on requests per minute (RPM), input
+tokens per minute (ITPM) and output tokens per minute (OTPM). Rather than
+sending requests until the API answers 429 and then sleeping blindly, the
+limiter keeps a one-minute sliding window of what has been sent, reserves
+each request's estimated tokens before it is dispatched and only lets it
+through once the window has room. Reservations are reconciled with the
+actual usage when the response arrives, and requests waiting for capacity
+are woken as soon as a reconciliation or release frees some, so concurrent
+analyses are admitted as fast as the limits allow.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Default limits (Anthropic tier 1, Claude Sonnet)
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_INPUT_TOKENS_PER_MINUTE = 40000
+DEFAULT_OUTPUT_TOKENS_PER_MINUTE = 8000
+
+
+@dataclass(eq=False)
+class RateLimitReservation:
+    """Window capacity held by one in-flight request."""
+    timestamp: float
+    input_tokens: int
+    output_tokens: int
+
+
+class ClaudeRateLimiter:
+    """
+    Sliding-window scheduler for RPM, ITPM and OTPM limits.
+
+    A limit of 0 disables that dimension. A request larger than a whole
+    limit is admitted once the window is otherwise empty so it cannot
+    block forever. Waiters are plain futures created per wait and dropped
+    afterwards, so the limiter holds no event-loop bound state between
+    waits and can be shared across ``asyncio.run`` calls.
+    """
+
+    def __init__(self,
+                 requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                 input_tokens_per_minute: int = DEFAULT_INPUT_TOKENS_PER_MINUTE,
+                 output_tokens_per_minute: int = DEFAULT_OUTPUT_TOKENS_PER_MINUTE,
+                 window_seconds: float = 60.0):
+        """
+        Initialize limiter.
+
+        Args:
+            requests_per_minute: Request limit per window, 0 for unlimited
+            input_tokens_per_minute: Input token limit per window, 0 for unlimited
+            output_tokens_per_minute: Output token limit per window, 0 for unlimited
+            window_seconds: Length of the sliding window
+        """
+        self.requests_per_minute = requests_per_minute
+        self.input_tokens_per_minute = input_tokens_per_minute
+        self.output_tokens_per_minute = output_tokens_per_minute
+        self.window_seconds = window_seconds
+
+        self._window: Deque[RateLimitReservation] = deque()
+        self._waiters: List[asyncio.Future] = []
+        self._blocked_until = 0.0
+        self._stats = {
+            'requests_admitted': 0,
+            'requests_delayed': 0,
+            'total_wait_seconds': 0.0,
+            'rate_limit_pauses': 0,
+        }
+
+    def _expire(self, now: float) -> None:
+        """Drop reservations that have left the window."""
+        while self._window and now - self._window[0].timestamp >= self.window_seconds:
+            self._window.popleft()
+
+    def _usage(self) -> Dict[str, int]:
+        """Requests and tokens currently counted in the window."""
+        return {
+            'requests': len(self._window),
+            'input_tokens': sum(r.input_tokens for r in self._window),
+            'output_tokens': sum(r.output_tokens for r in self._window),
+        }
+
+    def _fits(self, input_tokens: int, output_tokens: int) -> bool:
+        """Check whether a request of this size fits the current window."""
+        if not self._window:
+            return True
+
+        usage = self._usage()
+        checks = (
+            (self.requests_per_minute, usage['requests'], 1),
+            (self.input_tokens_per_minute, usage['input_tokens'], input_tokens),
+            (self.output_tokens_per_minute, usage['output_tokens'], output_tokens),
+        )
+        return all(limit <= 0 or used + wanted <= limit for limit, used, wanted in checks)
+
+    def wait_time(self, input_tokens: int, output_tokens: int, now: Optional[float] = None) -> float:
+        """
+        Seconds until a request of this size can be admitted.
+
+        Args:
+            input_tokens: Estimated input tokens of the request
+            output_tokens: Estimated output tokens of the request
+            now: Current monotonic time, defaults to time.monotonic()
+
+        Returns:
+            0.0 if the request can go now
+        """
+        now = time.monotonic() if now is None else now
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        self._expire(now)
+        if self._fits(input_tokens, output_tokens):
+            return 0.0
+
+        # Find the earliest point at which enough old reservations have expired
+        pending = list(self._window)
+        self._window.clear()
+        try:
+            for i, reservation in enumerate(pending):
+                self._window.extend(pending[i + 1:])
+                fits = self._fits(input_tokens, output_tokens)
+                self._window.clear()
+                if fits:
+                    return max(0.0, reservation.timestamp + self.window_seconds - now)
+        finally:
+            self._window.extend(pending)
+        return self.window_seconds
+
+    def try_acquire(self, input_tokens: int, output_tokens: int,
+                    now: Optional[float] = None) -> Optional[RateLimitReservation]:
+        """Reserve window capacity if the request fits now, else return None."""
+        now = time.monotonic() if now is None else now
+        if self.wait_time(input_tokens, output_tokens, now) > 0:
+            return None
+
+        reservation = RateLimitReservation(now, input_tokens, output_tokens)
+        self._window.append(reservation)
+        self._stats['requests_admitted'] += 1
+        return reservation
+
+    async def acquire(self, input_tokens: int, output_tokens: int) -> RateLimitReservation:
+        """
+        Wait until the request fits the window, then reserve its capacity.
+
+        Sleeps until the oldest blocking reservation leaves the window, or
+        until ``record``/``release`` frees capacity, whichever comes first.
+
+        Args:
+            input_tokens: Estimated input tokens of the request
+            output_tokens: Expected output tokens; an estimate of the actual
+                response size rather than max_tokens, which is rarely used up
+
+        Returns:
+            Reservation to reconcile with actual usage via ``record``
+        """
+        started = time.monotonic()
+        delayed = False
+        while True:
+            reservation = self.try_acquire(input_tokens, output_tokens)
+            if reservation is not None:
+                break
+            delayed = True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait([waiter], timeout=self.wait_time(input_tokens, output_tokens))
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        if delayed:
+            waited = time.monotonic() - started
+            self._stats['requests_delayed'] += 1
+            self._stats['total_wait_seconds'] += waited
+            logger.debug(f"Claude request waited {waited:.1f}s for rate limit capacity")
+        return reservation
+
+    def record(self, reservation: RateLimitReservation,
+               input_tokens: Optional[int] = None, output_tokens: Optional[int] = None) -> None:
+        """Replace a reservation's estimates with the actual usage."""
+        freed = False
+        if isinstance(input_tokens, int):
+            freed |= input_tokens < reservation.input_tokens
+            reservation.input_tokens = input_tokens
+        if isinstance(output_tokens, int):
+            freed |= output_tokens < reservation.output_tokens
+            reservation.output_tokens = output_tokens
+        if freed:
+            self._notify()
+
+    def release(self, reservation: RateLimitReservation) -> None:
+        """Return a reservation whose request was never processed."""
+        try:
+            self._window.remove(reservation)
+        except ValueError:
+            return
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake waiting ``acquire`` calls to re-check the window."""
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for ``seconds``, e.g. after a 429 with retry-after."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._stats['rate_limit_pauses'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics and current window usage."""
+        self._expire(time.monotonic())
+        return {**self._stats, 'window': self._usage()}
@@ -0,0 +1,122 @@
+"""
+Persistent content-addressed cache for Claude API responses.
+
+Responses are keyed by a hash of everything that determines the completion
+(model, temperature, max_tokens and the prompt), so byte-identical requests
+from same-day reruns or retries after a later pipeline failure are served
+from disk instead of being billed again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClaudeResponseCache:
+    """
+    File-backed map of request hash -> serialized Claude message.
+
+    Entries expire ``ttl_hours`` after they were stored. When the cache holds
+    more than ``max_entries`` entries the least recently used ones are evicted.
+    Changes are kept in memory until save() is called, once per scan.
+    """
+
+    def __init__(self, cache_file: str, ttl_hours: float = 24.0, max_entries: int = 500):
+        """
+        Initialize cache and load existing entries.
+
+        Args:
+            cache_file: Path of the JSON file backing the cache
+            ttl_hours: Hours a cached response stays valid
+            max_entries: Maximum number of responses kept on disk
+        """
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+        """Build the content hash identifying a request."""
+        payload = json.dumps(
+            {'model': model, 'temperature': temperature, 'max_tokens': max_tokens, 'prompt': prompt},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load(self) -> None:
+        """Load entries from disk, starting empty if the file is missing or corrupt."""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self._entries = dict(data.get('responses', {}))
+            self._evict_expired()
+            logger.debug(f"Loaded {len(self._entries)} cached Claude responses from {self.cache_file}")
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable Claude response cache {self.cache_file}: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Write entries to disk atomically if they changed since the last save."""
+        if not self._dirty:
+            return
+
+        try:
+            Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'responses': self._entries}, f)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save Claude response cache {self.cache_file}: {e}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        now = time.time()
+        self._dirty = True
+        if now - entry['stored_at'] >= self.ttl_seconds:
+            del self._entries[key]
+            return None
+
+        entry['last_used'] = now
+        return entry['response']
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a serialized response, evicting old entries as needed."""
+        now = time.time()
+        self._entries[key] = {'stored_at': now, 'last_used': now, 'response': response}
+        self._evict_expired(now)
+
+        if len(self._entries) > self.max_entries:
+            by_last_use = sorted(self._entries, key=lambda k: self._entries[k]['last_used'])
+            for stale_key in by_last_use[:len(self._entries) - self.max_entries]:
+                del self._entries[stale_key]
+
+        self._dirty = True
+
+    def _evict_expired(self, now: Optional[float] = None) -> None:
+        """Drop entries older than the TTL."""
+        now = now or time.time()
+        expired = [k for k, e in self._entries.items() if now - e['stored_at'] >= self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
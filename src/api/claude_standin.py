@@ -0,0 +1,341 @@
+"""
+Local stand-in for the Claude Messages API.
+
+Step 5 cannot be load tested against the real API without paying for every
+request. ``ClaudeStandIn`` offers the two calls ``ClaudeClient`` makes,
+``messages.create`` and ``messages.stream``, and answers them locally with
+real ``anthropic.types.Message`` objects. Analyses are replayed from
+recorded Claude submissions (the ``data/claude_submissions`` debug files the
+scanner writes) or synthesized as schema-valid JSON. Latency, rate-limit
+errors and token counts are configurable so ClaudeClient, ClaudeProvider and
+ClaudeIntegrationManager can be benchmarked end to end offline.
+"""
+
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import anthropic
+from anthropic.types import Message, TextBlock
+
+from src.api.prompt_compaction import estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+
+# Latency distributions understood by StandInConfig.latency_distribution
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+
+# Fields the client adds to parsed analyses; stripped from replayed recordings
+RECORDING_METADATA_FIELDS = {
+    'usage', 'processing_time_ms', 'model_used', 'analysis_timestamp', '_debug_prompt',
+    'prompt_compaction', 'stream_metrics', 'batch_size', 'provider_metadata',
+    'comprehensive_risk_score', 'fundamental_health_score', 'technical_momentum_score',
+    'analysis_summary', 'detailed_reasoning', 'analysis_reused', 'analyzed_at'
+}
+
+_SINGLE_SYMBOL_PATTERN = re.compile(r"## PMCC OPPORTUNITY: (\S+)")
+_BATCH_SYMBOLS_PATTERN = re.compile(r"Analyze these \d+ PMCC opportunities: (.+?)\.\n")
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the local Claude stand-in."""
+    replay_dir: Optional[str] = None  # Directory of recorded claude_analysis_*.json files
+    latency_distribution: str = 'lognormal'  # fixed, uniform or lognormal
+    latency_ms: float = 1500.0  # Median time to first token
+    latency_jitter_ms: float = 500.0  # Spread of the time to first token
+    output_tokens_per_second: float = 60.0  # Generation speed after the first token
+    rate_limit_probability: float = 0.0  # Chance a request is rejected with a 429
+    retry_after_seconds: float = 1.0  # retry-after header sent with a 429
+    output_tokens: int = 600  # Approximate size of each synthesized analysis
+    time_scale: float = 1.0  # Multiplier for all simulated delays, 0 for none
+    seed: Optional[int] = None
+
+
+class _StandInHTTPResponse:
+    """The parts of an HTTP response the SDK's error classes read."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+        self.request = None
+
+
+class ClaudeStandIn:
+    """
+    Drop-in replacement for ``AsyncAnthropic`` in ``ClaudeClient``.
+
+    Pass it as ``ClaudeClient(anthropic_client=ClaudeStandIn(...))`` or enable
+    it through ``CLAUDE_STANDIN_ENABLED`` for the Claude provider.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None):
+        """
+        Initialize stand-in.
+
+        Args:
+            config: Stand-in behaviour, defaults to StandInConfig()
+        """
+        self.config = config or StandInConfig()
+        if self.config.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.config.latency_distribution}")
+
+        self.messages = _StandInMessages(self)
+        self._rng = random.Random(self.config.seed)
+        self._recordings = self._load_recordings(self.config.replay_dir)
+        self._cached_prefixes = set()
+        self._in_flight = 0
+        self._stats = {
+            'requests': 0,
+            'rate_limited': 0,
+            'replayed': 0,
+            'synthesized': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'max_in_flight': 0,
+        }
+
+    @staticmethod
+    def _load_recordings(replay_dir: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        """Load the latest recorded analysis per symbol from scanner debug files."""
+        recordings = {}
+        if not replay_dir:
+            return recordings
+
+        for path in sorted(glob.glob(os.path.join(replay_dir, "claude_analysis_*.json"))):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                symbol = data['symbol']
+                analysis = data['response_data']
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.debug(f"Skipping unusable Claude recording {path}: {e}")
+                continue
+            if isinstance(analysis, dict) and 'pmcc_score' in analysis:
+                recordings[symbol] = {
+                    key: value for key, value in analysis.items()
+                    if key not in RECORDING_METADATA_FIELDS
+                }
+
+        logger.info(f"Claude stand-in loaded {len(recordings)} recorded analyses from {replay_dir}")
+        return recordings
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, token and concurrency counters."""
+        return dict(self._stats)
+
+    def _sample_first_token_seconds(self) -> float:
+        """Sample time to first token from the configured distribution."""
+        median = self.config.latency_ms / 1000
+        jitter = self.config.latency_jitter_ms / 1000
+        if self.config.latency_distribution == 'fixed' or median <= 0:
+            seconds = median
+        elif self.config.latency_distribution == 'uniform':
+            seconds = self._rng.uniform(median - jitter, median + jitter)
+        else:
+            sigma = math.log1p(jitter / median) if jitter > 0 else 0.0
+            seconds = self._rng.lognormvariate(math.log(median), sigma)
+        return max(0.0, seconds) * self.config.time_scale
+
+    def _generation_seconds(self, output_tokens: int) -> float:
+        """Time to generate output_tokens after the first token."""
+        if self.config.output_tokens_per_second <= 0:
+            return 0.0
+        return output_tokens / self.config.output_tokens_per_second * self.config.time_scale
+
+    def _check_rate_limit(self) -> None:
+        """Reject the request with a 429 at the configured probability."""
+        self._stats['requests'] += 1
+        if self._rng.random() < self.config.rate_limit_probability:
+            self._stats['rate_limited'] += 1
+            raise anthropic.RateLimitError(
+                "Stand-in rate limit exceeded",
+                response=_StandInHTTPResponse(429, {'retry-after': str(self.config.retry_after_seconds)}),
+                body={'type': 'error', 'error': {'type': 'rate_limit_error', 'message': 'Stand-in rate limit'}}
+            )
+
+    def _synthesize_analysis(self, symbol: str) -> Dict[str, Any]:
+        """Build a deterministic schema-valid analysis for a symbol."""
+        if symbol in self._recordings:
+            self._stats['replayed'] += 1
+            return {'symbol': symbol, **self._recordings[symbol]}
+
+        self._stats['synthesized'] += 1
+        rng = random.Random(int(hashlib.sha256(symbol.encode('utf-8')).hexdigest()[:12], 16))
+        score = rng.randint(35, 90)
+        analysis = {
+            'symbol': symbol,
+            'pmcc_score': score,
+            'execution_risk_score': rng.randint(5, 25),
+            'financial_stability_score': rng.randint(5, 25),
+            'calendar_event_score': rng.randint(5, 20),
+            'technical_setup_score': rng.randint(5, 20),
+            'recommendation': 'buy' if score >= 70 else 'hold' if score >= 50 else 'avoid',
+            'confidence_level': rng.randint(55, 90),
+            'key_risks': [f"{symbol} stand-in risk {i}" for i in range(1, 4)],
+            'key_opportunities': [f"{symbol} stand-in opportunity {i}" for i in range(1, 4)],
+            'management_strategy': "",
+            'entry_timing': 'Immediate',
+            'exit_conditions': ['Short call tested', 'LEAPS loses 50% of value'],
+            'position_sizing': '2% of portfolio based on risk profile'
+        }
+        # Pad the free-text field so the analysis is roughly the configured size
+        padding = max(0, self.config.output_tokens - estimate_tokens(json.dumps(analysis)))
+        analysis['management_strategy'] = ("Roll the short call before expiration. " * (padding // 9 + 1))[:padding * 4]
+        return analysis
+
+    def _respond(self, request: Dict[str, Any]) -> str:
+        """Build the response text for a request."""
+        prompt = ''.join(
+            m['content'] if isinstance(m.get('content'), str) else json.dumps(m.get('content'))
+            for m in request.get('messages', [])
+        )
+        batch = _BATCH_SYMBOLS_PATTERN.search(prompt)
+        if batch:
+            symbols = [s.strip() for s in batch.group(1).split(',') if s.strip()]
+            return json.dumps({symbol: self._synthesize_analysis(symbol) for symbol in symbols})
+
+        symbols = _SINGLE_SYMBOL_PATTERN.findall(prompt)
+        if symbols:
+            return json.dumps(self._synthesize_analysis(symbols[0]))
+        return "OK"
+
+    def _build_message(self, request: Dict[str, Any], text: str) -> Message:
+        """Wrap response text in a Message with estimated usage."""
+        system = request.get('system')
+        system_text = ''
+        cached = False
+        if isinstance(system, list):
+            system_text = ''.join(block.get('text', '') for block in system)
+            cached = any(block.get('cache_control') for block in system)
+        elif isinstance(system, str):
+            system_text = system
+
+        prompt_tokens = sum(
+            estimate_tokens(m['content'] if isinstance(m.get('content'), str) else json.dumps(m.get('content')))
+            for m in request.get('messages', [])
+        )
+        usage = {'input_tokens': prompt_tokens, 'output_tokens': estimate_tokens(text),
+                 'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 0}
+        if cached and system_text in self._cached_prefixes:
+            usage['cache_read_input_tokens'] = estimate_tokens(system_text)
+        elif cached:
+            self._cached_prefixes.add(system_text)
+            usage['cache_creation_input_tokens'] = estimate_tokens(system_text)
+        else:
+            usage['input_tokens'] += estimate_tokens(system_text)
+
+        max_tokens = request.get('max_tokens') or 0
+        stop_reason = 'end_turn'
+        if max_tokens and usage['output_tokens'] > max_tokens:
+            text = text[:max_tokens * 4]
+            usage['output_tokens'] = max_tokens
+            stop_reason = 'max_tokens'
+
+        self._stats['input_tokens'] += usage['input_tokens'] + usage['cache_creation_input_tokens']
+        self._stats['output_tokens'] += usage['output_tokens']
+        return Message.model_validate({
+            'id': f"msg_standin_{uuid.uuid4().hex[:16]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': request.get('model', 'claude-standin'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': stop_reason,
+            'stop_sequence': None,
+            'usage': usage
+        })
+
+    def _enter(self) -> None:
+        self._in_flight += 1
+        self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._in_flight)
+
+    def _exit(self) -> None:
+        self._in_flight -= 1
+
+
+class _StandInMessages:
+    """The ``messages`` resource of the stand-in."""
+
+    def __init__(self, standin: ClaudeStandIn):
+        self._standin = standin
+
+    async def create(self, **request: Any) -> Message:
+        """Answer a non-streaming request after the simulated latency."""
+        standin = self._standin
+        standin._check_rate_limit()
+        standin._enter()
+        try:
+            message = standin._build_message(request, standin._respond(request))
+            await asyncio.sleep(
+                standin._sample_first_token_seconds()
+                + standin._generation_seconds(message.usage.output_tokens)
+            )
+            return message
+        finally:
+            standin._exit()
+
+    def stream(self, **request: Any) -> '_StandInStream':
+        """Open a streaming request."""
+        return _StandInStream(self._standin, request)
+
+
+class _StandInStream:
+    """Async context manager mirroring the SDK's message stream."""
+
+    CHUNK_CHARS = 40
+
+    def __init__(self, standin: ClaudeStandIn, request: Dict[str, Any]):
+        self._standin = standin
+        self._request = request
+        self._final: Optional[Message] = None
+        self._sent = ''
+        self.current_message_snapshot: Optional[Message] = None
+
+    async def __aenter__(self) -> '_StandInStream':
+        self._standin._check_rate_limit()
+        self._standin._enter()
+        self._final = self._standin._build_message(self._request, self._standin._respond(self._request))
+        self.current_message_snapshot = self._final.model_copy(update={
+            'content': [], 'stop_reason': None,
+            'usage': self._final.usage.model_copy(update={'output_tokens': 0})
+        })
+        return self
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        self._standin._exit()
+        return False
+
+    @property
+    def text_stream(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        text = self._final.content[0].text
+        chunks: List[str] = [text[i:i + self.CHUNK_CHARS] for i in range(0, len(text), self.CHUNK_CHARS)]
+        await asyncio.sleep(self._standin._sample_first_token_seconds())
+        per_chunk = self._standin._generation_seconds(self._final.usage.output_tokens) / max(1, len(chunks))
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(per_chunk)
+            self._sent += chunk
+            self.current_message_snapshot = self.current_message_snapshot.model_copy(update={
+                'content': [TextBlock(type='text', text=self._sent)]
+            })
+            yield chunk
+
+    async def get_final_message(self) -> Message:
+        """Drain the stream and return the complete message."""
+        if not self._sent:
+            async for _ in self.text_stream:
+                pass
+        return self._final
@@ -14,7 +14,7 @@ Key features:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Union, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Tuple, Union, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import datetime, date
 from decimal import Decimal
@@ -140,6 +140,67 @@ class ScreeningCriteria:
         }
 
 
+@dataclass
+class OptionChainQuery:
+    """
+    Server-side filters for a single option chain request.
+    
+    Built from the active LEAPS/short call criteria so providers that support
+    filtering only download contracts that can pass the local filters.
+    """
+    
+    # Expiration window
+    expiration_from: Optional[date] = None
+    expiration_to: Optional[date] = None
+    
+    # Greeks filters
+    min_delta: Optional[Decimal] = None
+    max_delta: Optional[Decimal] = None
+    
+    # Strike filters
+    min_strike: Optional[Decimal] = None
+    max_strike: Optional[Decimal] = None
+    
+    # Liquidity filters
+    min_open_interest: Optional[int] = None
+    min_volume: Optional[int] = None
+    
+    side: str = "call"
+    
+    @staticmethod
+    def _format_range(low: Optional[Decimal], high: Optional[Decimal]) -> Optional[str]:
+        """Format bounds as a MarketData.app range or comparison filter."""
+        if low is not None and high is not None:
+            return f"{low}-{high}"
+        if low is not None:
+            return f">={low}"
+        if high is not None:
+            return f"<={high}"
+        return None
+    
+    def to_marketdata_params(self) -> Dict[str, Any]:
+        """Convert query to MarketDataClient.get_option_chain keyword arguments."""
+        return {
+            "from_date": self.expiration_from.isoformat() if self.expiration_from else None,
+            "to_date": self.expiration_to.isoformat() if self.expiration_to else None,
+            "side": self.side,
+            "delta_range": self._format_range(self.min_delta, self.max_delta),
+            "strike_range": self._format_range(self.min_strike, self.max_strike),
+            "min_open_interest": self.min_open_interest or None,
+            "min_volume": self.min_volume or None
+        }
+    
+    @staticmethod
+    def expiration_span(queries: List['OptionChainQuery']) -> Tuple[Optional[date], Optional[date]]:
+        """Get the (from, to) expiration window covering all queries."""
+        froms = [q.expiration_from for q in queries]
+        tos = [q.expiration_to for q in queries]
+        return (
+            None if not froms or None in froms else min(froms),
+            None if not tos or None in tos else max(tos)
+        )
+
+
 class DataProvider(ABC):
     """
     Abstract base class for all data providers.
@@ -228,6 +289,44 @@ class DataProvider(ABC):
             f"Provider {self.provider_type.value} does not support options data"
         )
     
+    async def get_option_expirations(self, symbol: str) -> APIResponse:
+        """
+        Get available option expiration dates for a stock.
+        
+        Default implementation for providers that don't support options.
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            APIResponse containing list of ISO expiration date strings or error
+        """
+        return self._create_error_response(
+            f"Provider {self.provider_type.value} does not support option expirations"
+        )
+    
+    async def get_options_chain_for_queries(
+        self,
+        symbol: str,
+        queries: List[OptionChainQuery]
+    ) -> APIResponse:
+        """
+        Get an options chain restricted by server-side query filters.
+        
+        Default implementation for providers without filter push-down: fetches
+        one chain covering the expiration span of all queries. Override in
+        providers that can filter by delta, strike and liquidity server-side.
+        
+        Args:
+            symbol: Stock symbol
+            queries: Filters for each targeted request
+            
+        Returns:
+            APIResponse containing OptionChain data or error
+        """
+        expiration_from, expiration_to = OptionChainQuery.expiration_span(queries)
+        return await self.get_options_chain(symbol, expiration_from, expiration_to)
+    
     @abstractmethod
     async def screen_stocks(self, criteria: ScreeningCriteria) -> APIResponse:
         """
@@ -482,6 +581,25 @@ class SyncDataProvider(ABC):
         """Get options chain synchronously."""
         pass
     
+    def get_option_expirations(self, symbol: str) -> APIResponse:
+        """Get available option expiration dates synchronously."""
+        return APIResponse(
+            status=APIStatus.ERROR,
+            error=APIError(
+                code=500,
+                message=f"Provider {self.provider_type.value} does not support option expirations"
+            )
+        )
+    
+    def get_options_chain_for_queries(
+        self,
+        symbol: str,
+        queries: List[OptionChainQuery]
+    ) -> APIResponse:
+        """Get options chain restricted by server-side query filters synchronously."""
+        expiration_from, expiration_to = OptionChainQuery.expiration_span(queries)
+        return self.get_options_chain(symbol, expiration_from, expiration_to)
+    
     @abstractmethod
     def screen_stocks(self, criteria: ScreeningCriteria) -> APIResponse:
         """Screen stocks synchronously."""
@@ -35,6 +35,20 @@ from src.models.api_models import (
 
 logger = logging.getLogger(__name__)
 
+# Symbols per bulk EOD request; keeps the symbols query parameter well under URL limits
+BULK_QUOTE_CHUNK_SIZE = 500
+
+# Comprehensive PMCC targets match contracts within these windows of the target
+OPTION_TARGET_WINDOW_DAYS = 3
+OPTION_TARGET_STRIKE_TOLERANCE = 0.5
+
+# Widest expiration span a single consolidated options range query may cover
+OPTION_RANGE_QUERY_MAX_DAYS = 200
+
+# Options API pagination limits (page[limit] max and deepest reachable offset)
+OPTIONS_PAGE_LIMIT = 1000
+OPTIONS_MAX_OFFSET = 10000
+
 
 class EODHDError(Exception):
     """Base exception for EODHD API errors."""
@@ -75,6 +89,7 @@ class EODHDClient:
                  timeout: float = 30.0,
                  max_retries: int = 3,
                  retry_backoff: float = 1.0,
+                 max_concurrent_requests: int = 10,
                  enable_tradetime_filtering: bool = True,
                  tradetime_lookback_days: int = 5,
                  custom_tradetime_date: Optional[str] = None):
@@ -87,6 +102,7 @@ class EODHDClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             retry_backoff: Initial backoff delay for retries (exponential backoff)
+            max_concurrent_requests: Maximum number of requests in flight at once
             enable_tradetime_filtering: Enable/disable tradetime filtering globally
             tradetime_lookback_days: Number of days to look back for trading dates
             custom_tradetime_date: Override tradetime filter date for testing (YYYY-MM-DD format)
@@ -111,11 +127,13 @@ class EODHDClient:
         self.tradetime_lookback_days = tradetime_lookback_days
         self.custom_tradetime_date = custom_tradetime_date
         
-        # EODHD handles rate limiting server-side
-        # No local rate limiting needed as per requirements
+        # EODHD handles rate limiting server-side; we only bound concurrency
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
         
-        # HTTP session (created lazily)
+        # HTTP session and concurrency limiter (created lazily, per event loop)
         self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
         
         # Request statistics
         self._stats = {
@@ -168,11 +186,20 @@ class EODHDClient:
         await self.close()
     
     async def _ensure_session(self):
-        """Ensure HTTP session is created."""
+        """Ensure HTTP session is created for the running event loop."""
+        loop = asyncio.get_running_loop()
+        
+        # Sync wrappers drive this client from short-lived event loops, and an
+        # aiohttp session cannot be reused once its loop has gone away.
+        if self._session is not None and self._session_loop is not loop:
+            if not self._session.closed and not self._session_loop.is_closed():
+                await self._session.close()
+            self._session = None
+        
         if self._session is None or self._session.closed:
             connector = aiohttp.TCPConnector(
-                limit=10,
-                limit_per_host=10,
+                limit=self.max_concurrent_requests,
+                limit_per_host=self.max_concurrent_requests,
                 ttl_dns_cache=300,
                 use_dns_cache=True
             )
@@ -185,12 +212,17 @@ class EODHDClient:
                     'Accept': 'application/json'
                 }
             )
+            self._session_loop = loop
+            self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
     
     async def close(self):
         """Close HTTP session and cleanup resources."""
         if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+        self._session = None
+        self._session_loop = None
+        self._request_semaphore = None
     
     def _build_filters(self, filters: List[List[Any]]) -> str:
         """
@@ -260,9 +292,10 @@ class EODHDClient:
         
         for attempt in range(self.max_retries + 1):
             try:
-                # EODHD handles rate limiting server-side
-                # Make the request
-                async with self._session.get(url, params=request_params) as response:
+                # EODHD handles rate limiting server-side; the semaphore only
+                # bounds how many requests this client keeps in flight
+                async with self._request_semaphore, \
+                        self._session.get(url, params=request_params) as response:
                     
                     # Update statistics
                     self._stats['requests_made'] += 1
@@ -965,7 +998,8 @@ class EODHDClient:
                                 symbol: str,
                                 from_date: Optional[str] = None,
                                 to_date: Optional[str] = None,
-                                period: str = 'd') -> APIResponse:
+                                period: str = 'd',
+                                order: Optional[str] = None) -> APIResponse:
         """
         Get historical end-of-day data for a symbol.
         
@@ -974,6 +1008,7 @@ class EODHDClient:
             from_date: Start date (YYYY-MM-DD format)
             to_date: End date (YYYY-MM-DD format)
             period: Data period ('d' for daily, 'w' for weekly, 'm' for monthly)
+            order: Sort order ('a' ascending, 'd' descending), API default if None
             
         Returns:
             APIResponse containing historical EOD data or error
@@ -993,10 +1028,244 @@ class EODHDClient:
             params['from'] = from_date
         if to_date:
             params['to'] = to_date
+        if order:
+            params['order'] = order
         
         # Make request to EOD historical endpoint
         return await self._make_request(f'eod/{eodhd_symbol}', params=params)
     
+    async def get_fundamentals(self, symbol: str) -> APIResponse:
+        """
+        Get the full fundamentals document for a symbol.
+        
+        Args:
+            symbol: Ticker with exchange suffix (e.g., "AAPL.US")
+            
+        Returns:
+            APIResponse containing the raw fundamentals dictionary or error
+        """
+        logger.debug(f"Getting fundamentals for {symbol}")
+        return await self._make_request(f'fundamentals/{symbol}', params={'fmt': 'json'})
+    
+    async def get_real_time_quotes(self, 
+                                   symbol: str,
+                                   additional_symbols: Optional[List[str]] = None) -> APIResponse:
+        """
+        Get live (15-20 minute delayed) prices for one or more symbols.
+        
+        Args:
+            symbol: Primary ticker (e.g., "AAPL.US")
+            additional_symbols: Extra tickers to fetch in the same request
+            
+        Returns:
+            APIResponse containing a dict for a single symbol, or a list of
+            dicts when additional symbols were requested
+        """
+        params: Dict[str, Any] = {'fmt': 'json'}
+        if additional_symbols:
+            params['s'] = ','.join(additional_symbols)
+        
+        return await self._make_request(f'real-time/{symbol}', params=params)
+    
+    async def get_economic_events(self,
+                                  date_from: Optional[str] = None,
+                                  date_to: Optional[str] = None,
+                                  country: Optional[str] = None,
+                                  comparison: Optional[str] = None,
+                                  offset: Optional[int] = None,
+                                  limit: Optional[int] = None) -> APIResponse:
+        """
+        Get economic events (macro calendar).
+        
+        Args:
+            date_from: Start date (YYYY-MM-DD format)
+            date_to: End date (YYYY-MM-DD format)
+            country: ISO 3166 two-letter country code
+            comparison: Comparison period ('mom', 'qoq', 'yoy')
+            offset: Result offset for pagination
+            limit: Number of events to return
+            
+        Returns:
+            APIResponse containing list of economic events or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json'}
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        if country:
+            params['country'] = country
+        if comparison:
+            params['comparison'] = comparison
+        if offset is not None:
+            params['offset'] = offset
+        if limit is not None:
+            params['limit'] = limit
+        
+        return await self._make_request('economic-events', params=params)
+    
+    async def get_news(self,
+                       symbol: str,
+                       date_from: Optional[str] = None,
+                       date_to: Optional[str] = None,
+                       limit: Optional[int] = None,
+                       offset: Optional[int] = None) -> APIResponse:
+        """
+        Get financial news articles for a symbol.
+        
+        Args:
+            symbol: Ticker with exchange suffix (e.g., "AAPL.US")
+            date_from: Start date (YYYY-MM-DD format)
+            date_to: End date (YYYY-MM-DD format)
+            limit: Number of articles to return
+            offset: Result offset for pagination
+            
+        Returns:
+            APIResponse containing list of news articles or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json', 's': symbol}
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        if limit is not None:
+            params['limit'] = limit
+        if offset is not None:
+            params['offset'] = offset
+        
+        return await self._make_request('news', params=params)
+    
+    async def get_sentiments(self,
+                             symbols: str,
+                             date_from: Optional[str] = None,
+                             date_to: Optional[str] = None) -> APIResponse:
+        """
+        Get aggregated news sentiment for one or more symbols.
+        
+        Args:
+            symbols: Comma-separated ticker list
+            date_from: Start date (YYYY-MM-DD format)
+            date_to: End date (YYYY-MM-DD format)
+            
+        Returns:
+            APIResponse containing sentiment data keyed by ticker or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json', 's': symbols}
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        
+        return await self._make_request('sentiments', params=params)
+    
+    async def get_earnings_calendar(self,
+                                    date_from: Optional[str] = None,
+                                    date_to: Optional[str] = None,
+                                    symbols: Optional[str] = None) -> APIResponse:
+        """
+        Get historical and upcoming earnings from the calendar API.
+        
+        Args:
+            date_from: Start date (YYYY-MM-DD format), ignored by EODHD when symbols is set
+            date_to: End date (YYYY-MM-DD format), ignored by EODHD when symbols is set
+            symbols: Comma-separated ticker list
+            
+        Returns:
+            APIResponse containing earnings calendar dict or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json'}
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        if symbols:
+            params['symbols'] = symbols
+        
+        return await self._make_request('calendar/earnings', params=params)
+    
+    async def get_dividends(self,
+                            symbol: str,
+                            date_from: Optional[str] = None,
+                            date_to: Optional[str] = None) -> APIResponse:
+        """
+        Get historical dividends for a symbol.
+        
+        Args:
+            symbol: Ticker with exchange suffix (e.g., "AAPL.US")
+            date_from: Start date (YYYY-MM-DD format)
+            date_to: End date (YYYY-MM-DD format)
+            
+        Returns:
+            APIResponse containing list of dividends or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json'}
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        
+        return await self._make_request(f'div/{symbol}', params=params)
+    
+    async def get_technical_indicator(self,
+                                      symbol: str,
+                                      function: str,
+                                      period: int = 50,
+                                      date_from: Optional[str] = None,
+                                      date_to: Optional[str] = None,
+                                      order: str = 'a',
+                                      splitadjusted_only: str = '0') -> APIResponse:
+        """
+        Get a technical indicator series for a symbol.
+        
+        Args:
+            symbol: Ticker with exchange suffix (e.g., "AAPL.US")
+            function: Indicator function name (e.g., "rsi", "volatility", "atr")
+            period: Number of data points used for each value
+            date_from: Start date (YYYY-MM-DD format)
+            date_to: End date (YYYY-MM-DD format)
+            order: Sort order ('a' ascending, 'd' descending)
+            splitadjusted_only: '1' to use split-only adjusted closes
+            
+        Returns:
+            APIResponse containing list of indicator values or error
+        """
+        params: Dict[str, Any] = {
+            'fmt': 'json',
+            'function': function,
+            'period': period,
+            'order': order,
+            'splitadjusted_only': splitadjusted_only
+        }
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        
+        return await self._make_request(f'technical/{symbol}', params=params)
+    
+    async def get_exchange_details(self,
+                                   exchange_code: str = 'US',
+                                   date_from: Optional[str] = None,
+                                   date_to: Optional[str] = None) -> APIResponse:
+        """
+        Get exchange trading hours and market holidays.
+        
+        Args:
+            exchange_code: EODHD exchange code (e.g., "US")
+            date_from: Start date for holidays (YYYY-MM-DD format)
+            date_to: End date for holidays (YYYY-MM-DD format)
+            
+        Returns:
+            APIResponse containing exchange details dict or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json'}
+        if date_from:
+            params['from'] = date_from
+        if date_to:
+            params['to'] = date_to
+        
+        return await self._make_request(f'exchange-details/{exchange_code}', params=params)
+    
     async def get_stock_quote_eod(self, symbol: str) -> APIResponse:
         """
         Get stock quote from EODHD EOD data in StockQuote-compatible format.
@@ -1032,30 +1301,7 @@ class EODHDClient:
                     error=APIError(500, "Invalid EOD data format")
                 )
             
-            # Import StockQuote here to avoid circular imports
-            from src.models.api_models import StockQuote
-            
-            # Extract data fields (EODHD EOD format)
-            # Create arrays like MarketData API expects for compatibility with StockQuote.from_api_response
-            quote_data = {
-                'symbol': [symbol],  # Array format
-                'last': [latest_data.get('adjusted_close', latest_data.get('close'))],
-                'close': [latest_data.get('close')],
-                'high': [latest_data.get('high')],
-                'low': [latest_data.get('low')],
-                'open': [latest_data.get('open')],
-                'volume': [latest_data.get('volume')],
-                'mid': [latest_data.get('adjusted_close', latest_data.get('close'))],  # Use close as mid
-                'date': [latest_data.get('date')],  # Date field for parsing
-                'bid': [None],  # EOD data doesn't include bid/ask
-                'ask': [None],  # EOD data doesn't include bid/ask
-                'change': [None],  # Would need to calculate from previous day
-                'change_percent': [None],  # Would need to calculate from previous day
-                'source': 'eodhd_eod'
-            }
-            
-            # Convert to StockQuote object
-            stock_quote = StockQuote.from_api_response(quote_data, index=0)
+            stock_quote = self._eod_bar_to_stock_quote(symbol, latest_data)
             
             return APIResponse(
                 status=APIStatus.OK,
@@ -1070,6 +1316,127 @@ class EODHDClient:
                 error=APIError(500, f"Error getting EOD quote: {e}")
             )
 
+    @staticmethod
+    def _eod_bar_to_stock_quote(symbol: str, bar: Dict[str, Any]):
+        """
+        Convert a single EODHD EOD bar (historical or bulk) to a StockQuote.
+        
+        Args:
+            symbol: Stock symbol without exchange suffix
+            bar: EOD record with close/adjusted_close/volume/date fields
+            
+        Returns:
+            StockQuote built from the bar
+        """
+        # Import StockQuote here to avoid circular imports
+        from src.models.api_models import StockQuote
+        
+        # Create arrays like MarketData API expects for compatibility with StockQuote.from_api_response
+        quote_data = {
+            'symbol': [symbol],  # Array format
+            'last': [bar.get('adjusted_close', bar.get('close'))],
+            'close': [bar.get('close')],
+            'high': [bar.get('high')],
+            'low': [bar.get('low')],
+            'open': [bar.get('open')],
+            'volume': [bar.get('volume')],
+            'mid': [bar.get('adjusted_close', bar.get('close'))],  # Use close as mid
+            'date': [bar.get('date')],  # Date field for parsing
+            'bid': [None],  # EOD data doesn't include bid/ask
+            'ask': [None],  # EOD data doesn't include bid/ask
+            'change': [bar.get('change')],  # Only present in extended bulk data
+            'change_percent': [bar.get('change_p')],
+            'source': 'eodhd_eod'
+        }
+        
+        return StockQuote.from_api_response(quote_data, index=0)
+    
+    async def get_eod_bulk_last_day(self,
+                                    symbols: Optional[List[str]] = None,
+                                    exchange: str = 'US',
+                                    date: Optional[str] = None) -> APIResponse:
+        """
+        Get last-day EOD bars for many symbols in a single request.
+        
+        Args:
+            symbols: Symbols to include; None downloads the whole exchange
+            exchange: EODHD exchange code
+            date: Trading date (YYYY-MM-DD), defaults to the last trading day
+            
+        Returns:
+            APIResponse containing a list of EOD bar dicts or error
+        """
+        params: Dict[str, Any] = {'fmt': 'json'}
+        if symbols:
+            params['symbols'] = ','.join(symbols)
+        if date:
+            params['date'] = date
+        
+        return await self._make_request(f'eod-bulk-last-day/{exchange}', params=params)
+    
+    async def get_stock_quotes_eod_bulk(self,
+                                        symbols: List[str],
+                                        chunk_size: int = BULK_QUOTE_CHUNK_SIZE) -> APIResponse:
+        """
+        Get StockQuotes for a whole universe using the bulk last-day EOD endpoint.
+        
+        Symbols are fetched in chunks of ``chunk_size`` so a 1,000 symbol screen
+        costs a couple of requests instead of one request per symbol. Symbols
+        missing from the bulk response are simply absent from the result.
+        
+        Args:
+            symbols: Stock symbols (with or without the .US suffix)
+            chunk_size: Maximum symbols per bulk request
+            
+        Returns:
+            APIResponse containing Dict[str, StockQuote] keyed by input symbol
+        """
+        if not symbols:
+            return APIResponse(status=APIStatus.OK, data={})
+        
+        # Bulk responses report the bare code, so map it back to the caller's symbol
+        code_to_symbol = {s.upper().removesuffix('.US'): s for s in symbols}
+        codes = list(code_to_symbol)
+        chunks = [codes[i:i + chunk_size] for i in range(0, len(codes), max(1, chunk_size))]
+        
+        logger.info(f"Fetching bulk EOD quotes for {len(codes)} symbols in {len(chunks)} request(s)")
+        
+        responses = await asyncio.gather(
+            *(self.get_eod_bulk_last_day([f"{code}.US" for code in chunk]) for chunk in chunks),
+            return_exceptions=True
+        )
+        
+        quotes: Dict[str, Any] = {}
+        errors = []
+        for response in responses:
+            if isinstance(response, Exception):
+                errors.append(str(response))
+                continue
+            if not response.is_success or not isinstance(response.data, list):
+                errors.append(str(response.error) if response.error else "Invalid bulk EOD data format")
+                continue
+            
+            for bar in response.data:
+                code = str(bar.get('code', '')).upper()
+                symbol = code_to_symbol.get(code)
+                if symbol is None:
+                    continue
+                try:
+                    quotes[symbol] = self._eod_bar_to_stock_quote(symbol, bar)
+                except Exception as e:
+                    logger.debug(f"Skipping bulk EOD bar for {code}: {e}")
+        
+        if errors and not quotes:
+            return APIResponse(
+                status=APIStatus.ERROR,
+                error=APIError(500, f"Bulk EOD quote fetch failed: {'; '.join(errors)}")
+            )
+        
+        if errors:
+            logger.warning(f"{len(errors)} of {len(chunks)} bulk EOD requests failed: {errors[0]}")
+        
+        return APIResponse(status=APIStatus.OK, data=quotes)
+    
     async def get_pmcc_options_fresh(self, symbol: str, current_price: Optional[float] = None) -> APIResponse:
         """
         Get PMCC-relevant options using granular date ranges to ensure fresh data.
@@ -1344,6 +1711,123 @@ class EODHDClient:
         logger.debug(f"Generated {len(targets['leaps'])} LEAPS targets and {len(targets['short'])} short call targets")
         return targets
     
+    def plan_option_range_queries(self,
+                                  targets: List[Dict[str, Any]],
+                                  max_span_days: int = OPTION_RANGE_QUERY_MAX_DAYS) -> List[Dict[str, Any]]:
+        """
+        Merge single-contract option targets into a few wide range queries.
+        
+        Targets whose 3-day expiration windows are adjacent are grouped until the
+        group would span more than ``max_span_days``. Each group becomes one
+        expiration/strike range query covering every target in it.
+        
+        Args:
+            targets: Option targets from generate_pmcc_targets
+            max_span_days: Maximum expiration span of a single query
+            
+        Returns:
+            List of query dicts with type, date/strike bounds and covered targets
+        """
+        window = timedelta(days=OPTION_TARGET_WINDOW_DAYS)
+        queries: List[Dict[str, Any]] = []
+        
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for target in targets:
+            by_type.setdefault(target['type'], []).append(target)
+        
+        for option_type, type_targets in by_type.items():
+            ordered = sorted(type_targets, key=lambda t: t['expiration'])
+            group: List[Dict[str, Any]] = []
+            group_start = group_end = None
+            
+            for target in ordered:
+                exp_date = datetime.strptime(target['expiration'], '%Y-%m-%d')
+                start, end = exp_date - window, exp_date + window
+                
+                if group and (start > group_end + timedelta(days=1) or
+                              (end - group_start).days > max_span_days):
+                    queries.append(self._build_range_query(option_type, group, group_start, group_end))
+                    group = []
+                
+                if not group:
+                    group_start, group_end = start, end
+                group.append(target)
+                group_end = max(group_end, end)
+            
+            if group:
+                queries.append(self._build_range_query(option_type, group, group_start, group_end))
+        
+        return queries
+    
+    @staticmethod
+    def _build_range_query(option_type: str,
+                           targets: List[Dict[str, Any]],
+                           start: datetime,
+                           end: datetime) -> Dict[str, Any]:
+        """Build a range query dict covering the given targets."""
+        strikes = [target['strike'] for target in targets]
+        return {
+            'type': option_type,
+            'exp_date_from': start.strftime('%Y-%m-%d'),
+            'exp_date_to': end.strftime('%Y-%m-%d'),
+            'strike_from': min(strikes) - OPTION_TARGET_STRIKE_TOLERANCE,
+            'strike_to': max(strikes) + OPTION_TARGET_STRIKE_TOLERANCE,
+            'targets': targets
+        }
+    
+    async def _fetch_option_range(self,
+                                  symbol: str,
+                                  query: Dict[str, Any],
+                                  tradetime_from: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch every contract in a range query, following page offsets.
+        
+        Args:
+            symbol: Underlying stock symbol
+            query: Range query from plan_option_range_queries
+            tradetime_from: Optional tradetime filter
+            
+        Returns:
+            List of option attribute dicts sorted by expiration date
+            
+        Raises:
+            EODHDError: If any page request fails
+        """
+        options: List[Dict[str, Any]] = []
+        offset = 0
+        
+        while True:
+            params = {
+                'filter[underlying_symbol]': symbol,
+                'filter[type]': query['type'],
+                'filter[exp_date_from]': query['exp_date_from'],
+                'filter[exp_date_to]': query['exp_date_to'],
+                'filter[strike_from]': query['strike_from'],
+                'filter[strike_to]': query['strike_to'],
+                'page[limit]': OPTIONS_PAGE_LIMIT,
+                'page[offset]': offset,
+                'sort': 'exp_date'
+            }
+            if tradetime_from:
+                params['filter[tradetime_from]'] = tradetime_from
+            
+            response = await self._make_request('mp/unicornbay/options/eod', params=params)
+            if not response.is_success:
+                raise EODHDError(f"Options range request failed: {response.error}")
+            
+            page = (response.data or {}).get('data', [])
+            options.extend(item['attributes'] for item in page if 'attributes' in item)
+            
+            total = ((response.data or {}).get('meta') or {}).get('total')
+            offset += len(page)
+            if len(page) < OPTIONS_PAGE_LIMIT or (total is not None and offset >= total):
+                break
+            if offset >= OPTIONS_MAX_OFFSET:
+                logger.warning(f"Options range query for {symbol} truncated at offset {offset}")
+                break
+        
+        return options
+    
     async def get_pmcc_options_comprehensive(self, 
                                          symbol: str, 
                                          current_price: Optional[float] = None,
@@ -1359,14 +1843,14 @@ class EODHDClient:
         This method implements a comprehensive approach to fetch PMCC-suitable options:
         - Generates 96 LEAPS targets (24 weekly expirations × 4 strikes)
         - Generates 16 short call targets (4 weekly expirations × 4 strikes)
-        - Fetches each option with a 3-day date window
-        - Processes requests in batches to avoid overwhelming the API
+        - Merges the targets into a few paginated expiration/strike range queries
+        - Selects each target's contracts (3-day date window) client-side
         - Returns comprehensive results with all PMCC opportunities
         
         Args:
             symbol: Stock symbol to analyze
             current_price: Current stock price for strike targeting
-            batch_size: Number of options to process per batch
+            batch_size: Number of range queries to run concurrently
             batch_delay: Delay in seconds between batches
             min_success_rate: Minimum success rate (%) to consider operation successful
             retry_failed: Whether to retry failed option requests
@@ -1415,113 +1899,81 @@ class EODHDClient:
         total_targets = len(targets['leaps']) + len(targets['short'])
         logger.info(f"Generated {total_targets} option targets ({len(targets['leaps'])} LEAPS, {len(targets['short'])} short calls)")
         
-        # Use provided batch configuration
-        
         all_options = []
         successful_requests = 0
         failed_requests = 0
         
-        async def fetch_option_batch(option_targets: List[Dict[str, Any]], option_type: str) -> List[Dict[str, Any]]:
-            """Fetch a batch of options concurrently."""
-            nonlocal successful_requests, failed_requests
-            batch_options = []
-            
-            # Create tasks for concurrent execution
-            tasks = []
-            for target in option_targets:
-                exp_date = datetime.strptime(target['expiration'], '%Y-%m-%d')
-                
-                # 3-day window around target expiration
-                start_date = (exp_date - timedelta(days=3)).strftime('%Y-%m-%d')
-                end_date = (exp_date + timedelta(days=3)).strftime('%Y-%m-%d')
-                
-                params = {
-                    'filter[underlying_symbol]': symbol,
-                    'filter[type]': target['type'],
-                    'filter[exp_date_from]': start_date,
-                    'filter[exp_date_to]': end_date,
-                    'filter[strike_from]': target['strike'] - 0.5,
-                    'filter[strike_to]': target['strike'] + 0.5,
-                    'page[limit]': 50,
-                    'sort': 'exp_date'
-                }
-                
-                # Add tradetime filter if available for consistent filtering
-                if tradetime_from:
-                    params['filter[tradetime_from]'] = tradetime_from
-                
-                task = self._make_request('mp/unicornbay/options/eod', params=params)
-                tasks.append((task, target, option_type))
-            
-            # Execute batch concurrently
-            results = await asyncio.gather(*[task for task, _, _ in tasks], return_exceptions=True)
-            
-            # Process results
-            for i, result in enumerate(results):
-                _, target, opt_type = tasks[i]
-                
-                if isinstance(result, Exception):
-                    logger.warning(f"Failed to fetch {opt_type} option {target['strike']} exp {target['expiration']}: {result}")
-                    failed_requests += 1
+        def select_target_options(options: List[Dict[str, Any]], target: Dict[str, Any],
+                                  option_type: str) -> List[Dict[str, Any]]:
+            """Pick a target's contracts from a range result and validate PMCC criteria."""
+            nonlocal successful_requests
+            exp_date = datetime.strptime(target['expiration'], '%Y-%m-%d')
+            
+            # 3-day window around target expiration
+            start_date = (exp_date - timedelta(days=OPTION_TARGET_WINDOW_DAYS)).strftime('%Y-%m-%d')
+            end_date = (exp_date + timedelta(days=OPTION_TARGET_WINDOW_DAYS)).strftime('%Y-%m-%d')
+            
+            selected = []
+            for opt in options:
+                if (opt.get('type', target['type']) != target['type'] or
+                        not start_date <= (opt.get('exp_date') or '') <= end_date or
+                        abs(opt.get('strike', 0) - target['strike']) > OPTION_TARGET_STRIKE_TOLERANCE):
                     continue
                 
-                if result.is_success and result.data:
-                    options_data = result.data.get('data', [])
-                    
-                    for item in options_data:
-                        if 'attributes' in item:
-                            opt = item['attributes']
-                            
-                            # Validate option meets PMCC criteria
-                            delta = opt.get('delta', 0)
-                            dte = opt.get('dte', 0)
-                            strike = opt.get('strike', 0)
-                            
-                            if opt_type == 'leaps':
-                                if dte >= 180 and delta >= 0.70 and abs(strike - target['strike']) <= 2.5:
-                                    opt['pmcc_type'] = 'leaps'
-                                    opt['target_strike'] = target['strike']
-                                    opt['target_expiration'] = target['expiration']
-                                    batch_options.append(opt)
-                                    successful_requests += 1
-                            elif opt_type == 'short':
-                                if 25 <= dte <= 50 and 0.15 <= delta <= 0.40 and abs(strike - target['strike']) <= 2.5:
-                                    opt['pmcc_type'] = 'short'
-                                    opt['target_strike'] = target['strike']
-                                    opt['target_expiration'] = target['expiration']
-                                    batch_options.append(opt)
-                                    successful_requests += 1
+                # Validate option meets PMCC criteria
+                delta = opt.get('delta', 0)
+                dte = opt.get('dte', 0)
+                strike = opt.get('strike', 0)
+                
+                if option_type == 'leaps':
+                    valid = dte >= 180 and delta >= 0.70 and abs(strike - target['strike']) <= 2.5
                 else:
-                    logger.debug(f"No data for {opt_type} option {target['strike']} exp {target['expiration']}")
-                    failed_requests += 1
-            
-            return batch_options
-        
-        # Process LEAPS in batches
-        logger.info(f"Processing {len(targets['leaps'])} LEAPS targets in batches of {batch_size}")
-        leaps_batches = [targets['leaps'][i:i + batch_size] for i in range(0, len(targets['leaps']), batch_size)]
-        
-        for i, batch in enumerate(leaps_batches):
-            logger.debug(f"Processing LEAPS batch {i + 1}/{len(leaps_batches)} ({len(batch)} options)")
-            batch_options = await fetch_option_batch(batch, 'leaps')
-            all_options.extend(batch_options)
+                    valid = 25 <= dte <= 50 and 0.15 <= delta <= 0.40 and abs(strike - target['strike']) <= 2.5
+                
+                if valid:
+                    opt = dict(opt)
+                    opt['pmcc_type'] = option_type
+                    opt['target_strike'] = target['strike']
+                    opt['target_expiration'] = target['expiration']
+                    selected.append(opt)
+                    successful_requests += 1
+            
+            return selected
+        
+        queries = []
+        for option_type in ('leaps', 'short'):
+            for query in self.plan_option_range_queries(targets[option_type]):
+                queries.append((option_type, query))
+        logger.info(f"Consolidated {total_targets} option targets into {len(queries)} range queries")
+        
+        # Fetch range queries concurrently, batch_size at a time
+        range_results = []
+        for i in range(0, len(queries), batch_size):
+            batch = queries[i:i + batch_size]
+            range_results.extend(await asyncio.gather(
+                *(self._fetch_option_range(symbol, query, tradetime_from) for _, query in batch),
+                return_exceptions=True
+            ))
             
             # Delay between batches to avoid overwhelming API
-            if i < len(leaps_batches) - 1:
+            if i + batch_size < len(queries):
                 await asyncio.sleep(batch_delay)
         
-        # Process short calls in batches
-        logger.info(f"Processing {len(targets['short'])} short call targets in batches of {batch_size}")
-        short_batches = [targets['short'][i:i + batch_size] for i in range(0, len(targets['short']), batch_size)]
-        
-        for i, batch in enumerate(short_batches):
-            logger.debug(f"Processing short call batch {i + 1}/{len(short_batches)} ({len(batch)} options)")
-            batch_options = await fetch_option_batch(batch, 'short')
-            all_options.extend(batch_options)
-            
-            # Delay between batches to avoid overwhelming API
-            if i < len(short_batches) - 1:
-                await asyncio.sleep(batch_delay)
+        options_by_target: Dict[int, List[Dict[str, Any]]] = {}
+        for (option_type, query), result in zip(queries, range_results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to fetch {option_type} options {query['exp_date_from']} to "
+                               f"{query['exp_date_to']}: {result}")
+                failed_requests += len(query['targets'])
+                continue
+            
+            for target in query['targets']:
+                options_by_target[id(target)] = select_target_options(result, target, option_type)
+        
+        # Emit options in target order so results match per-target retrieval
+        for option_type in ('leaps', 'short'):
+            for target in targets[option_type]:
+                all_options.extend(options_by_target.get(id(target), []))
         
         # Separate options by type for reporting
         leaps_options = [opt for opt in all_options if opt.get('pmcc_type') == 'leaps']
@@ -413,6 +413,7 @@ class MarketDataClient:
                               from_date: Optional[str] = None,
                               to_date: Optional[str] = None,
                               delta_range: Optional[str] = None,
+                              strike_range: Optional[str] = None,
                               min_open_interest: Optional[int] = None,
                               min_volume: Optional[int] = None,
                               use_cached_feed: bool = True) -> APIResponse:
@@ -429,6 +430,7 @@ class MarketDataClient:
             from_date: Start date for expiration range (YYYY-MM-DD)
             to_date: End date for expiration range (YYYY-MM-DD)
             delta_range: Delta range filter (e.g., '.70-.95' for LEAPS)
+            strike_range: Strike range or comparison filter (e.g., '100-150', '>=120')
             min_open_interest: Minimum open interest filter
             min_volume: Minimum volume filter
             use_cached_feed: Use cached feed (1 credit) vs live (1 credit per contract)
@@ -459,6 +461,8 @@ class MarketDataClient:
             params['strikeLimit'] = strike_limit
         if delta_range:
             params['delta'] = delta_range
+        if strike_range:
+            params['strike'] = strike_range
         if min_open_interest:
             params['minOpenInterest'] = min_open_interest
         if min_volume:
@@ -589,13 +593,21 @@ class MarketDataClient:
             # Parse expiration timestamps to dates
             try:
                 expirations = []
-                if 'expirations' in response.data:
-                    for timestamp in response.data['expirations']:
-                        try:
-                            date = datetime.fromtimestamp(timestamp).date()
-                            expirations.append(date.isoformat())
-                        except (ValueError, TypeError):
-                            continue
+                raw_expirations = response.data.get('expirations') or []
+                for value in raw_expirations:
+                    try:
+                        # Unix timestamps or ISO date strings
+                        if isinstance(value, str):
+                            date = datetime.fromisoformat(value[:10]).date()
+                        else:
+                            date = datetime.fromtimestamp(value).date()
+                        expirations.append(date.isoformat())
+                    except (ValueError, TypeError, OSError):
+                        continue
+                
+                # An empty list would read as "no options listed"
+                if raw_expirations and not expirations:
+                    raise ValueError(f"unrecognized expiration format: {raw_expirations[0]!r}")
                 
                 return APIResponse(
                     status=response.status,
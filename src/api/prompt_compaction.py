@@ -0,0 +1,261 @@
+"""
+Token-budgeted compaction for Claude analysis prompts.
+
+The single-opportunity prompt is assembled from many optional data sections
+whose size depends on how much EODHD returned for a symbol. This module
+keeps that input bounded: sections carry a priority and a token budget,
+repeated fields are emitted once, long series are reduced to summary
+statistics and the lowest-priority content is truncated first when the
+whole prompt exceeds its budget.
+"""
+
+import math
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Rough characters-per-token ratio for English prose and numbers
+CHARS_PER_TOKEN = 4
+
+# Marker appended to items cut to fit a budget
+TRUNCATION_MARKER = " [...]"
+
+# Items that would be cut below this many tokens are dropped instead
+MIN_TRUNCATED_ITEM_TOKENS = 8
+
+# Default per-section token budgets, keyed by PromptSection.key
+DEFAULT_SECTION_BUDGETS: Dict[str, int] = {
+    'company': 200,
+    'news': 1200,
+    'earnings_calendar': 400,
+    'economic_context': 400,
+}
+
+# Budget applied to sections without an explicit entry above. Core PMCC
+# inputs (options analysis, risk, dividend and calendar risk) are built as
+# required sections, so only supplementary data is held to it
+DEFAULT_SECTION_BUDGET = 250
+
+# Cap on a single news article's content
+NEWS_ARTICLE_MAX_TOKENS = 300
+
+# Default budget for all data sections combined
+DEFAULT_TOTAL_BUDGET = 4000
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without calling the API."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, preferring a word boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    cut = text[:max_chars]
+    if ' ' in cut:
+        cut = cut[:cut.rindex(' ')]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def summarize_series(values: Sequence[float]) -> Optional[Dict[str, float]]:
+    """
+    Reduce a numeric series to summary statistics.
+
+    Args:
+        values: Series in chronological order
+
+    Returns:
+        Dict with count, first, last, min, max, mean and stdev, or None if empty
+    """
+    clean = [float(v) for v in values if v is not None]
+    if not clean:
+        return None
+
+    return {
+        'count': len(clean),
+        'first': clean[0],
+        'last': clean[-1],
+        'min': min(clean),
+        'max': max(clean),
+        'mean': statistics.fmean(clean),
+        'stdev': statistics.stdev(clean) if len(clean) > 1 else 0.0,
+    }
+
+
+@dataclass
+class PromptSection:
+    """
+    One section of prompt data.
+
+    Items are ordered by importance within the section; compaction drops
+    or truncates from the end. Lower priority numbers are kept longer.
+    """
+    key: str
+    title: Optional[str]
+    items: List[str]
+    priority: int
+    separator: str = ' | '
+    required: bool = False
+    max_item_tokens: Optional[int] = None
+
+    def render(self) -> str:
+        """Render the section as prompt text."""
+        if not self.items:
+            return ""
+        if self.title is None:
+            return self.separator.join(self.items)
+        if self.separator == ' | ':
+            return f"\n**{self.title}:**\n- {' | '.join(self.items)}"
+        return f"\n**{self.title}:**\n{self.separator.join(self.items)}"
+
+
+@dataclass
+class PromptCompactionReport:
+    """Token accounting for one compacted prompt."""
+    original_tokens: int = 0
+    compacted_tokens: int = 0
+    deduplicated_items: int = 0
+    dropped_items: int = 0
+    truncated_items: int = 0
+    dropped_sections: List[str] = field(default_factory=list)
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens removed by compaction."""
+        return self.original_tokens - self.compacted_tokens
+
+    def to_dict(self) -> Dict[str, object]:
+        """Convert report to dictionary."""
+        return {
+            'original_tokens': self.original_tokens,
+            'compacted_tokens': self.compacted_tokens,
+            'tokens_saved': self.tokens_saved,
+            'deduplicated_items': self.deduplicated_items,
+            'dropped_items': self.dropped_items,
+            'truncated_items': self.truncated_items,
+            'dropped_sections': list(self.dropped_sections),
+        }
+
+
+class PromptCompactor:
+    """
+    Fits prompt sections into per-section and total token budgets.
+
+    Compaction runs in three passes: identical fields already emitted by an
+    earlier section are removed, each section is capped per item and trimmed
+    to its own budget,
+    and then the lowest-priority non-required sections lose items until the
+    total fits.
+    """
+
+    def __init__(self,
+                 total_budget: int = DEFAULT_TOTAL_BUDGET,
+                 section_budgets: Optional[Dict[str, int]] = None,
+                 default_section_budget: int = DEFAULT_SECTION_BUDGET):
+        """
+        Initialize compactor.
+
+        Args:
+            total_budget: Token budget for all sections combined
+            section_budgets: Per-section budgets overriding the defaults
+            default_section_budget: Budget for sections not listed
+        """
+        self.total_budget = total_budget
+        self.section_budgets = {**DEFAULT_SECTION_BUDGETS, **(section_budgets or {})}
+        self.default_section_budget = default_section_budget
+
+    def compact(self, sections: List[PromptSection]) -> Tuple[str, PromptCompactionReport]:
+        """
+        Compact sections and render them.
+
+        Args:
+            sections: Sections in output order
+
+        Returns:
+            Tuple of (rendered text, compaction report)
+        """
+        report = PromptCompactionReport(
+            original_tokens=estimate_tokens(''.join(s.render() for s in sections))
+        )
+        sections = [
+            PromptSection(s.key, s.title, list(s.items), s.priority, s.separator,
+                          s.required, s.max_item_tokens)
+            for s in sections if s.items
+        ]
+
+        self._deduplicate(sections, report)
+        for section in sections:
+            if section.max_item_tokens is not None:
+                self._cap_items(section, report)
+            if not section.required:
+                self._fit_section(section, self.section_budgets.get(section.key, self.default_section_budget), report)
+        self._fit_total(sections, report)
+
+        text = ''.join(s.render() for s in sections if s.items)
+        report.compacted_tokens = estimate_tokens(text)
+        return text, report
+
+    def _deduplicate(self, sections: List[PromptSection], report: PromptCompactionReport) -> None:
+        """Drop fields whose exact text was already emitted by an earlier section."""
+        seen = set()
+        for section in sections:
+            kept = []
+            for item in section.items:
+                normalized = ' '.join(item.split()).lower()
+                if normalized in seen and not section.required:
+                    report.deduplicated_items += 1
+                    continue
+                seen.add(normalized)
+                kept.append(item)
+            section.items = kept
+
+    def _cap_items(self, section: PromptSection, report: PromptCompactionReport) -> None:
+        """Truncate individual items longer than the section's per-item cap."""
+        for i, item in enumerate(section.items):
+            capped = truncate_to_tokens(item, section.max_item_tokens)
+            if capped != item:
+                section.items[i] = capped
+                report.truncated_items += 1
+
+    def _fit_section(self, section: PromptSection, budget: int,
+                     report: PromptCompactionReport) -> None:
+        """Trim a section's trailing items, then truncate the last one, to fit budget."""
+        while section.items and estimate_tokens(section.render()) > budget:
+            last = section.items[-1]
+            remaining = budget - (estimate_tokens(section.render()) - estimate_tokens(last))
+            # Drop the item when only a stub of it would fit
+            if remaining < MIN_TRUNCATED_ITEM_TOKENS or (
+                    len(section.items) > 1 and remaining < estimate_tokens(last) // 2):
+                section.items.pop()
+                report.dropped_items += 1
+                continue
+            section.items[-1] = truncate_to_tokens(last, remaining)
+            report.truncated_items += 1
+            break
+
+        if not section.items:
+            report.dropped_sections.append(section.key)
+
+    def _fit_total(self, sections: List[PromptSection], report: PromptCompactionReport) -> None:
+        """Remove items from the lowest-priority sections until the total fits."""
+        def total() -> int:
+            return estimate_tokens(''.join(s.render() for s in sections if s.items))
+
+        candidates = sorted(
+            (s for s in sections if not s.required and s.items),
+            key=lambda s: s.priority, reverse=True
+        )
+        for section in candidates:
+            while section.items and total() > self.total_budget:
+                section.items.pop()
+                report.dropped_items += 1
+            if not section.items:
+                report.dropped_sections.append(section.key)
+            if total() <= self.total_budget:
+                break
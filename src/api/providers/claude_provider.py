@@ -15,13 +15,23 @@ Key features:
 
 import asyncio
 import logging
+import os
 import time
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 
 from src.api.data_provider import DataProvider, ProviderType, ProviderStatus, ProviderHealth, ScreeningCriteria
-from src.api.claude_client import ClaudeClient, ClaudeError, AuthenticationError, RateLimitError
+from src.api.claude_client import (
+    ClaudeClient, ClaudeError, AuthenticationError, RateLimitError,
+    DEFAULT_BATCH_TOKEN_BUDGET, DEFAULT_MAX_BATCH_SIZE, estimate_usage_cost
+)
+from src.api.claude_rate_limiter import (
+    ClaudeRateLimiter, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_INPUT_TOKENS_PER_MINUTE,
+    DEFAULT_OUTPUT_TOKENS_PER_MINUTE
+)
+from src.api.claude_response_cache import ClaudeResponseCache
+from src.api.claude_standin import ClaudeStandIn, StandInConfig
 from src.models.api_models import (
     StockQuote, OptionChain, OptionContract, APIResponse, APIError, APIStatus, 
     RateLimitHeaders, ProviderMetadata, EnhancedStockData, ClaudeAnalysisResponse,
@@ -50,6 +60,38 @@ class ClaudeProvider(DataProvider):
         """
         super().__init__(provider_type, config)
         
+        # Persistent cache for byte-identical analysis requests
+        response_cache = None
+        if config.get('response_cache_enabled', False):
+            response_cache = ClaudeResponseCache(
+                cache_file=config.get('response_cache_file', os.path.join("data", "claude_response_cache.json")),
+                ttl_hours=config.get('response_cache_ttl_hours', 24.0),
+                max_entries=config.get('response_cache_max_entries', 500)
+            )
+        
+        # Pace requests against the organization's RPM/ITPM/OTPM limits
+        self.rate_limiter = None
+        if config.get('rate_limit_enabled', True):
+            self.rate_limiter = ClaudeRateLimiter(
+                requests_per_minute=config.get('requests_per_minute', DEFAULT_REQUESTS_PER_MINUTE),
+                input_tokens_per_minute=config.get('input_tokens_per_minute', DEFAULT_INPUT_TOKENS_PER_MINUTE),
+                output_tokens_per_minute=config.get('output_tokens_per_minute', DEFAULT_OUTPUT_TOKENS_PER_MINUTE)
+            )
+        
+        # Optional local stand-in so Step 5 can be load tested without spend
+        self.standin = None
+        if config.get('standin_enabled', False):
+            self.standin = ClaudeStandIn(StandInConfig(
+                replay_dir=config.get('standin_replay_dir'),
+                latency_distribution=config.get('standin_latency_distribution', 'lognormal'),
+                latency_ms=config.get('standin_latency_ms', 1500.0),
+                latency_jitter_ms=config.get('standin_latency_jitter_ms', 500.0),
+                output_tokens_per_second=config.get('standin_output_tokens_per_second', 60.0),
+                rate_limit_probability=config.get('standin_rate_limit_probability', 0.0),
+                output_tokens=config.get('standin_output_tokens', 600)
+            ))
+            logger.warning("Claude provider is using the local stand-in; analyses are simulated")
+        
         # Initialize Claude client with config
         self.client = ClaudeClient(
             api_key=config.get('api_key'),
@@ -58,14 +100,22 @@ class ClaudeProvider(DataProvider):
             temperature=config.get('temperature', 0.1),
             timeout=config.get('timeout', 60.0),
             max_retries=config.get('max_retries', 3),
-            retry_backoff=config.get('retry_backoff', 1.0)
+            retry_backoff=config.get('retry_backoff', 1.0),
+            response_cache=response_cache,
+            prompt_token_budget=config.get('prompt_token_budget', 4000),
+            prompt_caching_enabled=config.get('prompt_caching_enabled', True),
+            rate_limiter=self.rate_limiter,
+            streaming_enabled=config.get('streaming_enabled', False),
+            stream_early_stop=config.get('stream_early_stop', False),
+            anthropic_client=self.standin
         )
         
         # Provider capabilities - Claude is specialized for analysis
         self._supported_operations = {
             'analyze_pmcc_opportunities',        # Batch analysis operation
             'get_enhanced_analysis',             # Alternative name for batch analysis
-            'analyze_single_pmcc_opportunity'    # Single opportunity analysis
+            'analyze_single_pmcc_opportunity',   # Single opportunity analysis
+            'analyze_pmcc_opportunity_batch'     # Packed multi-opportunity analysis
         }
         
         # Analysis settings
@@ -300,10 +350,7 @@ class ClaudeProvider(DataProvider):
                 
                 # Update cost tracking if we have usage data
                 if response.data and response.data.get('usage'):
-                    usage = response.data['usage']
-                    input_cost = usage.get('input_tokens', 0) * 0.000003
-                    output_cost = usage.get('output_tokens', 0) * 0.000015
-                    total_cost = input_cost + output_cost
+                    total_cost = estimate_usage_cost(response.data['usage'])
                     self._daily_cost_used += total_cost
                     logger.info(f"Single opportunity analysis cost: ${total_cost:.4f}")
             else:
@@ -328,6 +375,76 @@ class ClaudeProvider(DataProvider):
             logger.error(f"Error in single opportunity analysis for {opportunity_data.get('symbol', 'unknown')}: {e}")
             return self._create_error_response(f"Single opportunity analysis failed: {str(e)}", code=500)
     
+    async def analyze_pmcc_opportunity_batch(
+        self,
+        requests: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        market_context: Optional[Dict[str, Any]] = None,
+        batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ) -> Dict[str, APIResponse]:
+        """
+        Analyze several PMCC opportunities using packed multi-opportunity requests.
+        
+        Args:
+            requests: (opportunity_data, enhanced_stock_data) pairs, one per symbol
+            market_context: Optional market context information
+            batch_token_budget: Estimated token budget for one batch's data sections
+            max_batch_size: Maximum opportunities per request
+            
+        Returns:
+            Dict of symbol -> APIResponse with the same data as analyze_single_pmcc_opportunity
+        """
+        if not self._check_cost_limits():
+            error = self._create_error_response(
+                f"Daily cost limit of ${self._daily_cost_limit} exceeded", 
+                code=429
+            )
+            return {opportunity_data.get('symbol', 'Unknown'): error for opportunity_data, _ in requests}
+        
+        start_time = time.time()
+        try:
+            responses = await self.client.analyze_opportunities_batch(
+                requests, market_context, batch_token_budget, max_batch_size
+            )
+        except Exception as e:
+            logger.error(f"Error in packed opportunity analysis: {e}")
+            error = self._create_error_response(f"Packed opportunity analysis failed: {str(e)}", code=500)
+            return {opportunity_data.get('symbol', 'Unknown'): error for opportunity_data, _ in requests}
+        latency_ms = (time.time() - start_time) * 1000
+        
+        batch_cost = 0.0
+        for symbol, response in responses.items():
+            if not response.is_success or not response.data:
+                continue
+            
+            usage = response.data.get('usage') or {}
+            batch_cost += estimate_usage_cost(usage)
+            response.data['provider_metadata'] = {
+                'provider_type': 'claude',
+                'provider_name': 'Claude AI',
+                'analysis_type': 'packed_batch' if response.data.get('batch_size') else 'single_opportunity',
+                'latency_ms': latency_ms,
+                'api_version': '2024-10-22'
+            }
+        
+        self._daily_cost_used += batch_cost
+        successful = sum(1 for response in responses.values() if response.is_success)
+        self._health.status = ProviderStatus.HEALTHY if successful else ProviderStatus.DEGRADED
+        self._health.latency_ms = latency_ms
+        self._health.last_check = datetime.now()
+        logger.info(f"Packed opportunity analysis: {successful}/{len(requests)} successful, cost: ${batch_cost:.4f}")
+        
+        return responses
+    
+    def save_response_cache(self) -> None:
+        """Write the responses cached during this scan to disk."""
+        self.client.save_response_cache()
+    
+    async def close(self):
+        """Close the provider, persisting the response cache."""
+        await self.client.close()
+        logger.info("Claude provider closed")
+    
     # Rate limiting and quota management
     
     def get_rate_limit_info(self) -> Optional[RateLimitHeaders]:
@@ -414,10 +531,13 @@ class ClaudeProvider(DataProvider):
     def _update_cost_tracking(self, analysis_response: ClaudeAnalysisResponse):
         """Update cost tracking based on usage."""
         if analysis_response.input_tokens and analysis_response.output_tokens:
-            # Calculate actual cost
-            input_cost = analysis_response.input_tokens * 0.000003
-            output_cost = analysis_response.output_tokens * 0.000015
-            total_cost = input_cost + output_cost
+            # Calculate actual cost, including prompt cache writes and reads
+            total_cost = estimate_usage_cost({
+                'input_tokens': analysis_response.input_tokens,
+                'output_tokens': analysis_response.output_tokens,
+                'cache_creation_input_tokens': analysis_response.cache_creation_input_tokens,
+                'cache_read_input_tokens': analysis_response.cache_read_input_tokens
+            })
             
             self._daily_cost_used += total_cost
             
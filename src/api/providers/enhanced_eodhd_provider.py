@@ -1,13 +1,14 @@
 """
-Enhanced EODHD provider implementation using the official EODHD Python library.
+Enhanced EODHD provider implementation using the native async EODHD client.
 
-This provider implements the DataProvider interface using the official EODHD library
+This provider implements the DataProvider interface on top of EODHDClient
 while maintaining compatibility with the existing provider factory pattern. It adds
 support for fundamental data, calendar events, technical indicators, and risk metrics
 for AI-enhanced PMCC analysis.
 
 Key features:
-- Uses official EODHD Python library for improved reliability
+- Fully async aiohttp transport shared with the basic EODHD provider
+- Concurrency bounded by the client's request limiter instead of a thread pool
 - Comprehensive fundamental data collection
 - Calendar events (earnings, dividends) integration
 - Technical indicators and risk metrics
@@ -22,10 +23,8 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal
 import time
 
-# Official EODHD library
-from eodhd import APIClient as EODHDAPIClient
-
 from src.api.data_provider import DataProvider, ProviderType, ProviderStatus, ProviderHealth, ScreeningCriteria
+from src.api.eodhd_client import EODHDClient, EODHDError
 from src.models.api_models import (
     StockQuote, OptionChain, OptionContract, APIResponse, APIError, APIStatus, 
     RateLimitHeaders, ProviderMetadata, EODHDScreenerResponse,
@@ -37,7 +36,7 @@ logger = logging.getLogger(__name__)
 
 class EnhancedEODHDProvider(DataProvider):
     """
-    Enhanced EODHD implementation using the official EODHD Python library.
+    Enhanced EODHD implementation using the native async EODHD client.
     
     This provider extends the basic EODHD functionality with comprehensive
     fundamental data, calendar events, technical indicators, and risk metrics
@@ -54,12 +53,19 @@ class EnhancedEODHDProvider(DataProvider):
         """
         super().__init__(provider_type, config)
         
-        # Initialize official EODHD client
+        # Initialize native async EODHD client
         api_token = config.get('api_token')
         if not api_token:
             raise ValueError("EODHD API token is required")
         
-        self.client = EODHDAPIClient(api_token)
+        self.client = EODHDClient(
+            api_token=api_token,
+            base_url=config.get('base_url'),
+            timeout=config.get('timeout', config.get('timeout_seconds', 30.0)),
+            max_retries=config.get('max_retries', 3),
+            retry_backoff=config.get('retry_backoff', 1.0),
+            max_concurrent_requests=config.get('max_concurrent_requests', 10)
+        )
         
         # Provider capabilities - FUNDAMENTALS AND ENHANCED DATA ONLY, NO OPTIONS
         self._supported_operations = {
@@ -82,9 +88,16 @@ class EnhancedEODHDProvider(DataProvider):
         self._calendar_cache: Dict[str, List[CalendarEvent]] = {}
         self._technical_cache: Dict[str, TechnicalIndicators] = {}
         
-        logger.info("Enhanced EODHD provider initialized with official library")
+        logger.info("Enhanced EODHD provider initialized with native async client")
+    
+    @staticmethod
+    def _unwrap(response: APIResponse) -> Any:
+        """Return response data, raising EODHDError for unsuccessful responses."""
+        if not response.is_success:
+            raise EODHDError(str(response.error) if response.error else "EODHD request failed")
+        return response.data
     
-    def get_last_trading_day(self, today: Optional[datetime] = None) -> str:
+    async def get_last_trading_day(self, today: Optional[datetime] = None) -> str:
         """Get the most recent trading day, accounting for market holidays"""
         if today is None:
             today = datetime.now()
@@ -95,11 +108,11 @@ class EnhancedEODHDProvider(DataProvider):
         
         try:
             # Get market holidays in the recent period
-            holidays_data = self.client.get_details_trading_hours_stock_market_holidays(
-                code="US", 
-                from_date=ten_days_ago, 
-                to_date=today_str
-            )
+            holidays_data = self._unwrap(await self.client.get_exchange_details(
+                exchange_code="US",
+                date_from=ten_days_ago,
+                date_to=today_str
+            ))
             
             # Extract holiday dates
             holiday_dates = set()
@@ -135,10 +148,10 @@ class EnhancedEODHDProvider(DataProvider):
             fallback_date = fallback_date - timedelta(days=1)
         return fallback_date.strftime('%Y-%m-%d')
     
-    def get_trading_dates(self) -> Dict[str, str]:
+    async def get_trading_dates(self) -> Dict[str, str]:
         """Get all the dynamic dates needed for API calls"""
         today = datetime.now()
-        last_trading_day = self.get_last_trading_day(today)
+        last_trading_day = await self.get_last_trading_day(today)
         last_trading_date = datetime.strptime(last_trading_day, '%Y-%m-%d')
         
         return {
@@ -162,9 +175,7 @@ class EnhancedEODHDProvider(DataProvider):
         try:
             # Use a simple call to check API connectivity
             # Get fundamental data for a well-known stock (AAPL) as health check
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, self.client.get_fundamentals_data, 'AAPL.US'
-            )
+            response = self._unwrap(await self.client.get_fundamentals('AAPL.US'))
             
             latency_ms = (time.time() - start_time) * 1000
             
@@ -207,13 +218,8 @@ class EnhancedEODHDProvider(DataProvider):
             
             if historical_data and hasattr(historical_data, '__len__') and len(historical_data) > 1:
                 # Get previous day data for change calculation
-                if hasattr(historical_data, 'iloc'):
-                    # DataFrame response
-                    prev_data = historical_data.iloc[-2]  # Second to last entry
-                    previous_close = float(prev_data.get('adjusted_close', prev_data.get('close', 0)))
-                elif isinstance(historical_data, list) and len(historical_data) > 1:
-                    # List response
-                    prev_data = historical_data[-2]
+                if isinstance(historical_data, list) and len(historical_data) > 1:
+                    prev_data = historical_data[-2]  # Second to last entry
                     previous_close = float(prev_data.get('adjusted_close', prev_data.get('close', 0)))
                 
                 # Calculate change values
@@ -275,12 +281,9 @@ class EnhancedEODHDProvider(DataProvider):
             
             # First try live stock prices for current quotes
             try:
-                live_response = await asyncio.get_event_loop().run_in_executor(
-                    None, self.client.get_live_stock_prices, symbol_with_exchange
-                )
+                live_data = self._unwrap(await self.client.get_real_time_quotes(symbol_with_exchange))
                 
-                if live_response and isinstance(live_response, dict) and symbol_with_exchange in live_response:
-                    live_data = live_response[symbol_with_exchange]
+                if live_data and isinstance(live_data, dict) and live_data.get('code') == symbol_with_exchange:
                     quote_data = {
                         'symbol': symbol,
                         'last': float(live_data.get('close', live_data.get('price', 0))),
@@ -303,34 +306,25 @@ class EnhancedEODHDProvider(DataProvider):
             except Exception as live_error:
                 logger.warning(f"Live prices failed for {symbol}, falling back to EOD data: {live_error}")
             
-            # Fallback to EOD historical data (most recent day)
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, self.client.get_eod_historical_stock_market_data, 
-                symbol_with_exchange, 'd', None, None, 'd'
-            )
+            # Fallback to EOD historical data (last week, oldest first so the
+            # final bar is the most recent day and the one before it is the
+            # previous close)
+            week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+            response = self._unwrap(await self.client.get_eod_historical(
+                symbol_with_exchange, from_date=week_ago, period='d', order='a'
+            ))
             
             latency_ms = (time.time() - start_time) * 1000
             
             if response is not None and hasattr(response, '__len__') and len(response) > 0:
-                # Get the most recent trading day data - response is a DataFrame
-                if hasattr(response, 'iloc'):
-                    # DataFrame response
-                    latest_data = response.iloc[-1]
-                    quote_data = {
-                        'symbol': symbol,
-                        'last': float(latest_data.get('adjusted_close', latest_data.get('close', 0))),
-                        'volume': int(latest_data.get('volume', 0)),
-                        'updated': str(latest_data.get('date', ''))
-                    }
-                else:
-                    # List/dict response (fallback)
-                    latest_data = response[-1] if isinstance(response, list) else response
-                    quote_data = {
-                        'symbol': symbol,
-                        'last': float(latest_data.get('adjusted_close', latest_data.get('close', 0))),
-                        'volume': int(latest_data.get('volume', 0)),
-                        'updated': str(latest_data.get('date', ''))
-                    }
+                # Get the most recent trading day data (last bar, ascending order)
+                latest_data = response[-1] if isinstance(response, list) else response
+                quote_data = {
+                    'symbol': symbol,
+                    'last': float(latest_data.get('adjusted_close', latest_data.get('close', 0))),
+                    'volume': int(latest_data.get('volume', 0)),
+                    'updated': str(latest_data.get('date', ''))
+                }
                 
                 # Validate data before creating quote
                 if quote_data['last'] <= 0:
@@ -362,7 +356,10 @@ class EnhancedEODHDProvider(DataProvider):
     
     async def get_stock_quotes(self, symbols: List[str]) -> APIResponse:
         """
-        Get multiple stock quotes using concurrent EODHD EOD requests.
+        Get multiple stock quotes using the EODHD bulk last-day endpoint.
+        
+        Symbols missing from the bulk response fall back to individual
+        quote requests.
         
         Args:
             symbols: List of stock symbols
@@ -373,7 +370,17 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            logger.info(f"Fetching EOD quotes for {len(symbols)} symbols using official EODHD library")
+            logger.info(f"Fetching EOD quotes for {len(symbols)} symbols via EODHD bulk endpoint")
+            
+            bulk_quotes: Dict[str, StockQuote] = {}
+            try:
+                bulk_response = await self.client.get_stock_quotes_eod_bulk(symbols)
+                if bulk_response.is_success and bulk_response.data:
+                    bulk_quotes = bulk_response.data
+                else:
+                    logger.warning(f"Bulk EOD quote request failed: {bulk_response.error}")
+            except EODHDError as e:
+                logger.warning(f"Bulk EOD quote request failed: {e}")
             
             async def get_quote_safe(symbol: str) -> tuple[str, Optional[StockQuote]]:
                 try:
@@ -387,13 +394,17 @@ class EnhancedEODHDProvider(DataProvider):
                     logger.warning(f"Exception getting quote for {symbol}: {e}")
                     return symbol, None
             
-            # Process symbols in batches to avoid overwhelming the API
+            missing_symbols = [symbol for symbol in symbols if symbol not in bulk_quotes]
+            if missing_symbols:
+                logger.info(f"Fetching {len(missing_symbols)} quotes missing from bulk response individually")
+            
+            # Process remaining symbols in batches to avoid overwhelming the API
             batch_size = 20
-            all_quotes = []
+            fallback_quotes: Dict[str, StockQuote] = {}
             failed_symbols = []
             
-            for i in range(0, len(symbols), batch_size):
-                batch_symbols = symbols[i:i + batch_size]
+            for i in range(0, len(missing_symbols), batch_size):
+                batch_symbols = missing_symbols[i:i + batch_size]
                 tasks = [get_quote_safe(symbol) for symbol in batch_symbols]
                 
                 results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -405,14 +416,20 @@ class EnhancedEODHDProvider(DataProvider):
                     
                     symbol, quote = result
                     if quote:
-                        all_quotes.append(quote)
+                        fallback_quotes[symbol] = quote
                     else:
                         failed_symbols.append(symbol)
                 
                 # Small delay between batches
-                if i + batch_size < len(symbols):
+                if i + batch_size < len(missing_symbols):
                     await asyncio.sleep(0.3)  # 300ms delay for EODHD
             
+            all_quotes = [
+                bulk_quotes.get(symbol) or fallback_quotes[symbol]
+                for symbol in symbols
+                if symbol in bulk_quotes or symbol in fallback_quotes
+            ]
+            
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += len(symbols)
             self._error_count += len(failed_symbols)
@@ -521,30 +538,19 @@ class EnhancedEODHDProvider(DataProvider):
                         range_results = []
                         
                         while offset <= 999:  # EODHD API has a maximum offset of 999
-                            # Call the method with keyword arguments via lambda
-                            response = await asyncio.get_event_loop().run_in_executor(
-                                None, 
-                                lambda: self.client.stock_market_screener(
-                                    sort='market_capitalization.desc',
-                                    filters=range_filters,
-                                    limit=max_per_request,
-                                    offset=offset
-                                )
+                            response = await self.client.screen_stocks(
+                                filters=range_filters,
+                                sort='market_capitalization.desc',
+                                limit=max_per_request,
+                                offset=offset
                             )
                             
-                            if response and isinstance(response, dict) and 'data' in response:
-                                batch_results = response['data']
+                            if response.is_success and isinstance(response.data, EODHDScreenerResponse):
+                                batch_results = response.data.results
                                 if not batch_results:
                                     break  # No more results
                                 
-                                for stock_data in batch_results:
-                                    try:
-                                        from src.models.api_models import EODHDScreenerResult
-                                        result = EODHDScreenerResult.from_api_response(stock_data)
-                                        range_results.append(result)
-                                    except Exception as e:
-                                        logger.warning(f"Error parsing screener result: {e}")
-                                        continue
+                                range_results.extend(batch_results)
                                 
                                 # Check if we should continue
                                 if len(batch_results) < max_per_request:
@@ -807,7 +813,7 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
+            dates = await self.get_trading_dates()
             if not date_from:
                 date_from = dates['six_months_ago']
             if not date_to:
@@ -815,16 +821,14 @@ class EnhancedEODHDProvider(DataProvider):
             
             logger.debug(f"Fetching economic events from {date_from} to {date_to}")
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.client.get_economic_events_data,
-                date_from,
-                date_to,
-                'US',
-                'mom',
-                0,
-                30
-            )
+            response = self._unwrap(await self.client.get_economic_events(
+                date_from=date_from,
+                date_to=date_to,
+                country='US',
+                comparison='mom',
+                offset=0,
+                limit=30
+            ))
             
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += 1
@@ -850,7 +854,7 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
+            dates = await self.get_trading_dates()
             if not date_from:
                 date_from = dates['thirty_days_ago']
             if not date_to:
@@ -858,16 +862,13 @@ class EnhancedEODHDProvider(DataProvider):
             
             logger.debug(f"Fetching news for {symbol} from {date_from} to {date_to}")
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.client.financial_news,
+            response = self._unwrap(await self.client.get_news(
                 f'{symbol}.US',
-                None,
-                date_from,
-                date_to,
-                limit,
-                0
-            )
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit,
+                offset=0
+            ))
             
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += 1
@@ -893,19 +894,9 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
-            
             logger.debug(f"Fetching live price for {symbol}")
             
-            # Call with positional arguments in correct order
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.get_live_stock_prices(
-                    ticker=symbol,
-                    date_from=dates['today'],
-                    date_to=dates['today']
-                )
-            )
+            response = self._unwrap(await self.client.get_real_time_quotes(symbol))
             
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += 1
@@ -931,7 +922,7 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
+            dates = await self.get_trading_dates()
             if not date_from:
                 # Go back 15 months to get full year of historical earnings + buffer
                 date_from = (datetime.now() - timedelta(days=450)).strftime('%Y-%m-%d')
@@ -941,13 +932,11 @@ class EnhancedEODHDProvider(DataProvider):
             
             logger.debug(f"Fetching earnings data for {symbol} from {date_from} to {date_to}")
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.client.get_upcoming_earnings_data,
-                date_from,
-                date_to,
-                symbol
-            )
+            response = self._unwrap(await self.client.get_earnings_calendar(
+                date_from=date_from,
+                date_to=date_to,
+                symbols=symbol
+            ))
             
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += 1
@@ -973,7 +962,7 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
+            dates = await self.get_trading_dates()
             if not date_from:
                 date_from = dates['thirty_days_ago']
             if not date_to:
@@ -981,15 +970,13 @@ class EnhancedEODHDProvider(DataProvider):
             
             logger.debug(f"Fetching historical prices for {symbol} from {date_from} to {date_to}")
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.client.get_eod_historical_stock_market_data,
+            response = self._unwrap(await self.client.get_eod_historical(
                 symbol,
-                period,
-                date_from,
-                date_to,
-                'd'
-            )
+                from_date=date_from,
+                to_date=date_to,
+                period=period,
+                order='d'
+            ))
             
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += 1
@@ -1015,7 +1002,7 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
+            dates = await self.get_trading_dates()
             if not date_from:
                 date_from = dates['thirty_days_ago']
             if not date_to:
@@ -1023,13 +1010,11 @@ class EnhancedEODHDProvider(DataProvider):
             
             logger.debug(f"Fetching sentiment data for {symbol} from {date_from} to {date_to}")
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.client.get_sentiment,
+            response = self._unwrap(await self.client.get_sentiments(
                 symbol,
-                date_from,
-                date_to
-            )
+                date_from=date_from,
+                date_to=date_to
+            ))
             
             latency_ms = (time.time() - start_time) * 1000
             self._request_count += 1
@@ -1055,7 +1040,7 @@ class EnhancedEODHDProvider(DataProvider):
         start_time = time.time()
         
         try:
-            dates = self.get_trading_dates()
+            dates = await self.get_trading_dates()
             
             logger.debug(f"Fetching technical indicators for {symbol}")
             
@@ -1076,22 +1061,20 @@ class EnhancedEODHDProvider(DataProvider):
                     
                     # Safe API call with parameter validation
                     try:
-                        result = await asyncio.get_event_loop().run_in_executor(
-                            None,
-                            self.client.get_technical_indicator_data,
+                        result = self._unwrap(await self.client.get_technical_indicator(
                             f'{symbol}.US',
                             indicator['function'],  # Ensure this is 'function' not 'fanction'
-                            indicator['period'],
-                            days_back,
-                            dates['today'],
-                            'd',
-                            '0'
-                        )
+                            period=indicator['period'],
+                            date_from=days_back,
+                            date_to=dates['today'],
+                            order='d',
+                            splitadjusted_only='0'
+                        ))
                     except Exception as api_error:
                         error_msg = str(api_error)
                         if 'fanction' in error_msg:
                             logger.error(f"  ✗ API parameter error for {indicator['name']}: {error_msg}")
-                            logger.error(f"    Check EODHD library version and parameter names")
+                            logger.error(f"    Check EODHD technical API parameter names")
                         else:
                             logger.error(f"  ✗ API call failed for {indicator['name']}: {error_msg}")
                         result = None
@@ -1248,11 +1231,8 @@ class EnhancedEODHDProvider(DataProvider):
             
             logger.debug(f"Fetching fundamental data for {symbol}")
             
-            # Use official EODHD library for fundamental data
             symbol_with_exchange = f"{symbol}.US"
-            raw_response = await asyncio.get_event_loop().run_in_executor(
-                None, self.client.get_fundamentals_data, symbol_with_exchange
-            )
+            raw_response = self._unwrap(await self.client.get_fundamentals(symbol_with_exchange))
             
             latency_ms = (time.time() - start_time) * 1000
             
@@ -1326,13 +1306,11 @@ class EnhancedEODHDProvider(DataProvider):
             if 'earnings' in event_types:
                 try:
                     symbol_with_exchange = f"{symbol}.US"
-                    earnings_response = await asyncio.get_event_loop().run_in_executor(
-                        None, 
-                        self.client.get_upcoming_earnings_data,
-                        date_from.strftime('%Y-%m-%d'),
-                        date_to.strftime('%Y-%m-%d'),
-                        symbol_with_exchange
-                    )
+                    earnings_response = self._unwrap(await self.client.get_earnings_calendar(
+                        date_from=date_from.strftime('%Y-%m-%d'),
+                        date_to=date_to.strftime('%Y-%m-%d'),
+                        symbols=symbol_with_exchange
+                    ))
                     
                     if earnings_response and isinstance(earnings_response, dict):
                         # EODHD upcoming earnings returns a dict, not a list
@@ -1361,13 +1339,11 @@ class EnhancedEODHDProvider(DataProvider):
             if 'dividends' in event_types:
                 try:
                     symbol_with_exchange = f"{symbol}.US"
-                    dividend_response = await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        self.client.get_historical_dividends_data,
+                    dividend_response = self._unwrap(await self.client.get_dividends(
                         symbol_with_exchange,
-                        date_from.strftime('%Y-%m-%d'),
-                        date_to.strftime('%Y-%m-%d')
-                    )
+                        date_from=date_from.strftime('%Y-%m-%d'),
+                        date_to=date_to.strftime('%Y-%m-%d')
+                    ))
                     
                     if dividend_response:
                         # Handle both list and dict responses
@@ -1423,9 +1399,7 @@ class EnhancedEODHDProvider(DataProvider):
             
             # Get raw fundamental data directly from EODHD API
             symbol_with_exchange = f"{symbol}.US"
-            raw_response = await asyncio.get_event_loop().run_in_executor(
-                None, self.client.get_fundamentals_data, symbol_with_exchange
-            )
+            raw_response = self._unwrap(await self.client.get_fundamentals(symbol_with_exchange))
             
             if not raw_response or not isinstance(raw_response, dict):
                 return self._create_error_response(
@@ -1491,9 +1465,7 @@ class EnhancedEODHDProvider(DataProvider):
             
             # Get raw fundamental data directly from EODHD API
             symbol_with_exchange = f"{symbol}.US"
-            raw_response = await asyncio.get_event_loop().run_in_executor(
-                None, self.client.get_fundamentals_data, symbol_with_exchange
-            )
+            raw_response = self._unwrap(await self.client.get_fundamentals(symbol_with_exchange))
             
             if not raw_response or not isinstance(raw_response, dict):
                 return self._create_error_response(
@@ -1685,4 +1657,6 @@ class EnhancedEODHDProvider(DataProvider):
         if hasattr(self, '_technical_cache'):
             self._technical_cache.clear()
         
+        await self.client.close()
+        
         logger.info("Enhanced EODHD provider closed")
\ No newline at end of file
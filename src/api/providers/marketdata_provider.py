@@ -23,7 +23,9 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal
 import time
 
-from src.api.data_provider import DataProvider, ProviderType, ProviderStatus, ProviderHealth, ScreeningCriteria
+from src.api.data_provider import (
+    DataProvider, ProviderType, ProviderStatus, ProviderHealth, ScreeningCriteria, OptionChainQuery
+)
 from src.api.marketdata_client import MarketDataClient, MarketDataError, RateLimitError, APIQuotaError
 from src.models.api_models import (
     StockQuote, OptionChain, OptionContract, APIResponse, APIError, APIStatus, 
@@ -63,7 +65,7 @@ class MarketDataProvider(DataProvider):
         # Provider capabilities
         self._supported_operations = {
             'get_stock_quote', 'get_stock_quotes', 'get_options_chain', 
-            'screen_stocks', 'get_greeks'
+            'get_option_expirations', 'screen_stocks', 'get_greeks'
         }
         
         # Since MarketData.app doesn't have a native screener, we need a stock universe
@@ -297,6 +299,125 @@ class MarketDataProvider(DataProvider):
                 f"Failed to get options chain for {symbol}: {str(e)}"
             )
     
+    async def get_option_expirations(self, symbol: str) -> APIResponse:
+        """
+        Get available option expiration dates for a stock.
+        
+        Much cheaper than a chain request, so it is used to check whether a
+        symbol lists options (and LEAPS) at all before fetching chains.
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            APIResponse containing list of ISO expiration date strings or error
+        """
+        start_time = time.time()
+        
+        try:
+            response = await self.client.get_option_expirations(symbol)
+            
+            latency_ms = (time.time() - start_time) * 1000
+            self._update_health_from_response(response, latency_ms)
+            self._request_count += 1
+            if not response.is_success:
+                self._error_count += 1
+            
+            return response.with_provider_metadata(ProviderMetadata.for_marketdata(latency_ms))
+            
+        except Exception as e:
+            self._error_count += 1
+            logger.error(f"Error getting option expirations for {symbol}: {e}")
+            
+            return self._create_error_response(
+                f"Failed to get option expirations for {symbol}: {str(e)}"
+            )
+    
+    async def get_options_chain_for_queries(
+        self,
+        symbol: str,
+        queries: List[OptionChainQuery]
+    ) -> APIResponse:
+        """
+        Get options chain using criteria-aware server-side filters.
+        
+        Each query becomes one cached-feed request with its expiration window,
+        delta, strike and liquidity filters pushed down to MarketData.app, so
+        only contracts that can pass the local filters are downloaded. Results
+        are merged into a single OptionChain.
+        
+        Args:
+            symbol: Stock symbol
+            queries: Filters for each targeted request (e.g. LEAPS and short calls)
+            
+        Returns:
+            APIResponse containing combined OptionChain data or error
+        """
+        if not queries:
+            return await self.get_options_chain(symbol)
+        
+        start_time = time.time()
+        
+        try:
+            logger.info(f"MarketData.app: Fetching {len(queries)} filtered option chain request(s) for {symbol}")
+            
+            responses = await asyncio.gather(*(
+                self.client.get_option_chain(
+                    symbol=symbol,
+                    use_cached_feed=True,  # 1 credit per call vs 1 credit per contract
+                    **query.to_marketdata_params()
+                )
+                for query in queries
+            ))
+            
+            latency_ms = (time.time() - start_time) * 1000
+            self._request_count += len(responses)
+            
+            contracts_by_symbol: Dict[str, Any] = {}
+            underlying_price = None
+            last_error = None
+            for response in responses:
+                self._update_health_from_response(response, latency_ms)
+                if not response.is_success:
+                    self._error_count += 1
+                    last_error = response
+                    continue
+                chain = response.data
+                if not chain or not getattr(chain, 'contracts', None):
+                    continue
+                underlying_price = underlying_price or chain.underlying_price
+                for contract in chain.contracts:
+                    contracts_by_symbol.setdefault(contract.option_symbol, contract)
+            
+            if last_error is not None:
+                if all(not response.is_success for response in responses):
+                    return last_error.with_provider_metadata(ProviderMetadata.for_marketdata(latency_ms))
+                logger.warning(f"Some filtered option chain requests failed for {symbol}: {last_error.error}")
+            
+            combined_chain = OptionChain(
+                underlying=symbol,
+                underlying_price=underlying_price,
+                contracts=list(contracts_by_symbol.values()),
+                updated=datetime.now()
+            )
+            
+            metadata = ProviderMetadata.for_marketdata(latency_ms)
+            metadata.api_credits_used = len(responses)
+            
+            return APIResponse(
+                status=APIStatus.OK,
+                data=combined_chain,
+                provider_metadata=metadata
+            )
+            
+        except Exception as e:
+            self._error_count += 1
+            logger.error(f"Error getting filtered options chain for {symbol}: {e}")
+            
+            return self._create_error_response(
+                f"Failed to get options chain for {symbol}: {str(e)}"
+            )
+    
     async def get_pmcc_optimized_chains(self, symbol: str) -> APIResponse:
         """
         Get highly optimized option chains specifically for PMCC analysis.
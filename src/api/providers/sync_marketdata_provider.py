@@ -19,7 +19,9 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal
 import asyncio
 
-from src.api.data_provider import SyncDataProvider, ProviderType, ProviderStatus, ProviderHealth, ScreeningCriteria
+from src.api.data_provider import (
+    SyncDataProvider, ProviderType, ProviderStatus, ProviderHealth, ScreeningCriteria, OptionChainQuery
+)
 from src.api.providers.marketdata_provider import MarketDataProvider
 from src.models.api_models import (
     StockQuote, OptionChain, OptionContract, APIResponse, APIError, APIStatus, 
@@ -174,6 +176,49 @@ class SyncMarketDataProvider(SyncDataProvider):
                 f"Failed to get options chain for {symbol}: {str(e)}"
             )
     
+    def get_option_expirations(self, symbol: str) -> APIResponse:
+        """
+        Get available option expiration dates synchronously.
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            APIResponse containing list of ISO expiration date strings or error
+        """
+        try:
+            return self._run_async(self._async_provider.get_option_expirations(symbol))
+        except Exception as e:
+            logger.error(f"Sync get_option_expirations failed: {e}")
+            return self._create_error_response(
+                f"Failed to get option expirations for {symbol}: {str(e)}"
+            )
+    
+    def get_options_chain_for_queries(
+        self,
+        symbol: str,
+        queries: List[OptionChainQuery]
+    ) -> APIResponse:
+        """
+        Get options chain with server-side query filters synchronously.
+        
+        Args:
+            symbol: Stock symbol
+            queries: Filters for each targeted request
+            
+        Returns:
+            APIResponse containing combined OptionChain data or error
+        """
+        try:
+            return self._run_async(
+                self._async_provider.get_options_chain_for_queries(symbol, queries)
+            )
+        except Exception as e:
+            logger.error(f"Sync get_options_chain_for_queries failed: {e}")
+            return self._create_error_response(
+                f"Failed to get options chain for {symbol}: {str(e)}"
+            )
+    
     def get_pmcc_optimized_chains(self, symbol: str) -> APIResponse:
         """
         Get PMCC-optimized option chains synchronously.
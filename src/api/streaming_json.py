@@ -0,0 +1,107 @@
+"""
+Incremental tracking of a JSON object arriving in streamed chunks.
+
+Claude returns each opportunity analysis as one JSON object. When the
+response is streamed, this tracker follows the object's top-level members
+as text arrives so the caller can stop reading once the fields it needs
+are complete, and still hand a valid JSON object to the normal parser.
+"""
+
+from typing import Iterable, List, Optional, Set
+
+
+class StreamingJSONObject:
+    """
+    Follows the top-level members of a JSON object fed in arbitrary chunks.
+
+    Text before the opening brace (e.g. a markdown fence) is ignored. A
+    member counts as complete once the comma or closing brace after its
+    value has arrived.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._length = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expecting_key = False
+        self._reading_key = False
+        self._key_chars: List[str] = []
+        self._current_key: Optional[str] = None
+        self._complete_end: Optional[int] = None
+        self.completed_keys: Set[str] = set()
+        self.finished = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return ''.join(self._chunks)
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of streamed text."""
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self.finished:
+            return
+
+        for i, char in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._reading_key:
+                        self._reading_key = False
+                        self._current_key = ''.join(self._key_chars)
+                elif self._reading_key:
+                    self._key_chars.append(char)
+                continue
+
+            if self._start is None:
+                if char == '{':
+                    self._start = i
+                    self._depth = 1
+                    self._expecting_key = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expecting_key:
+                    self._expecting_key = False
+                    self._reading_key = True
+                    self._key_chars = []
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_member(i)
+                    self._complete_end = i + 1
+                    self.finished = True
+                    return
+            elif char == ',' and self._depth == 1:
+                self._complete_member(i)
+                self._expecting_key = True
+
+    def _complete_member(self, end: int) -> None:
+        """Record the member ending before position ``end``."""
+        if self._current_key is not None:
+            self.completed_keys.add(self._current_key)
+            self._current_key = None
+            self._complete_end = end
+
+    def has_completed(self, keys: Iterable[str]) -> bool:
+        """Check whether all of ``keys`` have been read in full."""
+        return all(key in self.completed_keys for key in keys)
+
+    def completed_json(self) -> Optional[str]:
+        """The object truncated after its last complete member, closed with a brace."""
+        if self._start is None or self._complete_end is None:
+            return None
+        text = self.text[self._start:self._complete_end]
+        return text if self.finished else text + '}'
@@ -272,6 +272,13 @@ class SyncEODHDClient:
             self._session_active = True
             return await self._client.get_stock_quote_eod(symbol)
     
+    @async_to_sync
+    async def get_stock_quotes_eod_bulk(self, symbols: List[str]) -> APIResponse:
+        """Get StockQuotes for many symbols via the bulk last-day EOD endpoint."""
+        async with self._client:
+            self._session_active = True
+            return await self._client.get_stock_quotes_eod_bulk(symbols)
+    
     # Compatibility methods to match MarketData client interface
     def get_option_chain(self, symbol: str) -> APIResponse:
         """
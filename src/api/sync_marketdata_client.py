@@ -492,13 +492,21 @@ class SyncMarketDataClient:
         if response.is_success and response.data:
             try:
                 expirations = []
-                if 'expirations' in response.data:
-                    for timestamp in response.data['expirations']:
-                        try:
-                            date = datetime.fromtimestamp(timestamp).date()
-                            expirations.append(date.isoformat())
-                        except (ValueError, TypeError):
-                            continue
+                raw_expirations = response.data.get('expirations') or []
+                for value in raw_expirations:
+                    try:
+                        # Unix timestamps or ISO date strings
+                        if isinstance(value, str):
+                            date = datetime.fromisoformat(value[:10]).date()
+                        else:
+                            date = datetime.fromtimestamp(value).date()
+                        expirations.append(date.isoformat())
+                    except (ValueError, TypeError, OSError):
+                        continue
+                
+                # An empty list would read as "no options listed"
+                if raw_expirations and not expirations:
+                    raise ValueError(f"unrecognized expiration format: {raw_expirations[0]!r}")
                 
                 return APIResponse(
                     status=response.status,
@@ -523,7 +523,27 @@ class ProviderConfigurationManager:
             "retry_backoff": 1.0,
             "max_stocks_per_analysis": 20,
             "daily_cost_limit": self.settings.claude.daily_cost_limit,
-            "min_data_completeness_threshold": 60.0
+            "min_data_completeness_threshold": 60.0,
+            "response_cache_enabled": self.settings.claude.response_cache_enabled,
+            "response_cache_file": os.path.join(self.settings.data_dir, "claude_response_cache.json"),
+            "response_cache_ttl_hours": self.settings.claude.response_cache_ttl_hours,
+            "response_cache_max_entries": self.settings.claude.response_cache_max_entries,
+            "prompt_token_budget": self.settings.claude.prompt_token_budget,
+            "prompt_caching_enabled": self.settings.claude.prompt_caching_enabled,
+            "streaming_enabled": self.settings.claude.streaming_enabled,
+            "stream_early_stop": self.settings.claude.stream_early_stop,
+            "rate_limit_enabled": self.settings.claude.rate_limit_enabled,
+            "requests_per_minute": self.settings.claude.requests_per_minute,
+            "input_tokens_per_minute": self.settings.claude.input_tokens_per_minute,
+            "output_tokens_per_minute": self.settings.claude.output_tokens_per_minute,
+            "standin_enabled": self.settings.claude.standin_enabled,
+            "standin_replay_dir": self.settings.claude.standin_replay_dir,
+            "standin_latency_distribution": self.settings.claude.standin_latency_distribution,
+            "standin_latency_ms": self.settings.claude.standin_latency_ms,
+            "standin_latency_jitter_ms": self.settings.claude.standin_latency_jitter_ms,
+            "standin_output_tokens_per_second": self.settings.claude.standin_output_tokens_per_second,
+            "standin_rate_limit_probability": self.settings.claude.standin_rate_limit_probability,
+            "standin_output_tokens": self.settings.claude.standin_output_tokens
         }
     
     def get_provider_summary(self) -> Dict[str, Any]:
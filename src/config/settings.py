@@ -236,10 +236,35 @@ class ClaudeConfig(BaseSettings):
     # Analysis configuration
     max_stocks_per_analysis: int = Field(20, description="Maximum stocks to analyze per request")
     min_data_completeness_threshold: float = Field(60.0, description="Minimum data completeness % for analysis")
+    prompt_token_budget: int = Field(4000, description="Estimated token budget for prompt data sections")
+    prompt_caching_enabled: bool = Field(True, description="Cache the static instruction prefix provider-side")
+    streaming_enabled: bool = Field(False, description="Stream responses and record time-to-first-token metrics")
+    stream_early_stop: bool = Field(False, description="Stop streamed analyses once score, recommendation, risks and opportunities are complete; drops management strategy, entry timing, exit conditions and position sizing")
     
     # Cost management
     daily_cost_limit: float = Field(10.0, description="Daily cost limit in USD")
     
+    # Response cache configuration
+    response_cache_enabled: bool = Field(True, description="Reuse responses for byte-identical requests")
+    response_cache_ttl_hours: float = Field(24.0, description="Hours a cached response stays valid")
+    response_cache_max_entries: int = Field(500, description="Maximum number of cached responses")
+    
+    # Organization rate limits (0 disables a limit)
+    rate_limit_enabled: bool = Field(True, description="Schedule requests against the rate limits below")
+    requests_per_minute: int = Field(50, description="Requests per minute limit")
+    input_tokens_per_minute: int = Field(40000, description="Input tokens per minute limit")
+    output_tokens_per_minute: int = Field(8000, description="Output tokens per minute limit")
+    
+    # Local stand-in for offline load tests (no requests reach Anthropic)
+    standin_enabled: bool = Field(False, description="Answer requests with the local Claude stand-in")
+    standin_replay_dir: Optional[str] = Field(None, description="Directory of recorded analyses to replay")
+    standin_latency_distribution: str = Field("lognormal", description="Latency distribution: fixed, uniform or lognormal")
+    standin_latency_ms: float = Field(1500.0, description="Median simulated time to first token")
+    standin_latency_jitter_ms: float = Field(500.0, description="Spread of simulated time to first token")
+    standin_output_tokens_per_second: float = Field(60.0, description="Simulated generation speed")
+    standin_rate_limit_probability: float = Field(0.0, description="Probability of a simulated 429 response")
+    standin_output_tokens: int = Field(600, description="Approximate output tokens per synthesized analysis")
+    
     # Retry configuration
     max_retries: int = Field(3, description="Maximum retry attempts")
     retry_backoff_factor: float = Field(2.0, description="Exponential backoff factor")
@@ -454,8 +479,14 @@ class ScanConfig(BaseSettings):
     # Risk management
     max_risk_per_trade: Decimal = Field(Decimal('0.02'), description="Maximum risk per trade (as fraction)")
     risk_free_rate: Decimal = Field(Decimal('0.05'), description="Risk-free rate for calculations")
+    monte_carlo_paths: int = Field(10000, description="Monte Carlo paths for VaR, expected shortfall and Sharpe ratio (0 disables simulation)")
+    monte_carlo_seed: Optional[int] = Field(42, description="Monte Carlo RNG seed for reproducible risk metrics")
     min_liquidity_score: Decimal = Field(Decimal('60'), description="Minimum liquidity score")
-    min_total_score: Decimal = Field(Decimal('70'), description="Minimum total score for opportunities")
+    min_total_score: Decimal = Field(Decimal('60'), description="Minimum total score for opportunities (the probability component is the model probability of profit, typically 50-60)")
+    score_weight_roi: Decimal = Field(Decimal('0.25'), description="Weight of the ROI component in the total score")
+    score_weight_risk_reward: Decimal = Field(Decimal('0.25'), description="Weight of the risk-reward component in the total score")
+    score_weight_probability: Decimal = Field(Decimal('0.30'), description="Weight of the probability component in the total score")
+    score_weight_liquidity: Decimal = Field(Decimal('0.20'), description="Weight of the liquidity component in the total score")
     
     # Output settings
     max_opportunities: int = Field(25, description="Maximum opportunities to return")
@@ -479,6 +510,20 @@ class ScanConfig(BaseSettings):
     tradetime_lookback_days: int = Field(5, description="Number of days to look back for trading dates")
     custom_tradetime_date: Optional[str] = Field(None, description="Override tradetime filter date for testing (YYYY-MM-DD format)")
     
+    # Options availability negative cache
+    options_negative_cache_enabled: bool = Field(True, description="Skip symbols recently found to have no options or no LEAPS")
+    no_options_recheck_days: int = Field(7, description="Days before re-checking a symbol that had no listed options")
+    no_leaps_recheck_days: int = Field(3, description="Days before re-checking a symbol that had no LEAPS expirations")
+    
+    # IV surface history
+    iv_history_enabled: bool = Field(True, description="Record each symbol's daily ATM IV so IV rank can be computed from past scans")
+    
+    # Candidate store
+    candidate_store_enabled: bool = Field(True, description="Save every scored candidate so results can be rescored without a new scan")
+    
+    # Scan profiles
+    profiles_file: Optional[str] = Field(None, description="JSON file of named scan profiles (name -> scan setting overrides) run on one shared data fetch")
+    
     # AI Enhancement settings
     claude_analysis_enabled: bool = Field(True, description="Enable Claude AI analysis (auto-detects based on API key)")
     top_n_opportunities: int = Field(10, description="Number of top opportunities to select after AI analysis")
@@ -486,6 +531,12 @@ class ScanConfig(BaseSettings):
     min_combined_score: float = Field(70.0, description="Minimum combined (PMCC + Claude) score threshold")
     enhanced_data_collection_enabled: bool = Field(True, description="Enable enhanced data collection with fundamentals, calendar events, etc.")
     require_all_data_sources: bool = Field(False, description="Require all data sources (fundamental, calendar, technical) for AI analysis")
+    claude_batch_enabled: bool = Field(True, description="Pack several opportunities into each Claude request")
+    claude_batch_token_budget: int = Field(12000, description="Estimated token budget for the opportunity data in one packed Claude request")
+    claude_max_batch_size: int = Field(5, description="Maximum opportunities per packed Claude request")
+    claude_prefilter_enabled: bool = Field(True, description="Skip Claude for opportunities that cannot reach the minimum combined score even with a perfect AI score")
+    ai_analysis_reuse_enabled: bool = Field(True, description="Reuse stored Claude analyses for opportunities whose fingerprint is unchanged")
+    ai_analysis_max_age_hours: float = Field(72.0, description="Hours after which a stored Claude analysis is re-run even if unchanged")
     
     # Scoring Weight Configuration
     traditional_pmcc_weight: float = Field(0.6, description="Weight for traditional PMCC analysis in combined scoring (0.0-1.0)")
@@ -18,7 +18,7 @@ import json
 
 try:
     # Try absolute imports first (when running from project root)
-    from src.config import get_settings, Settings, Environment
+    from src.config import get_settings, Settings, Environment, ScanConfig
     from src.utils.logger import get_logger, get_performance_logger
     from src.utils.error_handler import get_error_handler, monitor_performance, handle_errors
     
@@ -28,7 +28,7 @@ try:
     # Core components for configuration
     from src.analysis.scanner import ScanConfiguration, ScanResults
     from src.analysis.stock_screener import ScreeningCriteria
-    from src.analysis.options_analyzer import LEAPSCriteria, ShortCallCriteria
+    from src.analysis.options_analyzer import LEAPSCriteria, ShortCallCriteria, ScoringWeights
     
     # Models
     from src.models.pmcc_models import PMCCCandidate
@@ -38,7 +38,7 @@ except ImportError:
     sys.path.insert(0, str(Path(__file__).parent))
     try:
         # Configuration and utilities
-        from config import get_settings, Settings, Environment
+        from config import get_settings, Settings, Environment, ScanConfig
         from utils.logger import get_logger, get_performance_logger
         from utils.error_handler import get_error_handler, monitor_performance, handle_errors
         
@@ -48,7 +48,7 @@ except ImportError:
         # Core components for configuration
         from analysis.scanner import ScanConfiguration, ScanResults
         from analysis.stock_screener import ScreeningCriteria
-        from analysis.options_analyzer import LEAPSCriteria, ShortCallCriteria
+        from analysis.options_analyzer import LEAPSCriteria, ShortCallCriteria, ScoringWeights
         
         # Models
         from models.pmcc_models import PMCCCandidate
@@ -271,9 +271,76 @@ class PMCCApplication:
         if not self.initialize():
             return False
         
+        if self.settings.scan.profiles_file:
+            profile_results = self.run_profile_scan()
+            return profile_results is not None and not any(r.errors for r in profile_results.values())
+        
         result = self.run_scan()
         return result is not None and not result.errors
     
+    def run_profile_scan(self) -> Optional[Dict[str, ScanResults]]:
+        """
+        Run the scan profiles of the profiles file on one shared data fetch.
+        
+        Each profile's results are exported by the scanner and notified like a scan's.
+        
+        Returns:
+            Profile name -> scan results, or None if failed
+        """
+        if not self.initialized:
+            self.logger.error("Application not initialized")
+            return None
+        
+        try:
+            with self.perf_logger.timer("pmcc_profile_scan"):
+                profile_configs = self._create_profile_configs()
+                self.logger.info(f"Starting PMCC profile scan: {', '.join(profile_configs)}")
+                profile_results = self.container.scanner.scan_profiles(profile_configs)
+                
+                for name, results in profile_results.items():
+                    if self.container.notification_manager:
+                        self.logger.info(f"Sending notifications for profile '{name}'")
+                        self._send_scan_notifications(results)
+                    self._log_scan_summary(results)
+                return profile_results
+        
+        except Exception as e:
+            self.error_handler.report_error(e, "application", context={"operation": "profile_scan"})
+            
+            if self.container.notification_manager:
+                try:
+                    self.container.notification_manager.send_system_alert(
+                        f"PMCC profile scan failed: {str(e)}",
+                        severity="error"
+                    )
+                except Exception as notify_error:
+                    self.logger.error(f"Failed to send error notification: {notify_error}")
+            
+            return None
+    
+    def run_rescore(self) -> Optional[ScanResults]:
+        """
+        Re-rank the last scan's stored candidates with the current scoring settings.
+        
+        No data provider is called; results are exported like a scan's.
+        
+        Returns:
+            Rescored results or None if no candidate store is available
+        """
+        scan_config = self._create_scan_config()
+        if not os.path.exists(scan_config.candidate_store_file):
+            self.logger.error(f"No candidate store at {scan_config.candidate_store_file}; run a scan first")
+            return None
+        
+        try:
+            results = self.container.scanner.rescore(config=scan_config)
+            self.last_scan_result = results
+            self._log_scan_summary(results)
+            return results
+        except Exception as e:
+            self.error_handler.report_error(e, "application", context={"operation": "rescore"})
+            return None
+    
     def run_daemon(self):
         """Run as a daemon with scheduled scans."""
         if not self.start():
@@ -374,87 +441,143 @@ class PMCCApplication:
         return base_health
     
     
-    def _create_scan_config(self) -> ScanConfiguration:
-        """Create scan configuration from settings."""
+    def _create_scan_config(self, scan: Optional[ScanConfig] = None) -> ScanConfiguration:
+        """Create scan configuration from settings (or the given scan settings)."""
+        scan = scan or self.settings.scan
+        
         # Parse custom symbols if provided
         custom_symbols = None
-        if self.settings.scan.custom_symbols:
-            custom_symbols = [s.strip().upper() for s in self.settings.scan.custom_symbols.split(',')]
+        if scan.custom_symbols:
+            custom_symbols = [s.strip().upper() for s in scan.custom_symbols.split(',')]
         
         # Create screening criteria
         # Convert market cap from actual dollars to millions for ScreeningCriteria
-        min_market_cap_millions = self.settings.scan.min_market_cap / Decimal('1000000') if self.settings.scan.min_market_cap else Decimal('50')
-        max_market_cap_millions = self.settings.scan.max_market_cap / Decimal('1000000') if self.settings.scan.max_market_cap else Decimal('5000')
+        min_market_cap_millions = scan.min_market_cap / Decimal('1000000') if scan.min_market_cap else Decimal('50')
+        max_market_cap_millions = scan.max_market_cap / Decimal('1000000') if scan.max_market_cap else Decimal('5000')
         
         screening_criteria = ScreeningCriteria(
-            min_price=self.settings.scan.min_stock_price,
-            max_price=self.settings.scan.max_stock_price,
-            min_daily_volume=self.settings.scan.min_volume,
+            min_price=scan.min_stock_price,
+            max_price=scan.max_stock_price,
+            min_daily_volume=scan.min_volume,
             min_market_cap=min_market_cap_millions,
             max_market_cap=max_market_cap_millions
         )
         
         # Create LEAPS criteria
         leaps_criteria = LEAPSCriteria(
-            min_dte=self.settings.scan.leaps_min_dte,
-            max_dte=self.settings.scan.leaps_max_dte,
-            min_delta=self.settings.scan.leaps_min_delta,
-            max_delta=self.settings.scan.leaps_max_delta,
-            max_premium_pct=self.settings.scan.leaps_max_premium_pct,
-            min_open_interest=self.settings.scan.leaps_min_open_interest,
-            min_volume=self.settings.scan.leaps_min_volume,
-            max_bid_ask_spread_pct=self.settings.scan.leaps_max_bid_ask_spread_pct,
-            max_extrinsic_pct=self.settings.scan.leaps_max_extrinsic_pct
+            min_dte=scan.leaps_min_dte,
+            max_dte=scan.leaps_max_dte,
+            min_delta=scan.leaps_min_delta,
+            max_delta=scan.leaps_max_delta,
+            max_premium_pct=scan.leaps_max_premium_pct,
+            min_open_interest=scan.leaps_min_open_interest,
+            min_volume=scan.leaps_min_volume,
+            max_bid_ask_spread_pct=scan.leaps_max_bid_ask_spread_pct,
+            max_extrinsic_pct=scan.leaps_max_extrinsic_pct
         )
         
         # Create short call criteria
         short_criteria = ShortCallCriteria(
-            min_dte=self.settings.scan.short_min_dte,
-            max_dte=self.settings.scan.short_max_dte,
-            min_delta=self.settings.scan.short_min_delta,
-            max_delta=self.settings.scan.short_max_delta,
-            min_open_interest=self.settings.scan.short_min_open_interest,
-            min_volume=self.settings.scan.short_min_volume,
-            max_bid_ask_spread_pct=self.settings.scan.short_max_bid_ask_spread_pct,
-            min_premium_coverage_ratio=self.settings.scan.short_min_premium_coverage_ratio
+            min_dte=scan.short_min_dte,
+            max_dte=scan.short_max_dte,
+            min_delta=scan.short_min_delta,
+            max_delta=scan.short_max_delta,
+            min_open_interest=scan.short_min_open_interest,
+            min_volume=scan.short_min_volume,
+            max_bid_ask_spread_pct=scan.short_max_bid_ask_spread_pct,
+            min_premium_coverage_ratio=scan.short_min_premium_coverage_ratio
         )
         
         # Determine Claude availability
         claude_available = (
             self.settings.claude and 
             self.settings.claude.is_configured and 
-            self.settings.scan.claude_analysis_enabled
+            scan.claude_analysis_enabled
         )
         
         # Determine enhanced data collection availability
         enhanced_data_available = (
             self.settings.eodhd and 
-            self.settings.scan.enhanced_data_collection_enabled
+            scan.enhanced_data_collection_enabled
         )
         
         return ScanConfiguration(
-            universe=self.settings.scan.default_universe,
+            universe=scan.default_universe,
             custom_symbols=custom_symbols,
-            max_stocks_to_screen=self.settings.scan.max_stocks_to_screen,
+            max_stocks_to_screen=scan.max_stocks_to_screen,
             screening_criteria=screening_criteria,
             leaps_criteria=leaps_criteria,
             short_criteria=short_criteria,
-            max_risk_per_trade=self.settings.scan.max_risk_per_trade,
-            risk_free_rate=self.settings.scan.risk_free_rate,
-            max_opportunities=self.settings.scan.max_opportunities,
-            best_per_symbol_only=self.settings.scan.best_per_symbol_only,
-            min_total_score=self.settings.scan.min_total_score,
-            options_source=self.settings.scan.options_source,
-            use_hybrid_flow=self.settings.scan.use_hybrid_flow,
+            max_risk_per_trade=scan.max_risk_per_trade,
+            risk_free_rate=scan.risk_free_rate,
+            monte_carlo_paths=scan.monte_carlo_paths,
+            monte_carlo_seed=scan.monte_carlo_seed,
+            max_opportunities=scan.max_opportunities,
+            best_per_symbol_only=scan.best_per_symbol_only,
+            min_total_score=scan.min_total_score,
+            scoring_weights=ScoringWeights(
+                roi=scan.score_weight_roi,
+                risk_reward=scan.score_weight_risk_reward,
+                probability=scan.score_weight_probability,
+                liquidity=scan.score_weight_liquidity
+            ),
+            options_source=scan.options_source,
+            use_hybrid_flow=scan.use_hybrid_flow,
+            options_negative_cache_enabled=scan.options_negative_cache_enabled,
+            options_negative_cache_file=os.path.join(self.settings.data_dir, "options_negative_cache.json"),
+            no_options_recheck_days=scan.no_options_recheck_days,
+            no_leaps_recheck_days=scan.no_leaps_recheck_days,
+            iv_history_enabled=scan.iv_history_enabled,
+            iv_history_file=os.path.join(self.settings.data_dir, "iv_history.json"),
+            candidate_store_enabled=scan.candidate_store_enabled,
+            candidate_store_file=os.path.join(self.settings.data_dir, "scan_candidates.npz"),
             # AI Enhancement settings (Phase 3)
             claude_analysis_enabled=claude_available,
             enhanced_data_collection_enabled=enhanced_data_available,
-            top_n_opportunities=self.settings.scan.top_n_opportunities,
-            min_claude_confidence=self.settings.scan.min_claude_confidence,
-            min_combined_score=self.settings.scan.min_combined_score,
-            require_all_data_sources=self.settings.scan.require_all_data_sources
+            top_n_opportunities=scan.top_n_opportunities,
+            min_claude_confidence=scan.min_claude_confidence,
+            min_combined_score=scan.min_combined_score,
+            traditional_pmcc_weight=scan.traditional_pmcc_weight,
+            ai_analysis_weight=scan.ai_analysis_weight,
+            require_all_data_sources=scan.require_all_data_sources,
+            claude_batch_enabled=scan.claude_batch_enabled,
+            claude_batch_token_budget=scan.claude_batch_token_budget,
+            claude_max_batch_size=scan.claude_max_batch_size,
+            claude_prefilter_enabled=scan.claude_prefilter_enabled,
+            ai_analysis_reuse_enabled=scan.ai_analysis_reuse_enabled,
+            ai_analysis_cache_file=os.path.join(self.settings.data_dir, "ai_analysis_cache.json"),
+            ai_analysis_max_age_hours=scan.ai_analysis_max_age_hours,
+            **self._claude_rate_limits()
         )
     
+    def _create_profile_configs(self) -> Dict[str, ScanConfiguration]:
+        """Create one scan configuration per profile of the scan profiles file."""
+        with open(self.settings.scan.profiles_file) as f:
+            overrides_by_profile = json.load(f)
+        if not isinstance(overrides_by_profile, dict) or not overrides_by_profile:
+            raise ValueError(f"{self.settings.scan.profiles_file} must map profile names to setting overrides")
+        
+        base = self.settings.scan.model_dump()
+        return {
+            name: self._create_scan_config(ScanConfig(**{**base, **overrides}))
+            for name, overrides in overrides_by_profile.items()
+        }
+    
+    def _claude_rate_limits(self) -> Dict[str, int]:
+        """Claude organization rate limits for the scanner's request pacing."""
+        claude = self.settings.claude
+        if not claude or not claude.rate_limit_enabled:
+            return {
+                'claude_requests_per_minute': 0,
+                'claude_input_tokens_per_minute': 0,
+                'claude_output_tokens_per_minute': 0
+            }
+        return {
+            'claude_requests_per_minute': claude.requests_per_minute,
+            'claude_input_tokens_per_minute': claude.input_tokens_per_minute,
+            'claude_output_tokens_per_minute': claude.output_tokens_per_minute
+        }
+    
     def _export_scan_results(self, results: ScanResults):
         """Export scan results to file."""
         try:
@@ -684,14 +807,18 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="PMCC Scanner Application")
-    parser.add_argument("--mode", choices=["daemon", "once", "test"], default="daemon",
-                       help="Run mode: daemon (scheduled), once (single scan), test (validation)")
+    parser.add_argument("--mode", choices=["daemon", "once", "test", "rescore"], default="daemon",
+                       help="Run mode: daemon (scheduled), once (single scan), test (validation), "
+                            "rescore (re-rank the last scan's candidates with current settings)")
     parser.add_argument("--config", help="Path to configuration file")
     parser.add_argument("--env", help="Environment override")
     parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
                        help="Log level override")
     parser.add_argument("--no-notifications", action="store_true",
                        help="Disable notifications")
+    parser.add_argument("--profiles",
+                       help="JSON file of named scan profiles to run on one shared data fetch "
+                            "(once mode; overrides SCAN_PROFILES_FILE)")
     
     args = parser.parse_args()
     
@@ -704,6 +831,9 @@ def main():
     if args.log_level:
         os.environ['LOG_LEVEL'] = args.log_level
     
+    if args.profiles:
+        os.environ['SCAN_PROFILES_FILE'] = args.profiles
+    
     if args.no_notifications:
         os.environ['NOTIFICATION_WHATSAPP_ENABLED'] = 'false'
         os.environ['NOTIFICATION_EMAIL_ENABLED'] = 'false'
@@ -758,6 +888,18 @@ def main():
                 print("=" * 80 + "\n")
                 return 1
         
+        elif args.mode == "rescore":
+            # Re-rank stored candidates without calling any provider
+            results = app.run_rescore()
+            if results is None:
+                print("❌ RESCORE FAILED")
+                return 1
+            
+            print(f"✅ Rescored {results.opportunities_found} candidates: "
+                  f"{len(results.top_opportunities)} selected in "
+                  f"{results.total_duration_seconds * 1000:.0f} ms")
+            return 0
+        
         else:
             # Daemon mode (default)
             print("🚀 Starting PMCC Scanner daemon...")
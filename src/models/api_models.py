@@ -1597,6 +1597,8 @@ class ClaudeAnalysisResponse:
     processing_time_ms: Optional[float] = None
     input_tokens: Optional[int] = None
     output_tokens: Optional[int] = None
+    cache_creation_input_tokens: Optional[int] = None
+    cache_read_input_tokens: Optional[int] = None
     
     @classmethod
     def from_claude_response(cls, raw_response: Dict[str, Any], processing_time_ms: Optional[float] = None) -> 'ClaudeAnalysisResponse':
@@ -1637,7 +1639,9 @@ class ClaudeAnalysisResponse:
             model_used=raw_response.get('model'),
             processing_time_ms=processing_time_ms,
             input_tokens=usage.get('input_tokens'),
-            output_tokens=usage.get('output_tokens')
+            output_tokens=usage.get('output_tokens'),
+            cache_creation_input_tokens=usage.get('cache_creation_input_tokens'),
+            cache_read_input_tokens=usage.get('cache_read_input_tokens')
         )
     
     def get_top_opportunities(self, limit: int = 10) -> List[PMCCOpportunityAnalysis]:
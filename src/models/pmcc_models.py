@@ -124,7 +124,7 @@ class PMCCAnalysis:
             max_loss=max_loss,
             max_profit=max_profit,
             breakeven=breakeven,
-            probability_of_profit=None,  # Would need statistical model
+            probability_of_profit=None,  # Filled from the options analyzer's lognormal model
             net_delta=net_delta,
             net_gamma=net_gamma,
             net_theta=net_theta,
@@ -199,6 +199,9 @@ class PMCCCandidate:
     # Complete option chain data for AI analysis
     complete_option_chain: Optional['OptionChain'] = None
     
+    # Comprehensive risk (ComprehensiveRisk), set for the final ranked candidates
+    comprehensive_risk: Optional[Any] = None
+    
     # AI Analysis Results (added to preserve Claude AI insights)
     ai_insights: Optional[Dict[str, Any]] = None
     claude_score: Optional[float] = None
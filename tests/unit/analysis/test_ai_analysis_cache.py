@@ -0,0 +1,87 @@
+"""
+Unit tests for fingerprint-based reuse of Claude analyses.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from src.analysis.ai_analysis_cache import AIAnalysisCache, opportunity_fingerprint
+from src.analysis.scanner import PMCCScanner
+
+
+def _opportunity(underlying=102.0, short_strike=110.0, short_iv=0.30) -> dict:
+    return {
+        'symbol': 'ABC',
+        'underlying_price': underlying,
+        'strategy_details': {'net_debit': 20.0},
+        'leaps_option': {'strike': 80.0, 'expiration': '2027-01-15', 'mid': 25.0, 'iv': 0.28},
+        'short_option': {'strike': short_strike, 'expiration': '2026-11-20', 'mid': 2.0, 'iv': short_iv}
+    }
+
+
+class TestOpportunityFingerprint:
+    """Test what does and does not change an opportunity's fingerprint."""
+
+    def test_small_moves_keep_fingerprint(self):
+        """Test noise within a bucket leaves the fingerprint unchanged."""
+        base = opportunity_fingerprint(_opportunity(), {'fundamentals': {'pe_ratio': 25.0}})
+
+        assert base == opportunity_fingerprint(_opportunity(underlying=102.3, short_iv=0.305),
+                                               {'fundamentals': {'pe_ratio': 25.2}})
+
+    def test_material_changes_change_fingerprint(self):
+        """Test new contracts, price moves, IV shifts and earnings change the fingerprint."""
+        base = opportunity_fingerprint(_opportunity())
+
+        assert base != opportunity_fingerprint(_opportunity(short_strike=115.0))
+        assert base != opportunity_fingerprint(_opportunity(underlying=108.0))
+        assert base != opportunity_fingerprint(_opportunity(short_iv=0.40))
+        upcoming = (datetime.now() + timedelta(days=10)).date().isoformat()
+        assert base != opportunity_fingerprint(_opportunity(),
+                                               {'earnings_calendar': [{'report_date': upcoming}]})
+
+
+class TestAIAnalysisCache:
+    """Test AIAnalysisCache lookup, staleness and persistence."""
+
+    def test_record_persist_and_match(self, tmp_path):
+        """Test a stored analysis is returned only for a matching fingerprint."""
+        cache_file = str(tmp_path / "analyses.json")
+        cache = AIAnalysisCache(cache_file)
+        cache.record("abc", "fp1", {'pmcc_score': 72})
+        cache.save()
+
+        reloaded = AIAnalysisCache(cache_file)
+
+        assert reloaded.get("ABC", "fp1").analysis == {'pmcc_score': 72}
+        assert reloaded.get("ABC", "fp2") is None
+
+    def test_stale_entries_expire(self, tmp_path):
+        """Test analyses older than the staleness window are not reused and are pruned."""
+        cache = AIAnalysisCache(str(tmp_path / "analyses.json"), max_age_hours=24)
+        cache.record("ABC", "fp", {'pmcc_score': 72}, datetime.now() - timedelta(hours=25))
+
+        assert cache.get("ABC", "fp") is None
+        cache.save()
+        assert len(cache) == 0
+
+
+class TestScannerAnalysisReuse:
+    """Test the scanner turns stored analyses into responses."""
+
+    def test_reuse_stored_analyses(self, tmp_path):
+        """Test unchanged opportunities get a response, changed ones do not."""
+        scanner = PMCCScanner(Mock())
+        cache = AIAnalysisCache(str(tmp_path / "analyses.json"))
+        unchanged, changed = _opportunity(), _opportunity(short_strike=115.0)
+        cache.record("ABC", opportunity_fingerprint(unchanged, {}), {'pmcc_score': 72})
+
+        fingerprints, reused = scanner._reuse_stored_analyses(
+            [("ABC", Mock(), unchanged, {})], cache
+        )
+        assert reused["ABC"].data['pmcc_score'] == 72
+        assert reused["ABC"].data['analysis_reused'] is True
+        assert fingerprints["ABC"] == opportunity_fingerprint(unchanged, {})
+
+        _, reused = scanner._reuse_stored_analyses([("ABC", Mock(), changed, {})], cache)
+        assert reused == {}
@@ -0,0 +1,123 @@
+"""
+Unit tests for vectorized Black-Scholes pricing and Greeks.
+"""
+
+import numpy as np
+import pytest
+
+from src.analysis.black_scholes import (
+    call_price, call_price_from_log_spot, call_delta, call_greeks, call_theta,
+    gamma, implied_volatility, norm_cdf, probability_above, probability_of_touch,
+    spot_for_call_value, vega
+)
+
+
+class TestBlackScholes:
+    """Test prices and Greeks against reference values."""
+
+    def test_call_price_reference_values(self):
+        """Test prices against textbook values and the expiry fallback."""
+        assert float(call_price(100, 100, 1.0, 0.05, 0.2)) == pytest.approx(10.4506, abs=1e-3)
+        assert float(call_price(110, 100, 0.0, 0.05, 0.2)) == pytest.approx(10.0)
+        assert float(norm_cdf(0.0)) == pytest.approx(0.5)
+        assert float(norm_cdf(1.96)) == pytest.approx(0.9750, abs=1e-4)
+
+    def test_log_spot_matches_call_price(self):
+        """Test the log-space pricer agrees with call_price for live contracts."""
+        spot = np.array([80.0, 100.0, 130.0])
+        expected = call_price(spot, 100, 0.75, 0.04, 0.3)
+        actual = call_price_from_log_spot(np.log(spot), 100, 0.75, 0.04, 0.3)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+    def test_greeks_reference_values(self):
+        """Test Greeks use per-day theta and per-point vega."""
+        greeks = call_greeks(100, 100, 1.0, 0.05, 0.2)
+
+        assert float(greeks['delta']) == pytest.approx(0.6368, abs=1e-4)
+        assert float(greeks['gamma']) == pytest.approx(0.01876, abs=1e-5)
+        assert float(greeks['theta']) == pytest.approx(-6.414 / 365, abs=1e-4)
+        assert float(greeks['vega']) == pytest.approx(0.3752, abs=1e-4)
+        assert float(call_delta(100, 100, 1.0, 0.05, 0.2)) == pytest.approx(float(greeks['delta']))
+        assert float(gamma(100, 100, 1.0, 0.05, 0.2)) == pytest.approx(float(greeks['gamma']))
+        assert float(call_theta(100, 100, 1.0, 0.05, 0.2)) == pytest.approx(float(greeks['theta']))
+        assert float(vega(100, 100, 1.0, 0.05, 0.2)) == pytest.approx(float(greeks['vega']))
+
+    def test_expired_greeks(self):
+        """Test expired contracts get intrinsic price and boundary Greeks."""
+        greeks = call_greeks([120.0, 80.0], 100, 0.0, 0.05, 0.3)
+
+        assert greeks['price'].tolist() == [20.0, 0.0]
+        assert greeks['delta'].tolist() == [1.0, 0.0]
+        assert greeks['gamma'].tolist() == [0.0, 0.0]
+
+    def test_zero_volatility_price_matches_call_price(self):
+        """Test zero-vol contracts with time left are valued at discounted intrinsic by both pricers."""
+        greeks = call_greeks([120.0, 100.0], 100, 1.0, 0.05, 0.0)
+        expected = call_price([120.0, 100.0], 100, 1.0, 0.05, 0.0)
+
+        np.testing.assert_allclose(greeks['price'], expected)
+        assert float(greeks['price'][0]) == pytest.approx(120 - 100 * np.exp(-0.05))
+
+
+class TestImpliedVolatility:
+    """Test vectorized implied volatility inversion."""
+
+    def test_round_trip(self):
+        """Test prices generated at known volatilities invert back to them."""
+        strike = np.array([60.0, 90.0, 100.0, 120.0, 150.0])
+        years = np.array([2.0, 1.0, 0.1, 0.5, 1.5])
+        volatility = np.array([0.25, 0.4, 0.2, 0.6, 0.35])
+        price = call_price(100, strike, years, 0.05, volatility)
+
+        np.testing.assert_allclose(implied_volatility(price, 100, strike, years, 0.05), volatility, atol=1e-4)
+
+    def test_arbitrage_violations_are_nan(self):
+        """Test prices outside the no-arbitrage bounds have no IV."""
+        result = implied_volatility([1.0, 120.0, 5.0], 100, [80.0, 100.0, 100.0], [1.0, 1.0, 0.0], 0.05)
+
+        assert np.isnan(result).all()
+
+
+class TestSpotForCallValue:
+    """Test the spot search behind the short expiration breakeven."""
+
+    def test_inverts_call_price(self):
+        """Test the spot found prices the call at the value, and unreachable values are inf."""
+        spot = spot_for_call_value([10.0, 30.0, 80.0, np.nan], 100, [0.5, 1.0, 1.0, 1.0], 0.05, 0.3, 150)
+
+        np.testing.assert_allclose(call_price(spot[:2], 100, [0.5, 1.0], 0.05, 0.3), [10.0, 30.0], atol=1e-3)
+        assert spot[2] == np.inf
+        assert np.isnan(spot[3])
+
+
+class TestProbabilities:
+    """Test lognormal terminal and touch probabilities."""
+
+    def test_probability_above_is_n_d2(self):
+        """Test the terminal probability equals N(d2) and handles expiry."""
+        d2 = (np.log(100 / 110) + (0.05 - 0.5 * 0.3 ** 2) * 0.5) / (0.3 * np.sqrt(0.5))
+
+        assert float(probability_above(100, 110, 0.5, 0.05, 0.3)) == pytest.approx(float(norm_cdf(d2)))
+        assert probability_above([120.0, 80.0], 100, 0.0, 0.05, 0.3).tolist() == [1.0, 0.0]
+
+    def test_touch_matches_simulation(self):
+        """Test the touch probability against a finely monitored simulated path."""
+        rng = np.random.default_rng(7)
+        years, steps = 45 / 365, 2000
+        dt = years / steps
+        log_paths = np.cumsum((0.05 - 0.5 * 0.3 ** 2) * dt + 0.3 * np.sqrt(dt) * rng.standard_normal((4000, steps)), axis=1)
+        simulated = (log_paths.max(axis=1) >= np.log(110 / 100)).mean()
+
+        assert float(probability_of_touch(100, 110, years, 0.05, 0.3)) == pytest.approx(simulated, abs=0.02)
+
+    def test_touch_bounds(self):
+        """Test touching is at least as likely as finishing above, and twice as likely without drift."""
+        level = np.array([101.0, 110.0, 130.0])
+        touch = probability_of_touch(100, level, 0.25, 0.05, 0.35)
+
+        assert (touch >= probability_above(100, level, 0.25, 0.05, 0.35)).all()
+        # rate = volatility^2 / 2 leaves the log price driftless (reflection principle)
+        np.testing.assert_allclose(probability_of_touch(100, level, 0.25, 0.02, 0.2),
+                                   2 * probability_above(100, level, 0.25, 0.02, 0.2), rtol=1e-12)
+        assert probability_of_touch([100.0, 100.0], [90.0, 110.0], [0.1, 0.0], 0.05, 0.3).tolist() == [1.0, 0.0]
@@ -0,0 +1,176 @@
+"""
+Unit tests for the columnar candidate store and rescoring.
+"""
+
+from dataclasses import replace
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from src.analysis.candidate_store import CandidateStore
+from src.analysis.options_analyzer import OptionsAnalyzer, PMCCOpportunity, ScoringWeights
+from src.analysis.scanner import MAX_OPPORTUNITIES_PER_SYMBOL, PMCCScanner, ScanConfiguration, ScanResults
+from src.models.api_models import OptionContract, OptionSide, StockQuote
+
+
+def _opportunity(symbol, short_strike=155, roi=8.7, rr=0.5, probability=70, liquidity=75):
+    leaps = OptionContract(
+        option_symbol=f"{symbol}241220C00130000", underlying=symbol, expiration=datetime(2024, 12, 20),
+        side=OptionSide.CALL, strike=Decimal('130'), bid=Decimal('24.50'), ask=Decimal('25.50'),
+        delta=Decimal('0.80'), iv=Decimal('0.28'), volume=12, open_interest=340, dte=450
+    )
+    short = OptionContract(
+        option_symbol=f"{symbol}240315C00{short_strike}000", underlying=symbol, expiration=datetime(2024, 3, 15),
+        side=OptionSide.CALL, strike=Decimal(short_strike), bid=Decimal('2.50'), ask=Decimal('2.70'),
+        delta=Decimal('0.30'), dte=35
+    )
+    return PMCCOpportunity(
+        leaps_contract=leaps, short_contract=short,
+        underlying_quote=StockQuote(symbol=symbol, last=Decimal('150.00'), volume=2_000_000),
+        net_debit=Decimal('23.00'), max_profit=Decimal('2.00'), max_loss=Decimal('23.00'),
+        breakeven=Decimal('153.00'), roi_potential=Decimal(str(roi)), risk_reward_ratio=Decimal(str(rr)),
+        probability_score=Decimal(str(probability)), liquidity_score=Decimal(str(liquidity)),
+        total_score=Decimal('60'), analyzed_at=datetime(2024, 2, 9, 15, 30),
+        probability_of_profit=Decimal(str(probability / 100))
+    )
+
+
+def _opportunities():
+    # AAA is strong on probability, BBB on liquidity; AAA has a weaker second candidate
+    return [
+        _opportunity("AAA", probability=95, liquidity=40),
+        _opportunity("AAA", short_strike=160, probability=80, liquidity=40),
+        _opportunity("BBB", probability=40, liquidity=95),
+        _opportunity("CCC", roi=0, rr=0.1, probability=20, liquidity=20)
+    ]
+
+
+class TestCandidateStore:
+    """Test storing, scoring and ranking candidates as arrays."""
+
+    def test_save_load_round_trip(self, tmp_path):
+        """Test a saved store rebuilds the same opportunities."""
+        path = str(tmp_path / "candidates.npz")
+        CandidateStore.from_opportunities(_opportunities(), "scan_1").save(path)
+
+        store = CandidateStore.load(path)
+        rebuilt = store.opportunity(0)
+        original = _opportunities()[0]
+
+        assert store.scan_id == "scan_1"
+        assert len(store) == 4
+        assert rebuilt.leaps_contract.option_symbol == original.leaps_contract.option_symbol
+        assert rebuilt.leaps_contract.iv == Decimal('0.28')
+        assert rebuilt.leaps_contract.open_interest == 340
+        assert rebuilt.short_contract.iv is None
+        assert rebuilt.short_contract.expiration == datetime(2024, 3, 15)
+        assert rebuilt.underlying_quote.last == Decimal('150.0')
+        assert rebuilt.probability_score == Decimal('95.0')
+        assert rebuilt.probability_of_profit == Decimal('0.95')
+        assert rebuilt.probability_of_touch is None
+        assert rebuilt.analyzed_at == original.analyzed_at
+
+    def test_total_scores_match_analyzer(self):
+        """Test vectorized scores equal the analyzer's score for the same weights."""
+        analyzer = OptionsAnalyzer(Mock())
+        analyzer.scoring_weights = ScoringWeights(roi=Decimal('0.1'), risk_reward=Decimal('0.2'),
+                                                  probability=Decimal('0.3'), liquidity=Decimal('0.4'))
+        opportunities = _opportunities()
+        store = CandidateStore.from_opportunities(opportunities, "scan_1")
+
+        scores = store.total_scores(analyzer.scoring_weights)
+
+        expected = [
+            float(analyzer._calculate_total_score(o.roi_potential, o.risk_reward_ratio,
+                                                  o.probability_score, o.liquidity_score))
+            for o in opportunities
+        ]
+        np.testing.assert_allclose(scores, expected)
+
+    def test_rank_filters_and_keeps_best_per_symbol(self):
+        """Test ranking applies the score threshold and best-per-symbol rule."""
+        store = CandidateStore.from_opportunities(_opportunities(), "scan_1")
+        scores = store.total_scores(ScoringWeights())
+
+        assert store.rank(scores, Decimal('30'), True, 10).tolist() == [0, 2]
+        assert store.rank(scores, Decimal('30'), False, 10).tolist() == [0, 1, 2]
+        assert store.rank(scores, Decimal('30'), False, 1).tolist() == [0]
+
+
+class TestScannerRescore:
+    """Test PMCCScanner.rescore re-ranks stored candidates without providers."""
+
+    def test_new_weights_reorder_without_provider_calls(self, tmp_path):
+        """Test changed weights reorder the top opportunities and nothing is fetched."""
+        api_client = Mock()
+        scanner = PMCCScanner(api_client)
+        path = str(tmp_path / "candidates.npz")
+        CandidateStore.from_opportunities(_opportunities(), "scan_1").save(path)
+        probability_first = ScanConfiguration(min_total_score=Decimal('30'), perform_scenario_analysis=False)
+        liquidity_first = ScanConfiguration(
+            min_total_score=Decimal('30'), perform_scenario_analysis=False,
+            scoring_weights=ScoringWeights(probability=Decimal('0.1'), liquidity=Decimal('0.4'))
+        )
+
+        first = scanner.rescore(path, probability_first, export=False)
+        second = scanner.rescore(path, liquidity_first, export=False)
+
+        assert [c.symbol for c in first.top_opportunities] == ["AAA", "BBB"]
+        assert [c.symbol for c in second.top_opportunities] == ["BBB", "AAA"]
+        assert [c.rank for c in second.top_opportunities] == [1, 2]
+        assert second.opportunities_found == 4
+        assert second.top_opportunities[0].analysis.long_call.strike == Decimal('130.0')
+        assert api_client.method_calls == []
+
+    def test_store_keeps_candidates_beyond_per_symbol_cut(self, tmp_path):
+        """Test new weights can promote a candidate the scan cut from its symbol's top list."""
+        scanner = PMCCScanner(Mock())
+        path = str(tmp_path / "candidates.npz")
+        opportunities = [_opportunity("AAA", short_strike=150 + i, probability=90 - i, liquidity=30)
+                         for i in range(MAX_OPPORTUNITIES_PER_SYMBOL + 1)]
+        opportunities.append(_opportunity("AAA", short_strike=170, probability=20, liquidity=100))
+        for opportunity in opportunities:
+            opportunity.total_score = Decimal(str(float(ScoringWeights().total_scores(
+                opportunity.roi_potential, opportunity.risk_reward_ratio,
+                opportunity.probability_score, opportunity.liquidity_score
+            ))))
+        config = ScanConfiguration(min_total_score=Decimal('0'), perform_scenario_analysis=False,
+                                   best_per_symbol_only=True, candidate_store_enabled=True,
+                                   candidate_store_file=path, claude_analysis_enabled=False,
+                                   enhanced_data_collection_enabled=False)
+
+        results = ScanResults(scan_id="scan_1")
+        scanner._select_opportunities(opportunities, config, results)
+        liquidity_first = replace(config, scoring_weights=ScoringWeights(
+            roi=Decimal('0'), risk_reward=Decimal('0'), probability=Decimal('0'), liquidity=Decimal('1')
+        ))
+        rescored = scanner.rescore(path, liquidity_first, export=False)
+
+        assert results.opportunities_found == MAX_OPPORTUNITIES_PER_SYMBOL
+        assert len(CandidateStore.load(path)) == len(opportunities)
+        assert rescored.top_opportunities[0].analysis.short_call.strike == Decimal('170')
+
+    def test_ai_scores_recombined(self):
+        """Test stored Claude scores are recombined with the new traditional weight."""
+        scanner = PMCCScanner(Mock())
+        opportunities = _opportunities()
+        ranked = scanner._calculate_risk_metrics(opportunities, ScanConfiguration(
+            perform_scenario_analysis=False), Mock(warnings=[]))
+        ranked[0].claude_score, ranked[0].claude_confidence = 40.0, 80.0
+        ranked[2].claude_score, ranked[2].claude_confidence = 95.0, 80.0
+        ranked[2].claude_reasoning = "Strong liquidity"
+        store = CandidateStore.from_opportunities(opportunities, "scan_1", analyzed=ranked)
+        config = ScanConfiguration(min_total_score=Decimal('30'), min_combined_score=30.0,
+                                   perform_scenario_analysis=False)
+
+        traditional = scanner.rescore(store, config, traditional_pmcc_weight=1.0, export=False)
+        ai_heavy = scanner.rescore(store, config, traditional_pmcc_weight=0.2, export=False)
+
+        assert [c.symbol for c in traditional.top_opportunities] == ["AAA", "BBB"]
+        assert [c.symbol for c in ai_heavy.top_opportunities] == ["BBB", "AAA"]
+        bbb = ai_heavy.top_opportunities[0]
+        assert bbb.claude_reasoning == "Strong liquidity"
+        assert bbb.combined_score == pytest.approx(float(bbb.total_score) * 0.2 + 95.0 * 0.8, abs=1e-4)
@@ -0,0 +1,181 @@
+"""
+Unit tests for the vectorized criteria sweep.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from src.analysis.criteria_sweep import CriteriaSweep, CriteriaVariant
+from src.analysis.iv_surface import IVSurfaceCache
+from src.analysis.options_analyzer import LEAPSCriteria, OptionsAnalyzer, ShortCallCriteria, ScoringWeights
+from src.analysis.scanner import PMCCScanner, ScanConfiguration, ScanResults
+from src.analysis.stock_screener import StockScreenResult
+from src.models.api_models import OptionChain, OptionContract, OptionSide, StockQuote
+
+
+def _chain(symbol="AAPL", price=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    # Most contracts carry IV (probability model), the rest score with the heuristic
+    iv_rng = np.random.default_rng(seed + 100)
+    contracts = []
+    for dte in (21, 30, 45, 60, 240, 400, 600):
+        for strike in np.arange(60, 150, 2.5):
+            moneyness = np.log(price / strike)
+            delta = float(np.clip(0.5 + moneyness * (1.8 if dte < 100 else 1.2), 0.02, 0.98))
+            intrinsic = max(0.0, price - strike)
+            value = intrinsic + price * 0.1 * np.sqrt(dte / 365) * np.exp(-abs(moneyness) * 4)
+            spread = value * rng.uniform(0.01, 0.12)
+            bid = round(max(value - spread / 2, 0.05), 2)
+            ask = round(bid + spread, 2)
+            contracts.append(OptionContract(
+                option_symbol=f"{symbol}{dte}C{strike}", underlying=symbol,
+                expiration=datetime(2026, 1, 2) + timedelta(days=dte), side=OptionSide.CALL,
+                strike=Decimal(str(strike)), bid=Decimal(str(bid)), ask=Decimal(str(ask)),
+                mid=Decimal(str(round((bid + ask) / 2, 3))) if rng.random() < 0.7 else None,
+                delta=Decimal(str(round(delta, 3))), volume=int(rng.integers(0, 40)),
+                open_interest=int(rng.integers(0, 600)), dte=dte,
+                iv=Decimal(str(round(iv_rng.uniform(0.2, 0.45), 3))) if iv_rng.random() < 0.8 else None
+            ))
+    return OptionChain(underlying=symbol, underlying_price=Decimal(str(price)), contracts=contracts)
+
+
+def _variants():
+    return CriteriaVariant.grid(
+        leaps_values={'min_delta': [Decimal('0.70'), Decimal('0.80')], 'max_extrinsic_pct': [Decimal('0'), Decimal('0.15')]},
+        short_values={'min_dte': [21, 40], 'min_premium_coverage_ratio': [Decimal('0'), Decimal('0.5')]},
+        leaps_criteria=LEAPSCriteria(min_dte=180, max_premium_pct=Decimal('0.5')),
+        short_criteria=ShortCallCriteria(min_open_interest=50, max_delta=Decimal('0.40'))
+    )
+
+
+def _analyzer_scores(analyzer, chain, quote, variant):
+    """Total scores of the analyzer's own candidate selection and combination loop."""
+    leaps_candidates, short_candidates = analyzer._screen_option_chain(
+        chain, variant.leaps_criteria, variant.short_criteria, quote
+    )
+    scores = []
+    for leaps in leaps_candidates:
+        mid = leaps.mid if leaps.mid else (leaps.bid + leaps.ask) / 2
+        extrinsic = mid - max(Decimal('0'), quote.last - leaps.strike)
+        for short in short_candidates:
+            if not analyzer._is_valid_pmcc_combination(leaps, short, quote):
+                continue
+            ratio = variant.short_criteria.min_premium_coverage_ratio
+            if ratio > 0 and extrinsic > 0 and short.bid / extrinsic < ratio:
+                continue
+            scores.append(float(analyzer._analyze_pmcc_combination(leaps, short, quote).total_score))
+    return sorted(scores)
+
+
+class TestCriteriaVariant:
+    """Test building variant grids."""
+
+    def test_grid_is_cartesian_product(self):
+        """Test every combination of swept values becomes a named variant."""
+        variants = _variants()
+
+        assert len(variants) == 16
+        assert variants[0].name == ("leaps.min_delta=0.70, leaps.max_extrinsic_pct=0, "
+                                    "short.min_dte=21, short.min_premium_coverage_ratio=0")
+        assert variants[-1].leaps_criteria.min_delta == Decimal('0.80')
+        assert variants[-1].leaps_criteria.min_dte == 180
+        assert variants[-1].short_criteria.min_open_interest == 50
+        assert CriteriaVariant.grid()[0].name == "base"
+
+
+class TestCriteriaSweep:
+    """Test the sweep against the options analyzer."""
+
+    def test_matches_analyzer_selection_and_scores(self):
+        """Test every variant finds the analyzer's combinations with the same scores."""
+        analyzer = OptionsAnalyzer(Mock())
+        weights = ScoringWeights(roi=Decimal('0.2'), risk_reward=Decimal('0.2'),
+                                 probability=Decimal('0.35'), liquidity=Decimal('0.25'))
+        analyzer.scoring_weights = weights
+        chains = {"AAPL": _chain(), "MSFT": _chain("MSFT", price=103.3, seed=1)}
+        quotes = {s: StockQuote(symbol=s, last=c.underlying_price) for s, c in chains.items()}
+        variants = _variants()
+
+        results = CriteriaSweep(weights, min_total_score=Decimal('50')).run(chains, variants, quotes)
+
+        assert sum(r.opportunities for r in results) > 0
+        for variant, result in zip(variants, results):
+            expected = []
+            for symbol, chain in chains.items():
+                expected += _analyzer_scores(analyzer, chain, quotes[symbol], variant)
+            assert result.opportunities == len(expected), variant.name
+            np.testing.assert_allclose(np.sort(result.scores), np.sort(expected), atol=1e-9)
+            assert result.opportunities_above_min_score == sum(s >= 50 for s in expected)
+            assert result.symbols_evaluated == 2
+
+    def test_matches_analyzer_short_ranking_with_iv_surface(self):
+        """Test short calls are kept by surface-adjusted premium, as the analyzer keeps them."""
+        analyzer = OptionsAnalyzer(Mock())
+        chain = _chain()
+        quote = StockQuote(symbol="AAPL", last=chain.underlying_price)
+        analyzer.fill_missing_greeks(chain, quote)
+        analyzer.iv_surface_cache = IVSurfaceCache()
+        variants = CriteriaVariant.grid(
+            short_values={'max_dte': [45, 60]},
+            leaps_criteria=LEAPSCriteria(min_dte=180, max_premium_pct=Decimal('0.5')),
+            short_criteria=ShortCallCriteria(min_open_interest=0, min_volume=0, min_delta=Decimal('0.05'),
+                                             max_delta=Decimal('0.60'), max_bid_ask_spread_pct=Decimal('15'),
+                                             min_premium_coverage_ratio=Decimal('0'))
+        )
+
+        results = CriteriaSweep(iv_surface_cache=analyzer.iv_surface_cache).run(
+            {"AAPL": chain}, variants, {"AAPL": quote}
+        )
+        by_bid = CriteriaSweep().run({"AAPL": chain}, variants, {"AAPL": quote})
+
+        assert all(r.short_candidates > 20 for r in results)
+        for variant, result in zip(variants, results):
+            expected = _analyzer_scores(analyzer, chain, quote, variant)
+            np.testing.assert_allclose(np.sort(result.scores), expected, atol=1e-9)
+        assert any(not np.array_equal(np.sort(a.scores), np.sort(b.scores)) for a, b in zip(results, by_bid))
+
+    def test_stricter_criteria_find_fewer(self):
+        """Test counts shrink as the criteria tighten and the table renders."""
+        variants = CriteriaVariant.grid(
+            short_values={'min_open_interest': [0, 400, 100000]},
+            leaps_criteria=LEAPSCriteria(min_dte=180, max_premium_pct=Decimal('0.5'))
+        )
+
+        results = CriteriaSweep().run({"AAPL": _chain()}, variants)
+
+        counts = [r.opportunities for r in results]
+        assert counts[0] > counts[1] > counts[2] == 0
+        assert results[2].score_percentiles()['median'] is None
+        assert results[0].to_dict()['score_max'] == pytest.approx(float(results[0].scores.max()))
+        table = CriteriaSweep.to_table(results)
+        assert "short.min_open_interest=100000" in table
+
+
+class TestScannerSweep:
+    """Test PMCCScanner.sweep_criteria uses the scan's chains without providers."""
+
+    def test_sweeps_analyzed_chains(self):
+        """Test the scan's chains and quotes are swept and nothing is fetched."""
+        api_client = Mock()
+        scanner = PMCCScanner(api_client)
+        chain = _chain()
+        results = ScanResults(
+            scan_id="scan_1", started_at=datetime.now(),
+            configuration=ScanConfiguration(min_total_score=Decimal('40')),
+            screening_results=[StockScreenResult(symbol="AAPL", quote=StockQuote(symbol="AAPL", last=Decimal('100')))],
+            analyzed_option_chains={"AAPL": chain}
+        )
+        variants = _variants()[:2]
+
+        swept = scanner.sweep_criteria(variants, results)
+
+        expected = CriteriaSweep(min_total_score=Decimal('40'), iv_surface_cache=scanner.iv_surface_cache).run(
+            {"AAPL": chain}, variants
+        )
+        assert [r.opportunities for r in swept] == [r.opportunities for r in expected]
+        assert [r.opportunities_above_min_score for r in swept] == [r.opportunities_above_min_score for r in expected]
+        assert api_client.method_calls == []
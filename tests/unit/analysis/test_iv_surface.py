@@ -0,0 +1,138 @@
+"""
+Unit tests for the IV surface and its per-day cache.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.analysis.black_scholes import call_price
+from src.analysis.iv_surface import IVSurface, IVSurfaceCache
+from src.models.api_models import OptionChain, OptionContract, OptionSide
+
+
+def _smile(strike, dte):
+    k = np.log(strike / 100.0)
+    return 0.30 - 0.10 * k + 0.20 * k * k + 0.02 * dte / 400
+
+
+def _chain(symbol="AAPL", expirations=(30, 60, 120, 400), bump=None):
+    contracts = []
+    for dte in expirations:
+        for strike in range(60, 150, 5):
+            iv = _smile(strike, dte) + (0.05 if bump == (dte, strike) else 0.0)
+            contracts.append(OptionContract(
+                option_symbol=f"{symbol}{dte}C{strike}", underlying=symbol,
+                expiration=datetime.now() + timedelta(days=dte), side=OptionSide.CALL,
+                strike=Decimal(strike), iv=Decimal(str(round(iv, 6))), dte=dte
+            ))
+    return OptionChain(underlying=symbol, underlying_price=Decimal('100'), contracts=contracts)
+
+
+class TestIVSurface:
+    """Test fitting and querying the surface."""
+
+    def test_fit_recovers_smile(self):
+        """Test quoted expirations reproduce the generating smile."""
+        surface = IVSurface.from_chain(_chain())
+
+        strikes = np.array([70.0, 100.0, 135.0])
+        np.testing.assert_allclose(surface.iv(strikes, 60), _smile(strikes, 60), atol=1e-4)
+        assert surface.points == 4 * 18
+        assert surface.market_iv(Decimal('85'), 30) == pytest.approx(_smile(85, 30), abs=1e-6)
+
+    def test_total_variance_interpolation(self):
+        """Test IV between expirations lies between the neighbouring smiles."""
+        surface = IVSurface.from_chain(_chain())
+
+        between = surface.atm_iv(90)
+
+        assert surface.atm_iv(60) < between < surface.atm_iv(120)
+        assert surface.atm_iv(5) == pytest.approx(surface.atm_iv(30))
+        assert surface.atm_iv(800) == pytest.approx(surface.atm_iv(400))
+
+    def test_richness_flags_outlier(self):
+        """Test a quote above the fitted smile is rich and its neighbours are not."""
+        chain = _chain(bump=(60, 110))
+        surface = IVSurface.from_chain(chain)
+        by_symbol = {c.option_symbol: c for c in chain.contracts}
+
+        assert surface.richness(by_symbol["AAPL60C110"]) > 0.03
+        assert abs(surface.richness(by_symbol["AAPL30C110"])) < 0.01
+
+    def test_missing_iv_implied_from_mid(self):
+        """Test calls without IV are inverted from their mid price."""
+        price = float(call_price(100, 100, 30 / 365, 0.05, 0.4))
+        contract = OptionContract(
+            option_symbol="X30C100", underlying="X", expiration=datetime.now() + timedelta(days=30),
+            side=OptionSide.CALL, strike=Decimal('100'), mid=Decimal(str(round(price, 4))), dte=30
+        )
+        chain = OptionChain(underlying="X", underlying_price=Decimal('100'), contracts=[contract])
+
+        surface = IVSurface.from_chain(chain)
+
+        assert surface.atm_iv() == pytest.approx(0.4, abs=1e-3)
+
+    def test_unusable_chain(self):
+        """Test chains without a price or quotes yield no surface."""
+        assert IVSurface.from_chain(OptionChain(underlying="X", underlying_price=Decimal('100'))) is None
+        assert IVSurface.from_chain(OptionChain(underlying="X", contracts=_chain().contracts)) is None
+
+
+class TestIVSurfaceCache:
+    """Test per-day caching and IV rank history."""
+
+    def test_surface_built_once_per_trading_day(self):
+        """Test repeated lookups on the same day reuse the fitted surface."""
+        cache = IVSurfaceCache()
+        chain = _chain()
+
+        with patch.object(IVSurface, 'from_chain', wraps=IVSurface.from_chain) as fit:
+            first = cache.get_or_build(chain)
+            second = cache.get_or_build(chain)
+            next_day = cache.get_or_build(chain, trading_date=date.today() + timedelta(days=1))
+
+        assert first is second
+        assert cache.get("aapl") is first
+        assert cache.latest("aapl") is next_day
+        assert fit.call_count == 2
+
+    def test_clear_surfaces_keeps_history(self):
+        """Test cleared surfaces are refitted while the ATM IV history survives."""
+        cache = IVSurfaceCache()
+        chain = _chain()
+        first = cache.get_or_build(chain)
+
+        cache.clear_surfaces()
+
+        assert len(cache) == 0
+        assert cache.latest("AAPL") is None
+        assert cache.iv_rank_inputs("AAPL")['observations'] == 1
+        assert cache.get_or_build(chain) is not first
+
+    def test_iv_rank_from_persisted_history(self, tmp_path):
+        """Test IV rank needs enough history and survives a save/load round trip."""
+        history_file = str(tmp_path / "iv_history.json")
+        cache = IVSurfaceCache(history_file, min_observations=3)
+        start = date(2026, 1, 1)
+        for i, atm_iv in enumerate([0.20, 0.40]):
+            cache.record_atm_iv("AAPL", atm_iv, start + timedelta(days=i))
+        assert cache.iv_rank("AAPL") is None
+
+        cache.record_atm_iv("AAPL", 0.25, start + timedelta(days=2))
+        cache.save()
+        reloaded = IVSurfaceCache(history_file, min_observations=3)
+
+        assert reloaded.iv_rank("AAPL") == Decimal('25.0')
+        assert reloaded.iv_rank_inputs("AAPL")['observations'] == 3
+
+    def test_history_window_pruned(self):
+        """Test observations older than the lookback window are dropped."""
+        cache = IVSurfaceCache(lookback_days=10)
+        cache.record_atm_iv("AAPL", 0.5, date(2026, 1, 1))
+        cache.record_atm_iv("AAPL", 0.3, date(2026, 2, 1))
+
+        assert cache.iv_rank_inputs("AAPL") == {'current': 0.3, 'low': 0.3, 'high': 0.3, 'observations': 1}
@@ -0,0 +1,118 @@
+"""
+Unit tests for the Monte Carlo P&L engine.
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from src.analysis.monte_carlo import MonteCarloSimulator
+from src.analysis.risk_calculator import RiskCalculator
+from src.models.api_models import OptionContract, StockQuote, OptionSide
+from src.models.pmcc_models import PMCCAnalysis
+
+
+def _candidates(n=5):
+    spot = np.linspace(50, 250, n)
+    return dict(
+        spot=spot, long_strike=spot * 0.8, short_strike=spot * 1.1, net_debit=spot * 0.22,
+        short_years=np.full(n, 35 / 365), long_years=np.full(n, 1.5),
+        volatility=np.linspace(0.2, 0.6, n), long_volatility=np.linspace(0.2, 0.5, n)
+    )
+
+
+class TestMonteCarloSimulator:
+    """Test MonteCarloSimulator statistics and reproducibility."""
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test the same seed gives identical metrics."""
+        first = MonteCarloSimulator(paths=2000, seed=7).simulate(**_candidates())
+        second = MonteCarloSimulator(paths=2000, seed=7).simulate(**_candidates())
+
+        np.testing.assert_array_equal(first.var_95, second.var_95)
+        np.testing.assert_array_equal(first.expected_shortfall, second.expected_shortfall)
+
+    def test_tail_metrics(self):
+        """Test expected shortfall is defined and never below VaR."""
+        results = MonteCarloSimulator(paths=4000).simulate(**_candidates())
+
+        assert results.valid.all()
+        assert (results.var_95 > 0).all()
+        assert (results.expected_shortfall >= results.var_95).all()
+        assert ((results.probability_of_profit > 0) & (results.probability_of_profit < 1)).all()
+        assert np.isfinite(results.sharpe_ratio).all()
+
+    def test_results_independent_of_batch(self):
+        """Test a candidate's metrics do not depend on the other candidates."""
+        candidates = _candidates()
+        batch = MonteCarloSimulator(paths=2000, chunk_size=2).simulate(**candidates)
+        single = MonteCarloSimulator(paths=2000).simulate(**{k: v[3:4] for k, v in candidates.items()})
+
+        assert single.var_95[0] == batch.var_95[3]
+        assert single.expected_pnl[0] == batch.expected_pnl[3]
+
+    def test_missing_volatility_is_invalid(self):
+        """Test rows without IV are reported as NaN."""
+        candidates = _candidates(3)
+        candidates['volatility'] = np.array([0.3, np.nan, 0.3])
+        candidates['long_volatility'] = np.array([0.3, np.nan, 0.3])
+
+        results = MonteCarloSimulator(paths=1000).simulate(**candidates)
+
+        assert results.valid.tolist() == [True, False, True]
+        assert np.isnan(results.var_95[1])
+
+    def test_odd_path_count_rounded_up(self):
+        """Test antithetic pairing rounds paths up and rejects too few."""
+        assert MonteCarloSimulator(paths=1001).paths == 1002
+        with pytest.raises(ValueError):
+            MonteCarloSimulator(paths=1)
+
+
+class TestRiskCalculatorMonteCarlo:
+    """Test RiskCalculator uses simulated tail metrics when IV is available."""
+
+    def _analysis(self):
+        long_call = OptionContract(
+            option_symbol="AAPL241220C00130000", underlying="AAPL", expiration=datetime(2024, 12, 20),
+            side=OptionSide.CALL, strike=Decimal('130'), bid=Decimal('24.50'), ask=Decimal('25.50'),
+            delta=Decimal('0.80'), iv=Decimal('0.28'), dte=450
+        )
+        short_call = OptionContract(
+            option_symbol="AAPL240315C00155000", underlying="AAPL", expiration=datetime(2024, 3, 15),
+            side=OptionSide.CALL, strike=Decimal('155'), bid=Decimal('2.50'), ask=Decimal('2.70'),
+            delta=Decimal('0.30'), iv=Decimal('0.30'), dte=35
+        )
+        analysis = PMCCAnalysis(
+            long_call=long_call, short_call=short_call,
+            underlying=StockQuote(symbol="AAPL", last=Decimal('150.00'), volume=2_000_000),
+            net_debit=Decimal('23.00'), credit_received=Decimal('2.50'), analyzed_at=datetime.now()
+        )
+        analysis.risk_metrics = analysis.calculate_risk_metrics()
+        return analysis
+
+    def test_simulated_metrics_used(self):
+        """Test VaR, expected shortfall and Sharpe ratio come from the simulation."""
+        calculator = RiskCalculator(MonteCarloSimulator(paths=4000))
+        analysis = self._analysis()
+
+        risk = calculator.calculate_comprehensive_risk(analysis)
+        batch = calculator.calculate_comprehensive_risk_batch([analysis])
+        materialized = calculator.materialize_comprehensive_risk(batch, 0)
+
+        assert risk.expected_shortfall is not None
+        assert risk.expected_shortfall >= risk.var_95
+        assert risk.probability_of_profit is not None
+        assert materialized.var_95 == risk.var_95
+        assert materialized.expected_shortfall == risk.expected_shortfall
+
+    def test_disabled_simulation_falls_back_to_scenarios(self):
+        """Test the scenario estimates are used when simulation is disabled."""
+        calculator = RiskCalculator()
+        calculator.monte_carlo = None
+
+        risk = calculator.calculate_comprehensive_risk(self._analysis())
+
+        assert risk.expected_shortfall is None
+        assert risk.probability_of_profit is None
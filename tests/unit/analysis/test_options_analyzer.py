@@ -2,19 +2,27 @@
 Unit tests for options analyzer functionality.
 """
 
+import numpy as np
 import pytest
 from decimal import Decimal
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+from src.analysis.black_scholes import probability_above, spot_for_call_value
+from src.analysis.iv_surface import IVSurfaceCache
 from src.analysis.options_analyzer import (
-    OptionsAnalyzer, LEAPSCriteria, ShortCallCriteria, PMCCOpportunity
+    OptionsAnalyzer, LEAPSCriteria, ShortCallCriteria, PMCCOpportunity, ScoringWeights,
+    profit_and_touch_probabilities, widest_criteria
 )
 from src.models.api_models import (
     OptionContract, OptionChain, StockQuote, OptionSide, APIResponse, APIStatus
 )
 from src.models.pmcc_models import PMCCAnalysis
 from src.api.marketdata_client import MarketDataClient
+from src.analysis.pmcc_analysis_reporter import PMCCAnalysisReporter
+from src.analysis.risk_calculator import RiskCalculator
+from src.config.settings import AnalysisVerbosity
 
 
 class TestLEAPSCriteria:
@@ -469,4 +477,431 @@ class TestOptionsAnalyzer:
         
         result = self.analyzer.find_pmcc_opportunities("AAPL")
         
-        assert result == []
\ No newline at end of file
+        assert result == []
+
+class TestFusedChainScreen:
+    """Test the single-pass chain screen shared by the analyzer and the reporter."""
+    
+    def setup_method(self):
+        """Set up a chain with several LEAPS and short call candidates."""
+        self.analyzer = OptionsAnalyzer(Mock(spec=MarketDataClient))
+        self.quote = StockQuote(symbol="AAPL", last=Decimal('150.00'))
+        self.leaps_criteria = LEAPSCriteria(min_open_interest=10, max_premium_pct=Decimal('0.50'),
+                                            max_extrinsic_pct=Decimal('0'))
+        self.short_criteria = ShortCallCriteria(min_open_interest=10, min_premium_coverage_ratio=Decimal('0'))
+        make = TestOptionsAnalyzer().create_test_option_contract
+        contracts = [
+            make(f"L{strike}", Decimal(strike), 400, Decimal('0.80'),
+                 bid=Decimal(150 - strike) + Decimal('5.00'), ask=Decimal(150 - strike) + Decimal('5.20'))
+            for strike in (110, 120, 130)
+        ] + [
+            make(f"S{strike}", Decimal(strike), 30, Decimal('0.30'),
+                 bid=Decimal('2.00'), ask=Decimal('2.05'))
+            for strike in (155, 160, 200)
+        ] + [
+            make("OLD", Decimal('120'), 5, Decimal('0.95'))
+        ]
+        self.chain = OptionChain(underlying="AAPL", underlying_price=Decimal('150.00'), contracts=contracts)
+    
+    def test_screen_matches_separate_filters(self):
+        """Test one pass yields the same candidates as the two filters."""
+        leaps, shorts = self.analyzer._screen_option_chain(
+            self.chain, self.leaps_criteria, self.short_criteria, self.quote
+        )
+        
+        assert leaps == self.analyzer._filter_leaps_contracts(self.chain, self.leaps_criteria, self.quote)
+        assert shorts == self.analyzer._filter_short_contracts(self.chain, self.short_criteria, self.quote)
+        assert len(leaps) == 3 and len(shorts) == 3
+    
+    @patch.object(OptionsAnalyzer, '_get_option_chain_with_details')
+    @patch.object(OptionsAnalyzer, '_get_current_quote')
+    def test_report_and_opportunities_share_pair_checks(self, mock_get_quote, mock_get_chain):
+        """Test the report is unchanged and every pair is checked once."""
+        mock_get_quote.return_value = self.quote
+        mock_get_chain.return_value = {"status": "success", "data": self.chain}
+        standalone = PMCCAnalysisReporter(verbosity=AnalysisVerbosity.QUIET).analyze_option_chain_comprehensive(
+            "AAPL", self.chain, self.quote, self.leaps_criteria, self.short_criteria
+        )
+        reporter = self.analyzer.analysis_reporter
+        analyze = reporter.analyze_option_chain_comprehensive
+        reports = []
+        
+        with patch.object(reporter, '_check_pmcc_combination',
+                          wraps=reporter._check_pmcc_combination) as pair_check, \
+             patch.object(reporter, 'analyze_option_chain_comprehensive',
+                          side_effect=lambda *a, **kw: reports.append(analyze(*a, **kw)) or reports[-1]):
+            fused = self.analyzer.find_pmcc_opportunities(
+                "AAPL", self.leaps_criteria, self.short_criteria
+            )
+        report = reports[0]
+        
+        self.analyzer.set_verbosity(AnalysisVerbosity.QUIET)
+        quiet = self.analyzer.find_pmcc_opportunities("AAPL", self.leaps_criteria, self.short_criteria)
+        
+        assert pair_check.call_count == 9
+        assert report.valid_combinations == standalone.valid_combinations == 3
+        assert report.leaps_failure_reasons == standalone.leaps_failure_reasons
+        assert report.short_failure_reasons == standalone.short_failure_reasons
+        assert report.combination_failure_reasons == standalone.combination_failure_reasons
+        assert [(o.leaps_contract.strike, o.short_contract.strike) for o in fused] == \
+            [(o.leaps_contract.strike, o.short_contract.strike) for o in quiet]
+        assert len(fused) == 3
+    
+    def test_short_calls_ranked_by_richness_to_iv_surface(self):
+        """Test a short call quoted above the fitted smile outranks an equal bid."""
+        make = TestOptionsAnalyzer().create_test_option_contract
+        # Quotes outside the short delta window anchor the 30-day smile
+        self.chain.contracts += [
+            make(f"A{strike}", Decimal(strike), 30, Decimal('0.60') if strike < 150 else Decimal('0.10'))
+            for strike in (135, 140, 145, 170, 180, 190, 210)
+        ]
+        for contract in self.chain.contracts:
+            contract.iv = Decimal('0.45') if contract.option_symbol == "S200" else Decimal('0.30')
+            contract.vega = Decimal('0.10')
+        self.analyzer.iv_surface_cache = IVSurfaceCache()
+        
+        _, shorts = self.analyzer._screen_option_chain(
+            self.chain, self.leaps_criteria, self.short_criteria, self.quote
+        )
+        
+        assert [s.option_symbol for s in shorts] == ["S200", "S155", "S160"]
+        assert len(self.analyzer.iv_surface_cache) == 1
+    
+    def test_iv_surface_not_fitted_without_short_candidates(self):
+        """Test the surface is only fitted when short calls are ranked against it."""
+        self.analyzer.iv_surface_cache = IVSurfaceCache()
+        
+        self.analyzer._screen_option_chain(
+            self.chain, self.leaps_criteria, ShortCallCriteria(min_dte=100, max_dte=200), self.quote
+        )
+        
+        assert len(self.analyzer.iv_surface_cache) == 0
+
+
+class TestOptionChainQueryPlanning:
+    """Test criteria-aware option chain query planning."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_provider = Mock(spec=['get_options_chain_for_queries', 'provider_type'])
+        self.analyzer = OptionsAnalyzer(self.mock_provider)
+    
+    def test_plan_splits_non_overlapping_legs(self):
+        """Test LEAPS and short calls get separate targeted queries."""
+        leaps_criteria = LEAPSCriteria()
+        short_criteria = ShortCallCriteria()
+        
+        queries = self.analyzer._plan_option_chain_queries(leaps_criteria, short_criteria, 150.0)
+        
+        assert len(queries) == 2
+        leaps_query, short_query = queries
+        assert (leaps_query.expiration_to - leaps_query.expiration_from).days == 730 - 270
+        assert leaps_query.min_delta == leaps_criteria.min_delta
+        assert leaps_query.max_strike == Decimal('150.0')
+        assert leaps_query.min_strike is None
+        assert leaps_query.min_open_interest == leaps_criteria.min_open_interest
+        assert short_query.min_strike == Decimal('150.0')
+        assert short_query.max_strike is None
+        assert short_query.max_delta == short_criteria.max_delta
+    
+    def test_plan_merges_overlapping_legs(self):
+        """Test overlapping DTE windows collapse into one covering query."""
+        leaps_criteria = LEAPSCriteria(min_dte=40, max_dte=400)
+        short_criteria = ShortCallCriteria(min_dte=21, max_dte=60)
+        
+        queries = self.analyzer._plan_option_chain_queries(leaps_criteria, short_criteria, 150.0)
+        
+        assert len(queries) == 1
+        query = queries[0]
+        assert query.min_delta == short_criteria.min_delta
+        assert query.max_delta == leaps_criteria.max_delta
+        assert query.min_strike is None
+        assert query.max_strike is None
+        assert query.min_open_interest == min(leaps_criteria.min_open_interest,
+                                              short_criteria.min_open_interest)
+    
+    def test_query_marketdata_params(self):
+        """Test query filters map onto MarketData.app chain parameters."""
+        queries = self.analyzer._plan_option_chain_queries(LEAPSCriteria(), ShortCallCriteria(), 150.0)
+        
+        params = queries[0].to_marketdata_params()
+        
+        assert params['delta_range'] == '0.75-0.90'
+        assert params['strike_range'] == '<=150.0'
+        assert params['side'] == 'call'
+        assert params['min_open_interest'] == 100
+    
+    def test_chain_fetch_pushes_queries_to_provider(self):
+        """Test chain fetch hands planned queries to the provider."""
+        chain = OptionChain(underlying="AAPL", contracts=[])
+        self.mock_provider.get_options_chain_for_queries.return_value = APIResponse(
+            status=APIStatus.OK, data=chain
+        )
+        
+        result = self.analyzer._get_option_chain_with_details(
+            "AAPL", 150.0, LEAPSCriteria(), ShortCallCriteria()
+        )
+        
+        symbol, queries = self.mock_provider.get_options_chain_for_queries.call_args.args
+        assert symbol == "AAPL"
+        assert len(queries) == 2
+        assert result["api_calls"] == 2
+        assert result["status"] == "empty_chain"
+    
+    def test_leaps_unavailability_from_expirations(self):
+        """Test the expirations pre-check classifies LEAPS availability."""
+        provider = Mock(spec=['get_option_expirations', 'provider_type'])
+        analyzer = OptionsAnalyzer(provider)
+        today = datetime.now().date()
+        near = (today + timedelta(days=30)).isoformat()
+        far = (today + timedelta(days=400)).isoformat()
+        
+        provider.get_option_expirations.return_value = APIResponse(status=APIStatus.OK, data=[near])
+        assert analyzer.get_leaps_unavailability_reason("AAPL", 270) == "no_leaps"
+        
+        provider.get_option_expirations.return_value = APIResponse(status=APIStatus.OK, data=[near, far])
+        assert analyzer.get_leaps_unavailability_reason("AAPL", 270) is None
+        
+        provider.get_option_expirations.return_value = APIResponse(status=APIStatus.NO_DATA)
+        assert analyzer.get_leaps_unavailability_reason("AAPL", 270) == "no_options"
+    
+    def test_leaps_unavailability_needs_expirations_support(self):
+        """Test providers without expirations support are not asked."""
+        provider = Mock()
+        provider.supports_operation.side_effect = lambda operation: operation != 'get_option_expirations'
+        analyzer = OptionsAnalyzer(provider)
+        
+        assert not analyzer.supports_option_expirations()
+        assert analyzer.get_leaps_unavailability_reason("AAPL", 270) is None
+        provider.get_option_expirations.assert_not_called()
+
+
+class TestFillMissingGreeks:
+    """Test Black-Scholes filling of contracts that arrive without Greeks."""
+    
+    def test_fills_only_missing_values(self):
+        """Test IV is implied from the mid and provider values are kept."""
+        analyzer = OptionsAnalyzer(Mock(spec=MarketDataClient))
+        bare = OptionContract(
+            option_symbol="AAPL250117C00120000", underlying="AAPL", expiration=datetime.now() + timedelta(days=365),
+            side=OptionSide.CALL, strike=Decimal('120'), bid=Decimal('39.00'), ask=Decimal('40.00'), dte=365
+        )
+        partial = OptionContract(
+            option_symbol="AAPL241115C00160000", underlying="AAPL", expiration=datetime.now() + timedelta(days=30),
+            side=OptionSide.CALL, strike=Decimal('160'), mid=Decimal('2.00'), delta=Decimal('0.25'),
+            iv=Decimal('0.30'), dte=30
+        )
+        put = OptionContract(
+            option_symbol="AAPL241115P00140000", underlying="AAPL", expiration=datetime.now() + timedelta(days=30),
+            side=OptionSide.PUT, strike=Decimal('140'), mid=Decimal('2.00'), dte=30
+        )
+        chain = OptionChain(underlying="AAPL", underlying_price=Decimal('150.00'), contracts=[bare, partial, put])
+        
+        filled = analyzer.fill_missing_greeks(chain)
+        
+        assert filled == 2
+        assert Decimal('0.2') < bare.iv < Decimal('0.6')
+        assert Decimal('0.75') < bare.delta < Decimal('1')
+        assert bare.theta < 0 and bare.gamma > 0 and bare.vega > 0
+        assert partial.delta == Decimal('0.25')
+        assert partial.iv == Decimal('0.30')
+        assert partial.gamma is not None
+        assert put.delta is None
+
+
+class TestMultiProfileAnalysis:
+    """Test analyzing several criteria profiles from one chain fetch."""
+    
+    def setup_method(self):
+        """Set up a chain with short calls for a near and a far DTE window."""
+        self.analyzer = OptionsAnalyzer(Mock(spec=MarketDataClient))
+        self.analyzer.set_verbosity(AnalysisVerbosity.QUIET)
+        self.quote = StockQuote(symbol="AAPL", last=Decimal('150.00'))
+        make = TestOptionsAnalyzer().create_test_option_contract
+        contracts = [
+            make("L120", Decimal('120'), 400, Decimal('0.80'), bid=Decimal('31.00'), ask=Decimal('31.20')),
+            make("S160N", Decimal('160'), 30, Decimal('0.30'), bid=Decimal('2.00'), ask=Decimal('2.05')),
+            make("S160F", Decimal('160'), 60, Decimal('0.30'), bid=Decimal('3.00'), ask=Decimal('3.05'))
+        ]
+        self.chain = OptionChain(underlying="AAPL", underlying_price=Decimal('150.00'), contracts=contracts)
+        leaps_criteria = LEAPSCriteria(min_open_interest=10, max_premium_pct=Decimal('0.50'),
+                                       max_extrinsic_pct=Decimal('0'))
+        self.profiles = {
+            "near": (leaps_criteria, ShortCallCriteria(min_open_interest=10, min_dte=21, max_dte=45,
+                                                       min_premium_coverage_ratio=Decimal('0'))),
+            "far": (leaps_criteria, ShortCallCriteria(min_open_interest=10, min_dte=50, max_dte=70,
+                                                      max_delta=Decimal('0.40'),
+                                                      min_premium_coverage_ratio=Decimal('0.5')))
+        }
+    
+    def test_widest_criteria(self):
+        """Test the fetch criteria cover every profile."""
+        near, far = self.profiles["near"][1], self.profiles["far"][1]
+        
+        widest = widest_criteria([near, far, ShortCallCriteria(moneyness="ATM")])
+        leaps = widest_criteria([LEAPSCriteria(), LEAPSCriteria(max_extrinsic_pct=Decimal('0'), min_delta=Decimal('0.6'))])
+        
+        assert (widest.min_dte, widest.max_dte) == (21, 70)
+        assert widest.max_delta == Decimal('0.40')
+        assert widest.min_open_interest == 10
+        assert widest.moneyness == ""
+        assert widest.min_premium_coverage_ratio == Decimal('0')
+        assert leaps.min_delta == Decimal('0.6') and leaps.moneyness == "ITM"
+        assert leaps.max_extrinsic_pct == Decimal('0')
+    
+    @patch.object(OptionsAnalyzer, '_get_option_chain_with_details')
+    @patch.object(OptionsAnalyzer, '_get_current_quote')
+    def test_profiles_share_one_fetch(self, mock_get_quote, mock_get_chain):
+        """Test each profile gets its own opportunities from a single chain fetch."""
+        mock_get_quote.return_value = self.quote
+        mock_get_chain.return_value = {"status": "success", "data": self.chain}
+        
+        far_weights = ScoringWeights(probability=Decimal('0'), liquidity=Decimal('0.5'))
+        
+        by_profile, chain = self.analyzer.find_pmcc_opportunities_for_profiles(
+            "AAPL", self.profiles, {"far": far_weights}
+        )
+        
+        assert mock_get_quote.call_count == 1
+        assert mock_get_chain.call_count == 1
+        fetched_short = mock_get_chain.call_args[0][3]
+        assert (fetched_short.min_dte, fetched_short.max_dte) == (21, 70)
+        assert chain is self.chain
+        assert [o.short_contract.option_symbol for o in by_profile["near"]] == ["S160N"]
+        assert [o.short_contract.option_symbol for o in by_profile["far"]] == ["S160F"]
+        
+        far = by_profile["far"][0]
+        single = self.analyzer.find_pmcc_opportunities("AAPL", *self.profiles["near"])
+        assert single[0].total_score == by_profile["near"][0].total_score
+        assert float(far.total_score) == pytest.approx(float(far_weights.total_scores(
+            far.roi_potential, far.risk_reward_ratio, far.probability_score, far.liquidity_score
+        )))
+        assert self.analyzer.scoring_weights == ScoringWeights()
+
+
+class TestProbabilityModel:
+    """Test the lognormal probability of profit and touch of PMCC combinations."""
+    
+    def setup_method(self):
+        """Set up LEAPS and short calls with and without IV."""
+        self.analyzer = OptionsAnalyzer(Mock(spec=MarketDataClient))
+        self.analyzer.set_verbosity(AnalysisVerbosity.QUIET)
+        self.quote = StockQuote(symbol="AAPL", last=Decimal('150.00'))
+        make = TestOptionsAnalyzer().create_test_option_contract
+        self.leaps = [
+            make("L120", Decimal('120'), 400, Decimal('0.80'), bid=Decimal('34.00'), ask=Decimal('34.40')),
+            make("L130", Decimal('130'), 400, Decimal('0.72'), bid=Decimal('26.00'), ask=Decimal('26.40'))
+        ]
+        self.shorts = [
+            make("S160", Decimal('160'), 35, Decimal('0.30'), bid=Decimal('2.40'), ask=Decimal('2.50')),
+            make("S165", Decimal('165'), 35, Decimal('0.22'), bid=Decimal('1.50'), ask=Decimal('1.60')),
+            make("S170", Decimal('170'), 49, Decimal('0.20'), bid=Decimal('1.40'), ask=Decimal('1.50'))
+        ]
+        self.leaps[0].iv = Decimal('0.28')
+        self.shorts[0].iv = Decimal('0.25')
+        self.shorts[2].iv = Decimal('0.30')
+    
+    def _expected(self, leaps, short):
+        """Probabilities of one pair from its short expiration breakeven and the IV it should use."""
+        iv = short.iv if short.iv is not None else leaps.iv
+        if iv is None:
+            return float('nan'), float('nan')
+        net_debit = leaps.ask - short.bid
+        breakeven = float(leaps.strike + net_debit)
+        if leaps.iv is not None:
+            breakeven = float(spot_for_call_value(float(net_debit), float(leaps.strike),
+                                                  (leaps.dte - short.dte) / 365, 0.05, float(leaps.iv),
+                                                  float(short.strike)))
+        profit, touch = profit_and_touch_probabilities(150.0, breakeven, float(short.strike),
+                                                       short.dte, float(iv))
+        return float(profit), float(touch)
+    
+    def test_matrix_matches_pairs(self):
+        """Test the vectorized matrices equal the pairwise probabilities."""
+        profit, touch = self.analyzer._combination_probabilities(self.leaps, self.shorts, self.quote)
+        
+        assert profit.shape == touch.shape == (2, 3)
+        for i, leaps in enumerate(self.leaps):
+            for j, short in enumerate(self.shorts):
+                expected_profit, expected_touch = self._expected(leaps, short)
+                assert profit[i, j] == pytest.approx(expected_profit, nan_ok=True)
+                assert touch[i, j] == pytest.approx(expected_touch, nan_ok=True)
+        # No IV on either leg
+        assert np.isnan(profit[1, 1])
+        assert 0 < profit[0, 0] < 1
+    
+    def test_probability_score_uses_model(self):
+        """Test opportunities carry the model probabilities and score with them."""
+        opportunity = self.analyzer._analyze_pmcc_combination(self.leaps[0], self.shorts[1], self.quote)
+        expected_profit, expected_touch = self._expected(self.leaps[0], self.shorts[1])
+        without_iv = self.analyzer._analyze_pmcc_combination(self.leaps[1], self.shorts[1], self.quote)
+        
+        assert float(opportunity.probability_of_profit) == pytest.approx(expected_profit, abs=1e-6)
+        assert float(opportunity.probability_of_touch) == pytest.approx(expected_touch, abs=1e-6)
+        assert opportunity.probability_score == Decimal(str(round(expected_profit * 100, 2)))
+        assert without_iv.probability_of_profit is None
+        assert without_iv.probability_score == self.analyzer._calculate_probability_score(
+            self.leaps[1], self.shorts[1], self.quote, without_iv.breakeven
+        )
+    
+    def test_chain_search_populates_probabilities(self):
+        """Test the combination search fills probabilities from one vectorized pass."""
+        chain = OptionChain(underlying="AAPL", underlying_price=Decimal('150.00'),
+                            contracts=self.leaps + self.shorts)
+        leaps_criteria = LEAPSCriteria(min_delta=Decimal('0.70'), min_open_interest=10,
+                                       max_premium_pct=Decimal('0.50'), max_extrinsic_pct=Decimal('0'))
+        short_criteria = ShortCallCriteria(min_open_interest=10, min_delta=Decimal('0.15'),
+                                           min_premium_coverage_ratio=Decimal('0'))
+        
+        with patch.object(self.analyzer, '_combination_probabilities',
+                          wraps=self.analyzer._combination_probabilities) as probabilities:
+            opportunities = self.analyzer._find_opportunities_in_chain(
+                "AAPL", chain, self.quote, leaps_criteria, short_criteria
+            )
+        
+        assert probabilities.call_count == 1
+        assert len(opportunities) > 1
+        for opportunity in opportunities:
+            expected_profit, _ = self._expected(opportunity.leaps_contract, opportunity.short_contract)
+            if np.isnan(expected_profit):
+                assert opportunity.probability_of_profit is None
+            else:
+                assert float(opportunity.probability_of_profit) == pytest.approx(expected_profit, abs=1e-6)
+    
+    def test_breakeven_matches_risk_calculator(self):
+        """Test profit is priced above RiskCalculator's short expiration breakeven."""
+        leaps, short = self.leaps[0], self.shorts[1]
+        analysis = SimpleNamespace(long_call=leaps, short_call=short, underlying=self.quote,
+                                   net_debit=leaps.ask - short.bid)
+        breakeven = RiskCalculator()._short_expiration_breakeven(analysis, Decimal('0.05'))
+        
+        profit, _ = self.analyzer._combination_probabilities([leaps], [short], self.quote)
+        
+        assert breakeven < leaps.strike + analysis.net_debit
+        assert profit[0, 0] == pytest.approx(
+            float(probability_above(150.0, float(breakeven), short.dte / 365, 0.05, float(leaps.iv))), abs=1e-4
+        )
+    
+    def test_no_profit_when_losing_at_short_strike(self):
+        """Test a debit the LEAPS cannot recover by the short strike has zero probability."""
+        self.leaps[0].ask = Decimal('60.00')
+        
+        profit, _ = self.analyzer._combination_probabilities(self.leaps[:1], self.shorts[:1], self.quote)
+        
+        assert profit[0, 0] == 0
+    
+    def test_surface_iv_used(self):
+        """Test the IV surface prices the LEAPS repricing and both probabilities."""
+        surface = Mock()
+        surface.iv.side_effect = lambda strike, dte: np.full(np.broadcast(strike, dte).shape, 0.40)
+        leaps, short = self.leaps[1], self.shorts[1]  # Neither has an IV of its own
+        
+        profit, touch = self.analyzer._combination_probabilities([leaps], [short], self.quote, surface)
+        
+        breakeven = float(spot_for_call_value(float(leaps.ask - short.bid), float(leaps.strike),
+                                              (leaps.dte - short.dte) / 365, 0.05, 0.40, float(short.strike)))
+        expected_profit, expected_touch = profit_and_touch_probabilities(
+            150.0, breakeven, float(short.strike), short.dte, 0.40
+        )
+        assert profit[0, 0] == pytest.approx(float(expected_profit))
+        assert touch[0, 0] == pytest.approx(float(expected_touch))
@@ -0,0 +1,121 @@
+"""
+Unit tests for the options availability negative cache.
+"""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+from src.analysis.options_availability_cache import (
+    OptionsAvailabilityCache, NO_OPTIONS, NO_LEAPS
+)
+from src.analysis.scanner import PMCCScanner, ScanConfiguration, ScanResults
+from src.analysis.stock_screener import StockScreenResult
+from src.models.api_models import StockQuote
+
+
+class TestOptionsAvailabilityCache:
+    """Test OptionsAvailabilityCache persistence and freshness."""
+
+    def test_record_and_persist(self, tmp_path):
+        """Test entries survive a save/load round trip."""
+        cache_file = str(tmp_path / "cache.json")
+        cache = OptionsAvailabilityCache(cache_file)
+        cache.record("abc", NO_OPTIONS)
+        cache.save()
+
+        reloaded = OptionsAvailabilityCache(cache_file)
+
+        assert len(reloaded) == 1
+        assert reloaded.get("ABC").reason == NO_OPTIONS
+        assert reloaded.excluded_reason("ABC") == NO_OPTIONS
+
+    def test_recheck_interval_per_reason(self, tmp_path):
+        """Test entries go stale after their reason's re-check interval."""
+        cache = OptionsAvailabilityCache(str(tmp_path / "cache.json"),
+                                         no_options_recheck_days=7, no_leaps_recheck_days=3)
+        checked = date.today() - timedelta(days=4)
+        cache.record("NOOPT", NO_OPTIONS, checked)
+        cache.record("NOLEAPS", NO_LEAPS, checked)
+
+        assert cache.excluded_reason("NOOPT") == NO_OPTIONS
+        assert cache.excluded_reason("NOLEAPS") is None
+        assert cache.get("NOLEAPS") is not None
+
+    def test_discard(self, tmp_path):
+        """Test discarding a symbol removes it from the cache."""
+        cache = OptionsAvailabilityCache(str(tmp_path / "cache.json"))
+        cache.record("ABC", NO_LEAPS)
+        cache.discard("ABC")
+
+        assert cache.get("ABC") is None
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        """Test an unreadable cache file is ignored."""
+        cache_file = tmp_path / "cache.json"
+        cache_file.write_text("{not json")
+
+        cache = OptionsAvailabilityCache(str(cache_file))
+
+        assert len(cache) == 0
+
+
+class TestScannerOptionsAvailability:
+    """Test the scanner applies the negative cache before options analysis."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.scanner = PMCCScanner(Mock())
+        self.scanner.options_analyzer = Mock()
+
+    def _stock(self, symbol: str) -> StockScreenResult:
+        return StockScreenResult(symbol=symbol, quote=StockQuote(symbol=symbol))
+
+    def test_skips_fresh_and_rechecks_stale(self, tmp_path):
+        """Test fresh entries are skipped and stale ones re-checked via expirations."""
+        cache = OptionsAvailabilityCache(str(tmp_path / "cache.json"))
+        cache.record("FRESH", NO_OPTIONS)
+        cache.record("STALE", NO_LEAPS, date.today() - timedelta(days=10))
+        cache.record("BACK", NO_LEAPS, date.today() - timedelta(days=10))
+        self.scanner.options_analyzer.get_leaps_unavailability_reason.side_effect = (
+            lambda symbol, min_dte: NO_LEAPS if symbol == "STALE" else None
+        )
+        results = ScanResults()
+
+        remaining = self.scanner._skip_unavailable_options(
+            [self._stock(s) for s in ["AAPL", "FRESH", "STALE", "BACK"]],
+            cache, ScanConfiguration(), results
+        )
+
+        assert [r.symbol for r in remaining] == ["AAPL", "BACK"]
+        assert results.options_skipped_unavailable == 2
+        assert cache.excluded_reason("STALE") == NO_LEAPS
+        assert self.scanner.options_analyzer.get_leaps_unavailability_reason.call_count == 2
+
+    def test_records_symbols_without_leaps(self, tmp_path):
+        """Test chain results without LEAPS are confirmed and cached."""
+        cache = OptionsAvailabilityCache(str(tmp_path / "cache.json"))
+        self.scanner.options_analyzer.last_chain_result = {'status': 'empty_chain'}
+        self.scanner.options_analyzer.get_leaps_unavailability_reason.return_value = NO_LEAPS
+
+        self.scanner._update_options_availability("XYZ", cache, ScanConfiguration())
+
+        assert cache.excluded_reason("XYZ") == NO_LEAPS
+
+        self.scanner.options_analyzer.last_chain_result = {'status': 'success', 'leaps_count': 5}
+        self.scanner._update_options_availability("XYZ", cache, ScanConfiguration())
+
+        assert cache.get("XYZ") is None
+
+    def test_no_options_without_expirations_support(self, tmp_path):
+        """Test a chain with no options is cached when expirations cannot be checked."""
+        cache = OptionsAvailabilityCache(str(tmp_path / "cache.json"))
+        self.scanner.options_analyzer.last_chain_result = {'status': 'no_options'}
+        self.scanner.options_analyzer.get_leaps_unavailability_reason.return_value = None
+
+        self.scanner.options_analyzer.supports_option_expirations.return_value = True
+        self.scanner._update_options_availability("XYZ", cache, ScanConfiguration())
+        assert cache.get("XYZ") is None
+
+        self.scanner.options_analyzer.supports_option_expirations.return_value = False
+        self.scanner._update_options_availability("XYZ", cache, ScanConfiguration())
+        assert cache.excluded_reason("XYZ") == NO_OPTIONS
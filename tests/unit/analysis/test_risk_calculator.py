@@ -7,11 +7,12 @@ from decimal import Decimal
 from datetime import datetime, timedelta
 from unittest.mock import Mock
 
+from src.analysis.iv_surface import IVSurfaceCache
 from src.analysis.risk_calculator import (
     RiskCalculator, EarlyAssignmentRisk, PositionSizing, 
-    ScenarioAnalysis, ComprehensiveRisk
+    ScenarioAnalysis, ComprehensiveRisk, BatchRiskMetrics
 )
-from src.models.api_models import OptionContract, StockQuote, OptionSide
+from src.models.api_models import OptionChain, OptionContract, StockQuote, OptionSide
 from src.models.pmcc_models import PMCCAnalysis, RiskMetrics
 
 
@@ -508,4 +509,126 @@ class TestRiskCalculator:
         assert impact['dividend_amount'] == Decimal('1.00')
         assert impact['early_assignment_likely'] is False
         assert len(impact['recommendations']) > 0
-        assert any("monitor" in rec.lower() for rec in impact['recommendations'])
\ No newline at end of file
+        assert any("monitor" in rec.lower() for rec in impact['recommendations'])
+
+
+class TestBatchComprehensiveRisk:
+    """Test the vectorized batch risk API against the per-position calculation."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calculator = RiskCalculator()
+    
+    def _analyses(self):
+        analyses = []
+        for price, short_dte in [('150.00', 35), ('166.00', 5), ('140.00', 10)]:
+            analysis = TestRiskCalculator().create_test_pmcc_analysis()
+            analysis.underlying.last = Decimal(price)
+            analysis.short_call.dte = short_dte
+            analyses.append(analysis)
+        return analyses
+    
+    def test_batch_matches_single_calculation(self):
+        """Test every materialized metric equals the scalar result."""
+        analyses = self._analyses()
+        account_size = Decimal('50000')
+        
+        batch = self.calculator.calculate_comprehensive_risk_batch(analyses, account_size)
+        
+        assert isinstance(batch, BatchRiskMetrics)
+        assert batch.scenario_pnl.shape == (3, len(RiskCalculator.PRICE_SCENARIOS))
+        for i, analysis in enumerate(analyses):
+            expected = self.calculator.calculate_comprehensive_risk(analysis, account_size)
+            actual = self.calculator.materialize_comprehensive_risk(batch, batch.index_of(analysis))
+            
+            assert float(batch.early_assignment_probability[i]) == pytest.approx(
+                float(expected.early_assignment.probability))
+            assert actual.early_assignment.risk_level == expected.early_assignment.risk_level
+            assert actual.position_sizing.recommended_size == expected.position_sizing.recommended_size
+            assert actual.position_sizing.capital_required == expected.position_sizing.capital_required
+            for name, scenario in expected.scenario_analysis.scenarios.items():
+                assert actual.scenario_analysis.scenarios[name]['pnl'] == pytest.approx(scenario['pnl'])
+                assert actual.scenario_analysis.scenarios[name]['roi'] == pytest.approx(scenario['roi'])
+            assert actual.scenario_analysis.best_case['move_pct'] == expected.scenario_analysis.best_case['move_pct']
+            assert actual.scenario_analysis.worst_case['move_pct'] == expected.scenario_analysis.worst_case['move_pct']
+            assert actual.var_95 == pytest.approx(expected.var_95)
+            assert actual.expected_shortfall == expected.expected_shortfall
+            assert float(actual.sharpe_ratio) == pytest.approx(float(expected.sharpe_ratio))
+            assert actual.theta_decay_rate == pytest.approx(expected.theta_decay_rate)
+            assert actual.vega_risk == pytest.approx(expected.vega_risk)
+    
+    def test_missing_price_has_no_scenarios(self):
+        """Test rows without an underlying price get empty scenarios and no VaR."""
+        analysis = TestRiskCalculator().create_test_pmcc_analysis()
+        analysis.underlying.last = None
+        
+        batch = self.calculator.calculate_comprehensive_risk_batch([analysis])
+        risk = self.calculator.materialize_comprehensive_risk(batch, 0)
+        
+        assert not batch.has_scenarios[0]
+        assert risk.scenario_analysis.scenarios == {}
+        assert risk.var_95 is None
+
+
+class TestLeapsValuation:
+    """Test LEAPS extrinsic value is kept at short expiration when IV is known."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calculator = RiskCalculator()
+        self.analysis = TestRiskCalculator().create_test_pmcc_analysis()
+        self.analysis.long_call.iv = Decimal('0.30')
+    
+    def test_pnl_includes_leaps_time_value(self):
+        """Test P&L exceeds the intrinsic-only value and matches the batch."""
+        pnl = self.calculator._calculate_pnl_at_expiration(self.analysis, Decimal('150.00'))
+        batch = self.calculator.calculate_comprehensive_risk_batch([self.analysis])
+        
+        # Intrinsic-only P&L would be 20 - 0 - 23 = -3
+        assert pnl > Decimal('-3')
+        flat = list(RiskCalculator.PRICE_SCENARIOS).index('flat')
+        assert float(batch.scenario_pnl[0, flat]) == pytest.approx(float(pnl))
+    
+    def test_short_expiration_breakeven(self):
+        """Test the Black-Scholes breakeven lies below the static breakeven and breaks even."""
+        breakevens = self.calculator.calculate_breakeven_analysis(self.analysis)
+        
+        breakeven = breakevens['short_expiration_breakeven']
+        assert breakeven < breakevens['static_breakeven']
+        assert breakevens['theta_adjusted_breakeven'] is None
+        assert abs(self.calculator._calculate_pnl_at_expiration(self.analysis, breakeven)) < Decimal('0.05')
+    
+    def test_leaps_repriced_off_iv_surface(self):
+        """Test a cached surface supplies the LEAPS IV at its remaining DTE."""
+        contracts = [
+            OptionContract(
+                option_symbol=f"AAPL{dte}C{strike}", underlying="AAPL",
+                expiration=datetime.now() + timedelta(days=dte), side=OptionSide.CALL,
+                strike=Decimal(strike), iv=Decimal('0.45'), dte=dte
+            )
+            for dte in (35, 400) for strike in range(110, 200, 10)
+        ]
+        cache = IVSurfaceCache()
+        cache.get_or_build(OptionChain(underlying="AAPL", underlying_price=Decimal('150'), contracts=contracts))
+        without_surface = self.calculator._calculate_pnl_at_expiration(self.analysis, Decimal('150.00'))
+        breakeven = self.calculator.calculate_breakeven_analysis(self.analysis)['short_expiration_breakeven']
+        
+        self.calculator.iv_surface_cache = cache
+        pnl = self.calculator._calculate_pnl_at_expiration(self.analysis, Decimal('150.00'))
+        batch = self.calculator.calculate_comprehensive_risk_batch([self.analysis])
+        
+        assert self.calculator._leaps_repricing_iv(self.analysis) == pytest.approx(0.45)
+        assert pnl > without_surface
+        flat = list(RiskCalculator.PRICE_SCENARIOS).index('flat')
+        assert float(batch.scenario_pnl[0, flat]) == pytest.approx(float(pnl))
+        assert self.calculator.calculate_breakeven_analysis(self.analysis)['short_expiration_breakeven'] < breakeven
+    
+    def test_breakeven_keys_stable_without_leaps_iv(self):
+        """Test the same keys come back when the model breakeven cannot be computed."""
+        with_iv = self.calculator.calculate_breakeven_analysis(self.analysis)
+        self.analysis.long_call.iv = None
+        without_iv = self.calculator.calculate_breakeven_analysis(self.analysis)
+        
+        assert without_iv.keys() == with_iv.keys()
+        assert without_iv['short_expiration_breakeven'] is None
+        assert without_iv['static_breakeven'] == with_iv['static_breakeven']
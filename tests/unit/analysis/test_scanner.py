@@ -5,15 +5,16 @@ Unit tests for PMCC scanner orchestrator.
 import pytest
 from decimal import Decimal
 from datetime import datetime
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.analysis.scanner import (
     PMCCScanner, ScanConfiguration, ScanResults
 )
 from src.analysis.stock_screener import StockScreenResult
-from src.analysis.options_analyzer import PMCCOpportunity
+from src.analysis.options_analyzer import PMCCOpportunity, ScoringWeights, ShortCallCriteria
 from src.models.pmcc_models import PMCCCandidate, PMCCAnalysis
-from src.models.api_models import StockQuote, OptionContract, OptionSide
+from src.models.api_models import StockQuote, OptionContract, OptionSide, OptionChain, APIResponse, APIStatus
 from src.api.marketdata_client import MarketDataClient
 
 
@@ -225,8 +226,9 @@ class TestPMCCScanner:
     @patch.object(PMCCScanner, '_calculate_risk_metrics')
     @patch.object(PMCCScanner, '_rank_and_filter')
     def test_scan_complete_workflow(self, mock_rank, mock_calc_risk, 
-                                   mock_analyze_options, mock_screen_stocks):
+                                   mock_analyze_options, mock_screen_stocks, tmp_path, monkeypatch):
         """Test complete scan workflow."""
+        monkeypatch.chdir(tmp_path)  # Exports go to ./data
         # Mock the workflow steps
         stock_results = [
             self.create_test_stock_result("AAPL"),
@@ -555,4 +557,316 @@ class TestPMCCScanner:
         
         result = self.scanner.scan_symbol("INVALID")
         
-        assert result == []
\ No newline at end of file
+        assert result == []
+
+class TestBatchRiskMetrics:
+    """Test comprehensive risk is batched and only materialized for final candidates."""
+
+    def test_only_final_candidates_materialized(self):
+        """Test risk arrays cover every candidate but objects only the final ones."""
+        scanner = PMCCScanner(Mock())
+        opportunities = [TestPMCCScanner().create_test_opportunity(s) for s in ["AAA", "BBB", "CCC"]]
+
+        candidates = scanner._calculate_risk_metrics(opportunities, ScanConfiguration(), ScanResults())
+        scanner._attach_comprehensive_risk(candidates[:1])
+
+        assert len(scanner.last_risk_batch) == 3
+        assert candidates[0].comprehensive_risk.position_sizing.recommended_size >= 1
+        assert candidates[1].comprehensive_risk is None
+        assert candidates[2].comprehensive_risk is None
+
+
+class TestIVSurfaceWiring:
+    """Test the IV surface cache reaches the components that read it."""
+
+    def test_screener_fits_surfaces_only_with_iv_history(self, tmp_path):
+        """Test the analyzer and risk calculator always share the cache, the screener only for IV rank."""
+        scanner = PMCCScanner(Mock())
+        scanner._initialize_options_analyzer(ScanConfiguration())
+
+        scanner._attach_iv_surface_cache(ScanConfiguration(iv_history_enabled=False))
+
+        assert scanner.stock_screener.iv_surface_cache is None
+        assert scanner.options_analyzer.iv_surface_cache is scanner.iv_surface_cache
+        assert scanner.risk_calculator.iv_surface_cache is scanner.iv_surface_cache
+
+        scanner._attach_iv_surface_cache(ScanConfiguration(
+            iv_history_enabled=True, iv_history_file=str(tmp_path / "iv_history.json")
+        ))
+
+        assert scanner.stock_screener.iv_surface_cache is scanner.iv_surface_cache
+        assert scanner.risk_calculator.iv_surface_cache is scanner.iv_surface_cache
+
+    def test_analyzer_uses_configured_risk_free_rate(self):
+        """Test the scan's risk-free rate reaches the options analyzer."""
+        scanner = PMCCScanner(Mock())
+
+        scanner._initialize_options_analyzer(ScanConfiguration(risk_free_rate=Decimal('0.0325')))
+
+        assert scanner.options_analyzer.risk_free_rate == Decimal('0.0325')
+
+    def test_second_scan_refits_surfaces(self):
+        """Test a later scan on the same trading date does not reuse an earlier scan's fit."""
+        scanner = PMCCScanner(Mock())
+        chain = OptionChain(underlying="AAPL", underlying_price=Decimal('100'))
+        surface = Mock(atm_iv=Mock(return_value=0.3))
+        fitted = []
+
+        def screen(config, results):
+            fitted.append(scanner.iv_surface_cache.get_or_build(chain))
+            return []
+
+        with patch.object(scanner, '_initialize_options_analyzer'), \
+                patch.object(scanner, 'options_analyzer', Mock(), create=True), \
+                patch.object(scanner, '_screen_stocks', side_effect=screen), \
+                patch('src.analysis.iv_surface.IVSurface.from_chain', return_value=surface) as fit:
+            scanner.scan(ScanConfiguration(iv_history_enabled=False))
+            scanner.scan(ScanConfiguration(iv_history_enabled=False))
+
+        assert fit.call_count == 2
+        assert fitted == [surface, surface]
+
+
+class TestClaudePrefilter:
+    """Test opportunities that cannot reach min_combined_score skip Claude."""
+
+    def test_unreachable_opportunities_skipped(self):
+        """Test the perfect-AI upper bound decides who is sent to Claude."""
+        scanner = PMCCScanner(Mock())
+        opportunities = [Mock(symbol=s, total_score=Decimal(score))
+                         for s, score in [("HIGH", 80), ("EDGE", 50), ("LOW", 49)]]
+        results = ScanResults()
+
+        remaining = scanner._prefilter_for_claude(
+            opportunities, ScanConfiguration(min_combined_score=70.0), results
+        )
+
+        assert [o.symbol for o in remaining] == ["HIGH", "EDGE"]
+        assert results.claude_prefilter_skipped == 1
+
+    def test_bound_uses_configured_weights(self):
+        """Test a profile's own score weights decide the bound, not the global settings."""
+        scanner = PMCCScanner(Mock())
+        opportunities = [Mock(symbol=s, total_score=Decimal(score)) for s, score in [("HIGH", 80), ("EDGE", 50)]]
+        config = ScanConfiguration(min_combined_score=70.0, traditional_pmcc_weight=0.8, ai_analysis_weight=0.2)
+
+        remaining = scanner._prefilter_for_claude(opportunities, config, ScanResults())
+
+        assert [o.symbol for o in remaining] == ["HIGH"]
+
+
+class TestEnhancedDataIndex:
+    """Test enhanced data is collected and converted once per symbol."""
+
+    def test_duplicate_symbols_collected_once(self):
+        """Test several opportunities on one symbol trigger one collection."""
+        scanner = PMCCScanner(Mock())
+        scanner.enhanced_eodhd_provider = Mock()
+        scanner.enhanced_eodhd_provider.get_comprehensive_enhanced_data.return_value = Mock(
+            is_success=True, data={'fundamentals': {'pe_ratio': 20}}
+        )
+        opportunities = [Mock(symbol=s, analysis=None) for s in ["AAA", "AAA", "BBB"]]
+
+        scanner._perform_enhanced_analysis(
+            opportunities, ScanConfiguration(claude_analysis_enabled=False), ScanResults()
+        )
+
+        calls = scanner.enhanced_eodhd_provider.get_comprehensive_enhanced_data.call_args_list
+        assert [c.args[0] for c in calls] == ["AAA", "BBB"]
+
+    def test_conversion_memoized_per_data_object(self):
+        """Test the Claude dict is reused until the symbol's data changes."""
+        scanner = PMCCScanner(Mock())
+        data = {'fundamentals': {'pe_ratio': 20}}
+
+        with patch.object(scanner, '_enhanced_stock_data_to_dict',
+                          wraps=scanner._enhanced_stock_data_to_dict) as convert:
+            first = scanner._get_enhanced_stock_dict("AAA", data)
+            assert scanner._get_enhanced_stock_dict("AAA", data) is first
+            scanner._get_enhanced_stock_dict("AAA", dict(data))
+
+        assert convert.call_count == 2
+
+    def test_memo_scoped_to_scan(self):
+        """Test a scan starts without and leaves behind no converted data."""
+        scanner = PMCCScanner(Mock())
+        scanner._get_enhanced_stock_dict("AAA", {'fundamentals': {'pe_ratio': 20}})
+        seen = {}
+
+        def screen(config, results):
+            seen['memo'] = dict(scanner._enhanced_dicts)
+            scanner._get_enhanced_stock_dict("BBB", {'fundamentals': {'pe_ratio': 15}})
+            return []
+
+        with patch.object(scanner, '_initialize_options_analyzer'), \
+                patch.object(scanner, '_attach_iv_surface_cache'), \
+                patch.object(scanner, 'options_analyzer', Mock(), create=True), \
+                patch.object(scanner, '_screen_stocks', side_effect=screen):
+            scanner.scan(ScanConfiguration())
+
+        assert seen['memo'] == {}
+        assert scanner._enhanced_dicts == {}
+
+
+class TestFilterFunnel:
+    """Test per-symbol filter funnel stats for symbols without opportunities."""
+
+    def _call(self, strike, dte, delta, oi=500, bid="10.00", ask="10.20"):
+        return OptionContract(
+            option_symbol=f"AAPL{strike}{dte}", underlying="AAPL", expiration=datetime.now(),
+            side=OptionSide.CALL, strike=Decimal(strike), bid=Decimal(bid), ask=Decimal(ask),
+            delta=Decimal(delta), open_interest=oi, dte=dte, underlying_price=Decimal("150")
+        )
+
+    def test_cumulative_stages_counted(self):
+        """Test each stage counts calls passing it and every earlier stage."""
+        chain = OptionChain(underlying="AAPL", underlying_price=Decimal("150"), contracts=[
+            self._call("120", 400, "0.80"),
+            self._call("125", 400, "0.80", ask="40.00"),
+            self._call("130", 400, "0.60"),
+            self._call("140", 400, "0.80", oi=1),
+            self._call("160", 30, "0.30", bid="1.00", ask="1.05"),
+            self._call("170", 30, "0.10"),
+            self._call("150", 5, "0.50")
+        ])
+        config = ScanConfiguration()
+
+        funnel = PMCCScanner(Mock())._compute_filter_funnel(chain, config)
+
+        assert funnel['total_calls'] == 7
+        assert funnel['leaps_in_dte_range'] == 4
+        assert funnel['leaps_with_delta'] == 3
+        assert funnel['leaps_itm_and_delta'] == 3
+        assert funnel['leaps_pass_basic_filters'] == 2
+        assert funnel['leaps_pass_premium_filter'] == 1
+        assert funnel['short_in_dte_range'] == 2
+        assert funnel['short_otm'] == 2
+        assert funnel['short_pass_basic_filters'] == 1
+
+    def test_funnel_stored_not_printed(self, capsys, tmp_path, monkeypatch):
+        """Test a symbol with no opportunities gets its funnel in the results."""
+        monkeypatch.chdir(tmp_path)  # The complete option chains are exported to ./data
+        scanner = PMCCScanner(Mock())
+        chain = OptionChain(underlying="AAPL", underlying_price=None,
+                            contracts=[self._call("120", 400, "0.80")])
+        scanner.options_analyzer = Mock()
+        scanner.options_analyzer.find_pmcc_opportunities.return_value = ([], chain)
+        results = ScanResults()
+
+        scanner._analyze_options([Mock(symbol="AAPL")], ScanConfiguration(), results)
+
+        assert results.option_filter_funnels["AAPL"]['leaps_in_dte_range'] == 1
+        assert results.option_filter_funnels["AAPL"]['leaps_pass_premium_filter'] is None
+        assert results.to_dict()['option_filter_funnels'] == results.option_filter_funnels
+        assert "LEAPS with OI" not in capsys.readouterr().out
+
+
+class TestScanProfiles:
+    """Test several scan profiles sharing one screening and chain fetch."""
+
+    def _opportunity(self, symbol, score):
+        leaps = OptionContract(option_symbol=f"{symbol}L", underlying=symbol, side=OptionSide.CALL,
+                               expiration=datetime(2027, 1, 15), strike=Decimal('120'),
+                               bid=Decimal('31.00'), ask=Decimal('31.20'), delta=Decimal('0.80'), dte=400)
+        short = OptionContract(option_symbol=f"{symbol}S", underlying=symbol, side=OptionSide.CALL,
+                               expiration=datetime(2026, 1, 16), strike=Decimal('160'),
+                               bid=Decimal('2.00'), ask=Decimal('2.05'), delta=Decimal('0.30'), dte=30)
+        return PMCCOpportunity(
+            leaps_contract=leaps, short_contract=short,
+            underlying_quote=StockQuote(symbol=symbol, last=Decimal('150.00')),
+            net_debit=Decimal('29.20'), max_profit=Decimal('10.80'), max_loss=Decimal('29.20'),
+            breakeven=Decimal('149.20'), roi_potential=Decimal('37'), risk_reward_ratio=Decimal('0.37'),
+            probability_score=Decimal('70'), liquidity_score=Decimal('80'), total_score=Decimal(score),
+            analyzed_at=datetime.now()
+        )
+
+    def test_profiles_share_fetch_and_rank_independently(self, tmp_path):
+        """Test each symbol is fetched once and each profile gets its own results."""
+        scanner = PMCCScanner(Mock())
+        scanner.options_analyzer = Mock()
+        scanner.options_analyzer.find_pmcc_opportunities_for_profiles.side_effect = lambda symbol, criteria, weights, **kwargs: (
+            {"conservative": [self._opportunity(symbol, '75')],
+             "aggressive": [self._opportunity(symbol, '75'), self._opportunity(symbol, '65')]},
+            OptionChain(underlying=symbol, underlying_price=Decimal('150.00'))
+        )
+        store_file = str(tmp_path / "candidates.npz")
+        profiles = {
+            "conservative": ScanConfiguration(
+                short_criteria=ShortCallCriteria(min_dte=30, max_dte=45), min_total_score=Decimal('70'),
+                perform_scenario_analysis=False, candidate_store_enabled=True, candidate_store_file=store_file
+            ),
+            "aggressive": ScanConfiguration(
+                short_criteria=ShortCallCriteria(min_dte=14, max_dte=30), min_total_score=Decimal('60'),
+                best_per_symbol_only=False, perform_scenario_analysis=False,
+                candidate_store_enabled=True, candidate_store_file=store_file,
+                scoring_weights=ScoringWeights(liquidity=Decimal('0.4'))
+            )
+        }
+        screened = [StockScreenResult(symbol=s, quote=StockQuote(symbol=s, last=Decimal('150.00')))
+                    for s in ("AAPL", "MSFT")]
+
+        with patch.object(scanner, '_initialize_options_analyzer'), \
+             patch.object(scanner, '_screen_stocks', return_value=screened) as screen, \
+             patch.object(scanner, '_initialize_enhanced_workflow', return_value=False), \
+             patch.object(scanner, 'export_complete_option_chains'), \
+             patch.object(scanner, 'export_results', return_value="file") as export:
+            results = scanner.scan_profiles(profiles)
+
+        find = scanner.options_analyzer.find_pmcc_opportunities_for_profiles
+        assert screen.call_count == 1
+        assert [c.args[0] for c in find.call_args_list] == ["AAPL", "MSFT"]
+        criteria = find.call_args_list[0].args[1]
+        assert criteria["aggressive"][1].min_dte == 14
+        assert find.call_args_list[0].args[2]["aggressive"].liquidity == Decimal('0.4')
+        assert list(results) == ["conservative", "aggressive"]
+        assert results["conservative"].opportunities_found == 2
+        assert len(results["conservative"].top_opportunities) == 2
+        assert results["aggressive"].opportunities_found == 4
+        assert len(results["aggressive"].top_opportunities) == 4
+        assert results["aggressive"].configuration.leaps_criteria is None
+        assert results["aggressive"].scan_id.endswith("_aggressive")
+        assert results["aggressive"].stocks_passed_screening == results["conservative"].stocks_passed_screening
+        assert set(results["conservative"].analyzed_option_chains) == {"AAPL", "MSFT"}
+        assert results["conservative"].analyzed_option_chains is not results["aggressive"].analyzed_option_chains
+        assert results["conservative"].screening_results is not results["aggressive"].screening_results
+        assert (tmp_path / "candidates_conservative.npz").exists()
+        assert (tmp_path / "candidates_aggressive.npz").exists()
+        assert sorted(c.kwargs['filename'] for c in export.call_args_list)[0].startswith("pmcc_scan_aggressive_")
+
+    def test_claude_analysis_shared_by_fingerprint(self, tmp_path, monkeypatch):
+        """Test a later profile reuses Claude results of identical opportunities only."""
+        monkeypatch.chdir(tmp_path)  # Claude submissions are saved to ./data
+        scanner = PMCCScanner(Mock())
+        scanner.enhanced_eodhd_provider = Mock()
+        scanner.enhanced_eodhd_provider.get_comprehensive_enhanced_data.return_value = Mock(
+            is_success=True, data={'fundamentals': {'pe_ratio': 20}}
+        )
+        scanner.claude_client = Mock()
+        scanner.claude_client.analyze_single_opportunity = AsyncMock(
+            return_value=APIResponse(status=APIStatus.OK, data={'pmcc_score': 80})
+        )
+        config = ScanConfiguration(claude_analysis_enabled=True, claude_prefilter_enabled=False,
+                                   claude_batch_enabled=False, ai_analysis_reuse_enabled=False)
+
+        def candidate(symbol, net_debit):
+            return Mock(symbol=symbol, underlying_price=Decimal('150'), total_score=Decimal('75'),
+                        liquidity_score=Decimal('80'),
+                        analysis=SimpleNamespace(long_call=None, short_call=None, net_debit=net_debit))
+
+        scanner._shared_claude_results = {}
+        scanner._perform_enhanced_analysis([candidate("AAPL", 29)], config, ScanResults())
+        results = ScanResults()
+        scanner._perform_enhanced_analysis(
+            [candidate("AAPL", 29), candidate("MSFT", 29)], config, results
+        )
+        scanner._perform_enhanced_analysis([candidate("AAPL", 35)], config, ScanResults())
+
+        analyzed = [c.args[0]['symbol'] for c in scanner.claude_client.analyze_single_opportunity.call_args_list]
+        assert analyzed == ["AAPL", "MSFT", "AAPL"]
+        assert results.claude_analyses_reused == 1
+        assert len(scanner._shared_claude_results) == 3
+
+    def test_empty_profiles_rejected(self):
+        """Test a profile scan needs at least one profile."""
+        with pytest.raises(ValueError):
+            PMCCScanner(Mock()).scan_profiles({})
@@ -350,6 +350,30 @@ class TestStockScreener:
         """Test screening empty symbol list."""
         results = self.screener.screen_symbols([])
         assert results == []
+
+    @patch.object(StockScreener, '_screen_single_symbol')
+    def test_screen_symbols_prefetches_eodhd_quotes(self, mock_screen_single):
+        """Test EODHD quotes are fetched in bulk and handed to each symbol."""
+        quote = StockQuote(symbol="AAPL", last=Decimal('150'), volume=1_000_000)
+        sync_client = Mock()
+        sync_client.get_stock_quotes_eod_bulk.return_value = APIResponse(
+            status=APIStatus.OK, data={"AAPL": quote}
+        )
+        self.screener.eodhd_client = Mock()
+        self.screener.sync_eodhd_client = sync_client
+        mock_screen_single.return_value = None
+
+        self.screener.screen_symbols(["AAPL", "MSFT"], quote_source="eodhd")
+
+        sync_client.get_stock_quotes_eod_bulk.assert_called_once_with(["AAPL", "MSFT"])
+        assert mock_screen_single.call_args_list[0].kwargs['quote'] is quote
+        assert mock_screen_single.call_args_list[1].kwargs['quote'] is None
+
+    def test_screen_symbols_skips_prefetch_for_marketdata(self):
+        """Test no bulk EODHD fetch happens when MarketData serves quotes."""
+        self.screener.eodhd_client = Mock()
+
+        assert self.screener._prefetch_eodhd_quotes(["AAPL"], "marketdata") == {}
     
     @patch.object(StockScreener, 'screen_symbols')
     @patch.object(StockScreener, '_get_universe_symbols')
@@ -369,4 +393,34 @@ class TestStockScreener:
         mock_get_universe.assert_called_once_with("SP500")
         mock_screen_symbols.assert_called_once()
         assert len(results) == 1
-        assert results[0].symbol == "AAPL"
\ No newline at end of file
+        assert results[0].symbol == "AAPL"
+
+class TestScreenerIVRank:
+    """Test IV rank comes from the IV surface of the fetched option chain."""
+    
+    def test_iv_rank_from_surface_cache(self):
+        """Test the screened chain is fitted and its ATM IV ranked against history."""
+        from datetime import date, timedelta
+        from src.analysis.iv_surface import IVSurfaceCache
+        from src.models.api_models import OptionChain, OptionContract, OptionSide
+        
+        contracts = [
+            OptionContract(option_symbol=f"AAPL30C{strike}", underlying="AAPL",
+                           expiration=datetime.now() + timedelta(days=30), side=OptionSide.CALL,
+                           strike=Decimal(strike), iv=Decimal('0.30'), dte=30)
+            for strike in (140, 150, 160)
+        ]
+        chain = OptionChain(underlying="AAPL", underlying_price=Decimal('150'), contracts=contracts)
+        api_client = Mock()
+        api_client.get_option_chain.return_value = APIResponse(status=APIStatus.OK, data=chain)
+        cache = IVSurfaceCache(min_observations=3)
+        cache.record_atm_iv("AAPL", 0.20, date.today() - timedelta(days=2))
+        cache.record_atm_iv("AAPL", 0.40, date.today() - timedelta(days=1))
+        screener = StockScreener(api_client, iv_surface_cache=cache)
+        
+        market_data = screener._get_market_data(
+            "AAPL", quote=StockQuote(symbol="AAPL", last=Decimal('150'), volume=1_000_000)
+        )
+        
+        assert market_data['iv_rank'] == Decimal('50.0')
+        assert cache.get("AAPL") is not None
@@ -0,0 +1,406 @@
+"""
+Unit tests for Claude API client.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from anthropic.types import Message
+
+from src.api.claude_client import (
+    ClaudeClient, MIN_CACHEABLE_PROMPT_TOKENS, PMCC_ANALYST_SYSTEM_PROMPT, estimate_usage_cost
+)
+from src.api.claude_response_cache import ClaudeResponseCache
+from src.api.prompt_compaction import DEFAULT_SECTION_BUDGET, estimate_tokens
+from src.api.streaming_json import StreamingJSONObject
+
+
+def _message(text: str = '{"ok": true}') -> Message:
+    return Message.model_validate({
+        'id': 'msg_test',
+        'type': 'message',
+        'role': 'assistant',
+        'model': 'claude-test',
+        'content': [{'type': 'text', 'text': text}],
+        'stop_reason': 'end_turn',
+        'stop_sequence': None,
+        'usage': {'input_tokens': 1200, 'output_tokens': 300}
+    })
+
+
+class TestClaudeResponseCache:
+    """Test persistent Claude response cache."""
+
+    def test_key_covers_request_parameters(self):
+        """Test any change to model, sampling or prompt changes the key."""
+        base = ClaudeResponseCache.make_key("m", 0.1, 4000, "prompt")
+
+        assert base == ClaudeResponseCache.make_key("m", 0.1, 4000, "prompt")
+        assert base != ClaudeResponseCache.make_key("m2", 0.1, 4000, "prompt")
+        assert base != ClaudeResponseCache.make_key("m", 0.2, 4000, "prompt")
+        assert base != ClaudeResponseCache.make_key("m", 0.1, 2000, "prompt")
+        assert base != ClaudeResponseCache.make_key("m", 0.1, 4000, "prompt ")
+
+    def test_persist_ttl_and_eviction(self, tmp_path):
+        """Test entries persist, expire and are evicted least recently used first."""
+        cache_file = str(tmp_path / "responses.json")
+        cache = ClaudeResponseCache(cache_file, ttl_hours=1, max_entries=2)
+        cache.put("a", {'v': 1})
+        cache.put("b", {'v': 2})
+        cache._entries["a"]['last_used'] += 10
+        cache.put("c", {'v': 3})
+        cache.save()
+
+        reloaded = ClaudeResponseCache(cache_file, ttl_hours=1, max_entries=2)
+        assert reloaded.get("a") == {'v': 1}
+        assert reloaded.get("b") is None
+        assert reloaded.get("c") == {'v': 3}
+
+        reloaded._entries["a"]['stored_at'] -= 3600
+        assert reloaded.get("a") is None
+
+    def test_put_defers_write_until_save(self, tmp_path):
+        """Test inserts stay in memory and unchanged caches are not rewritten."""
+        cache_file = tmp_path / "responses.json"
+        cache = ClaudeResponseCache(str(cache_file))
+        cache.put("a", {'v': 1})
+        cache.put("b", {'v': 2})
+
+        assert not cache_file.exists()
+
+        cache.save()
+        assert len(ClaudeResponseCache(str(cache_file))) == 2
+
+        cache_file.write_text('{"responses": {}}')
+        cache.save()
+
+        assert cache_file.read_text() == '{"responses": {}}'
+
+
+class TestClaudeClientResponseCache:
+    """Test ClaudeClient serving repeated prompts from the cache."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_request_and_spend(self, tmp_path):
+        """Test an identical prompt is answered from cache without cost."""
+        cache = ClaudeResponseCache(str(tmp_path / "responses.json"))
+        client = ClaudeClient(api_key="test_key", response_cache=cache, max_retries=0)
+        client.client.messages.create = AsyncMock(return_value=_message())
+
+        first = await client._execute_with_retry("same prompt")
+        client._update_stats(first, success=True)
+        second = await client._execute_with_retry("same prompt")
+        client._update_stats(second, success=True)
+
+        stats = client.get_stats()
+        assert client.client.messages.create.await_count == 1
+        assert second.content[0].text == '{"ok": true}'
+        assert second.usage.input_tokens == 0
+        assert stats['cache_hits'] == 1
+        assert stats['cache_misses'] == 1
+        assert stats['cache_hit_rate'] == 0.5
+        assert stats['total_input_tokens'] == 1200
+
+    @pytest.mark.asyncio
+    async def test_close_persists_cached_responses(self, tmp_path):
+        """Test responses cached during a run are written once the client closes."""
+        cache_file = str(tmp_path / "responses.json")
+        client = ClaudeClient(api_key="test_key", response_cache=ClaudeResponseCache(cache_file),
+                              max_retries=0)
+        client.client.messages.create = AsyncMock(return_value=_message())
+
+        await client._execute_with_retry("prompt")
+        await client.close()
+
+        assert len(ClaudeResponseCache(cache_file)) == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_response_not_cached(self, tmp_path):
+        """Test responses cut off at max_tokens are not replayed."""
+        cache = ClaudeResponseCache(str(tmp_path / "responses.json"))
+        client = ClaudeClient(api_key="test_key", response_cache=cache, max_retries=0)
+        truncated = _message()
+        truncated.stop_reason = 'max_tokens'
+        client.client.messages.create = AsyncMock(return_value=truncated)
+
+        await client._execute_with_retry("prompt")
+        await client._execute_with_retry("prompt")
+
+        assert client.client.messages.create.await_count == 2
+        assert len(cache) == 0
+
+
+class TestSingleOpportunityPromptCompaction:
+    """Test the single-opportunity prompt stays within its data budget."""
+
+    def test_long_news_and_history_compacted(self):
+        """Test oversized inputs are reduced and the token counts reported."""
+        client = ClaudeClient(api_key="test_key", prompt_token_budget=1500)
+        opportunity = {
+            'symbol': 'TEST', 'underlying_price': 100,
+            'strategy_details': {'net_debit': 20},
+            'leaps_option': {'strike': 80, 'delta': 0.8},
+            'short_option': {'strike': 110, 'delta': 0.3}
+        }
+        enhanced = {
+            'historical_prices': [
+                {'date': f"2026-01-{day:02d}", 'adjusted_close': 90 + day, 'high': 91 + day,
+                 'low': 89 + day, 'volume': 1000}
+                for day in range(1, 31)
+            ],
+            'recent_news': [
+                {'date': '2026-01-30', 'title': f"Story {i}", 'content': "detail " * 2000}
+                for i in range(5)
+            ],
+            'completeness_score': 75.0
+        }
+
+        prompt, report = client._build_compacted_single_opportunity_prompt(opportunity, enhanced)
+
+        assert report.original_tokens > 10000
+        assert report.compacted_tokens <= 1500
+        assert "30-Day Stats" in prompt
+        assert "## PMCC OPPORTUNITY: TEST" in prompt
+
+    def test_full_options_section_survives_compaction(self):
+        """Test the core options analysis is never trimmed to make room."""
+        leg = {'bid': 20.1, 'ask': 20.5, 'mid': 20.3, 'last': 20.3, 'volume': 120, 'open_interest': 2400,
+               'delta': 0.8123, 'gamma': 0.0123, 'theta': -0.0312, 'vega': 0.2874, 'iv': 0.3125}
+        opportunity = {
+            'symbol': 'TEST', 'underlying_price': 100,
+            'strategy_details': {'net_debit': 18.25, 'max_profit': 11.75, 'max_loss': 18.25,
+                                 'breakeven_price': 98.25, 'risk_reward_ratio': 0.64},
+            'leaps_option': {**leg, 'option_symbol': 'TEST270617C00080000', 'strike': 80,
+                             'expiration': '2027-06-17', 'dte': 400},
+            'short_option': {**leg, 'option_symbol': 'TEST261120C00110000', 'strike': 110,
+                             'expiration': '2026-11-20', 'dte': 32,
+                             'bid': 2.05, 'ask': 2.15, 'delta': 0.2987, 'vega': 0.1142}
+        }
+        enhanced = {
+            'options_chain': {'underlying': 'TEST', 'underlying_price': 100, 'contract_count': 412,
+                              'iv_rank': 45.0, 'iv_percentile': 52.0},
+            'recent_news': [
+                {'date': '2026-01-30', 'title': f"Story {i}", 'content': "detail " * 2000}
+                for i in range(5)
+            ]
+        }
+
+        def options_section(prompt):
+            start = prompt.index("**COMPREHENSIVE OPTIONS ANALYSIS:**")
+            return prompt[start:prompt.index("\n**", start + 1)]
+
+        full, _ = ClaudeClient(api_key="test_key", prompt_token_budget=100000
+                               )._build_compacted_single_opportunity_prompt(opportunity, enhanced)
+        compacted, report = ClaudeClient(api_key="test_key", prompt_token_budget=600
+                                         )._build_compacted_single_opportunity_prompt(opportunity, enhanced)
+
+        assert estimate_tokens(options_section(full)) > DEFAULT_SECTION_BUDGET
+        assert options_section(compacted) == options_section(full)
+        assert 'news' in report.dropped_sections
+
+
+def _analysis(symbol: str, score: int = 70) -> dict:
+    return {'symbol': symbol, 'pmcc_score': score, 'recommendation': 'buy', 'confidence_level': 80}
+
+
+class TestPackedBatchAnalysis:
+    """Test packed multi-opportunity requests and their fallback."""
+
+    def _requests(self, symbols):
+        return [
+            ({'symbol': s, 'underlying_price': 100, 'leaps_option': {'strike': 80, 'delta': 0.8},
+              'short_option': {'strike': 110, 'delta': 0.3}}, {'completeness_score': 50.0})
+            for s in symbols
+        ]
+
+    def test_pack_batches_respects_size_and_budget(self):
+        """Test entries are grouped greedily by size and token budget."""
+        entries = [{'data_block': "x" * 400} for _ in range(5)]
+
+        batches = ClaudeClient._pack_batches(entries, token_budget=250, max_batch_size=2)
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [len(b) for b in ClaudeClient._pack_batches(entries, 150, 5)] == [1, 1, 1, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_batch_split_and_fallback(self):
+        """Test one packed request serves each symbol, missing ones go individual."""
+        client = ClaudeClient(api_key="test_key", max_retries=0)
+        batch_reply = _message(json.dumps({'AAA': _analysis('AAA', 80), 'BBB': _analysis('BBB', 60)}))
+        single_reply = _message(json.dumps(_analysis('CCC', 50)))
+        client.client.messages.create = AsyncMock(side_effect=[batch_reply, single_reply])
+
+        results = await client.analyze_opportunities_batch(self._requests(['AAA', 'BBB', 'CCC']))
+
+        assert client.client.messages.create.await_count == 2
+        first_call = client.client.messages.create.await_args_list[0].kwargs
+        assert "AAA, BBB, CCC" in first_call['messages'][0]['content']
+        assert results['AAA'].data['pmcc_score'] == 80
+        assert results['AAA'].data['batch_size'] == 3
+        assert results['BBB'].data['pmcc_score'] == 60
+        assert results['CCC'].data['pmcc_score'] == 50
+        assert 'batch_size' not in results['CCC'].data
+        assert (results['AAA'].data['usage']['input_tokens']
+                + results['BBB'].data['usage']['input_tokens']) == 1200
+
+
+class TestPromptCaching:
+    """Test the static prefix is sent as a cached system block and billed accordingly."""
+
+    @pytest.mark.asyncio
+    async def test_system_block_marked_for_caching(self):
+        """Test the rubric goes in a cache_control system block, not the user message."""
+        client = ClaudeClient(api_key="test_key", max_retries=0)
+        client.client.messages.create = AsyncMock(return_value=_message(json.dumps(_analysis('AAA'))))
+        opportunity, enhanced = TestPackedBatchAnalysis()._requests(['AAA'])[0]
+
+        await client.analyze_single_opportunity(opportunity, enhanced)
+
+        call = client.client.messages.create.await_args.kwargs
+        assert call['system'] == [{'type': 'text', 'text': PMCC_ANALYST_SYSTEM_PROMPT,
+                                   'cache_control': {'type': 'ephemeral'}}]
+        assert "SCORING FRAMEWORK" not in call['messages'][0]['content']
+        assert "## PMCC OPPORTUNITY: AAA" in call['messages'][0]['content']
+
+    @pytest.mark.asyncio
+    async def test_minimum_cacheable_length_not_warned(self, caplog):
+        """Test a system block of exactly the minimum cacheable length passes the check."""
+        client = ClaudeClient(api_key="test_key", max_retries=0)
+        client.client.messages.count_tokens = AsyncMock(
+            return_value=Mock(input_tokens=MIN_CACHEABLE_PROMPT_TOKENS)
+        )
+
+        assert await client.count_system_prompt_tokens() == MIN_CACHEABLE_PROMPT_TOKENS
+        assert "below the" not in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_health_check_counts_system_prompt_once(self):
+        """Test the first successful health check counts the system block's tokens."""
+        client = ClaudeClient(api_key="test_key", max_retries=0)
+        client.client.messages.create = AsyncMock(return_value=_message("OK"))
+        client.client.messages.count_tokens = AsyncMock(return_value=Mock(input_tokens=1400))
+
+        assert await client.health_check()
+        assert await client.health_check()
+
+        assert client.client.messages.count_tokens.await_count == 1
+        assert client.system_prompt_tokens == 1400
+
+    @pytest.mark.asyncio
+    async def test_count_system_prompt_tokens(self, caplog):
+        """Test the API token count of the system block is returned and checked."""
+        client = ClaudeClient(api_key="test_key", max_retries=0)
+        client.client.messages.count_tokens = AsyncMock(return_value=Mock(input_tokens=845))
+
+        assert await client.count_system_prompt_tokens() == 845
+
+        call = client.client.messages.count_tokens.await_args.kwargs
+        assert call['system'][0]['text'] == PMCC_ANALYST_SYSTEM_PROMPT
+        assert "below the 1024-token minimum" in caplog.text
+
+    def test_user_message_only_carries_data(self):
+        """Test the packed request's user message leaves the format rules to the system block."""
+        client = ClaudeClient(api_key="test_key", max_retries=0)
+        batch = [{'symbol': s, 'data_block': f"## PMCC OPPORTUNITY: {s}"} for s in ('AAA', 'BBB')]
+
+        prompt = client._build_batch_opportunity_prompt(batch)
+
+        assert "keyed by symbol" in prompt and "AAA, BBB" in prompt
+        assert "independently" not in prompt
+        assert "keyed by symbol" in PMCC_ANALYST_SYSTEM_PROMPT
+
+    def test_stats_track_cache_tokens(self):
+        """Test cache writes and reads are counted and priced."""
+        client = ClaudeClient(api_key="test_key", prompt_caching_enabled=False)
+        response = _message()
+        response.usage.cache_creation_input_tokens = 1000
+        response.usage.cache_read_input_tokens = 2000
+
+        client._update_stats(response, success=True)
+
+        stats = client.get_stats()
+        assert stats['total_cache_creation_input_tokens'] == 1000
+        assert stats['total_cache_read_input_tokens'] == 2000
+        assert stats['total_cost_estimate'] == pytest.approx(
+            1200 * 0.000003 + 300 * 0.000015 + 1000 * 0.00000375 + 2000 * 0.0000003
+        )
+        assert estimate_usage_cost({'cache_read_input_tokens': 1000000}) == pytest.approx(0.3)
+
+
+class _FakeStream:
+    """Minimal stand-in for the SDK's message stream context manager."""
+
+    def __init__(self, chunks, final):
+        self.chunks = chunks
+        self.final = final
+        self.read = 0
+        self.current_message_snapshot = final.model_copy(update={'stop_reason': None})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def iterate():
+            for chunk in self.chunks:
+                self.read += 1
+                yield chunk
+        return iterate()
+
+    async def get_final_message(self):
+        return self.final
+
+
+class TestStreamingAnalysis:
+    """Test streamed responses, early stop and latency metrics."""
+
+    def test_tracker_completes_members_across_chunks(self):
+        """Test members split across chunks, nesting and strings with braces."""
+        tracker = StreamingJSONObject()
+        for chunk in ['```json\n{"a": "x,}', '", "b": [1, {"c": 2}]', ', "d": 3', '}']:
+            tracker.feed(chunk)
+            if tracker.has_completed(['a', 'b']):
+                break
+
+        assert json.loads(tracker.completed_json()) == {'a': 'x,}', 'b': [1, {'c': 2}]}
+        assert not tracker.finished
+
+    @pytest.mark.asyncio
+    async def test_early_stop_once_required_fields_complete(self):
+        """Test the stream closes after the stop fields and the analysis still parses."""
+        analysis = {**_analysis('AAA'), 'key_risks': ['r1'], 'key_opportunities': ['o1'],
+                    'management_strategy': 'long text ' * 50}
+        text = json.dumps(analysis)
+        chunks = [text[i:i + 20] for i in range(0, len(text), 20)]
+        stream = _FakeStream(chunks, _message(text))
+        client = ClaudeClient(api_key="test_key", max_retries=0,
+                              streaming_enabled=True, stream_early_stop=True)
+        client.client.messages.stream = lambda **kwargs: stream
+
+        result = await client.analyze_single_opportunity(*TestPackedBatchAnalysis()._requests(['AAA'])[0])
+
+        assert result.is_success
+        assert result.data['pmcc_score'] == 70
+        assert result.data['key_opportunities'] == ['o1']
+        assert 'management_strategy' not in result.data
+        assert result.data['stream_metrics']['early_stopped'] is True
+        assert stream.read < len(chunks)
+        assert client.get_stats()['early_stopped_requests'] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_stream_records_metrics(self):
+        """Test a stream read to the end returns the final message with metrics."""
+        stream = _FakeStream(['{"ok": ', 'true}'], _message())
+        client = ClaudeClient(api_key="test_key", max_retries=0, streaming_enabled=True)
+        client.client.messages.stream = lambda **kwargs: stream
+
+        response = await client._execute_with_retry("prompt")
+
+        assert response.content[0].text == '{"ok": true}'
+        assert response.stream_metrics['early_stopped'] is False
+        assert response.stream_metrics['time_to_first_token_ms'] is not None
+        assert client.get_stats()['streamed_requests'] == 1
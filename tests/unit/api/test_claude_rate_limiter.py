@@ -0,0 +1,171 @@
+"""
+Unit tests for the Claude requests/tokens-per-minute scheduler.
+"""
+
+import asyncio
+
+import anthropic
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from anthropic.types import Message
+
+from src.api.claude_client import ClaudeClient
+from src.api.claude_rate_limiter import ClaudeRateLimiter
+
+
+def _api_error(error_class, status_code: int):
+    return error_class("error", response=Mock(status_code=status_code, headers={}), body=None)
+
+
+def _message() -> Message:
+    return Message.model_validate({
+        'id': 'msg_test',
+        'type': 'message',
+        'role': 'assistant',
+        'model': 'claude-test',
+        'content': [{'type': 'text', 'text': '{"ok": true}'}],
+        'stop_reason': 'end_turn',
+        'stop_sequence': None,
+        'usage': {'input_tokens': 1200, 'output_tokens': 300}
+    })
+
+
+class TestClaudeRateLimiter:
+    """Test sliding-window admission against RPM, ITPM and OTPM limits."""
+
+    def test_admits_until_token_limit(self):
+        """Test requests are admitted while their tokens fit the window."""
+        limiter = ClaudeRateLimiter(requests_per_minute=10, input_tokens_per_minute=1000,
+                                    output_tokens_per_minute=0)
+
+        assert limiter.try_acquire(400, 100, now=0.0) is not None
+        assert limiter.try_acquire(400, 100, now=1.0) is not None
+        assert limiter.try_acquire(400, 100, now=2.0) is None
+        assert limiter.wait_time(400, 100, now=2.0) == pytest.approx(58.0)
+        assert limiter.try_acquire(400, 100, now=60.0) is not None
+
+    def test_request_limit_and_oversized_request(self):
+        """Test RPM caps admission and an oversized request goes on an empty window."""
+        limiter = ClaudeRateLimiter(requests_per_minute=2, input_tokens_per_minute=100,
+                                    output_tokens_per_minute=100)
+
+        assert limiter.try_acquire(5000, 5000, now=0.0) is not None
+        assert limiter.try_acquire(1, 1, now=1.0) is None
+        assert limiter.try_acquire(1, 1, now=60.0) is not None
+        assert limiter.try_acquire(1, 1, now=61.0) is not None
+        assert limiter.try_acquire(1, 1, now=62.0) is None
+
+    def test_record_reconciles_and_release_frees(self):
+        """Test actual usage replaces the estimate and released capacity is reusable."""
+        limiter = ClaudeRateLimiter(requests_per_minute=0, input_tokens_per_minute=0,
+                                    output_tokens_per_minute=1000)
+        first = limiter.try_acquire(100, 800, now=0.0)
+        assert limiter.try_acquire(100, 800, now=1.0) is None
+
+        limiter.record(first, 100, 200)
+        second = limiter.try_acquire(100, 800, now=1.0)
+        assert second is not None
+
+        assert limiter.try_acquire(100, 800, now=2.0) is None
+        limiter.release(second)
+        assert limiter.try_acquire(100, 800, now=2.0) is not None
+
+    @pytest.mark.asyncio
+    async def test_waiter_woken_when_capacity_frees(self):
+        """Test a waiting acquire is admitted on record() rather than window expiry."""
+        limiter = ClaudeRateLimiter(requests_per_minute=0, input_tokens_per_minute=0,
+                                    output_tokens_per_minute=1000)
+        first = await limiter.acquire(100, 800)
+        waiting = asyncio.create_task(limiter.acquire(100, 800))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        limiter.record(first, 100, 150)
+        second = await asyncio.wait_for(waiting, timeout=1.0)
+
+        assert second.output_tokens == 800
+        assert limiter.get_stats()['requests_delayed'] == 1
+
+    def test_pause_blocks_admission(self):
+        """Test a pause after a 429 holds every request."""
+        limiter = ClaudeRateLimiter()
+        limiter.pause(30)
+
+        assert limiter.try_acquire(1, 1) is None
+        assert limiter.get_stats()['rate_limit_pauses'] == 1
+
+
+class TestClaudeClientRateLimiting:
+    """Test ClaudeClient reserves capacity before each request."""
+
+    @pytest.mark.asyncio
+    async def test_reservation_reconciled_with_usage(self):
+        """Test the estimate is reserved before the call and replaced by actual usage."""
+        limiter = ClaudeRateLimiter(requests_per_minute=5, input_tokens_per_minute=100000,
+                                    output_tokens_per_minute=100000)
+        client = ClaudeClient(api_key="test_key", max_retries=0, rate_limiter=limiter)
+        client.client.messages.create = AsyncMock(return_value=_message())
+
+        await client._execute_with_retry("x" * 4000, max_tokens=2000)
+
+        window = client.get_stats()['rate_limiter']['window']
+        assert window == {'requests': 1, 'input_tokens': 1200, 'output_tokens': 300}
+
+    @pytest.mark.asyncio
+    async def test_reserves_expected_output_not_max_tokens(self):
+        """Test the output reservation uses the expected size, capped at max_tokens."""
+        limiter = ClaudeRateLimiter(requests_per_minute=5, input_tokens_per_minute=100000,
+                                    output_tokens_per_minute=100000)
+        client = ClaudeClient(api_key="test_key", max_retries=0, rate_limiter=limiter)
+        reserved = []
+        acquire = limiter.acquire
+
+        async def tracking_acquire(input_tokens, output_tokens):
+            reserved.append(output_tokens)
+            return await acquire(input_tokens, output_tokens)
+
+        limiter.acquire = tracking_acquire
+        client.client.messages.create = AsyncMock(return_value=_message())
+
+        await client._execute_with_retry("first", max_tokens=4000, expected_output_tokens=800)
+        await client._execute_with_retry("second", max_tokens=500, expected_output_tokens=800)
+
+        assert reserved == [800, 500]
+
+    @pytest.mark.asyncio
+    async def test_failed_request_counts_as_request_without_tokens(self):
+        """Test a request that errors after being sent keeps its RPM slot but no tokens."""
+        limiter = ClaudeRateLimiter()
+        client = ClaudeClient(api_key="test_key", max_retries=0, rate_limiter=limiter)
+        client.client.messages.create = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(Exception):
+            await client._execute_with_retry("prompt")
+
+        assert limiter.get_stats()['window'] == {'requests': 1, 'input_tokens': 0, 'output_tokens': 0}
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_attempts_count_against_rpm(self):
+        """Test every 429 attempt stays in the requests-per-minute window."""
+        limiter = ClaudeRateLimiter()
+        limiter.pause = lambda seconds: None
+        client = ClaudeClient(api_key="test_key", max_retries=1, retry_backoff=0, rate_limiter=limiter)
+        client.client.messages.create = AsyncMock(side_effect=_api_error(anthropic.RateLimitError, 429))
+
+        with pytest.raises(Exception):
+            await client._execute_with_retry("prompt")
+
+        assert limiter.get_stats()['window'] == {'requests': 2, 'input_tokens': 0, 'output_tokens': 0}
+
+    @pytest.mark.asyncio
+    async def test_rejected_request_releases_capacity(self):
+        """Test a bad request does not keep its reservation."""
+        limiter = ClaudeRateLimiter()
+        client = ClaudeClient(api_key="test_key", max_retries=0, rate_limiter=limiter)
+        client.client.messages.create = AsyncMock(side_effect=_api_error(anthropic.BadRequestError, 400))
+
+        with pytest.raises(Exception):
+            await client._execute_with_retry("prompt")
+
+        assert limiter.get_stats()['window']['requests'] == 0
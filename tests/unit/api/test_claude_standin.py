@@ -0,0 +1,96 @@
+"""
+Unit tests for the local Claude stand-in.
+"""
+
+import json
+import pytest
+
+import anthropic
+
+from src.api.claude_client import ClaudeClient, PMCC_ANALYSIS_JSON_FIELDS
+from src.api.claude_standin import ClaudeStandIn, StandInConfig
+
+
+def _standin(**overrides) -> ClaudeStandIn:
+    return ClaudeStandIn(StandInConfig(time_scale=0.0, seed=1, **overrides))
+
+
+def _requests(symbols):
+    return [
+        ({'symbol': s, 'underlying_price': 100, 'leaps_option': {'strike': 80, 'delta': 0.8},
+          'short_option': {'strike': 110, 'delta': 0.3}}, {'completeness_score': 50.0})
+        for s in symbols
+    ]
+
+
+class TestClaudeStandIn:
+    """Test the stand-in end to end through ClaudeClient."""
+
+    @pytest.mark.asyncio
+    async def test_single_analysis_is_schema_valid(self):
+        """Test a synthesized analysis parses and carries simulated usage."""
+        standin = _standin()
+        client = ClaudeClient(api_key="test_key", max_retries=0, anthropic_client=standin)
+
+        first = await client.analyze_single_opportunity(*_requests(['AAA'])[0])
+        second = await client.analyze_single_opportunity(*_requests(['AAA'])[0])
+
+        assert first.is_success
+        assert first.data['symbol'] == 'AAA'
+        assert 0 <= first.data['pmcc_score'] <= 100
+        assert set(json.loads('{' + PMCC_ANALYSIS_JSON_FIELDS + '}')) <= set(first.data)
+        assert first.data['pmcc_score'] == second.data['pmcc_score']
+        assert first.data['usage']['cache_creation_input_tokens'] > 0
+        assert second.data['usage']['cache_read_input_tokens'] > 0
+        assert standin.get_stats()['synthesized'] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_reply_keyed_by_symbol(self):
+        """Test a packed request is answered with one analysis per symbol."""
+        standin = _standin()
+        client = ClaudeClient(api_key="test_key", max_retries=0, anthropic_client=standin)
+
+        results = await client.analyze_opportunities_batch(_requests(['AAA', 'BBB', 'CCC']))
+
+        assert standin.get_stats()['requests'] == 1
+        assert {s: r.data['batch_size'] for s, r in results.items()} == {'AAA': 3, 'BBB': 3, 'CCC': 3}
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_errors_are_retried(self):
+        """Test simulated 429s carry retry-after and are retried by the client."""
+        standin = _standin(rate_limit_probability=1.0, retry_after_seconds=0.0)
+        client = ClaudeClient(api_key="test_key", max_retries=1, retry_backoff=0.0,
+                              anthropic_client=standin)
+
+        with pytest.raises(anthropic.RateLimitError) as error:
+            await standin.messages.create(messages=[{'role': 'user', 'content': 'hi'}])
+        assert ClaudeClient._retry_after_seconds(error.value) == 0.0
+
+        result = await client.analyze_single_opportunity(*_requests(['AAA'])[0])
+
+        assert not result.is_success
+        assert standin.get_stats()['rate_limited'] == 3
+
+    @pytest.mark.asyncio
+    async def test_replayed_analysis_and_streaming(self, tmp_path):
+        """Test recorded analyses are replayed and streams can stop early."""
+        recorded = {'symbol': 'AAA', 'pmcc_score': 42, 'recommendation': 'avoid',
+                    'confidence_level': 70, 'key_risks': ['recorded'],
+                    'key_opportunities': ['recorded'], 'usage': {'input_tokens': 1}}
+        with open(tmp_path / "claude_analysis_AAA_20260101_000000.json", 'w') as f:
+            json.dump({'symbol': 'AAA', 'response_data': recorded}, f)
+        standin = _standin(replay_dir=str(tmp_path))
+        client = ClaudeClient(api_key="test_key", max_retries=0, anthropic_client=standin,
+                              streaming_enabled=True, stream_early_stop=True)
+
+        result = await client.analyze_single_opportunity(*_requests(['AAA'])[0])
+
+        assert result.data['pmcc_score'] == 42
+        assert result.data['key_risks'] == ['recorded']
+        assert result.data['stream_metrics']['early_stopped'] is True
+        assert standin.get_stats()['replayed'] == 1
+
+    def test_unknown_latency_distribution_rejected(self):
+        """Test configuration errors surface at construction."""
+        with pytest.raises(ValueError):
+            ClaudeStandIn(StandInConfig(latency_distribution='pareto'))
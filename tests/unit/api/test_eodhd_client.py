@@ -434,6 +434,178 @@ class TestEODHDClient:
         assert client._session is None
 
 
+class TestEODHDClientEnhancedEndpoints:
+    """Test native async endpoints used by the enhanced EODHD provider."""
+    
+    @pytest.mark.asyncio
+    async def test_fundamentals_endpoint(self):
+        """Test fundamentals request path."""
+        client = EODHDClient(api_token="test_token")
+        ok = APIResponse(status=APIStatus.OK, data={"General": {}})
+        
+        with patch.object(client, '_make_request', AsyncMock(return_value=ok)) as mock_request:
+            response = await client.get_fundamentals("AAPL.US")
+        
+        assert response.data == {"General": {}}
+        mock_request.assert_awaited_once_with('fundamentals/AAPL.US', params={'fmt': 'json'})
+    
+    @pytest.mark.asyncio
+    async def test_technical_indicator_params(self):
+        """Test technical indicator query parameters."""
+        client = EODHDClient(api_token="test_token")
+        ok = APIResponse(status=APIStatus.OK, data=[])
+        
+        with patch.object(client, '_make_request', AsyncMock(return_value=ok)) as mock_request:
+            await client.get_technical_indicator(
+                "AAPL.US", "rsi", period=14, date_from="2024-01-01",
+                date_to="2024-03-01", order="d"
+            )
+        
+        endpoint = mock_request.await_args.args[0]
+        params = mock_request.await_args.kwargs['params']
+        assert endpoint == 'technical/AAPL.US'
+        assert params['function'] == 'rsi'
+        assert params['period'] == 14
+        assert params['from'] == '2024-01-01'
+        assert params['to'] == '2024-03-01'
+        assert params['order'] == 'd'
+    
+    @pytest.mark.asyncio
+    async def test_dividends_date_range(self):
+        """Test dividends request keeps from/to in the right order."""
+        client = EODHDClient(api_token="test_token")
+        ok = APIResponse(status=APIStatus.OK, data=[])
+        
+        with patch.object(client, '_make_request', AsyncMock(return_value=ok)) as mock_request:
+            await client.get_dividends("AAPL.US", date_from="2024-01-01", date_to="2024-06-01")
+        
+        params = mock_request.await_args.kwargs['params']
+        assert mock_request.await_args.args[0] == 'div/AAPL.US'
+        assert params['from'] == '2024-01-01'
+        assert params['to'] == '2024-06-01'
+    
+    def test_session_recreated_per_event_loop(self):
+        """Test sessions are not reused across event loops."""
+        client = EODHDClient(api_token="test_token", max_concurrent_requests=4)
+        sessions = []
+        
+        async def open_session():
+            await client._ensure_session()
+            sessions.append(client._session)
+        
+        asyncio.run(open_session())
+        asyncio.run(open_session())
+        
+        assert sessions[0] is not sessions[1]
+        assert client._request_semaphore._value == 4
+        asyncio.run(client.close())
+        assert client._session is None
+
+    @pytest.mark.asyncio
+    async def test_stock_quotes_eod_bulk_chunks_requests(self):
+        """Test bulk quotes are chunked and keyed by the caller's symbols."""
+        client = EODHDClient(api_token="test_token")
+        bulk_data = [
+            {"code": "AAPL", "date": "2024-01-12", "close": 185.5, "adjusted_close": 185.5,
+             "volume": 1000000, "change": 1.2, "change_p": 0.65},
+            {"code": "MSFT", "date": "2024-01-12", "close": 388.0, "adjusted_close": 388.0,
+             "volume": 500000},
+        ]
+        ok = APIResponse(status=APIStatus.OK, data=bulk_data)
+
+        with patch.object(client, '_make_request', AsyncMock(return_value=ok)) as mock_request:
+            response = await client.get_stock_quotes_eod_bulk(["AAPL", "MSFT.US", "TSLA"], chunk_size=2)
+
+        assert response.is_success
+        assert set(response.data) == {"AAPL", "MSFT.US"}
+        assert response.data["AAPL"].last == Decimal('185.5')
+        assert response.data["AAPL"].volume == 1000000
+        assert mock_request.await_count == 2
+        endpoints = {call.args[0] for call in mock_request.await_args_list}
+        symbols = [call.kwargs['params']['symbols'] for call in mock_request.await_args_list]
+        assert endpoints == {'eod-bulk-last-day/US'}
+        assert symbols == ['AAPL.US,MSFT.US', 'TSLA.US']
+
+    @pytest.mark.asyncio
+    async def test_stock_quotes_eod_bulk_all_chunks_failed(self):
+        """Test bulk quotes report an error only when every chunk fails."""
+        client = EODHDClient(api_token="test_token")
+        error = APIResponse(status=APIStatus.ERROR, error=APIError(500, "boom"))
+
+        with patch.object(client, '_make_request', AsyncMock(return_value=error)):
+            response = await client.get_stock_quotes_eod_bulk(["AAPL"])
+
+        assert not response.is_success
+        assert "boom" in response.error.message
+
+    def test_plan_option_range_queries_merges_targets(self):
+        """Test adjacent weekly targets collapse into one range query per type."""
+        client = EODHDClient(api_token="test_token")
+        targets = client.generate_pmcc_targets(200.0)
+
+        leaps_queries = client.plan_option_range_queries(targets['leaps'])
+        short_queries = client.plan_option_range_queries(targets['short'])
+
+        assert len(leaps_queries) == 1
+        assert len(short_queries) == 1
+        assert leaps_queries[0]['strike_from'] == 119.5
+        assert leaps_queries[0]['strike_to'] == 170.5
+        assert len(leaps_queries[0]['targets']) == len(targets['leaps'])
+
+    def test_plan_option_range_queries_splits_on_gap(self):
+        """Test non-adjacent expirations are queried separately."""
+        client = EODHDClient(api_token="test_token")
+        targets = [
+            {'expiration': '2025-01-17', 'strike': 100.0, 'type': 'call'},
+            {'expiration': '2025-01-24', 'strike': 105.0, 'type': 'call'},
+            {'expiration': '2025-06-20', 'strike': 100.0, 'type': 'call'},
+        ]
+
+        queries = client.plan_option_range_queries(targets)
+
+        assert [len(q['targets']) for q in queries] == [2, 1]
+        assert queries[0]['exp_date_from'] == '2025-01-14'
+        assert queries[0]['exp_date_to'] == '2025-01-27'
+
+    @pytest.mark.asyncio
+    async def test_pmcc_options_comprehensive_uses_range_queries(self):
+        """Test comprehensive fetch selects target contracts from paginated range queries."""
+        client = EODHDClient(api_token="test_token")
+        targets = client.generate_pmcc_targets(200.0)
+        leaps_target = targets['leaps'][0]
+        short_target = targets['short'][0]
+        contracts = [
+            {'type': 'call', 'exp_date': leaps_target['expiration'], 'strike': leaps_target['strike'],
+             'dte': 200, 'delta': 0.8},
+            {'type': 'call', 'exp_date': leaps_target['expiration'], 'strike': 165.0,
+             'dte': 200, 'delta': 0.75},  # between target strikes, not selected
+            {'type': 'call', 'exp_date': short_target['expiration'], 'strike': short_target['strike'],
+             'dte': 30, 'delta': 0.3},
+        ]
+
+        async def fake_request(endpoint, params):
+            matches = [
+                {'attributes': dict(c)} for c in contracts
+                if params['filter[exp_date_from]'] <= c['exp_date'] <= params['filter[exp_date_to]']
+                and params['filter[strike_from]'] <= c['strike'] <= params['filter[strike_to]']
+            ]
+            return APIResponse(status=APIStatus.OK, data={'data': matches, 'meta': {'total': len(matches)}})
+
+        with patch.object(client, '_make_request', AsyncMock(side_effect=fake_request)) as mock_request, \
+             patch.object(client, '_get_tradetime_filter', return_value=None):
+            response = await client.get_pmcc_options_comprehensive(
+                "AAPL", current_price=200.0, batch_delay=0, enable_caching=False
+            )
+
+        assert mock_request.await_count == 2
+        summary = response.data['summary']
+        assert summary['leaps_count'] == 1
+        assert summary['short_count'] == 1
+        assert summary['successful_requests'] == 2
+        assert summary['failed_requests'] == 0
+        assert response.data['leaps_options'][0]['target_strike'] == leaps_target['strike']
+
+
 class TestEODHDScreenerResult:
     """Test EODHD screener result model."""
     
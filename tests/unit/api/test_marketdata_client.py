@@ -519,4 +519,29 @@ async def test_rate_limiter_integration():
                 
                 # Verify rate limiter was used
                 mock_limiter.acquire.assert_called_once_with(1)
-                mock_context.set_credits_consumed.assert_called_once_with(2)
\ No newline at end of file
+                mock_context.set_credits_consumed.assert_called_once_with(2)
+
+class TestOptionExpirationParsing:
+    """Test parsing of the option expirations payload."""
+    
+    async def _expirations(self, payload):
+        client = MarketDataClient(api_token="test_token")
+        with patch.object(client, '_make_request', AsyncMock(
+            return_value=APIResponse(status=APIStatus.OK, data=payload)
+        )):
+            return await client.get_option_expirations('AAPL')
+    
+    @pytest.mark.asyncio
+    async def test_iso_dates_are_parsed(self):
+        """Test ISO date strings are accepted alongside timestamps."""
+        response = await self._expirations({'s': 'ok', 'expirations': ['2027-01-15', '2027-06-17T00:00:00']})
+        
+        assert response.is_success
+        assert response.data == ['2027-01-15', '2027-06-17']
+    
+    @pytest.mark.asyncio
+    async def test_unparseable_dates_are_not_an_empty_list(self):
+        """Test a listed but unrecognized payload is an error, not 'no options'."""
+        response = await self._expirations({'s': 'ok', 'expirations': ['Jan 15 2027']})
+        
+        assert response.status == APIStatus.ERROR
@@ -0,0 +1,84 @@
+"""
+Unit tests for token-budgeted prompt compaction.
+"""
+
+from src.api.prompt_compaction import (
+    PromptCompactor, PromptSection, TRUNCATION_MARKER,
+    estimate_tokens, summarize_series, truncate_to_tokens
+)
+
+
+class TestPromptCompactionHelpers:
+    """Test token estimation and series helpers."""
+
+    def test_estimate_and_truncate(self):
+        """Test truncation respects the estimated token budget."""
+        text = "word " * 400
+
+        truncated = truncate_to_tokens(text, 50)
+
+        assert estimate_tokens(text) == 500
+        assert estimate_tokens(truncated) <= 50
+        assert truncated.endswith(TRUNCATION_MARKER)
+        assert truncate_to_tokens("short", 50) == "short"
+
+    def test_summarize_series(self):
+        """Test series statistics."""
+        stats = summarize_series([1.0, 3.0, None, 2.0])
+
+        assert stats['count'] == 3
+        assert stats['first'] == 1.0
+        assert stats['last'] == 2.0
+        assert stats['min'] == 1.0
+        assert stats['max'] == 3.0
+        assert stats['mean'] == 2.0
+        assert summarize_series([]) is None
+
+
+class TestPromptCompactor:
+    """Test section budgets, deduplication and priority truncation."""
+
+    def test_deduplicates_repeated_fields(self):
+        """Test a field already emitted by an earlier section is dropped."""
+        compactor = PromptCompactor(total_budget=1000)
+        sections = [
+            PromptSection('balance_sheet', "BALANCE SHEET", ["Institutional Ownership: 60.00%", "Debt: $1B"], 2),
+            PromptSection('share_structure', "SHARE STRUCTURE", ["Institutional  ownership: 60.00%"], 6),
+        ]
+
+        text, report = compactor.compact(sections)
+
+        assert report.deduplicated_items == 1
+        assert "SHARE STRUCTURE" not in text
+        assert text.count("60.00%") == 1
+
+    def test_section_budget_and_item_cap(self):
+        """Test long items are capped and sections trimmed from the end."""
+        compactor = PromptCompactor(total_budget=5000, section_budgets={'news': 120})
+        sections = [
+            PromptSection('news', "NEWS", ["a " * 500, "b " * 500, "c " * 500], 7,
+                          separator='\n\n', max_item_tokens=50),
+        ]
+
+        text, report = compactor.compact(sections)
+
+        assert estimate_tokens(text) <= 120
+        assert report.original_tokens > report.compacted_tokens
+        assert "c c" not in text
+        assert report.truncated_items >= 2
+
+    def test_total_budget_drops_lowest_priority_first(self):
+        """Test the lowest-priority sections are cut before required ones."""
+        compactor = PromptCompactor(total_budget=55, default_section_budget=1000)
+        sections = [
+            PromptSection('strategy', None, ["x" * 160], 0, required=True),
+            PromptSection('risk', "RISK", ["Credit Rating: A"], 2),
+            PromptSection('sentiment', "SENTIMENT", ["Fear & Greed: 55 (neutral)", "VIX: 18"], 6),
+        ]
+
+        text, report = compactor.compact(sections)
+
+        assert "x" * 160 in text
+        assert "Credit Rating: A" in text
+        assert "SENTIMENT" not in text
+        assert report.dropped_sections == ['sentiment']